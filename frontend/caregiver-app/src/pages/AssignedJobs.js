@@ -3,7 +3,7 @@ import ScreenContainer from '../components/ScreenContainer';
 import CareCard from '../components/CareCard';
 import DualText from '../components/DualText';
 import PrimaryButton from '../components/PrimaryButton';
-import { getAuthHeaders } from '../utils/auth';
+import { getAuthHeaders, getSession } from '../utils/auth';
 
 const CAREGIVER_API = 'http://localhost:8001';
 
@@ -14,7 +14,7 @@ export default function AssignedJobs() {
     const [activeJob, setActiveJob] = useState(null);
     const [seconds, setSeconds] = useState(0);
 
-    // ── POLL for pending bookings ──────────────────────────────
+    // ── FETCH pending bookings ──────────────────────────────
     const fetchJobs = useCallback(async () => {
         try {
             const res = await fetch(`${CAREGIVER_API}/caregiver/bookings/pending`, {
@@ -60,8 +60,15 @@ export default function AssignedJobs() {
         // Only poll when waiting or showing job list
         if (phase !== 'waiting' && phase !== 'job') return;
         fetchJobs();
-        const interval = setInterval(fetchJobs, 3000);
-        return () => clearInterval(interval);
+        // Refetch when a booking change is pushed; slow poll as a safety net
+        const token = encodeURIComponent(getSession()?.access_token || '');
+        const source = new EventSource(`${CAREGIVER_API}/caregiver/bookings/stream?token=${token}`);
+        source.addEventListener('booking', fetchJobs);
+        const interval = setInterval(fetchJobs, 30000);
+        return () => {
+            source.close();
+            clearInterval(interval);
+        };
     }, [fetchJobs, phase]);
 
     // ── Session timer ──────────────────────────────────────────
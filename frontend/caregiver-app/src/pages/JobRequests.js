@@ -6,7 +6,7 @@ import CareCard from '../components/CareCard';
 export default function JobRequests() {
     const [jobs, setJobs] = useState([]);
 
-    // Polling logic
+    // Refetch on pushed booking changes (SSE), slow poll as a safety net
     useEffect(() => {
         const fetchJobs = async () => {
             try {
@@ -25,8 +25,15 @@ export default function JobRequests() {
         };
 
         fetchJobs(); // Initial call
-        const interval = setInterval(fetchJobs, 5000); // Poll every 5s
-        return () => clearInterval(interval);
+        const session = localStorage.getItem('caregiver_session');
+        const token = encodeURIComponent(session ? JSON.parse(session).access_token : '');
+        const source = new EventSource(`http://localhost:8001/caregiver/bookings/stream?token=${token}`);
+        source.addEventListener('booking', fetchJobs);
+        const interval = setInterval(fetchJobs, 30000);
+        return () => {
+            source.close();
+            clearInterval(interval);
+        };
     }, []);
 
     const handleAction = async (id, status) => {
@@ -19,7 +19,7 @@ export default function TrustPassport() {
         const session = getSession();
 
         try {
-            const res = await fetch(`${CAREGIVER_API}/caregiver/me`, {
+            const res = await fetch(`${CAREGIVER_API}/caregiver/passport`, {
                 headers: getAuthHeaders(),
             });
             if (res.ok) {
@@ -67,13 +67,33 @@ export default function TrustPassport() {
                             </div>
                             <div>
                                 <p className="text-2xl font-bold text-txtPrimary">
-                                    {info.verified ? '✓' : '✕'}
+                                    {info.breakdown.verification.verified ? '✓' : '✕'}
                                 </p>
                                 <DualText en="Verified" hi="सत्यापित" size="caption" />
                             </div>
                         </div>
                     </CareCard>
 
+                    <CareCard>
+                        <DualText en={`Trust Level: ${info.trust_level}`} hi="विश्वास स्तर" size="subheading" className="mb-3" />
+                        {[
+                            ['Verification', 'सत्यापन', info.breakdown.verification],
+                            ['Ratings', 'रेटिंग', info.breakdown.ratings],
+                            ['Experience', 'अनुभव', info.breakdown.experience],
+                        ].map(([en, hi, part]) => (
+                            <div key={en} className="flex justify-between py-1">
+                                <DualText en={en} hi={hi} size="small" />
+                                <span className="font-semibold text-txtPrimary">{part.score} / {part.max}</span>
+                            </div>
+                        ))}
+                        {info.breakdown.penalties.total > 0 && (
+                            <div className="flex justify-between py-1">
+                                <DualText en="Penalties" hi="दंड" size="small" />
+                                <span className="font-semibold text-red-600">-{info.breakdown.penalties.total}</span>
+                            </div>
+                        )}
+                    </CareCard>
+
                     <CareCard>
                         <DualText en="Skills" hi="कौशल" size="subheading" className="mb-3" />
                         <div className="flex flex-wrap gap-2">
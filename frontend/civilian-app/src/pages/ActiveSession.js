@@ -27,10 +27,11 @@ export default function ActiveSession() {
     const [review, setReview] = useState('');
     const [caregiverId, setCaregiverId] = useState(null);
 
-    // Update poll to get caregiver_id
+    // Live status over SSE, with a slow poll as a safety net
+    const isRated = bookingStatus === 'rated';
     useEffect(() => {
         if (!bookingId) return;
-        if (bookingStatus === 'rated') return;
+        if (isRated) return;
 
         const poll = async () => {
             try {
@@ -52,9 +53,25 @@ export default function ActiveSession() {
         };
 
         poll();
-        const interval = setInterval(poll, 3000);
-        return () => clearInterval(interval);
-    }, [bookingId, bookingStatus]);
+        const token = encodeURIComponent(getAuthToken());
+        const source = new EventSource(`${CIVILIAN_API}/civilian/booking/stream/${bookingId}?token=${token}`);
+        source.addEventListener('booking', (e) => {
+            const data = JSON.parse(e.data);
+            if (data.caregiver_id) {
+                setCaregiverId(prev => {
+                    // Caregiver changed: refresh name via the status endpoint
+                    if (prev !== data.caregiver_id) poll();
+                    return data.caregiver_id;
+                });
+            }
+            setBookingStatus(data.status);
+        });
+        const interval = setInterval(poll, 30000);
+        return () => {
+            source.close();
+            clearInterval(interval);
+        };
+    }, [bookingId, isRated]);
 
     // ── Session timer — only runs when in_progress ─────────────
     useEffect(() => {
@@ -0,0 +1,101 @@
+"""
+Benchmark of the request_care write path.
+
+Compares the old write sequence of request_care (commit the on-the-fly
+civilian, check the broadcast caregiver, commit the booking, refresh)
+with the single unit-of-work transaction it uses now, on a throwaway
+SQLite file.  Each simulated request books for a new civilian, which is
+the path with the most writes.
+
+Usage:
+    python scripts/benchmark_booking_writes.py [--requests 500]
+"""
+
+import argparse
+import os
+import shutil
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# The database must be chosen before shared.database is imported
+_tmpdir = tempfile.mkdtemp(prefix="sevasetu_bench_")
+os.environ["DATABASE_URL"] = f"sqlite:///{os.path.join(_tmpdir, 'bench.db')}"
+os.environ.setdefault("AUDIT_SYNC", "false")
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services'))
+
+from shared.database import SessionLocal
+from shared.migrations import run_migrations
+from shared.models import AuthIdentity, Booking, Caregiver, Civilian
+from shared.unit_of_work import unit_of_work
+from shared.workflow import BROADCAST_CAREGIVER_ID
+
+
+def _booking(civilian_id: int) -> Booking:
+    start = datetime.utcnow() + timedelta(days=1)
+    return Booking(
+        civilian_id=civilian_id,
+        caregiver_id=BROADCAST_CAREGIVER_ID,
+        start_time=start,
+        end_time=start + timedelta(hours=2),
+        status="pending",
+        payment_status="unpaid",
+    )
+
+
+def multi_commit(db, civilian_id: int) -> None:
+    """request_care before: one commit per step."""
+    if db.query(Civilian).filter(Civilian.id == civilian_id).first() is None:
+        db.add(Civilian(id=civilian_id, name="Bench User", guardian_contact="bench@sevasetu.in"))
+        db.commit()
+    # Per-request sentinel check
+    db.query(AuthIdentity).filter(AuthIdentity.id == BROADCAST_CAREGIVER_ID).first()
+    db.query(Caregiver).filter(Caregiver.id == BROADCAST_CAREGIVER_ID).first()
+    booking = _booking(civilian_id)
+    db.add(booking)
+    db.commit()
+    db.refresh(booking)
+
+
+def single_commit(db, civilian_id: int) -> None:
+    """request_care now: all writes in one unit of work."""
+    with unit_of_work(db):
+        if db.get(Civilian, civilian_id) is None:
+            db.add(Civilian(id=civilian_id, name="Bench User", guardian_contact="bench@sevasetu.in"))
+        db.add(_booking(civilian_id))
+        db.flush()
+
+
+def run(label: str, write, first_id: int, requests: int) -> float:
+    db = SessionLocal()
+    try:
+        started = time.perf_counter()
+        for civilian_id in range(first_id, first_id + requests):
+            write(db, civilian_id)
+        elapsed = time.perf_counter() - started
+    finally:
+        db.close()
+    rps = requests / elapsed
+    print(f"{label:<16} {requests} requests in {elapsed:.2f}s  ->  {rps:,.0f} req/s")
+    return rps
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--requests", type=int, default=500)
+    args = parser.parse_args()
+
+    try:
+        run_migrations()
+        print(f"Database: {os.environ['DATABASE_URL']}\n")
+        before = run("multi-commit", multi_commit, 100_000, args.requests)
+        after = run("unit of work", single_commit, 200_000, args.requests)
+        print(f"\nSpeed-up: {after / before:.2f}x")
+    finally:
+        shutil.rmtree(_tmpdir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -12,6 +12,7 @@ sys.path.insert(0, str(project_root / 'services'))
 
 from shared.database import Base, engine, SessionLocal
 from shared.models import Caregiver, Civilian, Rating
+from shared.migrations import run_migrations
 from datetime import datetime
 import json
 
@@ -19,7 +20,7 @@ print("\n🔧 Initializing SevaSetu Database...\n")
 
 # Create all tables
 print("Creating database tables...")
-Base.metadata.create_all(bind=engine)
+run_migrations()
 print("✅ Tables created successfully\n")
 
 # Seed demo data
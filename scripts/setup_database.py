@@ -12,12 +12,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', 'services'))
 
 from shared.database import Base, engine, SessionLocal
 from shared.models import Caregiver, Civilian, Booking, Rating
+from shared.migrations import run_migrations
 
 
 def create_tables():
     """Create all database tables."""
     print("Creating database tables...")
-    Base.metadata.create_all(bind=engine)
+    run_migrations()
     print("✓ Tables created successfully")
 
 
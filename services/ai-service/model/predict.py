@@ -2,13 +2,33 @@
 Prediction module for caregiver matching model.
 
 This module loads the trained model and makes match score predictions.
+
+Explanations:
+    Every prediction can be decomposed TreeInterpreter-style into
+    ``bias + sum(feature contributions)``.  Walking from a tree's root to
+    a leaf, each split moves the node value by ``value[child] -
+    value[parent]``; that delta is credited to the feature the parent
+    split on.  The cumulative credit for every node is precomputed once
+    when the model is loaded, so explaining a caregiver costs a single
+    gather of its leaf rows (one per tree) — no path walking per request.
 """
 
 import joblib
 import pandas as pd
 import numpy as np
 from pathlib import Path
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional, Tuple
+
+
+# Human-readable reason for each feature, used when it is the strongest
+# positive contributor to a caregiver's match score.
+FEATURE_REASONS = {
+    'skill_match_score': "Strong skill match",
+    'distance_score': "Close to your location",
+    'experience_years': "Highly experienced",
+    'rating_average': "Excellent ratings",
+    'price': "Good value for price",
+}
 
 
 class CaregiverMatcher:
@@ -19,21 +39,24 @@ class CaregiverMatcher:
     for caregiver-civilian pairings.
     """
     
-    def __init__(self, model_path: str = "caregiver_matcher.pkl"):
+    def __init__(self, model_path: str = "caregiver_matcher.pkl", model: Optional[Any] = None):
         """
         Initialize matcher with trained model.
         
         Args:
             model_path: Path to trained model file
+            model: Already-fitted forest to use instead of loading from disk
         """
-        full_path = Path(__file__).parent / model_path
-        if not full_path.exists():
-            raise FileNotFoundError(
-                f"Model file not found: {full_path}. "
-                "Run train.py first to generate the model."
-            )
-        
-        self.model = joblib.load(full_path)
+        if model is None:
+            full_path = Path(__file__).parent / model_path
+            if not full_path.exists():
+                raise FileNotFoundError(
+                    f"Model file not found: {full_path}. "
+                    "Run train.py first to generate the model."
+                )
+            model = joblib.load(full_path)
+        
+        self.model = model
         self.feature_names = [
             'skill_match_score',
             'distance_score',
@@ -41,6 +64,95 @@ class CaregiverMatcher:
             'rating_average',
             'price'
         ]
+        self._build_path_contributions()
+    
+    def _build_path_contributions(self) -> None:
+        """
+        Precompute root-to-node contribution vectors for every tree.
+        
+        All trees are stacked into two flat arrays indexed by
+        ``tree_offset + node_id``:
+        
+            _node_values:   (total_nodes,)             node prediction
+            _node_contribs: (total_nodes, n_features)  cumulative credit
+        
+        sklearn numbers nodes so that a parent always precedes its
+        children, which lets a single forward pass fill each child from
+        its already-finished parent.
+        """
+        n_features = len(self.feature_names)
+        values, contribs, offsets, roots = [], [], [], []
+        offset = 0
+        
+        for estimator in self.model.estimators_:
+            tree = estimator.tree_
+            node_values = tree.value[:, 0, 0]
+            node_contribs = np.zeros((tree.node_count, n_features))
+            
+            for parent in range(tree.node_count):
+                left = tree.children_left[parent]
+                if left == -1:
+                    continue  # leaf
+                right = tree.children_right[parent]
+                feature = tree.feature[parent]
+                for child in (left, right):
+                    node_contribs[child] = node_contribs[parent]
+                    node_contribs[child, feature] += node_values[child] - node_values[parent]
+            
+            values.append(node_values)
+            contribs.append(node_contribs)
+            offsets.append(offset)
+            roots.append(node_values[0])
+            offset += tree.node_count
+        
+        self._node_values = np.concatenate(values)
+        self._node_contribs = np.vstack(contribs)
+        self._tree_offsets = np.asarray(offsets, dtype=np.intp)
+        self._bias = float(np.mean(roots))
+    
+    def _feature_frame(self, caregivers: List[Dict[str, Any]]) -> pd.DataFrame:
+        """Build the model input frame, defaulting missing features to 0.0."""
+        rows = [[cg.get(name, 0.0) for name in self.feature_names] for cg in caregivers]
+        return pd.DataFrame(rows, columns=self.feature_names, dtype=float)
+    
+    def explain(self, caregivers: List[Dict[str, Any]]) -> Tuple[np.ndarray, float, np.ndarray]:
+        """
+        Predict and decompose match scores for a batch of caregivers.
+        
+        Args:
+            caregivers: List of caregiver feature dictionaries
+        
+        Returns:
+            Tuple of (raw predictions, bias, contributions) where
+            contributions has shape (n_caregivers, n_features) and
+            ``bias + contributions.sum(axis=1) == predictions``.
+        """
+        X = self._feature_frame(caregivers)
+        leaves = self.model.apply(X) + self._tree_offsets  # (n, n_trees)
+        
+        predictions = self._node_values[leaves].mean(axis=1)
+        contributions = self._node_contribs[leaves].mean(axis=1)
+        return predictions, self._bias, contributions
+    
+    def explanation_for(self, contributions: np.ndarray) -> Dict[str, Any]:
+        """
+        Turn one caregiver's contribution row into a response payload.
+        
+        Args:
+            contributions: Contribution vector of length n_features
+        
+        Returns:
+            Dictionary with per-feature contributions and a short reason
+        """
+        top = int(np.argmax(contributions))
+        return {
+            "bias": round(self._bias, 4),
+            "contributions": {
+                name: round(float(value), 4)
+                for name, value in zip(self.feature_names, contributions)
+            },
+            "ai_reason": FEATURE_REASONS[self.feature_names[top]],
+        }
     
     def predict_match_score(self, caregiver_data: Dict[str, Any]) -> float:
         """
@@ -48,7 +160,7 @@ class CaregiverMatcher:
         
         Args:
             caregiver_data: Dictionary with required features
-            
+        
         Returns:
             Predicted match score (0.0-1.0)
         """
@@ -64,22 +176,47 @@ class CaregiverMatcher:
         # Clip to valid range
         return float(np.clip(score, 0.0, 1.0))
     
-    def rank_caregivers(self, caregivers: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    def rank_caregivers(
+        self,
+        caregivers: List[Dict[str, Any]],
+        top_k: Optional[int] = None,
+        explain: bool = False,
+    ) -> List[Dict[str, Any]]:
         """
         Rank multiple caregivers by match score.
         
+        All candidates are scored in one batch.  When *explain* is set,
+        the returned caregivers also carry an ``explanation`` and an
+        ``ai_reason`` derived from their feature contributions.
+        
         Args:
             caregivers: List of caregiver data dictionaries
-            
+            top_k: Only return the best *top_k* caregivers (all if None)
+            explain: Attach per-feature contributions to returned caregivers
+        
         Returns:
             Caregivers sorted by match score (descending)
         """
-        # Add match scores to each caregiver
-        for caregiver in caregivers:
-            caregiver['match_score'] = self.predict_match_score(caregiver)
+        if not caregivers:
+            return []
+        
+        predictions, _, contributions = self.explain(caregivers)
+        scores = np.clip(predictions, 0.0, 1.0)
         
-        # Sort by match score (highest first)
-        ranked = sorted(caregivers, key=lambda x: x['match_score'], reverse=True)
+        # Stable sort so equal scores keep their input order
+        order = np.argsort(-scores, kind="stable")
+        if top_k is not None:
+            order = order[:top_k]
+        
+        ranked = []
+        for idx in order:
+            caregiver = caregivers[idx]
+            caregiver['match_score'] = float(scores[idx])
+            if explain:
+                explanation = self.explanation_for(contributions[idx])
+                caregiver['ai_reason'] = explanation.pop('ai_reason')
+                caregiver['explanation'] = explanation
+            ranked.append(caregiver)
         
         return ranked
 
@@ -98,3 +235,7 @@ if __name__ == "__main__":
     
     score = matcher.predict_match_score(test_caregiver)
     print(f"Predicted match score: {score:.4f}")
+    
+    ranked = matcher.rank_caregivers([test_caregiver], explain=True)
+    print(f"Reason: {ranked[0]['ai_reason']}")
+    print(f"Explanation: {ranked[0]['explanation']}")
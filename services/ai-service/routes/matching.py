@@ -31,9 +31,13 @@ class RankRequest(BaseModel):
     Attributes:
         caregivers: List of caregiver data with features
         required_skills: Required skills for matching context
+        top_k: Number of top caregivers to return
+        explain: Attach per-feature score contributions to the results
     """
     caregivers: List[Dict[str, Any]]
     required_skills: List[str]
+    top_k: int = Field(default=3, gt=0)
+    explain: bool = True
 
 
 class RankResponse(BaseModel):
@@ -51,17 +55,20 @@ def rank_caregivers(request: RankRequest):
     """
     Rank caregivers using ML model.
     
-    This endpoint receives caregiver candidates and returns the top 3
-    ranked by predicted match score.
+    This endpoint receives caregiver candidates and returns the top K
+    (default 3) ranked by predicted match score.  With ``explain`` set,
+    each returned caregiver carries an ``explanation`` (bias plus
+    per-feature contributions that sum to the raw score) and an
+    ``ai_reason`` naming its strongest feature.
     
     Args:
         request: Caregiver data and matching context
         
     Returns:
-        RankResponse: Top 3 caregivers sorted by match score
+        RankResponse: Top K caregivers sorted by match score
         
     Expected Input Features (per caregiver):
-        - skill_match: Skill overlap score (0.0-1.0)
+        - skill_match_score: Skill overlap score (0.0-1.0)
         - distance_score: Distance proximity (0.0-1.0)  
         - experience_years: Years of experience (0-20+)
         - rating_average: Average rating (1.0-5.0)
@@ -85,7 +92,7 @@ def rank_caregivers(request: RankRequest):
                 request.caregivers,
                 key=lambda x: x.get('trust_score', 0),
                 reverse=True
-            )[:3]
+            )[:request.top_k]
             return RankResponse(ranked_caregivers=sorted_caregivers)
     
     try:
@@ -94,13 +101,14 @@ def rank_caregivers(request: RankRequest):
             if 'price' not in cg:
                 cg['price'] = 0.5  # Default mid-range price
         
-        # Rank using ML model
-        ranked = matcher.rank_caregivers(request.caregivers)
-        
-        # Return top 3
-        top_3 = ranked[:3]
+        # Rank using ML model; explanations only for the returned top K
+        top_k = matcher.rank_caregivers(
+            request.caregivers,
+            top_k=request.top_k,
+            explain=request.explain,
+        )
         
-        return RankResponse(ranked_caregivers=top_3)
+        return RankResponse(ranked_caregivers=top_k)
         
     except Exception as e:
         raise HTTPException(
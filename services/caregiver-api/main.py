@@ -14,9 +14,16 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from shared.config import Config
-from shared.database import Base, engine, SessionLocal
+from shared.database import SessionLocal
+from shared.migrations import run_migrations
+from shared.workflow import BROADCAST_CAREGIVER_ID
 from shared.models import Caregiver
+from shared.presence import start_flusher, stop_flusher
+from shared import outbox
+from shared.audit import audit_metrics, start_audit_writer, stop_audit_writer
+from shared.singleflight import singleflight_metrics
 from routes import router
+from routes.job_board import board
 
 
 # ── DEMO_MODE: Seed default caregiver on startup ────────────────────────
@@ -26,10 +33,11 @@ async def lifespan(app):
     DEMO_MODE: Ensure a default caregiver always exists.
     Runs on every server startup. Skips if data already present.
     """
-    Base.metadata.create_all(bind=engine)
+    run_migrations()
     db = SessionLocal()
     try:
-        if db.query(Caregiver).count() == 0:
+        # (the broadcast sentinel, caregiver 0, is seeded by run_migrations)
+        if db.query(Caregiver).filter(Caregiver.id != BROADCAST_CAREGIVER_ID).count() == 0:
             demo_cg = Caregiver(
                 hashed_identity="demo_caregiver_hash_sevasetu",
                 name="Demo Caregiver",
@@ -49,8 +57,25 @@ async def lifespan(app):
     finally:
         db.close()
 
+    # Periodic snapshot of live caregiver locations to the DB
+    start_flusher()
+
+    # Booking events from every service: job board first (so clients
+    # refetching on an SSE push see the new board), SSE push, cache
+    # invalidation
+    outbox.subscribe("caregiver-api:jobboard", board.apply)
+    outbox.subscribe_standard("caregiver-api")
+    outbox.start_dispatcher()
+
+    # Buffered audit log
+    start_audit_writer()
+
     yield  # App runs here
 
+    outbox.stop_dispatcher()
+    stop_audit_writer()
+    stop_flusher()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -84,6 +109,24 @@ def health_check():
     return {"status": "healthy", "service": "caregiver-api"}
 
 
+@app.get("/metrics")
+def metrics():
+    """
+    Outbox dispatcher, job board, read-coalescing and audit metrics.
+
+    Returns:
+        dict: Per-consumer outbox offsets and failures; job board size
+        and counters; per-route single-flight requests, executions and
+        coalesced counts; audit rows queued, written and dropped
+    """
+    return {
+        "outbox": outbox.outbox_metrics(),
+        "job_board": board.metrics(),
+        "singleflight": singleflight_metrics(),
+        "audit": audit_metrics(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8001)
@@ -8,29 +8,44 @@ All endpoints are protected with require_role("caregiver").
 Job lifecycle uses shared.workflow state transitions.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy import or_
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
-from datetime import datetime
+from typing import Any, Dict, List, Optional
+from datetime import datetime, timezone
 import sys
+import time
 import os
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
-from shared.database import get_db
-from shared.models import Caregiver, Booking, Civilian
-from shared.auth.dependencies import require_role
-from shared.workflow import transition_booking
-from shared.payment import capture_payment
-from shared.models.audit import log_audit
+from shared.database import get_db, SessionLocal
+from shared.models import Caregiver, Booking, BookingArchive, Civilian
+from shared.auth.dependencies import require_role, get_current_user
+from shared.config import Config
+from shared import presence
+from shared.events import sse_stream
+from shared.changes import CHANGE_FEED_DEFAULT_LIMIT, CHANGE_FEED_MAX_LIMIT, changes_since
+from shared.etag import check_etag, collection_version, make_etag
+from shared.availability import decode_ranges, encode_ranges, get_calendar, set_calendar
+from shared.workflow import BROADCAST_CAREGIVER_ID, claim_transition
+from shared.payment import payment_receipt
+from shared.audit import log_audit
+from shared.booking_archive import booking_history
+from shared.trust_passport import passport_response, regenerate_passport
 from schemas import (
     CaregiverRegisterRequest,
     CaregiverUpdateRequest,
     CaregiverResponse,
     AvailabilityRequest,
+    LocationPing,
+    LocationBatchRequest,
     JobResponse,
+    ChangeFeedResponse,
     BookingStatusUpdateRequest,
 )
+from .job_board import board
 
 router = APIRouter(prefix="/caregiver", tags=["caregiver"])
 
@@ -54,22 +69,71 @@ def update_caregiver(
         cg.skills = request.skills
     if request.experience_years is not None:
         cg.experience_years = request.experience_years
+    if (request.home_lat is None) != (request.home_lng is None):
+        raise HTTPException(status_code=422, detail="home_lat and home_lng must be set together")
+    if request.home_lat is not None:
+        cg.set_home_location(request.home_lat, request.home_lng)
+    if request.service_radius_km is not None:
+        cg.service_radius_km = request.service_radius_km
+    regenerate_passport(db, cg.id)
 
     db.commit()
     db.refresh(cg)
     return cg
 
 
+def _caregiver_version(db: Session, user: Dict[str, Any]):
+    """(id, change_seq) of the caller's caregiver profile, or None."""
+    return (
+        db.query(Caregiver.id, Caregiver.change_seq)
+        .filter(Caregiver.identity_id == user["identity_id"])
+        .first()
+    )
+
+
+def _job_responses(db: Session, bookings, default_name: str = "Patient") -> List[JobResponse]:
+    """JobResponse rows for *bookings*, loading civilian names in one query."""
+    civilian_ids = {b.civilian_id for b in bookings}
+    names = dict(
+        db.query(Civilian.id, Civilian.name).filter(Civilian.id.in_(civilian_ids)).all()
+    ) if civilian_ids else {}
+    return [
+        JobResponse(
+            id=b.id,
+            civilian_id=b.civilian_id,
+            civilian_name=names.get(b.civilian_id, default_name),
+            start_time=b.start_time,
+            end_time=b.end_time,
+            status=b.status,
+        )
+        for b in bookings
+    ]
+
+
 @router.get("/me", response_model=CaregiverResponse)
 def get_current_caregiver(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
-    """Retrieve current caregiver profile."""
-    # Find by identity_id
-    cg = db.query(Caregiver).filter(Caregiver.identity_id == user["identity_id"]).first()
-    if not cg:
+    """
+    Retrieve current caregiver profile.
+
+    Supports If-None-Match.  The trust score shown depends on the
+    caregiver's bookings, so the ETag covers the profile's change number
+    and the version of their bookings.
+    """
+    version = _caregiver_version(db, user)
+    if version is None:
         raise HTTPException(status_code=404, detail="Caregiver profile not found")
+    cg_id, cg_seq = version
+    etag = make_etag("me", cg_id, cg_seq, *collection_version(db, Booking, Booking.caregiver_id == cg_id))
+    not_modified = check_etag(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    cg = db.get(Caregiver, cg_id)
 
     # Dynamic trust score calculation
     completed = db.query(Booking).filter(
@@ -84,29 +148,70 @@ def get_current_caregiver(
     return cg
 
 
+@router.get("/passport")
+@router.get("/passport/{version}")
+def get_own_passport(
+    request: Request,
+    version: Optional[int] = None,
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("caregiver")),
+):
+    """
+    The caller's Trust Passport.
+
+    Served from the stored document (see shared.trust_passport):
+    /passport is the current version, /passport/{version} is immutable.
+    """
+    cg_id = db.query(Caregiver.id).filter(Caregiver.identity_id == user["identity_id"]).scalar()
+    if cg_id is None:
+        raise HTTPException(status_code=404, detail="Caregiver profile not found")
+    return passport_response(request, db, cg_id, version)
+
+
+@router.get("/{caregiver_id}/passport")
+@router.get("/{caregiver_id}/passport/{version}")
+def get_passport(
+    caregiver_id: int,
+    request: Request,
+    version: Optional[int] = None,
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("caregiver")),
+):
+    """A caregiver's Trust Passport; same caching as /passport."""
+    return passport_response(request, db, caregiver_id, version)
+
+
 @router.get("/jobs/me", response_model=List[JobResponse])
 def get_current_caregiver_jobs(
+    request: Request,
+    response: Response,
+    history: bool = Query(False),
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
-    """List all jobs for the current caregiver."""
-    cg = db.query(Caregiver).filter(Caregiver.identity_id == user["identity_id"]).first()
-    if not cg:
-        raise HTTPException(status_code=404, detail="Caregiver not found")
+    """
+    List all jobs for the current caregiver (supports If-None-Match).
 
-    bookings = db.query(Booking).filter(Booking.caregiver_id == cg.id).all()
-    jobs = []
-    for b in bookings:
-        civ = db.query(Civilian).filter(Civilian.id == b.civilian_id).first()
-        jobs.append(JobResponse(
-            id=b.id,
-            civilian_id=b.civilian_id,
-            civilian_name=civ.name if civ else "Unknown",
-            start_time=b.start_time,
-            end_time=b.end_time,
-            status=b.status,
-        ))
-    return jobs
+    history=true also returns archived (old closed/cancelled) jobs,
+    ordered by start time.
+    """
+    version = _caregiver_version(db, user)
+    if version is None:
+        raise HTTPException(status_code=404, detail="Caregiver not found")
+    cg_id = version[0]
+    parts = collection_version(db, Booking, Booking.caregiver_id == cg_id)
+    if history:
+        parts += collection_version(db, BookingArchive, BookingArchive.caregiver_id == cg_id)
+    etag = make_etag("history" if history else "jobs", cg_id, *parts)
+    not_modified = check_etag(request, response, etag)
+    if not_modified is not None:
+        return not_modified
+
+    if history:
+        bookings = booking_history(db, caregiver_id=cg_id)
+    else:
+        bookings = db.query(Booking).filter(Booking.caregiver_id == cg_id).all()
+    return _job_responses(db, bookings, default_name="Unknown")
 
 
 # ---------- existing endpoints (unchanged logic, RBAC added) ----------
@@ -135,6 +240,8 @@ def register_caregiver(
         verified=False,
     )
     db.add(new_cg)
+    db.flush()
+    regenerate_passport(db, new_cg.id)
     db.commit()
     db.refresh(new_cg)
     return new_cg
@@ -146,10 +253,36 @@ def update_availability(
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
-    """Update caregiver availability (placeholder)."""
+    """
+    Update caregiver availability.
+
+    ``available`` toggles whether the caregiver is on shift right now;
+    ``weekly`` and ``overrides`` update the calendar used by matching.
+    """
     cg = db.query(Caregiver).filter(Caregiver.id == request.caregiver_id).first()
     if not cg:
         raise HTTPException(status_code=404, detail="Caregiver not found")
+    if cg.identity_id != user["identity_id"]:
+        raise HTTPException(status_code=403, detail="Cannot edit another caregiver's availability")
+
+    if request.available is not None:
+        presence.set_available(cg.id, request.available)
+
+    if request.weekly is not None or request.overrides is not None:
+        set_calendar(
+            db,
+            cg.id,
+            weekly=None if request.weekly is None else {
+                day: encode_ranges((r.start, r.end) for r in ranges)
+                for day, ranges in request.weekly.items()
+            },
+            overrides=None if request.overrides is None else {
+                day: encode_ranges((r.start, r.end) for r in ranges)
+                for day, ranges in request.overrides.items()
+            },
+        )
+        db.commit()
+
     return {
         "message": "Availability updated",
         "caregiver_id": request.caregiver_id,
@@ -157,6 +290,124 @@ def update_availability(
     }
 
 
+@router.get("/availability/{caregiver_id}")
+def get_availability(
+    caregiver_id: int,
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Weekly template and upcoming date overrides as time ranges."""
+    weekly, overrides = get_calendar(db, caregiver_id, from_date=datetime.utcnow().date())
+
+    def _ranges(bitmap):
+        return [{"start": start.isoformat(timespec="minutes"), "end": end.isoformat(timespec="minutes")}
+                for start, end in decode_ranges(bitmap)]
+
+    return {
+        "caregiver_id": caregiver_id,
+        "weekly": {day: _ranges(bitmap) for day, bitmap in weekly.items()},
+        "overrides": {day.isoformat(): _ranges(bitmap) for day, bitmap in overrides.items()},
+    }
+
+
+def _own_caregiver_id(db: Session, user: Dict[str, Any]) -> int:
+    cg_id = db.query(Caregiver.id).filter(Caregiver.identity_id == user["identity_id"]).scalar()
+    if cg_id is None:
+        raise HTTPException(status_code=404, detail="Caregiver profile not found")
+    return cg_id
+
+
+@router.post("/location", status_code=status.HTTP_202_ACCEPTED)
+def report_location(
+    request: LocationPing,
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("caregiver")),
+):
+    """
+    Report the caregiver's live location.
+
+    Held in the in-memory presence grid; the database only sees the
+    periodic snapshot.
+    """
+    return report_locations(LocationBatchRequest(pings=[request]), db, user)
+
+
+@router.post("/location/batch", status_code=status.HTTP_202_ACCEPTED)
+def report_locations(
+    request: LocationBatchRequest,
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("caregiver")),
+):
+    """Report several buffered location pings at once (latest wins)."""
+    cg_id = _own_caregiver_id(db, user)
+    now = time.time()
+
+    def _seen(ping: LocationPing) -> float:
+        if ping.recorded_at is None:
+            return now
+        recorded = ping.recorded_at
+        if recorded.tzinfo is None:
+            recorded = recorded.replace(tzinfo=timezone.utc)
+        return min(recorded.timestamp(), now)
+
+    accepted = presence.record_locations(
+        (cg_id, ping.lat, ping.lng, _seen(ping), ping.available) for ping in request.pings
+    )
+    return {"caregiver_id": cg_id, "accepted": accepted}
+
+
+@router.get("/presence/nearby")
+def nearby_caregivers(
+    lat: float,
+    lng: float,
+    radius_km: float = Query(Config.MATCH_RADIUS_KM, gt=0, le=presence.MAX_NEARBY_RADIUS_KM),
+    limit: int = Query(20, ge=1, le=presence.MAX_NEARBY_LIMIT),
+    user: Dict[str, Any] = Depends(get_current_user),
+):
+    """Available caregivers currently on shift near a point, nearest first."""
+    return {
+        "caregivers": [
+            {"caregiver_id": cg_id, "distance_km": round(distance, 3)}
+            for cg_id, distance in presence.nearby_caregivers(lat, lng, radius_km, limit=limit)
+        ]
+    }
+
+
+@router.get("/changes", response_model=ChangeFeedResponse)
+def get_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(CHANGE_FEED_DEFAULT_LIMIT, ge=1, le=CHANGE_FEED_MAX_LIMIT),
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("caregiver")),
+):
+    """
+    Incremental sync: bookings and profile changed since cursor *since*.
+
+    Covers the caregiver's own bookings and open broadcast offers.  A
+    booking that leaves this view — an offer claimed by someone else,
+    or a booking reassigned away — is listed by id in ``removed``.
+    Start with since=0, then pass back next_cursor.
+    """
+    cg = db.query(Caregiver).filter(Caregiver.identity_id == user["identity_id"]).first()
+    if not cg:
+        raise HTTPException(status_code=404, detail="Caregiver profile not found")
+
+    visible = Booking.caregiver_id.in_([cg.id, BROADCAST_CAREGIVER_ID])
+    # A full sync has nothing to remove.  "= 1" (not IS) so SQLite can
+    # read the partial idx_booking_reassigned_seq
+    in_scope = or_(visible, Booking.reassigned == True) if since else visible
+    rows, next_cursor, has_more = changes_since(db, Booking, since, limit, in_scope)
+    bookings = [b for b in rows if b.caregiver_id in (cg.id, BROADCAST_CAREGIVER_ID)]
+    profile_changed = cg.change_seq is not None and since < cg.change_seq <= next_cursor
+    return ChangeFeedResponse(
+        bookings=_job_responses(db, bookings),
+        removed=[b.id for b in rows if b.caregiver_id not in (cg.id, BROADCAST_CAREGIVER_ID)],
+        profile=CaregiverResponse.model_validate(cg) if profile_changed else None,
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
 @router.get("/{caregiver_id}", response_model=CaregiverResponse)
 def get_caregiver(
     caregiver_id: int,
@@ -183,27 +434,20 @@ def get_caregiver(
 @router.get("/jobs/{caregiver_id}", response_model=List[JobResponse])
 def get_caregiver_jobs(
     caregiver_id: int,
+    history: bool = Query(False),
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
-    """List all jobs for a caregiver."""
+    """List all jobs for a caregiver (history=true adds archived jobs)."""
     cg = db.query(Caregiver).filter(Caregiver.id == caregiver_id).first()
     if not cg:
         raise HTTPException(status_code=404, detail="Caregiver not found")
 
-    bookings = db.query(Booking).filter(Booking.caregiver_id == caregiver_id).all()
-    jobs = []
-    for b in bookings:
-        civ = db.query(Civilian).filter(Civilian.id == b.civilian_id).first()
-        jobs.append(JobResponse(
-            id=b.id,
-            civilian_id=b.civilian_id,
-            civilian_name=civ.name if civ else "Unknown",
-            start_time=b.start_time,
-            end_time=b.end_time,
-            status=b.status,
-        ))
-    return jobs
+    if history:
+        bookings = booking_history(db, caregiver_id=caregiver_id)
+    else:
+        bookings = db.query(Booking).filter(Booking.caregiver_id == caregiver_id).all()
+    return _job_responses(db, bookings, default_name="Unknown")
 
 
 # ---------- Part 4 – Job lifecycle endpoints ----------
@@ -219,15 +463,13 @@ def start_job(
 
     Captures payment and records the actual start timestamp.
     """
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    transition_booking(booking, "in_progress")
-    booking.started_at = datetime.utcnow()
-
-    # Capture the reserved payment
-    pay_result = capture_payment(booking)
+    # One conditional UPDATE moves the job and captures the reserved payment
+    booking = claim_transition(
+        db, booking_id, "in_progress", _own_caregiver_id(db, user),
+        where=(Booking.payment_status == "reserved",),
+        values={"started_at": datetime.utcnow(), "payment_status": "paid"},
+    )
+    pay_result = payment_receipt(booking)
 
     db.commit()
 
@@ -253,12 +495,10 @@ def end_job(
 
     Records the actual end timestamp.
     """
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    transition_booking(booking, "completed")
-    booking.ended_at = datetime.utcnow()
+    booking = claim_transition(
+        db, booking_id, "completed", _own_caregiver_id(db, user),
+        values={"ended_at": datetime.utcnow()},
+    )
 
     db.commit()
 
@@ -281,11 +521,7 @@ def pause_job(
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
     """Pause job on safety alert → IN_PROGRESS→PAUSED."""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    transition_booking(booking, "paused")
+    booking = claim_transition(db, booking_id, "paused", _own_caregiver_id(db, user))
     db.commit()
 
     log_audit(user["identity_id"], "job_paused_safety", "booking", booking.id)
@@ -300,11 +536,10 @@ def resume_job(
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
     """Resume paused job after guardian acknowledgement → PAUSED→IN_PROGRESS."""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    transition_booking(booking, "in_progress")
+    booking = claim_transition(
+        db, booking_id, "in_progress", _own_caregiver_id(db, user),
+        where=(Booking.status == "paused",),
+    )
     db.commit()
 
     log_audit(user["identity_id"], "job_resumed", "booking", booking.id)
@@ -316,39 +551,76 @@ def resume_job(
 
 @router.get("/bookings/pending", response_model=List[JobResponse])
 def get_pending_bookings(
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
     """
-    Poll for pending/matched/confirmed bookings from the real DB.
+    Poll for pending/matched/confirmed bookings.
     Returns only real bookings — no fake data.
+
+    Served from the in-memory job board (see job_board), which is kept
+    current from booking events.  Supports If-None-Match: the ETag is
+    the board's broadcast and per-caregiver version, so an unchanged
+    board answers 304 without touching the database.
     """
-    cg = db.query(Caregiver).filter(Caregiver.identity_id == user["identity_id"]).first()
-    if not cg:
-        cg = db.query(Caregiver).first()
-        if not cg:
+    cg_id = board.caregiver_id_for(db, user["identity_id"])
+    if cg_id is None:
+        cg_id = (
+            db.query(Caregiver.id)
+            .filter(Caregiver.id != BROADCAST_CAREGIVER_ID)
+            .order_by(Caregiver.id)
+            .limit(1)
+            .scalar()
+        )
+        if cg_id is None:
             return []
 
-    # Find bookings assigned to this caregiver OR unassigned (caregiver_id=0)
-    # Only show CONFIRMED bookings (after Civilian clicks "Select")
-    bookings = db.query(Booking).filter(
-        (Booking.caregiver_id == cg.id) | (Booking.caregiver_id == 0),
-        Booking.status.in_(["confirmed"])
-    ).all()
-
-    jobs = []
-    for b in bookings:
-        civ = db.query(Civilian).filter(Civilian.id == b.civilian_id).first()
-        jobs.append(JobResponse(
-            id=b.id,
-            civilian_id=b.civilian_id,
-            civilian_name=civ.name if civ else "Patient",
-            start_time=b.start_time,
-            end_time=b.end_time,
-            status=b.status,
-        ))
+    not_modified = check_etag(request, response, make_etag("pending", cg_id, *board.version(cg_id)))
+    if not_modified is not None:
+        return not_modified
+
+    # Bookings assigned to this caregiver OR unassigned (caregiver_id=0)
+    # Only CONFIRMED bookings are on the board (after Civilian clicks "Select")
+    return board.pending(cg_id)
 
-    return jobs
+
+@router.get("/bookings/stream")
+def stream_bookings(
+    request: Request,
+    user: Dict[str, Any] = Depends(require_role("caregiver", allow_query_token=True)),
+):
+    """
+    Server-Sent Events stream of booking changes for this caregiver.
+
+    Delivers changes to bookings assigned to the caregiver and to
+    broadcast bookings (new requests, and — as booking id and status
+    only — the moment another caregiver claims one).  Replaces polling of /bookings/pending and /jobs/me;
+    the JWT may be passed as ``?token=`` for EventSource.
+    """
+    with SessionLocal() as db:
+        cg_id = _own_caregiver_id(db, user)
+
+    def visible(evt: Dict[str, Any]) -> bool:
+        return evt["caregiver_id"] in (cg_id, BROADCAST_CAREGIVER_ID)
+
+    def accepts(evt: Dict[str, Any]) -> bool:
+        # Accepted elsewhere: drop it from the pending board if shown
+        return visible(evt) or evt["status"] == "accepted"
+
+    def view(evt: Dict[str, Any]) -> Dict[str, Any]:
+        if visible(evt):
+            return evt
+        # Another caregiver's booking: just enough to remove it, no
+        # civilian or schedule details
+        return {k: evt[k] for k in ("event_id", "booking_id", "status") if k in evt}
+
+    return StreamingResponse(
+        sse_stream(accepts, is_disconnected=request.is_disconnected, view=view),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
 
 
 @router.put("/bookings/{booking_id}/status")
@@ -358,20 +630,21 @@ def update_booking_status(
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("caregiver")),
 ):
-    """Accept or Reject booking."""
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not booking:
-        raise HTTPException(status_code=404, detail="Booking not found")
-
-    if request.status.lower() == "confirmed":
-        transition_booking(booking, "confirmed")
-    elif request.status.lower() == "accepted":
-        transition_booking(booking, "accepted")
-    elif request.status.lower() == "rejected":
-        # Transition to rejected state
-        transition_booking(booking, "rejected")
-        # TODO: Logic to re-open booking for matching? For now, it's terminal. 
-    
+    """
+    Accept or Reject booking.
+
+    Accepting a broadcast booking claims it atomically: when several
+    caregivers accept at once, exactly one wins and the rest get 409.
+    So does a caregiver already booked for an overlapping window — the
+    overlap check is part of the same UPDATE.
+    """
+    target = request.status.lower()
+    if target not in ("confirmed", "accepted", "rejected"):
+        raise HTTPException(status_code=422, detail=f"Unsupported status '{request.status}'")
+
+    # TODO: Logic to re-open a rejected booking for matching? For now, it's terminal.
+    booking = claim_transition(db, booking_id, target, _own_caregiver_id(db, user))
+
     db.commit()
     return {"message": f"Booking {request.status}", "status": booking.status}
 
@@ -396,6 +669,7 @@ def update_profile_demo(
         cg.skills = request.skills
     if request.experience_years is not None:
         cg.experience_years = request.experience_years
+    regenerate_passport(db, cg.id)
 
     db.commit()
     db.refresh(cg)
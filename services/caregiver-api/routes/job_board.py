@@ -0,0 +1,207 @@
+"""
+In-memory job board.
+
+Holds every confirmed booking — the broadcast set (caregiver_id = 0)
+and each caregiver's assigned set — as ready-made JobResponse objects,
+so a /bookings/pending poll is a dictionary read instead of a bookings
++ civilians query.
+
+Updates are incremental: the board is an outbox consumer
+("caregiver-api:jobboard") and applies each booking event by moving
+that one booking between sets.  Every set carries a version number that
+moves only when the set changes, and the ETag of a poll is built from
+(board generation, broadcast version, own version), so "nothing new"
+needs no database access at all.
+
+Consistency:
+    * The snapshot is loaded lazily (concurrent first polls share one
+      load) after reading the outbox tail; events are applied only if
+      newer than what the board already holds for that booking.
+    * Changes reach the board with outbox latency: immediately for
+      commits in this process, within OUTBOX_POLL_SECONDS for commits
+      made by civilian-api.
+    * Civilian names are cached; a renamed civilian shows the old name
+      until the board is reloaded.
+"""
+
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import func
+
+from shared.database import SessionLocal
+from shared.models import Booking, BookingEvent, Caregiver, Civilian
+from shared.singleflight import get_group
+from shared.workflow import BROADCAST_CAREGIVER_ID
+from schemas import JobResponse
+
+# Status of bookings shown on the board
+BOARD_STATUS = "confirmed"
+
+
+class JobBoard:
+    """
+    Versioned broadcast and per-caregiver sets of confirmed bookings.
+
+    Args:
+        session_factory: Session factory for the snapshot and name lookups
+    """
+
+    def __init__(self, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._loaded = False
+        # Distinguishes this board's versions from a previous process's
+        self.generation = uuid.uuid4().hex[:8]
+        self._clock = 0
+        self._sets: Dict[int, Dict[int, JobResponse]] = {}
+        self._versions: Dict[int, int] = {}
+        self._owner: Dict[int, int] = {}           # booking id → set key
+        self._last_event: Dict[int, int] = {}      # booking id → event id
+        self._snapshot_event_id = 0
+        self._names: Dict[int, str] = {}
+        self._identities: Dict[int, int] = {}      # identity id → caregiver id
+        self.applied = 0
+        self.polls = 0
+
+    # ── Loading ───────────────────────────────────────────────────────
+
+    def _load(self) -> None:
+        db = self._session_factory()
+        try:
+            tail = db.query(func.coalesce(func.max(BookingEvent.id), 0)).scalar()
+            rows = (
+                db.query(Booking, Civilian.name)
+                .outerjoin(Civilian, Civilian.id == Booking.civilian_id)
+                .filter(Booking.status == BOARD_STATUS)
+                .all()
+            )
+        finally:
+            db.close()
+        with self._lock:
+            self._sets.clear()
+            self._owner.clear()
+            self._last_event.clear()
+            self._snapshot_event_id = tail
+            for booking, name in rows:
+                if name is not None:
+                    self._names[booking.civilian_id] = name
+                self._place(booking.id, booking.caregiver_id, self._job(
+                    booking.id, booking.civilian_id, booking.start_time, booking.end_time
+                ))
+            self._loaded = True
+
+    def ensure_loaded(self) -> None:
+        if not self._loaded:
+            get_group("job-board-load").do(id(self), lambda: self._loaded or self._load())
+
+    # ── Incremental updates ───────────────────────────────────────────
+
+    def _job(self, booking_id: int, civilian_id: int, start, end) -> JobResponse:
+        return JobResponse(
+            id=booking_id,
+            civilian_id=civilian_id,
+            civilian_name=self._names.get(civilian_id, "Patient"),
+            start_time=start,
+            end_time=end,
+            status=BOARD_STATUS,
+        )
+
+    def _bump(self, key: int) -> None:
+        self._clock += 1
+        self._versions[key] = self._clock
+
+    def _place(self, booking_id: int, key: int, job: Optional[JobResponse]) -> None:
+        """Move a booking to set *key* (or off the board if job is None)."""
+        previous = self._owner.pop(booking_id, None)
+        if previous is not None:
+            self._sets.get(previous, {}).pop(booking_id, None)
+            self._bump(previous)
+        if job is not None:
+            self._sets.setdefault(key, {})[booking_id] = job
+            self._owner[booking_id] = key
+            self._bump(key)
+
+    def _civilian_name(self, civilian_id: int) -> None:
+        if civilian_id in self._names:
+            return
+        db = self._session_factory()
+        try:
+            name = db.query(Civilian.name).filter(Civilian.id == civilian_id).scalar()
+        finally:
+            db.close()
+        if name is not None:
+            self._names[civilian_id] = name
+
+    def apply(self, evt: Dict[str, Any]) -> None:
+        """Outbox consumer: reflect one booking event on the board."""
+        if evt.get("reminder"):
+            return
+        # Events at or below the snapshot's outbox tail are skipped below
+        self.ensure_loaded()
+        on_board = evt["status"] == BOARD_STATUS
+        if on_board:
+            self._civilian_name(evt["civilian_id"])
+        with self._lock:
+            booking_id = evt["booking_id"]
+            newest = max(self._snapshot_event_id, self._last_event.get(booking_id, 0))
+            if evt["event_id"] <= newest:
+                return
+            self._last_event[booking_id] = evt["event_id"]
+            job = None
+            if on_board:
+                job = self._job(
+                    booking_id, evt["civilian_id"],
+                    datetime.fromisoformat(evt["start_time"]), datetime.fromisoformat(evt["end_time"]),
+                )
+            elif booking_id not in self._owner:
+                return
+            self._place(booking_id, evt["caregiver_id"], job)
+            self.applied += 1
+
+    # ── Reads ─────────────────────────────────────────────────────────
+
+    def caregiver_id_for(self, db, identity_id: int) -> Optional[int]:
+        """Caregiver id of an auth identity (cached after the first lookup)."""
+        cg_id = self._identities.get(identity_id)
+        if cg_id is None:
+            cg_id = db.query(Caregiver.id).filter(Caregiver.identity_id == identity_id).scalar()
+            if cg_id is not None:
+                self._identities[identity_id] = cg_id
+        return cg_id
+
+    def version(self, caregiver_id: int) -> Tuple[str, int, int]:
+        """(generation, broadcast version, own version) for an ETag."""
+        self.ensure_loaded()
+        with self._lock:
+            self.polls += 1
+            return (
+                self.generation,
+                self._versions.get(BROADCAST_CAREGIVER_ID, 0),
+                self._versions.get(caregiver_id, 0),
+            )
+
+    def pending(self, caregiver_id: int) -> List[JobResponse]:
+        """Broadcast and own confirmed jobs, by booking id."""
+        self.ensure_loaded()
+        with self._lock:
+            jobs = list(self._sets.get(BROADCAST_CAREGIVER_ID, {}).values())
+            if caregiver_id != BROADCAST_CAREGIVER_ID:
+                jobs += self._sets.get(caregiver_id, {}).values()
+        return sorted(jobs, key=lambda job: job.id)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "loaded": self._loaded,
+                "jobs": len(self._owner),
+                "broadcast": len(self._sets.get(BROADCAST_CAREGIVER_ID, {})),
+                "applied_events": self.applied,
+                "polls": self.polls,
+            }
+
+
+# Global instance
+board = JobBoard()
@@ -7,7 +7,10 @@ from .caregiver import (
     CaregiverUpdateRequest,
     CaregiverResponse,
     AvailabilityRequest,
+    LocationPing,
+    LocationBatchRequest,
     JobResponse,
+    ChangeFeedResponse,
     BookingStatusUpdateRequest,
 )
 
@@ -16,6 +19,9 @@ __all__ = [
     "CaregiverUpdateRequest",
     "CaregiverResponse",
     "AvailabilityRequest",
+    "LocationPing",
+    "LocationBatchRequest",
     "JobResponse",
+    "ChangeFeedResponse",
     "BookingStatusUpdateRequest",
 ]
@@ -6,8 +6,8 @@ response serialization in the caregiver API.
 """
 
 from pydantic import BaseModel, Field, validator
-from typing import List, Optional
-from datetime import datetime
+from typing import Dict, List, Optional
+from datetime import date, datetime, time
 
 
 class CaregiverRegisterRequest(BaseModel):
@@ -41,6 +41,9 @@ class CaregiverUpdateRequest(BaseModel):
     gender: Optional[str] = None
     skills: Optional[List[str]] = None
     experience_years: Optional[int] = None
+    home_lat: Optional[float] = Field(None, ge=-90, le=90)
+    home_lng: Optional[float] = Field(None, ge=-180, le=180)
+    service_radius_km: Optional[float] = Field(None, gt=0)
 
 
 class CaregiverResponse(BaseModel):
@@ -56,6 +59,9 @@ class CaregiverResponse(BaseModel):
         rating_average: Average rating (1.0-5.0)
         trust_score: Computed trust score
         verified: Verification status
+        home_lat: Home latitude
+        home_lng: Home longitude
+        service_radius_km: Travel radius from home
     """
     id: int
     name: str
@@ -65,22 +71,65 @@ class CaregiverResponse(BaseModel):
     rating_average: float
     trust_score: float
     verified: bool
+    home_lat: Optional[float] = None
+    home_lng: Optional[float] = None
+    service_radius_km: Optional[float] = None
 
     class Config:
         """Pydantic configuration."""
         from_attributes = True
 
 
+class TimeRange(BaseModel):
+    """[start, end) within one day; end 00:00 means midnight."""
+    start: time
+    end: time
+
+
 class AvailabilityRequest(BaseModel):
     """
     Request schema for updating caregiver availability.
 
     Attributes:
         caregiver_id: Caregiver ID
-        available: Whether caregiver is currently available
+        available: Whether caregiver is currently available (on/off shift)
+        weekly: Weekday (0 = Monday) → available hours; replaces the
+            whole weekly template, an empty object clears it
+        overrides: Date → available hours for that date only
+            (an empty list marks a day off)
     """
     caregiver_id: int = Field(..., gt=0)
-    available: bool
+    available: Optional[bool] = None
+    weekly: Optional[Dict[int, List[TimeRange]]] = None
+    overrides: Optional[Dict[date, List[TimeRange]]] = None
+
+    @validator('weekly')
+    def validate_weekdays(cls, v):
+        """Weekday keys must be 0-6."""
+        if v is not None and any(not 0 <= day <= 6 for day in v):
+            raise ValueError("Weekdays must be 0 (Monday) to 6 (Sunday)")
+        return v
+
+
+class LocationPing(BaseModel):
+    """
+    Live location report from a caregiver's device.
+
+    Attributes:
+        lat: Latitude
+        lng: Longitude
+        available: Whether the caregiver can take a new job
+        recorded_at: Device timestamp (defaults to receipt time)
+    """
+    lat: float = Field(..., ge=-90, le=90)
+    lng: float = Field(..., ge=-180, le=180)
+    available: bool = True
+    recorded_at: Optional[datetime] = None
+
+
+class LocationBatchRequest(BaseModel):
+    """Pings buffered on the device and sent together."""
+    pings: List[LocationPing] = Field(..., min_items=1, max_items=500)
 
 
 class JobResponse(BaseModel):
@@ -107,6 +156,25 @@ class JobResponse(BaseModel):
         from_attributes = True
 
 
+class ChangeFeedResponse(BaseModel):
+    """
+    Response schema for the incremental sync feed.
+
+    Attributes:
+        bookings: Bookings changed since the cursor, oldest change first
+        removed: Ids of bookings that left this caregiver's view since the
+            cursor (an offer claimed by someone else); delete them locally
+        profile: The caregiver's profile if it changed since the cursor
+        next_cursor: Pass as ``since`` on the next sync
+        has_more: Another page is waiting; sync again immediately
+    """
+    bookings: List[JobResponse]
+    removed: List[int] = []
+    profile: Optional[CaregiverResponse] = None
+    next_cursor: int
+    has_more: bool
+
+
 class BookingStatusUpdateRequest(BaseModel):
     """Request schema for updating booking status (accept/reject)."""
     status: str
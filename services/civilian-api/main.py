@@ -14,9 +14,21 @@ import os
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 from shared.config import Config
-from shared.database import Base, engine, SessionLocal
+from shared.database import SessionLocal
+from shared.migrations import run_migrations
+from shared.workflow import BROADCAST_CAREGIVER_ID
 from shared.models import Caregiver, Civilian
-from routes import router
+from shared.service_client import start_clients, close_clients, client_metrics
+from shared import outbox
+from shared.audit import audit_metrics, start_audit_writer, stop_audit_writer
+from shared.audit_archive import retention_metrics, start_retention, stop_retention
+from shared.booking_archive import archive_metrics, start_archiver, stop_archiver
+from shared.idempotency import idempotency_metrics, start_purger, stop_purger
+from shared.scheduler import scheduler_metrics, start_scheduler, stop_scheduler
+from shared.singleflight import singleflight_metrics
+from shared.booking_jobs import register_booking_jobs, schedule_booking_jobs
+from shared.trust_jobs import on_booking_event as queue_trust_recompute, register_trust_jobs
+from routes import router, admin_router
 
 
 # ── DEMO_MODE: Seed default caregiver & civilian on startup ──────────────
@@ -26,11 +38,12 @@ async def lifespan(app):
     DEMO_MODE: Ensure a default caregiver and civilian always exist.
     Runs on every server startup. Skips if data already present.
     """
-    Base.metadata.create_all(bind=engine)
+    run_migrations()
     db = SessionLocal()
     try:
         # DEMO_MODE: Seed default caregiver if table is empty
-        if db.query(Caregiver).count() == 0:
+        # (the broadcast sentinel, caregiver 0, is seeded by run_migrations)
+        if db.query(Caregiver).filter(Caregiver.id != BROADCAST_CAREGIVER_ID).count() == 0:
             demo_cg = Caregiver(
                 hashed_identity="demo_caregiver_hash_sevasetu",
                 name="Demo Caregiver",
@@ -60,8 +73,40 @@ async def lifespan(app):
     finally:
         db.close()
 
+    # Pooled keep-alive clients for ai/safety/blockchain services
+    await start_clients()
+
+    # Booking events from every service: SSE push, cache invalidation,
+    # trust recompute jobs ...
+    outbox.subscribe_standard("civilian-api")
+    outbox.subscribe("civilian-api:trust", queue_trust_recompute)
+    # ... and the delayed actions each booking state needs (expiry,
+    # reminders, DEMO auto-accept), all run by the scheduler workers.  On
+    # first start it replays the outbox so existing bookings get theirs.
+    outbox.subscribe("civilian-api:scheduler", schedule_booking_jobs, replay=True)
+    register_booking_jobs()
+    register_trust_jobs()
+    outbox.start_dispatcher()
+    start_scheduler()
+
+    # Buffered audit log; civilian-api also owns archiving old audit
+    # months and old terminal bookings, and purging expired
+    # Idempotency-Key records
+    start_audit_writer()
+    start_retention()
+    start_archiver()
+    start_purger()
+
     yield  # App runs here
 
+    outbox.stop_dispatcher()
+    stop_scheduler()
+    stop_archiver()
+    stop_purger()
+    stop_retention()
+    stop_audit_writer()
+    await close_clients()
+
 
 # Initialize FastAPI app
 app = FastAPI(
@@ -92,6 +137,7 @@ app.add_middleware(
 
 # Include routers
 app.include_router(router)
+app.include_router(admin_router)
 
 
 @app.get("/health")
@@ -105,6 +151,29 @@ def health_check():
     return {"status": "healthy", "service": "civilian-api"}
 
 
+@app.get("/metrics")
+def metrics():
+    """
+    Inter-service client, outbox dispatcher and audit writer metrics.
+
+    Returns:
+        dict: Per-target call counts, error rates, latency and circuit
+        state; per-consumer outbox offsets and failures; audit rows
+        queued, written, dropped and backpressure waits; last audit
+        retention and booking archival runs; single-flight coalescing
+    """
+    return {
+        "service_clients": client_metrics(),
+        "outbox": outbox.outbox_metrics(),
+        "audit": audit_metrics(),
+        "audit_retention": retention_metrics(),
+        "booking_archive": archive_metrics(),
+        "idempotency": idempotency_metrics(),
+        "scheduler": scheduler_metrics(),
+        "singleflight": singleflight_metrics(),
+    }
+
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8002)
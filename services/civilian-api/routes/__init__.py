@@ -3,5 +3,6 @@ Civilian routes package.
 """
 
 from .civilian import router
+from .admin import router as admin_router
 
-__all__ = ["router"]
+__all__ = ["router", "admin_router"]
@@ -0,0 +1,99 @@
+"""
+Admin API routes.
+
+Operator endpoints for reading the audit log: "everything user X did
+last week", "all events for booking Y".  Served by civilian-api, which
+also owns audit retention.
+
+All endpoints are protected with require_role("admin"), which refuses
+DEMO_MODE tokens: only a real admin JWT can read the audit trail.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Optional
+import json
+import sys
+import os
+
+from fastapi import APIRouter, Depends, HTTPException, Query
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
+
+from shared.database import get_db
+from shared.auth.dependencies import require_role
+from shared.audit_query import AUDIT_PAGE_DEFAULT, AUDIT_PAGE_MAX, iter_audit, query_audit
+from schemas import AuditEntry, AuditPageResponse
+
+
+router = APIRouter(prefix="/admin", tags=["admin"])
+
+
+def _check_range(start: Optional[datetime], end: Optional[datetime]) -> None:
+    if start is not None and end is not None and end <= start:
+        raise HTTPException(status_code=400, detail="end must be after start")
+
+
+@router.get("/audit", response_model=AuditPageResponse)
+def get_audit_log(
+    user_id: Optional[int] = None,
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = Query(AUDIT_PAGE_DEFAULT, ge=1, le=AUDIT_PAGE_MAX),
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("admin")),
+):
+    """
+    One page of audit entries matching the filters, oldest first.
+
+    Pass back next_cursor as ``cursor`` for the following page; every
+    page is a keyset seek, so deep pages cost the same as the first.
+    """
+    _check_range(start, end)
+    try:
+        rows, next_cursor = query_audit(
+            db.get_bind(), user_id, entity, entity_id, action, start, end, cursor, limit,
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    return AuditPageResponse(entries=[AuditEntry(**row) for row in rows], next_cursor=next_cursor)
+
+
+@router.get("/audit/export")
+def export_audit_log(
+    user_id: Optional[int] = None,
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_archived: bool = False,
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("admin")),
+):
+    """
+    Every matching audit entry as NDJSON (one JSON object per line).
+
+    Rows are streamed from the database in batches as the client reads,
+    so the export size is not limited by memory.  include_archived adds
+    months already moved to the audit archive.
+    """
+    _check_range(start, end)
+    rows = iter_audit(
+        db.get_bind(), user_id, entity, entity_id, action, start, end, include_archived,
+    )
+
+    def _lines():
+        for row in rows:
+            yield json.dumps(row, default=lambda value: value.isoformat()) + "\n"
+
+    return StreamingResponse(
+        _lines(),
+        media_type="application/x-ndjson",
+        headers={"Content-Disposition": 'attachment; filename="audit.ndjson"'},
+    )
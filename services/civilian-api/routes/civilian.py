@@ -8,38 +8,50 @@ All endpoints are protected with require_role("civilian").
 Booking state transitions are enforced by shared.workflow.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Request, Response
+from fastapi.responses import StreamingResponse
+from sqlalchemy.exc import IntegrityError
 from sqlalchemy.orm import Session
-from typing import List, Dict, Any
+from typing import Any, Callable, Dict, List, Optional
 import sys
 import os
 import httpx
-import threading
+from functools import partial
 
 sys.path.append(os.path.dirname(os.path.dirname(os.path.dirname(__file__))))
 
 from shared.database import get_db, SessionLocal
-from shared.models import Caregiver, Booking, Civilian, Rating, BookingStatus
+from shared.models import Caregiver, Booking, BookingArchive, Civilian, Rating, BookingStatus
+from shared.models.booking import TERMINAL_STATUSES, violates_active_civilian
 from shared.config import Config
 from shared.auth.dependencies import require_role
-from shared.workflow import transition_booking
+from shared.workflow import BROADCAST_CAREGIVER_ID, transition_booking
 from shared.payment import reserve_payment
-from shared.models.audit import log_audit
+from shared.audit import log_audit
+from shared.geo import parse_location
+from shared.conflicts import caregiver_lock, ensure_no_conflict
+from shared.events import booking_snapshot, sse_stream
+from shared.changes import CHANGE_FEED_DEFAULT_LIMIT, CHANGE_FEED_MAX_LIMIT, changes_since
+from shared.etag import check_etag, make_etag
+from shared.unit_of_work import after_commit, unit_of_work
+from shared.idempotency import IdempotentRequest, idempotency_key
+from shared.singleflight import Coalescer, coalesced
+from shared.trust_jobs import enqueue_trust_recompute
+from shared.trust_passport import passport_response
 from schemas import (
     CareRequestRequest,
     CaregiverMatchResponse,
     MatchCaregiversResponse,
     ConfirmBookingRequest,
     BookingResponse,
+    BookingChangesResponse,
     SubmitRatingRequest,
     RatingResponse,
     CivilianUpdateRequest,
     SafetySessionResponse,
 )
-import time
-import random
 import uuid
-from .civilian_helper import _ensure_broadcast_caregiver
+from . import matching_pipeline
 
 
 router = APIRouter(prefix="/civilian", tags=["civilian"])
@@ -68,35 +80,48 @@ def _active_booking(db: Session, civilian_id: int):
         db.query(Booking)
         .filter(
             Booking.civilian_id == civilian_id,
-            ~Booking.status.in_(["closed", "cancelled", "rejected"]),
+            ~Booking.status.in_(TERMINAL_STATUSES),
         )
         .first()
     )
 
 
-def _recompute_trust(background: BackgroundTasks, caregiver_id: int):
-    """Queue a trust-score recompute as a background task."""
-    def _task():
-        from shared.database import SessionLocal
-        from shared.models import Caregiver as CG, Booking as BK
-        db = SessionLocal()
-        try:
-            cg = db.query(CG).filter(CG.id == caregiver_id).first()
-            if cg is None:
-                return
-            completed = db.query(BK).filter(
-                BK.caregiver_id == caregiver_id, BK.status == "completed"
-            ).count()
-            score = (
-                40.0 * int(cg.verified)
-                + 30.0 * (cg.rating_average / 5.0)
-                + 30.0 * min(completed / 10.0, 1.0)
-            )
-            cg.trust_score = round(score, 2)
-            db.commit()
-        finally:
-            db.close()
-    background.add_task(_task)
+def _active_or_new_booking(
+    db: Session,
+    civilian_id: int,
+    build: Callable[[], Booking],
+    identity_id: Optional[int] = None,
+) -> Booking:
+    """
+    The civilian's active booking, or a new one from build() if none.
+
+    All writes (the DEMO_MODE civilian, the booking) share one
+    transaction and one commit; the booking_created audit row is queued
+    only once that commit succeeded.
+
+    A concurrent request can win the race between the _active_booking
+    check and the insert; uq_booking_active_civilian then rejects ours
+    and the winner's booking is returned instead.
+    """
+    try:
+        with unit_of_work(db):
+            if db.get(Civilian, civilian_id) is None:
+                # DEMO_MODE: Create civilian on-the-fly if missing
+                db.add(Civilian(id=civilian_id, name="Demo User", guardian_contact="demo@sevasetu.in"))
+            active = _active_booking(db, civilian_id)
+            if active is not None:
+                return active
+            booking = build()
+            db.add(booking)
+            db.flush()
+            if identity_id is not None:
+                after_commit(db, partial(log_audit, identity_id, "booking_created", "booking", booking.id))
+            return booking
+    except IntegrityError:
+        active = _active_booking(db, civilian_id)
+        if active is None:
+            raise
+        return active
 
 
 def _get_demo_caregiver(db: Session):
@@ -104,34 +129,6 @@ def _get_demo_caregiver(db: Session):
     return db.query(Caregiver).filter(Caregiver.verified == True).order_by(Caregiver.id.desc()).first()
 
 
-# ── DEMO_MODE: Auto-accept booking after timeout ────────────────────────
-
-def _schedule_auto_accept(booking_id: int, delay_seconds: float = 5.0):
-    """
-    DEMO_MODE: Auto-accept a booking after `delay_seconds` if no caregiver
-    has accepted it yet. This ensures hackathon demo reliability.
-    """
-    def _auto_accept():
-        time.sleep(delay_seconds)
-        db = SessionLocal()
-        try:
-            booking = db.query(Booking).filter(Booking.id == booking_id).first()
-            if booking and booking.status in ("pending", "matched"):
-                # DEMO_MODE: Force transition to confirmed
-                booking.status = "confirmed"
-                booking.payment_status = "reserved"
-                db.commit()
-                print(f"DEMO_MODE: Auto-accepted booking #{booking_id} after {delay_seconds}s")
-        except Exception as e:
-            print(f"DEMO_MODE: Auto-accept failed for #{booking_id}: {e}")
-            db.rollback()
-        finally:
-            db.close()
-
-    thread = threading.Thread(target=_auto_accept, daemon=True)
-    thread.start()
-
-
 # ---------- endpoints ----------
 
 @router.post("/request-care", status_code=status.HTTP_201_CREATED)
@@ -139,51 +136,35 @@ def request_care(
     request: CareRequestRequest,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("civilian")),
+    idem: IdempotentRequest = Depends(idempotency_key()),
 ):
+    """Create a care request (retries with the same Idempotency-Key are replayed)."""
+    return idem.run(db, user["identity_id"], lambda: _request_care(request, db, user))
+
+
+def _request_care(request: CareRequestRequest, db: Session, user: Dict[str, Any]) -> BookingResponse:
     """
     Create a new care request → booking in PENDING state.
 
-    Blocks if the civilian already has an active (non-closed) booking.
+    DEMO_MODE: if the civilian already has an active (non-closed)
+    booking, that booking is returned instead of a 409.
     """
-    civilian = db.query(Civilian).filter(Civilian.id == request.civilian_id).first()
-    if not civilian:
-        # DEMO_MODE: Create civilian on-the-fly if missing
-        civilian = Civilian(id=request.civilian_id, name="Demo User", guardian_contact="demo@sevasetu.in")
-        db.add(civilian)
-        db.commit()
-
-    # Part 3 – Step F: prevent concurrent bookings
-    active = _active_booking(db, request.civilian_id)
-    if active:
-        # DEMO_MODE: Return existing booking instead of 409
-        return BookingResponse(
-            booking_id=active.id,
-            caregiver_id=active.caregiver_id,
-            civilian_id=active.civilian_id,
-            start_time=active.start_time,
-            end_time=active.end_time,
-            status=active.status,
-        )
-
-    # Create booking in PENDING state
-    _ensure_broadcast_caregiver(db)
-    booking = Booking(
-        civilian_id=request.civilian_id,
-        caregiver_id=0,  # Broadcast to all
-        start_time=request.start_time,
-        end_time=request.end_time,
-        status="pending",
-        payment_status="unpaid",
+    booking = _active_or_new_booking(
+        db,
+        request.civilian_id,
+        lambda: Booking(
+            civilian_id=request.civilian_id,
+            caregiver_id=BROADCAST_CAREGIVER_ID,  # Broadcast to all
+            start_time=request.start_time,
+            end_time=request.end_time,
+            status="pending",
+            payment_status="unpaid",
+        ),
+        identity_id=user["identity_id"],
     )
-    db.add(booking)
-    db.commit()
-    db.refresh(booking)
-
-    log_audit(user["identity_id"], "booking_created", "booking", booking.id)
-
     return BookingResponse(
         booking_id=booking.id,
-        caregiver_id=0,
+        caregiver_id=booking.caregiver_id,
         civilian_id=booking.civilian_id,
         start_time=booking.start_time,
         end_time=booking.end_time,
@@ -200,8 +181,11 @@ async def match_caregivers(
     """
     Find and rank matching caregivers.
 
+    Candidates are retrieved by skill, verification and availability,
+    ranked by the ai-service, and fall back to trust score order if
+    ranking misses Config.MATCH_DEADLINE_SECONDS.
+
     DEMO_MODE: Always returns at least 1 caregiver (fallback to demo profile).
-    Simulated AI processing delay of 1.5 seconds.
     """
     civilian = db.query(Civilian).filter(Civilian.id == request.civilian_id).first()
     if not civilian:
@@ -216,29 +200,20 @@ async def match_caregivers(
         .first()
     )
 
-    # DEMO_MODE: Simulated AI processing delay (1.5 seconds)
-    time.sleep(1.5)
-
-    # 1. Try to find real caregivers from DB
-    caregiver = _get_demo_caregiver(db)
+    point = parse_location(request.location)
+    near = (*point, request.radius_km or Config.MATCH_RADIUS_KM) if point else None
 
-    results = []
-    # DEMO_MODE: AI confidence between 93-98
-    confidence = round(random.uniform(93.0, 98.0), 1)
+    results = await matching_pipeline.match_caregivers(
+        db,
+        request.required_skills,
+        request.start_time,
+        request.end_time,
+        gender=request.preferred_gender,
+        near=near,
+    )
 
-    if caregiver:
-        results.append(CaregiverMatchResponse(
-            caregiver_id=caregiver.id,
-            name=caregiver.name,
-            skills=caregiver.skills,
-            experience_years=caregiver.experience_years,
-            rating_average=caregiver.rating_average,
-            trust_score=caregiver.trust_score,
-            match_score=caregiver.trust_score,
-            ai_confidence=confidence,
-            ai_reason="Best reliability prediction",
-        ))
-    else:
+    if not results:
+        # DEMO_MODE: nobody qualifies — offer the demo profile
         results.append(CaregiverMatchResponse(**DEMO_CAREGIVER))
 
     # Transition booking PENDING → MATCHED if booking exists
@@ -256,52 +231,79 @@ def confirm_booking(
     request: ConfirmBookingRequest,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("civilian")),
+    idem: IdempotentRequest = Depends(idempotency_key()),
 ):
+    """Confirm a booking (retries with the same Idempotency-Key are replayed)."""
+    # Check + commit under the caregiver's lock so racing confirms for
+    # the same caregiver cannot both pass the overlap check.  The lock
+    # spans idem.run because that is where the transaction commits.
+    with caregiver_lock(request.caregiver_id):
+        return idem.run(db, user["identity_id"], lambda: _confirm_booking(request, db, user))
+
+
+def _confirm_booking(request: ConfirmBookingRequest, db: Session, user: Dict[str, Any]) -> BookingResponse:
     """
     Confirm booking → MATCHED→CONFIRMED.
+
+    Rejects with 409 if the caregiver already has a blocking booking
+    overlapping the requested window.
     """
-    civilian = db.query(Civilian).filter(Civilian.id == request.civilian_id).first()
-    if not civilian:
-        civilian = Civilian(id=request.civilian_id, name="Demo User", guardian_contact="demo@sevasetu.in")
-        db.add(civilian)
-        db.commit()
+    # Everything below is one transaction with a single commit; the
+    # caller holds caregiver_lock across it.
+    try:
+        with unit_of_work(db):
+            if db.get(Civilian, request.civilian_id) is None:
+                # DEMO_MODE: Create civilian on-the-fly if missing
+                db.add(Civilian(id=request.civilian_id, name="Demo User", guardian_contact="demo@sevasetu.in"))
+
+            # Find or create the booking
+            booking = (
+                db.query(Booking)
+                .filter(
+                    Booking.civilian_id == request.civilian_id,
+                    Booking.status.in_(["pending", "matched"]),
+                )
+                .first()
+            )
 
-    # Find or create the booking
-    booking = (
-        db.query(Booking)
-        .filter(
-            Booking.civilian_id == request.civilian_id,
-            Booking.status.in_(["pending", "matched"]),
-        )
-        .first()
-    )
+            ensure_no_conflict(
+                db,
+                request.caregiver_id,
+                request.start_time,
+                request.end_time,
+                exclude_booking_id=booking.id if booking else None,
+            )
 
-    _ensure_broadcast_caregiver(db)
-    
-    if booking:
-        booking.caregiver_id = request.caregiver_id
-        booking.start_time = request.start_time
-        booking.end_time = request.end_time
-        if booking.status == "pending":
-            transition_booking(booking, "matched")
-        transition_booking(booking, "confirmed")
-    else:
-        booking = Booking(
-            caregiver_id=request.caregiver_id,
-            civilian_id=request.civilian_id,
-            start_time=request.start_time,
-            end_time=request.end_time,
-            status="confirmed",
-            payment_status="unpaid",
+            if booking:
+                booking.caregiver_id = request.caregiver_id
+                booking.start_time = request.start_time
+                booking.end_time = request.end_time
+                if booking.status == "pending":
+                    transition_booking(booking, "matched")
+                transition_booking(booking, "confirmed")
+            else:
+                booking = Booking(
+                    caregiver_id=request.caregiver_id,
+                    civilian_id=request.civilian_id,
+                    start_time=request.start_time,
+                    end_time=request.end_time,
+                    status="confirmed",
+                    payment_status="unpaid",
+                )
+                db.add(booking)
+
+            db.flush()
+            reserve_payment(booking)
+            after_commit(db, partial(log_audit, user["identity_id"], "booking_confirmed", "booking", booking.id))
+    except IntegrityError as e:
+        if not violates_active_civilian(e):
+            raise
+        # The civilian already has a booking past the matched stage (or
+        # a concurrent confirm created one)
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail="Civilian already has an active booking",
         )
-        db.add(booking)
-
-    db.flush()
-    reserve_payment(booking)
-    db.commit()
-    db.refresh(booking)
-
-    log_audit(user["identity_id"], "booking_confirmed", "booking", booking.id)
 
     return BookingResponse(
         booking_id=booking.id,
@@ -316,59 +318,68 @@ def confirm_booking(
 @router.post("/submit-rating", response_model=RatingResponse, status_code=status.HTTP_201_CREATED)
 def submit_rating(
     request: SubmitRatingRequest,
-    background_tasks: BackgroundTasks,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("civilian")),
+    idem: IdempotentRequest = Depends(idempotency_key()),
 ):
+    """
+    Submit a rating.  A retry with the same Idempotency-Key is answered
+    with the first response, so the rating (and the trust recompute it
+    triggers) is recorded once.
+    """
+    return idem.run(db, user["identity_id"], lambda: _submit_rating(request, db, user))
+
+
+def _submit_rating(request: SubmitRatingRequest, db: Session, user: Dict[str, Any]) -> RatingResponse:
     """
     Submit rating → COMPLETED→RATED.
 
-    Trust score recompute runs as a background task.
+    The trust score recompute is queued with the rating (shared.trust_jobs).
     """
     caregiver = db.query(Caregiver).filter(Caregiver.id == request.caregiver_id).first()
     if not caregiver:
         raise HTTPException(status_code=404, detail="Caregiver not found")
 
-    # Transition booking to RATED
-    booking = (
-        db.query(Booking)
-        .filter(
-            Booking.caregiver_id == request.caregiver_id,
-            Booking.status == "completed",
+    with unit_of_work(db):
+        # Transition booking to RATED
+        booking = (
+            db.query(Booking)
+            .filter(
+                Booking.caregiver_id == request.caregiver_id,
+                Booking.status == "completed",
+            )
+            .order_by(Booking.id.desc())
+            .first()
         )
-        .order_by(Booking.id.desc())
-        .first()
-    )
-    if booking:
-        transition_booking(booking, "rated")
-
-    # Create rating
-    new_rating = Rating(
-        caregiver_hash=caregiver.hashed_identity,
-        caregiver_id=caregiver.id,
-        rating=request.rating,
-        review_text=request.review_text,
-        blockchain_status="pending",
-    )
-    db.add(new_rating)
+        if booking:
+            transition_booking(booking, "rated")
 
-    # Update average
-    all_ratings = db.query(Rating).filter(Rating.caregiver_id == caregiver.id).all()
-    total = len(all_ratings) + 1
-    caregiver.rating_average = (sum(r.rating for r in all_ratings) + request.rating) / total
+        # Create rating
+        new_rating = Rating(
+            caregiver_hash=caregiver.hashed_identity,
+            caregiver_id=caregiver.id,
+            rating=request.rating,
+            review_text=request.review_text,
+            blockchain_status="pending",
+        )
+        db.add(new_rating)
 
-    db.commit()
-    db.refresh(new_rating)
+        # Update average
+        all_ratings = db.query(Rating).filter(Rating.caregiver_id == caregiver.id).all()
+        total = len(all_ratings) + 1
+        caregiver.rating_average = (sum(r.rating for r in all_ratings) + request.rating) / total
 
-    # Background: recompute trust score
-    _recompute_trust(background_tasks, caregiver.id)
+        # Durable, coalesced per caregiver: the "rated" event's job and a
+        # burst of ratings all collapse into one recompute
+        enqueue_trust_recompute(db, caregiver.id)
 
-    log_audit(user["identity_id"], "rating_submitted", "rating", new_rating.id)
+        db.flush()
+        after_commit(db, partial(log_audit, user["identity_id"], "rating_submitted", "rating", new_rating.id))
 
-    # Auto-close booking after rating
-    if booking:
-        transition_booking(booking, "closed")
-        db.commit()
+        # Auto-close booking after rating (flushed separately so the
+        # "rated" change is recorded before it)
+        if booking:
+            transition_booking(booking, "closed")
 
     return RatingResponse(
         rating_id=new_rating.id,
@@ -390,33 +401,22 @@ def create_booking_demo(
     DEMO_MODE: Create Booking with status=PENDING.
     Always succeeds — returns existing active booking if one exists.
     """
-    # DEMO_MODE: Check active booking — return it instead of failing
-    active = _active_booking(db, request.civilian_id)
-    if active:
-        return BookingResponse(
-            booking_id=active.id,
-            caregiver_id=active.caregiver_id,
-            civilian_id=active.civilian_id,
-            start_time=active.start_time,
-            end_time=active.end_time,
-            status=active.status,
-        )
-
     # DEMO_MODE: Assign demo caregiver automatically
     caregiver = _get_demo_caregiver(db)
-    cg_id = caregiver.id if caregiver else 0
-
-    booking = Booking(
-        civilian_id=request.civilian_id,
-        caregiver_id=cg_id,
-        start_time=request.start_time,
-        end_time=request.end_time,
-        status="pending",
-        payment_status="unpaid",
+    cg_id = caregiver.id if caregiver else BROADCAST_CAREGIVER_ID
+
+    booking = _active_or_new_booking(
+        db,
+        request.civilian_id,
+        lambda: Booking(
+            civilian_id=request.civilian_id,
+            caregiver_id=cg_id,
+            start_time=request.start_time,
+            end_time=request.end_time,
+            status="pending",
+            payment_status="unpaid",
+        ),
     )
-    db.add(booking)
-    db.commit()
-    db.refresh(booking)
 
     # Auto-accept removed — caregiver must accept manually
 
@@ -449,16 +449,44 @@ def update_profile(
 @router.get("/booking/status/{booking_id}")
 def get_booking_status(
     booking_id: int,
+    request: Request,
+    response: Response,
     db: Session = Depends(get_db),
     user: Dict[str, Any] = Depends(require_role("civilian")),
+    flight: Coalescer = Depends(coalesced()),
 ):
     """
     Poll booking status — used by civilian app to track lifecycle.
     Returns current status + caregiver name.
+
+    Supports If-None-Match: the ETag combines the booking's and the
+    caregiver's change numbers, so an unchanged booking costs one
+    version lookup and a 304.  Archived bookings are found too.
+    Identical concurrent polls that do need the body share one load
+    (shared.singleflight), keyed by that same version.
     """
-    booking = db.query(Booking).filter(Booking.id == booking_id).first()
-    if not booking:
+    # Live bookings first, then the archive (shared.booking_archive)
+    for model in (Booking, BookingArchive):
+        version = (
+            db.query(model.change_seq, Caregiver.change_seq)
+            .outerjoin(Caregiver, Caregiver.id == model.caregiver_id)
+            .filter(model.id == booking_id)
+            .first()
+        )
+        if version is not None:
+            break
+    else:
         return {"status": "not_found", "booking_id": booking_id}
+    not_modified = check_etag(request, response, make_etag("booking", booking_id, *version))
+    if not_modified is not None:
+        return not_modified
+
+    return flight.run(partial(_booking_status, db, model, booking_id), model.__tablename__, *version)
+
+
+def _booking_status(db: Session, model, booking_id: int) -> Dict[str, Any]:
+    """Status body of a live or archived booking."""
+    booking = db.get(model, booking_id)
 
     caregiver_name = "Caregiver"
     if booking.caregiver_id:
@@ -477,6 +505,88 @@ def get_booking_status(
     }
 
 
+@router.get("/booking/stream/{booking_id}")
+def stream_booking_status(
+    booking_id: int,
+    request: Request,
+    user: Dict[str, Any] = Depends(require_role("civilian", allow_query_token=True)),
+):
+    """
+    Server-Sent Events stream of status changes for one booking.
+
+    Sends the current state on connect, then one ``booking`` event per
+    committed change.  Replaces 3-second polling of /booking/status;
+    an idle stream issues no queries.  EventSource cannot set headers,
+    so the JWT may be passed as ``?token=``.
+    """
+    with SessionLocal() as db:
+        booking = db.query(Booking).filter(Booking.id == booking_id).first()
+        if not booking:
+            raise HTTPException(status_code=404, detail="Booking not found")
+        initial = [booking_snapshot(booking)]
+
+    return StreamingResponse(
+        sse_stream(lambda evt: evt["booking_id"] == booking_id, initial, request.is_disconnected),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+@router.get("/caregivers/{caregiver_id}/passport")
+@router.get("/caregivers/{caregiver_id}/passport/{version}")
+def get_caregiver_passport(
+    caregiver_id: int,
+    request: Request,
+    version: Optional[int] = None,
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("civilian")),
+):
+    """
+    A caregiver's Trust Passport, served from the stored document.
+
+    /passport is the current version (revalidate with If-None-Match);
+    /passport/{version} never changes and may be cached for good.
+    """
+    return passport_response(request, db, caregiver_id, version)
+
+
+@router.get("/changes", response_model=BookingChangesResponse)
+def get_booking_changes(
+    since: int = Query(0, ge=0),
+    limit: int = Query(CHANGE_FEED_DEFAULT_LIMIT, ge=1, le=CHANGE_FEED_MAX_LIMIT),
+    db: Session = Depends(get_db),
+    user: Dict[str, Any] = Depends(require_role("civilian")),
+):
+    """
+    Incremental sync: this civilian's bookings changed since cursor *since*.
+
+    Start with since=0, then pass back next_cursor; each call reads only
+    the changed rows via idx_booking_civilian_seq.
+    """
+    civ = db.query(Civilian).filter(Civilian.identity_id == user["identity_id"]).first()
+    if not civ:
+        raise HTTPException(status_code=404, detail="Civilian profile not found")
+
+    bookings, next_cursor, has_more = changes_since(
+        db, Booking, since, limit, Booking.civilian_id == civ.id,
+    )
+    return BookingChangesResponse(
+        bookings=[
+            BookingResponse(
+                booking_id=b.id,
+                caregiver_id=b.caregiver_id,
+                civilian_id=b.civilian_id,
+                start_time=b.start_time,
+                end_time=b.end_time,
+                status=b.status,
+            )
+            for b in bookings
+        ],
+        next_cursor=next_cursor,
+        has_more=has_more,
+    )
+
+
 @router.put("/booking/cancel/{booking_id}")
 def cancel_booking(
     booking_id: int,
@@ -0,0 +1,326 @@
+"""
+Caregiver matching pipeline.
+
+Turns a care request into a ranked shortlist:
+
+    1. retrieve   – verified caregivers with any required skill
+                    (SQL via caregiver_skills), nearest first when the
+                    request has a "lat,lng" location, minus those
+                    whose calendar does not cover the window (slot
+                    bitmaps, one vectorized pass) and those already
+                    booked for an overlapping window
+    2. features   – skill_match_score and distance_score for all
+                    candidates at once, plus experience / rating / price
+    3. rank       – ai-service /rank with explanations for the top N,
+                    over the pooled shared.service_client connection
+    4. fallback   – trust_score ordering if ranking fails, the circuit
+                    is open, or the end-to-end deadline is missed
+
+The whole pipeline runs under Config.MATCH_DEADLINE_SECONDS.  Retrieval
+is bounded by the full budget; ranking gets whatever is left of it.
+Retrieval runs in a worker thread on a session of its own: a missed
+deadline abandons that thread, which may still be querying, so it must
+never share the request's session.  The caller then gets the
+verified caregivers with a required skill and no overlapping booking
+with the highest trust score instead (top_by_trust) — one indexed
+query, skipping only the calendar and distance checks.
+"""
+
+import asyncio
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+from sqlalchemy import exists, func, select
+from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+
+from shared.availability import free_mask
+from shared.candidates import find_candidates
+from shared.config import Config
+from shared.database import SessionLocal
+from shared.conflicts import BLOCKING_STATUSES, max_booking_duration, overlapping_bookings
+from shared.geo import caregiver_distances, distance_scores
+from shared.models import Booking, Caregiver
+from shared.models.skill import CaregiverSkill, resolve_skill_ids
+from shared.service_client import ServiceCallError, get_client
+from shared.skills import score_candidates
+from shared.workflow import BROADCAST_CAREGIVER_ID
+from schemas import CaregiverMatchResponse
+
+
+# Neutral feature values when location / pricing data is missing
+DEFAULT_DISTANCE_SCORE = 0.5
+DEFAULT_PRICE = 0.5
+
+FALLBACK_REASON = "Ranked by trust score"
+
+
+def retrieve_candidates(
+    db: Session,
+    required_skills: List[str],
+    start_time: datetime,
+    end_time: datetime,
+    gender: Optional[str] = None,
+    limit: Optional[int] = None,
+    near: Optional[Tuple[float, float, float]] = None,
+) -> List[Caregiver]:
+    """
+    Fetch verified caregivers with a required skill who are free
+    (calendar covers the window and no overlapping booking).
+
+    With *near*, only caregivers within reach of the point are returned,
+    nearest first.  If none are (e.g. nobody has set a home location
+    yet), retrieval falls back to skill order without distance.
+
+    Args:
+        db: Database session
+        required_skills: Requested skills
+        start_time: Requested window start
+        end_time: Requested window end
+        gender: Optional gender preference
+        limit: Maximum candidates to pull from the skill index
+        near: Optional (lat, lng, radius_km)
+
+    Returns:
+        Candidate caregivers, best skill overlap first
+    """
+    matches = find_candidates(
+        db,
+        required_skills,
+        match="any",
+        verified=True,
+        gender=gender,
+        limit=limit or Config.MATCH_CANDIDATE_LIMIT,
+        near=near,
+    )
+    if near is not None and not matches:
+        matches = find_candidates(
+            db,
+            required_skills,
+            match="any",
+            verified=True,
+            gender=gender,
+            limit=limit or Config.MATCH_CANDIDATE_LIMIT,
+        )
+    caregivers = [caregiver for caregiver, _ in matches]
+    if not caregivers:
+        return []
+
+    free = free_mask(db, [cg.id for cg in caregivers], start_time, end_time)
+    caregivers = [cg for cg, ok in zip(caregivers, free) if ok]
+    if not caregivers:
+        return []
+
+    # One bounded range query on idx_caregiver_time for the whole set
+    busy = {
+        caregiver_id
+        for (caregiver_id,) in overlapping_bookings(db, [cg.id for cg in caregivers], start_time, end_time)
+        .with_entities(Booking.caregiver_id)
+        .distinct()
+    }
+    return [cg for cg in caregivers if cg.id not in busy]
+
+
+def _retrieve_in_own_session(session_factory, *args, **kwargs) -> List[Caregiver]:
+    """retrieve_candidates on a private session (runs in a worker thread)."""
+    db = session_factory()
+    try:
+        return retrieve_candidates(db, *args, **kwargs)
+    finally:
+        # Loaded attributes stay readable on the detached caregivers
+        db.close()
+
+
+def top_by_trust(
+    db: Session,
+    required_skills: List[str],
+    start_time: datetime,
+    end_time: datetime,
+    top_n: int,
+    gender: Optional[str] = None,
+) -> List[Caregiver]:
+    """
+    Retrieval fallback: the highest-trust verified caregivers with a
+    required skill and no blocking booking overlapping the window.
+
+    One query: the skill filter reads the caregiver_skills index and the
+    booking check is a bounded idx_caregiver_time probe per caregiver.
+    """
+    skill_ids = resolve_skill_ids(db, required_skills)
+    if not skill_ids:
+        return []
+    busy = exists().where(
+        Booking.caregiver_id == Caregiver.id,
+        Booking.start_time >= start_time - max_booking_duration(),
+        Booking.start_time < end_time,
+        Booking.end_time > start_time,
+        Booking.status.in_(BLOCKING_STATUSES),
+    )
+    query = db.query(Caregiver).filter(
+        Caregiver.id.in_(
+            select(CaregiverSkill.caregiver_id).where(CaregiverSkill.skill_id.in_(list(skill_ids.values())))
+        ),
+        Caregiver.verified.is_(True),
+        Caregiver.id != BROADCAST_CAREGIVER_ID,
+        ~busy,
+    )
+    if gender:
+        query = query.filter(func.lower(Caregiver.gender) == gender.strip().lower())
+    return query.order_by(Caregiver.trust_score.desc(), Caregiver.id).limit(top_n).all()
+
+
+def assemble_features(
+    caregivers: List[Caregiver],
+    required_skills: List[str],
+    near: Optional[Tuple[float, float, float]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Build the ai-service feature rows for every candidate.
+
+    Args:
+        caregivers: Candidate caregivers
+        required_skills: Requested skills
+        near: Optional (lat, lng, radius_km) of the request
+
+    Returns:
+        One feature dictionary per caregiver (same order)
+    """
+    skill_scores = score_candidates(required_skills, [cg.skills for cg in caregivers])
+    if near is not None:
+        lat, lng, radius_km = near
+        proximity = distance_scores(caregiver_distances(lat, lng, caregivers), radius_km)
+    else:
+        proximity = [DEFAULT_DISTANCE_SCORE] * len(caregivers)
+    return [
+        {
+            "caregiver_id": cg.id,
+            "skill_match_score": float(skill_score),
+            "distance_score": float(distance_score),
+            "experience_years": cg.experience_years,
+            "rating_average": cg.rating_average,
+            "price": DEFAULT_PRICE,
+            "trust_score": cg.trust_score,
+        }
+        for cg, skill_score, distance_score in zip(caregivers, skill_scores, proximity)
+    ]
+
+
+async def rank_with_ai(
+    features: List[Dict[str, Any]],
+    required_skills: List[str],
+    top_n: int,
+    deadline: float,
+) -> List[Dict[str, Any]]:
+    """
+    Rank candidates with the ai-service over its pooled client.
+
+    Raises:
+        ServiceCallError: On connection failure, timeout, open circuit or 5xx
+        httpx.HTTPStatusError: On a 4xx reply
+    """
+    response = await get_client("ai-service").post("/rank", deadline=deadline, json={
+        "caregivers": features,
+        "required_skills": required_skills,
+        "top_k": top_n,
+        "explain": True,
+    })
+    response.raise_for_status()
+    return response.json()["ranked_caregivers"]
+
+
+def rank_by_trust(features: List[Dict[str, Any]], top_n: int) -> List[Dict[str, Any]]:
+    """Fallback ranking: trust score, then rating."""
+    return sorted(
+        features,
+        key=lambda f: (f["trust_score"], f["rating_average"]),
+        reverse=True,
+    )[:top_n]
+
+
+def _to_response(caregiver: Caregiver, ranked: Dict[str, Any]) -> CaregiverMatchResponse:
+    """Merge a ranked feature row back with its caregiver profile."""
+    match_score = ranked.get("match_score")
+    if match_score is None:
+        score = caregiver.trust_score
+        reason = FALLBACK_REASON
+    else:
+        score = round(match_score * 100.0, 1)
+        reason = ranked.get("ai_reason") or "Best overall match"
+
+    return CaregiverMatchResponse(
+        caregiver_id=caregiver.id,
+        name=caregiver.name,
+        skills=caregiver.skills,
+        experience_years=caregiver.experience_years,
+        rating_average=caregiver.rating_average,
+        trust_score=caregiver.trust_score,
+        match_score=score,
+        ai_confidence=score,
+        ai_reason=reason,
+    )
+
+
+async def match_caregivers(
+    db: Session,
+    required_skills: List[str],
+    start_time: datetime,
+    end_time: datetime,
+    gender: Optional[str] = None,
+    top_n: Optional[int] = None,
+    near: Optional[Tuple[float, float, float]] = None,
+    session_factory=SessionLocal,
+) -> List[CaregiverMatchResponse]:
+    """
+    Run retrieval → features → ranking under the end-to-end deadline.
+
+    Args:
+        db: Request session (only used for the trust fallback)
+        required_skills: Requested skills
+        start_time: Requested window start
+        end_time: Requested window end
+        gender: Optional gender preference
+        top_n: Number of caregivers to return
+        near: Optional (lat, lng, radius_km) of the request
+        session_factory: Makes the retrieval thread's own session
+
+    Returns:
+        Up to *top_n* matches (empty if no caregiver qualifies); if
+        retrieval missed the deadline, the top_by_trust fallback
+    """
+    top_n = top_n or Config.MATCH_TOP_N
+    loop = asyncio.get_running_loop()
+    deadline = loop.time() + Config.MATCH_DEADLINE_SECONDS
+
+    try:
+        caregivers = await asyncio.wait_for(
+            run_in_threadpool(
+                _retrieve_in_own_session, session_factory,
+                required_skills, start_time, end_time, gender=gender, near=near,
+            ),
+            timeout=Config.MATCH_DEADLINE_SECONDS,
+        )
+    except asyncio.TimeoutError:
+        print("Matching: candidate retrieval missed the deadline, using trust score order")
+        fallback = top_by_trust(db, required_skills, start_time, end_time, top_n, gender=gender)
+        return [_to_response(cg, {}) for cg in fallback]
+    if not caregivers:
+        return []
+
+    features = assemble_features(caregivers, required_skills, near)
+    by_id = {cg.id: cg for cg in caregivers}
+
+    remaining = deadline - loop.time()
+    try:
+        if remaining <= 0:
+            raise ServiceCallError("ai-service", "deadline exceeded")
+        ranked = await rank_with_ai(features, required_skills, top_n, deadline=remaining)
+    except (ServiceCallError, httpx.HTTPError, KeyError, ValueError) as e:
+        print(f"Matching: AI ranking unavailable ({type(e).__name__}), using trust score order")
+        ranked = rank_by_trust(features, top_n)
+
+    return [
+        _to_response(by_id[row["caregiver_id"]], row)
+        for row in ranked[:top_n]
+        if row.get("caregiver_id") in by_id
+    ]
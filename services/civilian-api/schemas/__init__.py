@@ -8,11 +8,13 @@ from .civilian import (
     MatchCaregiversResponse,
     ConfirmBookingRequest,
     BookingResponse,
+    BookingChangesResponse,
     SubmitRatingRequest,
     RatingResponse,
     CivilianUpdateRequest,
     SafetySessionResponse,
 )
+from .admin import AuditEntry, AuditPageResponse
 
 __all__ = [
     "CareRequestRequest",
@@ -20,8 +22,11 @@ __all__ = [
     "MatchCaregiversResponse",
     "ConfirmBookingRequest",
     "BookingResponse",
+    "BookingChangesResponse",
     "SubmitRatingRequest",
     "RatingResponse",
     "CivilianUpdateRequest",
     "SafetySessionResponse",
+    "AuditEntry",
+    "AuditPageResponse",
 ]
@@ -0,0 +1,43 @@
+"""
+Admin API schemas.
+
+Response models for the operator-facing audit endpoints.
+"""
+
+from pydantic import BaseModel
+from typing import List, Optional
+from datetime import datetime
+
+
+class AuditEntry(BaseModel):
+    """
+    One audit row.
+
+    Attributes:
+        id: Row id (unique within its month)
+        user_id: AuthIdentity id of the actor (0 for system)
+        action: Short verb (booking_created, job_started, …)
+        entity: Resource name (booking, rating, …)
+        entity_id: PK of the affected row
+        detail: Optional free-text detail
+        timestamp: When the action happened
+    """
+    id: int
+    user_id: int
+    action: str
+    entity: str
+    entity_id: Optional[int] = None
+    detail: Optional[str] = None
+    timestamp: datetime
+
+
+class AuditPageResponse(BaseModel):
+    """
+    Response schema for one page of an audit query.
+
+    Attributes:
+        entries: Matching rows, oldest first
+        next_cursor: Pass as ``cursor`` for the next page; null on the last page
+    """
+    entries: List[AuditEntry]
+    next_cursor: Optional[str] = None
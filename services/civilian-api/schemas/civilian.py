@@ -19,13 +19,17 @@ class CareRequestRequest(BaseModel):
         required_skills: List of required skills
         start_time: Desired start time
         end_time: Desired end time
-        location: Service location (for distance calculation)
+        location: Service location as "lat,lng" (for distance calculation)
+        radius_km: Search radius around location (defaults to MATCH_RADIUS_KM)
+        preferred_gender: Optional caregiver gender preference
     """
     civilian_id: int = Field(..., gt=0)
     required_skills: List[str] = Field(..., min_items=1)
     start_time: datetime
     end_time: datetime
     location: Optional[str] = None
+    radius_km: Optional[float] = Field(None, gt=0)
+    preferred_gender: Optional[str] = None
 
 
 class CaregiverMatchResponse(BaseModel):
@@ -98,6 +102,20 @@ class BookingResponse(BaseModel):
     status: str
 
 
+class BookingChangesResponse(BaseModel):
+    """
+    Response schema for the incremental sync feed.
+
+    Attributes:
+        bookings: Bookings changed since the cursor, oldest change first
+        next_cursor: Pass as ``since`` on the next sync
+        has_more: Another page is waiting; sync again immediately
+    """
+    bookings: List[BookingResponse]
+    next_cursor: int
+    has_more: bool
+
+
 class SubmitRatingRequest(BaseModel):
     """
     Request schema for submitting caregiver rating.
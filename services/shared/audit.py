@@ -0,0 +1,300 @@
+"""
+Buffered audit log writer.
+
+Every booking action writes an audit row.  Inserting it on the request
+path costs a second connection and a commit (an fsync) per action, so
+log_audit() only appends the row to a bounded in-process queue; a
+background thread drains the queue and inserts rows in bulk with a
+single executemany per batch and monthly partition
+(shared.models.audit).
+
+Flushing:
+    * as soon as AUDIT_BATCH_SIZE rows are waiting, or
+    * every AUDIT_FLUSH_MS otherwise, and
+    * once more on shutdown (stop_audit_writer, or at interpreter exit).
+
+Backpressure: when the queue is full the caller waits up to
+AUDIT_BLOCK_MS for the writer to make room; if it is still full the row
+is dropped and counted.  Audit writes never fail or slow down a request
+by more than that.
+
+Failed batches: an OperationalError (database locked, disk trouble) is
+transient, so the whole batch is kept and retried on the next flush.
+Any other error means some row is bad; the batch is then written row by
+row and rows that still fail on their own are dropped and counted as
+rejected, so one bad row cannot block the rows queued behind it.
+
+The timestamp is taken when the action is logged, not when the row is
+written.  Set AUDIT_SYNC=true (or pass sync=True) to write each row
+immediately — for tests and one-off scripts that read the log back.
+"""
+
+import atexit
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy import insert
+from sqlalchemy.exc import OperationalError
+
+from .config import Config
+from .database import SessionLocal
+from .models.audit import ensure_partition, month_key
+
+
+class AuditWriter:
+    """
+    Queue of audit rows plus the thread that bulk-inserts them.
+
+    Args:
+        session_factory: Session factory for inserts
+        batch_size: Rows per insert; a full batch triggers a flush
+        flush_ms: Longest a row waits before it is written
+        queue_size: Rows buffered before callers see backpressure
+        block_ms: How long a caller waits on a full queue before dropping
+        sync: Write every row on the calling thread
+    """
+
+    def __init__(self, session_factory=SessionLocal, batch_size: Optional[int] = None,
+                 flush_ms: Optional[int] = None, queue_size: Optional[int] = None,
+                 block_ms: Optional[int] = None, sync: Optional[bool] = None):
+        self._session_factory = session_factory
+        self.batch_size = batch_size or Config.AUDIT_BATCH_SIZE
+        self.flush_interval = (flush_ms or Config.AUDIT_FLUSH_MS) / 1000.0
+        self.block_timeout = (Config.AUDIT_BLOCK_MS if block_ms is None else block_ms) / 1000.0
+        self.sync = Config.AUDIT_SYNC if sync is None else sync
+        self._queue: "queue.Queue[Dict[str, Any]]" = queue.Queue(queue_size or Config.AUDIT_QUEUE_SIZE)
+        self._retry: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.enqueued = 0
+        self.written = 0
+        self.batches = 0
+        self.dropped = 0
+        self.backpressure = 0
+        self.write_errors = 0
+        self.rejected = 0
+        self.last_error: Optional[str] = None
+        self.last_flush_at: Optional[float] = None
+
+    # ── Producer side ─────────────────────────────────────────────────
+
+    def log(self, user_id: int, action: str, entity: str, entity_id: Optional[int] = None,
+            detail: Optional[str] = None) -> bool:
+        """
+        Record an audit row.
+
+        Returns:
+            False if the row was dropped because the queue stayed full
+        """
+        row = {
+            "user_id": user_id,
+            "action": action,
+            "entity": entity,
+            "entity_id": entity_id,
+            "detail": detail,
+            "timestamp": datetime.utcnow(),
+        }
+        if self.sync:
+            with self._lock:
+                self.enqueued += 1
+            self._write([row])
+            return True
+
+        self._ensure_started()
+        try:
+            self._queue.put_nowait(row)
+        except queue.Full:
+            with self._lock:
+                self.backpressure += 1
+            self._wake.set()
+            try:
+                self._queue.put(row, timeout=self.block_timeout)
+            except queue.Full:
+                with self._lock:
+                    self.dropped += 1
+                return False
+        with self._lock:
+            self.enqueued += 1
+        if self._queue.qsize() >= self.batch_size:
+            self._wake.set()
+        return True
+
+    # ── Writer side ───────────────────────────────────────────────────
+
+    def _write(self, rows: List[Dict[str, Any]]) -> Optional[Exception]:
+        """Insert *rows* in one transaction; the error if it failed, else None."""
+        db = self._session_factory()
+        try:
+            by_month: Dict[str, List[Dict[str, Any]]] = {}
+            for row in rows:
+                by_month.setdefault(month_key(row["timestamp"]), []).append(row)
+            # Partition DDL runs before the session opens its transaction
+            tables = {month: ensure_partition(db.get_bind(), month) for month in by_month}
+            for month, month_rows in by_month.items():
+                db.execute(insert(tables[month]), month_rows)
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            with self._lock:
+                self.write_errors += 1
+                self.last_error = f"{type(e).__name__}: {e}"
+            print(f"Audit write of {len(rows)} rows failed: {e}")
+            return e
+        finally:
+            db.close()
+        with self._lock:
+            self.written += len(rows)
+            self.batches += 1
+        return None
+
+    def _write_singly(self, rows: List[Dict[str, Any]]) -> Tuple[int, List[Dict[str, Any]]]:
+        """
+        Write rows one at a time after a batch failed on bad data.
+
+        Returns:
+            (rows written, rows to retry) — rejected rows are neither;
+            a transient error stops the pass and keeps the rest
+        """
+        written = 0
+        for i, row in enumerate(rows):
+            error = self._write([row])
+            if error is None:
+                written += 1
+            elif isinstance(error, OperationalError):
+                return written, rows[i:]
+            else:
+                with self._lock:
+                    self.rejected += 1
+        return written, []
+
+    def _take(self, limit: int) -> List[Dict[str, Any]]:
+        rows, self._retry = self._retry[:limit], self._retry[limit:]
+        while len(rows) < limit:
+            try:
+                rows.append(self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return rows
+
+    def flush(self) -> int:
+        """
+        Write everything queued so far.
+
+        Returns:
+            Number of rows written
+        """
+        written = 0
+        with self._flush_lock:
+            while True:
+                rows = self._take(self.batch_size)
+                if not rows:
+                    break
+                error = self._write(rows)
+                if error is None:
+                    written += len(rows)
+                    continue
+                if not isinstance(error, OperationalError):
+                    # Bad data somewhere in the batch: find it row by row
+                    done, rows = self._write_singly(rows)
+                    written += done
+                    if not rows:
+                        continue
+                # Transient: keep the rows for the next flush, within the queue bound
+                keep = rows + self._retry
+                overflow = max(0, len(keep) - self._queue.maxsize)
+                self._retry = keep[overflow:]
+                if overflow:
+                    with self._lock:
+                        self.dropped += overflow
+                break
+            self.last_flush_at = time.time()
+        return written
+
+    def _ensure_started(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self.start()
+
+    def start(self) -> None:
+        """Start the background writer thread."""
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return
+            self._stop.clear()
+
+            def _run():
+                while not self._stop.is_set():
+                    self._wake.wait(self.flush_interval)
+                    self._wake.clear()
+                    self.flush()
+
+            self._thread = threading.Thread(target=_run, name="audit-writer", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the writer thread and write what is still queued."""
+        self._stop.set()
+        self._wake.set()
+        thread, self._thread = self._thread, None
+        if thread is not None:
+            thread.join(timeout=5)
+        self.flush()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "sync": self.sync,
+                "queued": self._queue.qsize() + len(self._retry),
+                "enqueued": self.enqueued,
+                "written": self.written,
+                "batches": self.batches,
+                "dropped": self.dropped,
+                "backpressure": self.backpressure,
+                "write_errors": self.write_errors,
+                "rejected": self.rejected,
+                "last_error": self.last_error,
+                "last_flush_at": self.last_flush_at,
+            }
+
+
+# Global instance
+_writer = AuditWriter()
+atexit.register(_writer.flush)
+
+
+def log_audit(
+    user_id: int,
+    action: str,
+    entity: str,
+    entity_id: int = None,
+    detail: str = None,
+) -> None:
+    """
+    Queue an audit row.  Safe to call from anywhere — the row is written
+    by the background writer, outside the caller's transaction.
+    """
+    _writer.log(user_id, action, entity, entity_id, detail)
+
+
+def flush_audit() -> int:
+    """Write every queued audit row now."""
+    return _writer.flush()
+
+
+def audit_metrics() -> Dict[str, Any]:
+    return _writer.metrics()
+
+
+def start_audit_writer() -> None:
+    """Start the background writer (call from lifespan)."""
+    _writer.start()
+
+
+def stop_audit_writer() -> None:
+    """Stop the writer and flush the queue (call from lifespan)."""
+    _writer.stop()
@@ -0,0 +1,256 @@
+"""
+Audit log retention and archival.
+
+Monthly audit partitions older than AUDIT_HOT_MONTHS are moved out of
+the database into compressed, append-only files under
+AUDIT_ARCHIVE_DIR, then their tables are dropped.  The database only
+ever holds the recent months that inserts and everyday queries touch.
+
+Files per month:
+    audit_YYYYMM.ndjson.gz   Rows in id order as NDJSON, in blocks of
+                             AUDIT_ARCHIVE_BLOCK_ROWS; each block is its
+                             own gzip member, so the file is a valid
+                             gzip stream and can only grow.
+    audit_YYYYMM.idx         Sparse index, one JSON line per block:
+                             byte offset and length, row count, first
+                             and last id, earliest and latest timestamp.
+                             A "sealed" line closes each archive run.
+
+A time-range read decompresses only the blocks whose timestamps overlap
+the range.
+
+Crash safety: blocks count only once their run is sealed.  An unsealed
+tail (crash while writing) is truncated from both files on the next
+run, and a sealed run whose rows are still in the table is recognised
+by its row count and max id, so the rows are deleted without being
+written twice.  Rows that reach an archived month later (a late
+queued write, the legacy migration) land in a fresh partition and are
+appended as a new run.
+"""
+
+import gzip
+import json
+import os
+import threading
+import uuid
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional
+
+from sqlalchemy import func, select
+
+from .config import Config
+from .database import engine as default_engine
+from .models.audit import forget_partition, list_partitions, partition_table
+
+
+def _paths(directory: str, month: str):
+    base = os.path.join(directory, f"audit_{month}")
+    return base + ".ndjson.gz", base + ".idx"
+
+
+def _read_index(index_path: str) -> List[Dict[str, Any]]:
+    if not os.path.exists(index_path):
+        return []
+    with open(index_path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def _sealed_entries(entries: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Index entries up to and including the last seal."""
+    last_seal = max((i for i, e in enumerate(entries) if e.get("sealed")), default=-1)
+    return entries[:last_seal + 1]
+
+
+def _recover(data_path: str, index_path: str) -> List[Dict[str, Any]]:
+    """Cut an unsealed tail off both files; return the valid index entries."""
+    entries = _read_index(index_path)
+    valid = _sealed_entries(entries)
+    blocks = [e for e in valid if not e.get("sealed")]
+    end = blocks[-1]["offset"] + blocks[-1]["length"] if blocks else 0
+    if os.path.exists(data_path) and os.path.getsize(data_path) != end:
+        with open(data_path, "r+b") as f:
+            f.truncate(end)
+    if len(valid) != len(entries):
+        tmp = index_path + ".tmp"
+        with open(tmp, "w") as f:
+            f.writelines(json.dumps(e) + "\n" for e in valid)
+        os.replace(tmp, index_path)
+    return valid
+
+
+def _row_dict(row) -> Dict[str, Any]:
+    data = dict(row._mapping)
+    data["timestamp"] = data["timestamp"].isoformat()
+    return data
+
+
+def archive_partition(bind, month: str, directory: Optional[str] = None,
+                      block_rows: Optional[int] = None) -> int:
+    """
+    Move one monthly partition to its archive files and drop the table.
+
+    Args:
+        bind: Engine holding the partition
+        month: YYYYMM
+        directory: Archive directory (default Config.AUDIT_ARCHIVE_DIR)
+        block_rows: Rows per compressed block
+
+    Returns:
+        Number of rows archived
+    """
+    directory = directory or Config.AUDIT_ARCHIVE_DIR
+    block_rows = block_rows or Config.AUDIT_ARCHIVE_BLOCK_ROWS
+    os.makedirs(directory, exist_ok=True)
+    data_path, index_path = _paths(directory, month)
+    table = partition_table(month)
+
+    with bind.connect() as conn:
+        count, max_id, max_ts = conn.execute(
+            select(func.count(), func.max(table.c.id), func.max(table.c.timestamp))
+        ).one()
+    stats = {"rows": count, "max_id": max_id, "max_ts": max_ts.isoformat() if max_ts else None}
+
+    entries = _recover(data_path, index_path)
+    seal = entries[-1] if entries else None
+    already = seal is not None and all(seal.get(k) == v for k, v in stats.items())
+
+    if count and not already:
+        run = uuid.uuid4().hex[:8]
+        with open(data_path, "ab") as data, open(index_path, "a") as index, bind.connect() as conn:
+            result = conn.execution_options(yield_per=block_rows).execute(
+                select(table).where(table.c.id <= max_id).order_by(table.c.id)
+            )
+            for chunk in result.partitions():
+                rows = [_row_dict(row) for row in chunk]
+                blob = gzip.compress("".join(json.dumps(r) + "\n" for r in rows).encode())
+                offset = data.tell()
+                data.write(blob)
+                index.write(json.dumps({
+                    "run": run,
+                    "offset": offset,
+                    "length": len(blob),
+                    "rows": len(rows),
+                    "first_id": rows[0]["id"],
+                    "last_id": rows[-1]["id"],
+                    "start": min(r["timestamp"] for r in rows),
+                    "end": max(r["timestamp"] for r in rows),
+                }) + "\n")
+            data.flush()
+            os.fsync(data.fileno())
+            index.write(json.dumps({"sealed": True, "run": run, **stats}) + "\n")
+            index.flush()
+            os.fsync(index.fileno())
+
+    # Rows inserted while archiving (ids above max_id) stay for the next run
+    with bind.begin() as conn:
+        if max_id is not None:
+            conn.execute(table.delete().where(table.c.id <= max_id))
+        if not conn.execute(select(func.count()).select_from(table)).scalar():
+            table.drop(conn)
+            forget_partition(bind, month)
+    return 0 if already else count
+
+
+def read_archive(month: str, start: Optional[datetime] = None, end: Optional[datetime] = None,
+                 directory: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Rows of an archived month with start <= timestamp < end, in id order.
+
+    Only blocks whose time span overlaps the range are decompressed.
+    Timestamps are returned as ISO strings.
+    """
+    directory = directory or Config.AUDIT_ARCHIVE_DIR
+    data_path, index_path = _paths(directory, month)
+    low = start.isoformat() if start is not None else None
+    high = end.isoformat() if end is not None else None
+    blocks = [e for e in _sealed_entries(_read_index(index_path)) if not e.get("sealed")]
+    if not blocks:
+        return
+    with open(data_path, "rb") as data:
+        for block in blocks:
+            if (low is not None and block["end"] < low) or (high is not None and block["start"] >= high):
+                continue
+            data.seek(block["offset"])
+            for line in gzip.decompress(data.read(block["length"])).splitlines():
+                row = json.loads(line)
+                if (low is None or row["timestamp"] >= low) and (high is None or row["timestamp"] < high):
+                    yield row
+
+
+def list_archives(directory: Optional[str] = None) -> List[str]:
+    """Months (YYYYMM) that have archive files, oldest first."""
+    directory = directory or Config.AUDIT_ARCHIVE_DIR
+    if not os.path.isdir(directory):
+        return []
+    return sorted(
+        name[len("audit_"):-len(".idx")]
+        for name in os.listdir(directory)
+        if name.startswith("audit_") and name.endswith(".idx")
+    )
+
+
+def cutoff_month(now: datetime, hot_months: int) -> str:
+    """Oldest month kept in the database when *hot_months* are kept."""
+    index = now.year * 12 + now.month - 1 - (max(hot_months, 1) - 1)
+    return f"{index // 12:04d}{index % 12 + 1:02d}"
+
+
+def run_retention(bind=None, now: Optional[datetime] = None, hot_months: Optional[int] = None,
+                  directory: Optional[str] = None) -> Dict[str, int]:
+    """
+    Archive every partition older than the hot window.
+
+    Returns:
+        {month: rows archived}
+    """
+    bind = bind or default_engine
+    now = now or datetime.utcnow()
+    cutoff = cutoff_month(now, Config.AUDIT_HOT_MONTHS if hot_months is None else hot_months)
+    archived = {}
+    for month in list_partitions(bind):
+        if month < cutoff:
+            archived[month] = archive_partition(bind, month, directory)
+            print(f"Audit retention: archived {archived[month]} rows of {month}")
+    return archived
+
+
+# Background retention thread
+_retention: Optional[threading.Thread] = None
+_stop = threading.Event()
+_last_run: Dict[str, Any] = {"at": None, "archived": {}, "error": None}
+
+
+def retention_metrics() -> Dict[str, Any]:
+    return dict(_last_run)
+
+
+def start_retention(interval: Optional[float] = None) -> None:
+    """Run retention now and then every *interval* seconds (call from lifespan)."""
+    global _retention
+    if _retention is not None and _retention.is_alive():
+        return
+    interval = interval or Config.AUDIT_RETENTION_INTERVAL_SECONDS
+    _stop.clear()
+
+    def _run():
+        while True:
+            try:
+                _last_run.update(archived=run_retention(), error=None)
+            except Exception as e:
+                _last_run["error"] = f"{type(e).__name__}: {e}"
+                print(f"Audit retention failed: {e}")
+            _last_run["at"] = datetime.utcnow().isoformat()
+            if _stop.wait(interval):
+                break
+
+    _retention = threading.Thread(target=_run, name="audit-retention", daemon=True)
+    _retention.start()
+
+
+def stop_retention() -> None:
+    """Stop the retention thread (call from lifespan)."""
+    global _retention
+    _stop.set()
+    if _retention is not None:
+        _retention.join(timeout=5)
+        _retention = None
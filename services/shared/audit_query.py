@@ -0,0 +1,170 @@
+"""
+Audit log queries across monthly partitions.
+
+Two access paths, both ordered by (timestamp, id), oldest first:
+
+    * query_audit — one page at a time with keyset pagination.  The
+      cursor names the partition, timestamp and id of the last row
+      returned, so page N costs the same as page 1 (no OFFSET).
+    * iter_audit — every matching row as a stream, fetched with
+      yield_per so an export of millions of rows holds one batch in
+      memory at a time.  Optionally includes archived months
+      (shared.audit_archive); a month's archived rows come before
+      rows still in its partition.
+
+Filters by user use the (user_id, timestamp) index of each partition,
+filters by entity the (entity, entity_id, timestamp) index.  Only
+partitions overlapping [start, end) are visited.
+"""
+
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from sqlalchemy import and_, or_, select
+
+from .audit_archive import list_archives, read_archive
+from .models.audit import partition_table, partitions_between
+
+# Page size bounds for query_audit
+AUDIT_PAGE_DEFAULT = 100
+AUDIT_PAGE_MAX = 1000
+
+# Rows fetched per round trip while streaming
+AUDIT_STREAM_BATCH = 1000
+
+
+def encode_cursor(month: str, timestamp: datetime, row_id: int) -> str:
+    return f"{month}:{timestamp.isoformat()}:{row_id}"
+
+
+def decode_cursor(cursor: str) -> Tuple[str, datetime, int]:
+    """Split a cursor from encode_cursor; raises ValueError if malformed."""
+    month, rest = cursor.split(":", 1)
+    timestamp, row_id = rest.rsplit(":", 1)
+    if len(month) != 6 or not month.isdigit():
+        raise ValueError(f"bad audit cursor: {cursor!r}")
+    return month, datetime.fromisoformat(timestamp), int(row_id)
+
+
+def _conditions(table, user_id, entity, entity_id, action, start, end) -> List[Any]:
+    c = table.c
+    conditions = []
+    if user_id is not None:
+        conditions.append(c.user_id == user_id)
+    if entity is not None:
+        conditions.append(c.entity == entity)
+    if entity_id is not None:
+        conditions.append(c.entity_id == entity_id)
+    if action is not None:
+        conditions.append(c.action == action)
+    if start is not None:
+        conditions.append(c.timestamp >= start)
+    if end is not None:
+        conditions.append(c.timestamp < end)
+    return conditions
+
+
+def _row_dict(row) -> Dict[str, Any]:
+    return dict(row._mapping)
+
+
+def query_audit(
+    bind,
+    user_id: Optional[int] = None,
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    cursor: Optional[str] = None,
+    limit: int = AUDIT_PAGE_DEFAULT,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    One page of audit rows matching the filters.
+
+    Args:
+        bind: Engine holding the partitions
+        user_id, entity, entity_id, action: Equality filters
+        start, end: Time range [start, end)
+        cursor: next_cursor of the previous page
+        limit: Page size (clamped to AUDIT_PAGE_MAX)
+
+    Returns:
+        (rows, next_cursor); next_cursor is None on the last page
+    """
+    limit = max(1, min(limit, AUDIT_PAGE_MAX))
+    after = decode_cursor(cursor) if cursor else None
+    page: List[Tuple[str, Dict[str, Any]]] = []
+    with bind.connect() as conn:
+        for month in partitions_between(bind, start, end):
+            if after is not None and month < after[0]:
+                continue
+            table = partition_table(month)
+            conditions = _conditions(table, user_id, entity, entity_id, action, start, end)
+            if after is not None and month == after[0]:
+                _, ts, row_id = after
+                conditions.append(or_(
+                    table.c.timestamp > ts,
+                    and_(table.c.timestamp == ts, table.c.id > row_id),
+                ))
+            # One extra row tells whether another page follows
+            result = conn.execute(
+                select(table).where(*conditions)
+                .order_by(table.c.timestamp, table.c.id)
+                .limit(limit + 1 - len(page))
+            )
+            page.extend((month, _row_dict(row)) for row in result)
+            if len(page) > limit:
+                break
+
+    if len(page) <= limit:
+        return [row for _, row in page], None
+    month, last = page[limit - 1]
+    return [row for _, row in page[:limit]], encode_cursor(month, last["timestamp"], last["id"])
+
+
+def iter_audit(
+    bind,
+    user_id: Optional[int] = None,
+    entity: Optional[str] = None,
+    entity_id: Optional[int] = None,
+    action: Optional[str] = None,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    include_archived: bool = False,
+    archive_dir: Optional[str] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    Stream every audit row matching the filters, oldest first.
+
+    Database rows are fetched AUDIT_STREAM_BATCH at a time; archived
+    rows are read block by block.  Archived rows carry their timestamp
+    as an ISO string.
+    """
+    live = partitions_between(bind, start, end)
+    archived = []
+    if include_archived:
+        low = start.strftime("%Y%m") if start is not None else None
+        high = end.strftime("%Y%m") if end is not None else None
+        archived = [
+            m for m in list_archives(archive_dir)
+            if (low is None or m >= low) and (high is None or m <= high)
+        ]
+
+    for month in sorted(set(live) | set(archived)):
+        if month in archived:
+            for row in read_archive(month, start, end, archive_dir):
+                if ((user_id is None or row["user_id"] == user_id)
+                        and (entity is None or row["entity"] == entity)
+                        and (entity_id is None or row["entity_id"] == entity_id)
+                        and (action is None or row["action"] == action)):
+                    yield row
+        if month in live:
+            table = partition_table(month)
+            conditions = _conditions(table, user_id, entity, entity_id, action, start, end)
+            with bind.connect() as conn:
+                result = conn.execution_options(yield_per=AUDIT_STREAM_BATCH).execute(
+                    select(table).where(*conditions).order_by(table.c.timestamp, table.c.id)
+                )
+                for row in result:
+                    yield _row_dict(row)
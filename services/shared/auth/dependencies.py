@@ -11,7 +11,7 @@ Usage in any service:
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import httpx
 
 import sys, os
@@ -54,6 +54,7 @@ async def get_current_user(
             "identity_id": 1,
             "role": demo_role,
             "session_id": "demo_session_001",
+            "demo": True,
         }
     # ────────────────────────────────────────────────────────────────
 
@@ -106,7 +107,22 @@ async def get_current_user(
     }
 
 
-def require_role(role_name: str):
+async def get_current_user_or_query_token(
+    token: Optional[str] = None,
+    credentials: HTTPAuthorizationCredentials = Depends(_bearer_scheme),
+) -> Dict[str, Any]:
+    """
+    Like get_current_user, but also accepts the JWT as ``?token=``.
+
+    For clients that cannot set headers, such as browser EventSource
+    streams.  The Authorization header wins when both are present.
+    """
+    if credentials is None and token:
+        credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+    return await get_current_user(credentials)
+
+
+def require_role(role_name: str, allow_query_token: bool = False, allow_demo: Optional[bool] = None):
     """
     Return a FastAPI dependency that enforces a specific role.
     
@@ -116,11 +132,25 @@ def require_role(role_name: str):
         @router.get("/my-endpoint")
         def my_endpoint(user=Depends(require_role("civilian"))):
             ...
+
+    Args:
+        role_name: Required role
+        allow_query_token: Also accept the token as ``?token=`` (SSE)
+        allow_demo: Accept DEMO_MODE tokens; by default every role but
+            "admin" does — admin routes need a real JWT
     """
+    user_dependency = get_current_user_or_query_token if allow_query_token else get_current_user
+    if allow_demo is None:
+        allow_demo = role_name != "admin"
 
     async def _role_checker(
-        user: Dict[str, Any] = Depends(get_current_user),
+        user: Dict[str, Any] = Depends(user_dependency),
     ) -> Dict[str, Any]:
+        if user.get("demo") and not allow_demo:
+            raise HTTPException(
+                status_code=status.HTTP_403_FORBIDDEN,
+                detail=f"Demo tokens cannot access {role_name} endpoints",
+            )
         if user["role"] != role_name:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
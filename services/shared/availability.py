@@ -0,0 +1,227 @@
+"""
+Caregiver availability calendar.
+
+Every day is a 96-bit bitmap of 15-minute slots stored as 12 bytes
+(slot 0 = 00:00-00:15, most significant bit of byte 0 first).  A
+caregiver's effective bitmap for a date is the date override if one
+exists, else the weekly template for that weekday (no row = day off),
+else "all free" when the caregiver has no weekly template at all.
+
+"Who is free for [start, end)?" becomes:
+
+    need  = window bitmap per day            (days, 12) uint8
+    have  = effective bitmaps per caregiver  (n, days, 12) uint8
+    free  = ((have & need) == need).all(axis=(1, 2))
+
+computed for the whole candidate set at once from two queries.
+"""
+
+from collections import defaultdict
+from datetime import date, datetime, time, timedelta
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from .models.availability import AvailabilityOverride, AvailabilityTemplate
+
+
+SLOT_MINUTES = 15
+SLOTS_PER_DAY = 24 * 60 // SLOT_MINUTES
+BYTES_PER_DAY = SLOTS_PER_DAY // 8
+
+EMPTY_DAY = bytes(BYTES_PER_DAY)
+
+
+def encode_slots(slots: Iterable[int]) -> bytes:
+    """Pack slot indexes into a day bitmap."""
+    bits = np.zeros(SLOTS_PER_DAY, dtype=np.uint8)
+    bits[list(slots)] = 1
+    return np.packbits(bits).tobytes()
+
+
+def decode_slots(bitmap: bytes) -> List[int]:
+    """Unpack a day bitmap into sorted slot indexes."""
+    return np.flatnonzero(np.unpackbits(np.frombuffer(bitmap, dtype=np.uint8))).tolist()
+
+
+def encode_ranges(ranges: Iterable[Tuple[time, time]]) -> bytes:
+    """
+    Encode [start, end) time ranges within one day.
+
+    An end of 00:00 means midnight at the end of the day.  Partial slots
+    at either end are not counted as available.
+    """
+    slots = set()
+    for start, end in ranges:
+        first = -(-(start.hour * 60 + start.minute) // SLOT_MINUTES)
+        last = SLOTS_PER_DAY if end == time(0, 0) else (end.hour * 60 + end.minute) // SLOT_MINUTES
+        slots.update(range(first, last))
+    return encode_slots(slots)
+
+
+def decode_ranges(bitmap: bytes) -> List[Tuple[time, time]]:
+    """Turn a day bitmap back into merged [start, end) time ranges."""
+    ranges = []
+    slots = decode_slots(bitmap)
+    i = 0
+    while i < len(slots):
+        j = i
+        while j + 1 < len(slots) and slots[j + 1] == slots[j] + 1:
+            j += 1
+        start = slots[i] * SLOT_MINUTES
+        end = (slots[j] + 1) * SLOT_MINUTES
+        ranges.append((
+            time(start // 60, start % 60),
+            time(0, 0) if end == 24 * 60 else time(end // 60, end % 60),
+        ))
+        i = j + 1
+    return ranges
+
+
+def window_masks(start: datetime, end: datetime) -> List[Tuple[date, bytes]]:
+    """
+    Bitmaps of the slots a booking window touches, one per calendar day.
+
+    Partial slots count as needed, so a 10:05-11:00 booking needs the
+    10:00 slot.
+    """
+    masks = []
+    day = start.date()
+    while datetime.combine(day, time(0, 0)) < end:
+        day_start = datetime.combine(day, time(0, 0))
+        lo = max(start, day_start) - day_start
+        hi = min(end, day_start + timedelta(days=1)) - day_start
+        first = int(lo.total_seconds() // 60) // SLOT_MINUTES
+        last = -(-int(hi.total_seconds() // 60) // SLOT_MINUTES)
+        masks.append((day, encode_slots(range(first, last))))
+        day += timedelta(days=1)
+    return masks
+
+
+def effective_bitmaps(
+    db: Session,
+    caregiver_ids: Sequence[int],
+    days: Sequence[date],
+) -> np.ndarray:
+    """
+    Effective day bitmaps for many caregivers and days.
+
+    Args:
+        db: Database session
+        caregiver_ids: Caregivers to look up
+        days: Dates to resolve
+
+    Returns:
+        uint8 array of shape (len(caregiver_ids), len(days), BYTES_PER_DAY)
+
+    Two queries regardless of the number of caregivers or days.
+    """
+    n, d = len(caregiver_ids), len(days)
+    row_of = {cg_id: i for i, cg_id in enumerate(caregiver_ids)}
+    col_of = {day: j for j, day in enumerate(days)}
+
+    templates = defaultdict(dict)
+    for cg_id, weekday, slots in db.query(
+        AvailabilityTemplate.caregiver_id, AvailabilityTemplate.weekday, AvailabilityTemplate.slots
+    ).filter(
+        AvailabilityTemplate.caregiver_id.in_(caregiver_ids),
+    ):
+        templates[cg_id][weekday] = slots
+
+    overrides = db.query(
+        AvailabilityOverride.caregiver_id, AvailabilityOverride.date, AvailabilityOverride.slots
+    ).filter(
+        AvailabilityOverride.caregiver_id.in_(caregiver_ids),
+        AvailabilityOverride.date.in_(list(days)),
+    )
+
+    # No template → always free; a template without this weekday → day off
+    have = np.full((n, d, BYTES_PER_DAY), 0xFF, dtype=np.uint8)
+    for cg_id, week in templates.items():
+        i = row_of[cg_id]
+        for day, j in col_of.items():
+            have[i, j] = np.frombuffer(week.get(day.weekday(), EMPTY_DAY), dtype=np.uint8)
+    for cg_id, day, slots in overrides:
+        have[row_of[cg_id], col_of[day]] = np.frombuffer(slots, dtype=np.uint8)
+    return have
+
+
+def free_mask(
+    db: Session,
+    caregiver_ids: Sequence[int],
+    start: datetime,
+    end: datetime,
+) -> np.ndarray:
+    """
+    Which caregivers are free for the whole of [start, end).
+
+    Args:
+        db: Database session
+        caregiver_ids: Candidate caregiver ids
+        start: Window start
+        end: Window end
+
+    Returns:
+        bool array aligned with *caregiver_ids*
+    """
+    if not caregiver_ids:
+        return np.zeros(0, dtype=bool)
+    masks = window_masks(start, end)
+    if not masks:
+        return np.ones(len(caregiver_ids), dtype=bool)
+
+    days = [day for day, _ in masks]
+    need = np.stack([np.frombuffer(m, dtype=np.uint8) for _, m in masks])
+    have = effective_bitmaps(db, caregiver_ids, days)
+    return ((have & need) == need).all(axis=(1, 2))
+
+
+def set_calendar(
+    db: Session,
+    caregiver_id: int,
+    weekly: Optional[Dict[int, bytes]] = None,
+    overrides: Optional[Dict[date, bytes]] = None,
+) -> None:
+    """
+    Replace a caregiver's weekly template and/or upsert date overrides.
+
+    Args:
+        db: Database session (caller commits)
+        caregiver_id: Caregiver to update
+        weekly: weekday → bitmap; replaces the whole template when given
+        overrides: date → bitmap; merged with existing overrides
+    """
+    if weekly is not None:
+        db.query(AvailabilityTemplate).filter(
+            AvailabilityTemplate.caregiver_id == caregiver_id
+        ).delete(synchronize_session=False)
+        db.add_all([
+            AvailabilityTemplate(caregiver_id=caregiver_id, weekday=weekday, slots=slots)
+            for weekday, slots in sorted(weekly.items())
+        ])
+    for day, slots in (overrides or {}).items():
+        db.merge(AvailabilityOverride(caregiver_id=caregiver_id, date=day, slots=slots))
+
+
+def get_calendar(db: Session, caregiver_id: int, from_date: Optional[date] = None):
+    """
+    Return (weekly, overrides) bitmaps for a caregiver.
+
+    Args:
+        db: Database session
+        caregiver_id: Caregiver to read
+        from_date: Skip overrides before this date
+
+    Returns:
+        (weekday → bitmap, date → bitmap)
+    """
+    weekly = {
+        row.weekday: row.slots
+        for row in db.query(AvailabilityTemplate).filter(AvailabilityTemplate.caregiver_id == caregiver_id)
+    }
+    query = db.query(AvailabilityOverride).filter(AvailabilityOverride.caregiver_id == caregiver_id)
+    if from_date is not None:
+        query = query.filter(AvailabilityOverride.date >= from_date)
+    overrides = {row.date: row.slots for row in query.order_by(AvailabilityOverride.date)}
+    return weekly, overrides
@@ -0,0 +1,166 @@
+"""
+Hot/cold split of bookings.
+
+Bookings in a terminal state (closed, cancelled, rejected) are read
+only as history, yet they make up most of the bookings table and every
+hot query has to filter them out.  archive_bookings moves those whose
+end_time is older than BOOKING_ARCHIVE_AFTER_DAYS into
+bookings_archive, BOOKING_ARCHIVE_BATCH_SIZE rows per transaction
+(INSERT … SELECT then DELETE), so writers are never blocked for long.
+
+Reads:
+    * find_booking — one booking by id, live or archived.
+    * booking_history — a caregiver's or civilian's bookings, optionally
+      merged with their archived ones, ordered by start_time.
+Archived rows are BookingArchive objects with the same attributes as
+Booking, so response builders accept either.
+
+The booking with the highest id is never archived: bookings ids are
+rowids (no AUTOINCREMENT), and moving the newest row would let SQLite
+hand its id out again.
+"""
+
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Dict, List, Optional, Union
+
+from sqlalchemy import DateTime, delete, func, insert, literal, select
+from sqlalchemy.orm import Session
+
+from .config import Config
+from .database import SessionLocal
+from .models import Booking, BookingArchive
+from .models.booking import TERMINAL_STATUSES
+
+# Columns copied from bookings to bookings_archive
+_COLUMNS = (
+    "id", "caregiver_id", "civilian_id", "start_time", "end_time", "status",
+    "started_at", "ended_at", "payment_status", "change_seq",
+)
+
+
+def archive_bookings(db: Session, now: Optional[datetime] = None, after_days: Optional[int] = None,
+                     batch_size: Optional[int] = None) -> int:
+    """
+    Move old terminal bookings to bookings_archive.
+
+    Args:
+        db: Database session (committed once per batch)
+        now: Current time (defaults to utcnow)
+        after_days: Minimum age of end_time (default BOOKING_ARCHIVE_AFTER_DAYS)
+        batch_size: Rows moved per transaction
+
+    Returns:
+        Number of bookings moved
+    """
+    now = now or datetime.utcnow()
+    after_days = Config.BOOKING_ARCHIVE_AFTER_DAYS if after_days is None else after_days
+    batch_size = batch_size or Config.BOOKING_ARCHIVE_BATCH_SIZE
+    cutoff = now - timedelta(days=after_days)
+
+    newest = db.query(func.max(Booking.id)).scalar()
+    if newest is None:
+        return 0
+    moved = 0
+    while True:
+        ids = [
+            row[0] for row in db.execute(
+                select(Booking.id)
+                .where(
+                    Booking.status.in_(TERMINAL_STATUSES),
+                    Booking.end_time < cutoff,
+                    Booking.id < newest,
+                )
+                .order_by(Booking.id)
+                .limit(batch_size)
+            )
+        ]
+        if not ids:
+            break
+        source = select(*[getattr(Booking, c) for c in _COLUMNS], literal(now, DateTime)).where(
+            Booking.id.in_(ids)
+        )
+        db.execute(insert(BookingArchive).from_select([*_COLUMNS, "archived_at"], source))
+        db.execute(delete(Booking).where(Booking.id.in_(ids)))
+        db.commit()
+        moved += len(ids)
+        if len(ids) < batch_size:
+            break
+    return moved
+
+
+def find_booking(db: Session, booking_id: int) -> Optional[Union[Booking, BookingArchive]]:
+    """A booking by id from the live table, else from the archive."""
+    booking = db.get(Booking, booking_id)
+    if booking is None:
+        booking = db.get(BookingArchive, booking_id)
+    return booking
+
+
+def booking_history(db: Session, caregiver_id: Optional[int] = None, civilian_id: Optional[int] = None,
+                    include_archived: bool = True) -> List[Union[Booking, BookingArchive]]:
+    """
+    Bookings of a caregiver and/or civilian, oldest start first.
+
+    Args:
+        db: Database session
+        caregiver_id: Filter by caregiver
+        civilian_id: Filter by civilian
+        include_archived: Merge in archived bookings
+    """
+    models = (Booking, BookingArchive) if include_archived else (Booking,)
+    rows: List[Union[Booking, BookingArchive]] = []
+    for model in models:
+        query = db.query(model)
+        if caregiver_id is not None:
+            query = query.filter(model.caregiver_id == caregiver_id)
+        if civilian_id is not None:
+            query = query.filter(model.civilian_id == civilian_id)
+        rows.extend(query.all())
+    return sorted(rows, key=lambda b: (b.start_time, b.id))
+
+
+# Background archiver
+_archiver: Optional[threading.Thread] = None
+_stop = threading.Event()
+_last_run: Dict[str, Any] = {"at": None, "moved": 0, "error": None}
+
+
+def archive_metrics() -> Dict[str, Any]:
+    return dict(_last_run)
+
+
+def start_archiver(interval: Optional[float] = None) -> None:
+    """Archive now and then every *interval* seconds (call from lifespan)."""
+    global _archiver
+    if _archiver is not None and _archiver.is_alive():
+        return
+    interval = interval or Config.BOOKING_ARCHIVE_INTERVAL_SECONDS
+    _stop.clear()
+
+    def _run():
+        while True:
+            db = SessionLocal()
+            try:
+                _last_run.update(moved=archive_bookings(db), error=None)
+            except Exception as e:
+                db.rollback()
+                _last_run["error"] = f"{type(e).__name__}: {e}"
+                print(f"Booking archival failed: {e}")
+            finally:
+                db.close()
+            _last_run["at"] = datetime.utcnow().isoformat()
+            if _stop.wait(interval):
+                break
+
+    _archiver = threading.Thread(target=_run, name="booking-archiver", daemon=True)
+    _archiver.start()
+
+
+def stop_archiver() -> None:
+    """Stop the archiver thread (call from lifespan)."""
+    global _archiver
+    _stop.set()
+    if _archiver is not None:
+        _archiver.join(timeout=5)
+        _archiver = None
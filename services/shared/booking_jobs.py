@@ -0,0 +1,122 @@
+"""
+Delayed booking actions, run by the scheduler (shared.scheduler).
+
+    booking.expire       A request still pending (nobody matched it)
+                         BOOKING_PENDING_GRACE_MINUTES after its start
+                         time is cancelled.
+    booking.remind       BOOKING_REMINDER_LEAD_MINUTES before a
+                         confirmed or accepted booking starts, a reminder
+                         goes through the outbox to the SSE streams of
+                         every service (caregivers' live in caregiver-api).
+    booking.auto_accept  DEMO_MODE: a booking nobody accepted within
+                         DEMO_AUTO_ACCEPT_SECONDS is confirmed (off when
+                         the setting is 0).
+
+schedule_booking_jobs is an outbox consumer: every committed booking
+change (re)schedules the tasks its new state needs and cancels the
+rest, whichever endpoint or service made the change.  Task keys are
+"<kind>:<booking id>", so a redelivered event just moves the same
+tasks.  Handlers re-check the booking's state when they run.
+"""
+
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from .config import Config
+from .database import SessionLocal
+from .models import Booking, ScheduledTask
+from .outbox import REMINDER as REMINDER_EVENT, record_booking_change
+from .payment import reserve_payment
+from .scheduler import Scheduler, cancel, schedule, scheduler as default_scheduler
+from .workflow import transition_booking
+
+EXPIRE = "booking.expire"
+REMIND = "booking.remind"
+AUTO_ACCEPT = "booking.auto_accept"
+KINDS = (EXPIRE, REMIND, AUTO_ACCEPT)
+
+# States a reminder is still useful in
+REMINDER_STATUSES = ("confirmed", "accepted")
+
+
+def task_key(kind: str, booking_id: int) -> str:
+    return f"{kind}:{booking_id}"
+
+
+# ── Handlers ──────────────────────────────────────────────────────────
+
+def expire_booking(db: Session, task: ScheduledTask) -> None:
+    """Cancel the booking if it is still an unmatched request."""
+    booking = db.get(Booking, task.target_id)
+    if booking is not None and booking.status == "pending":
+        transition_booking(booking, "cancelled")
+        db.flush()
+        print(f"Expired unmatched booking #{booking.id}")
+
+
+def remind_booking(db: Session, task: ScheduledTask) -> None:
+    """Send a reminder for an upcoming booking through the outbox."""
+    booking = db.get(Booking, task.target_id)
+    if booking is not None and booking.status in REMINDER_STATUSES:
+        record_booking_change(db, booking, kind=REMINDER_EVENT)
+
+
+def auto_accept_booking(db: Session, task: ScheduledTask) -> None:
+    """DEMO_MODE: confirm a booking nobody accepted in time."""
+    booking = db.get(Booking, task.target_id)
+    if booking is not None and booking.status in ("pending", "matched"):
+        if booking.status == "pending":
+            transition_booking(booking, "matched")
+        transition_booking(booking, "confirmed")
+        reserve_payment(booking)
+        db.flush()
+        print(f"DEMO_MODE: Auto-accepted booking #{booking.id}")
+
+
+def register_booking_jobs(scheduler: Optional[Scheduler] = None) -> None:
+    """Register the booking handlers with *scheduler* (default: the global one)."""
+    scheduler = scheduler or default_scheduler
+    scheduler.register(EXPIRE, expire_booking)
+    scheduler.register(REMIND, remind_booking)
+    scheduler.register(AUTO_ACCEPT, auto_accept_booking)
+
+
+# ── Scheduling ────────────────────────────────────────────────────────
+
+def booking_job_times(evt: Dict[str, Any], now: Optional[datetime] = None) -> Dict[str, datetime]:
+    """Due time of each task a booking in the event's state needs."""
+    now = now or datetime.utcnow()
+    status = evt["status"]
+    start = datetime.fromisoformat(evt["start_time"]) if evt.get("start_time") else None
+    due: Dict[str, datetime] = {}
+    if status == "pending" and start is not None:
+        due[EXPIRE] = start + timedelta(minutes=Config.BOOKING_PENDING_GRACE_MINUTES)
+    if status in REMINDER_STATUSES and start is not None:
+        remind_at = start - timedelta(minutes=Config.BOOKING_REMINDER_LEAD_MINUTES)
+        if remind_at > now:
+            due[REMIND] = remind_at
+    if status in ("pending", "matched") and Config.DEMO_AUTO_ACCEPT_SECONDS > 0:
+        changed_at = datetime.fromisoformat(evt["at"]) if evt.get("at") else now
+        due[AUTO_ACCEPT] = changed_at + timedelta(seconds=Config.DEMO_AUTO_ACCEPT_SECONDS)
+    return due
+
+
+def schedule_booking_jobs(evt: Dict[str, Any], session_factory=SessionLocal) -> None:
+    """Outbox consumer: bring the booking's scheduled tasks in line with its state."""
+    if evt.get("reminder"):
+        return
+    booking_id = evt["booking_id"]
+    due = booking_job_times(evt)
+    db = session_factory()
+    try:
+        cancel(db, *[task_key(kind, booking_id) for kind in KINDS if kind not in due])
+        for kind, due_at in due.items():
+            schedule(db, kind, due_at, target_id=booking_id, key=task_key(kind, booking_id))
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
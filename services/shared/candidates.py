@@ -0,0 +1,159 @@
+"""
+SQL-side caregiver candidate retrieval.
+
+Finds caregivers that offer any or all of a request's skills using the
+``caregiver_skills`` inverted index, together with the verified and
+gender filters, in a single query.  Only matching caregivers are loaded
+and decoded — the skills JSON of the rest of the table is never read.
+
+Query shape (match="all"):
+
+    SELECT caregivers.*, m.matched
+    FROM caregivers
+    JOIN (SELECT caregiver_id, COUNT(*) AS matched
+          FROM caregiver_skills
+          WHERE skill_id IN (:ids)
+          GROUP BY caregiver_id
+          HAVING COUNT(*) = :n_ids) AS m
+      ON caregivers.id = m.caregiver_id
+    WHERE caregivers.verified = 1 [AND lower(gender) = :gender]
+    ORDER BY m.matched DESC, caregivers.trust_score DESC
+    LIMIT :limit
+
+The inner query is answered from the (skill_id, caregiver_id) index.
+
+With ``near=(lat, lng, radius_km)`` the query also restricts
+caregivers.geohash to the prefix cells around the point and the home
+coordinates to the radius box, orders by approximate distance and
+loads at most Config.GEO_SCAN_LIMIT rows (see shared.geo); the result
+is ordered nearest first instead.
+"""
+
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from typing import Iterable, List, Optional, Tuple
+
+from .config import Config
+from .models import Caregiver
+from .models.skill import CaregiverSkill, resolve_skill_ids
+from .geo import approx_distance_sq, nearest, within_box, within_cells
+from .skills import vocabulary
+
+
+# Caregiver ids that are placeholders rather than real people
+# (0 = broadcast target used by request_care).
+SENTINEL_CAREGIVER_IDS = (0,)
+
+
+def _nearby(query, lat: float, lng: float, radius_km: float, limit: Optional[int]):
+    """Restrict *query* to caregivers near a point, closest first, bounded."""
+    return (
+        query.filter(
+            within_cells(Caregiver.geohash, lat, lng, radius_km),
+            within_box(Caregiver.home_lat, Caregiver.home_lng, lat, lng, radius_km),
+        )
+        .order_by(None)
+        .order_by(approx_distance_sq(Caregiver.home_lat, Caregiver.home_lng, lat, lng), Caregiver.id)
+        .limit(max(limit or 0, Config.GEO_SCAN_LIMIT))
+    )
+
+
+def find_candidates(
+    db: Session,
+    required_skills: Iterable[str],
+    match: str = "any",
+    verified: Optional[bool] = True,
+    gender: Optional[str] = None,
+    limit: Optional[int] = None,
+    near: Optional[Tuple[float, float, float]] = None,
+) -> List[Tuple[Caregiver, int]]:
+    """
+    Retrieve caregivers offering the required skills.
+
+    Args:
+        db: Database session
+        required_skills: Requested skills (any spelling)
+        match: "any" (at least one skill) or "all" (every skill)
+        verified: Filter on verification status (None = don't filter)
+        gender: Optional case-insensitive gender filter
+        limit: Maximum number of caregivers to return
+        near: Optional (lat, lng, radius_km); keeps only caregivers
+            within reach of the point
+
+    Returns:
+        List of (caregiver, matched_skill_count), best skill overlap
+        first, ties broken by trust score — or nearest first with *near*
+
+    Raises:
+        ValueError: On an unknown match mode
+    """
+    if match not in ("any", "all"):
+        raise ValueError(f"Unknown match mode: {match}")
+
+    wanted = {vocabulary.canonical(skill) for skill in required_skills} - {""}
+    skill_ids = resolve_skill_ids(db, wanted)
+    if not skill_ids or (match == "all" and len(skill_ids) < len(wanted)):
+        # Nothing requested, or a required skill no caregiver has listed
+        return []
+
+    matched_count = func.count(CaregiverSkill.skill_id).label("matched")
+    matched = (
+        select(CaregiverSkill.caregiver_id, matched_count)
+        .where(CaregiverSkill.skill_id.in_(list(skill_ids.values())))
+        .group_by(CaregiverSkill.caregiver_id)
+    )
+    if match == "all":
+        matched = matched.having(func.count(CaregiverSkill.skill_id) == len(skill_ids))
+    matched = matched.subquery()
+
+    query = (
+        db.query(Caregiver, matched.c.matched)
+        .join(matched, Caregiver.id == matched.c.caregiver_id)
+        .filter(Caregiver.id.notin_(SENTINEL_CAREGIVER_IDS))
+    )
+    if verified is not None:
+        query = query.filter(Caregiver.verified == verified)
+    if gender:
+        query = query.filter(func.lower(Caregiver.gender) == gender.strip().lower())
+
+    query = query.order_by(matched.c.matched.desc(), Caregiver.trust_score.desc(), Caregiver.id)
+
+    if near is not None:
+        lat, lng, radius_km = near
+        rows = _nearby(query, lat, lng, radius_km, limit).all()
+        counts = {caregiver.id: count for caregiver, count in rows}
+        closest = nearest(lat, lng, [caregiver for caregiver, _ in rows], radius_km, k=limit)
+        return [(caregiver, counts[caregiver.id]) for caregiver, _ in closest]
+
+    if limit is not None:
+        query = query.limit(limit)
+
+    return [(caregiver, count) for caregiver, count in query.all()]
+
+
+def find_nearby(
+    db: Session,
+    lat: float,
+    lng: float,
+    radius_km: float,
+    k: int = 10,
+    verified: Optional[bool] = True,
+) -> List[Tuple[Caregiver, float]]:
+    """
+    K nearest caregivers within *radius_km* of a point, any skills.
+
+    Args:
+        db: Database session
+        lat: Latitude in degrees
+        lng: Longitude in degrees
+        radius_km: Search radius
+        k: Maximum number of caregivers to return
+        verified: Filter on verification status (None = don't filter)
+
+    Returns:
+        List of (caregiver, distance_km), nearest first
+    """
+    query = db.query(Caregiver).filter(Caregiver.id.notin_(SENTINEL_CAREGIVER_IDS))
+    if verified is not None:
+        query = query.filter(Caregiver.verified == verified)
+    return nearest(lat, lng, _nearby(query, lat, lng, radius_km, k).all(), radius_km, k=k)
@@ -0,0 +1,153 @@
+"""
+Incremental change feed for bookings and caregiver profiles.
+
+Every write to a Booking or Caregiver row stamps it with the next
+number of a single monotonic counter (change_sequences."changes").
+A client keeps the highest number it has seen as its cursor and asks
+for rows with change_seq > cursor; with the (owner, change_seq)
+indexes each sync reads only the rows that changed, however long the
+history.
+
+Stamping:
+    * ORM writes are stamped in a ``before_flush`` hook, one counter
+      UPDATE per flush for all rows in it.  A change_seq set explicitly
+      on the object is left alone.
+    * Bulk UPDATEs (shared.workflow.claim_transition) take a number
+      with next_change_seq and set it themselves.
+
+A booking that changes caregiver is also marked ``reassigned`` (by the
+same hook, or by claim_transition's UPDATE), which lets a caregiver's
+feed report bookings that left it as removals.
+
+The counter row is updated inside the writing transaction and SQLite
+serializes writers, so numbers become visible in order: once the
+counter reads N, every row stamped <= N is committed.  changes_since
+reads the counter before the rows, which makes the returned cursor
+safe — a row can be delivered twice (clients upsert by id) but is
+never skipped.
+"""
+
+from typing import Any, List, Tuple
+
+from sqlalchemy import event, insert, select, update
+from sqlalchemy.orm import Session, attributes
+
+from .models import Booking, Caregiver, ChangeSequence
+
+SEQUENCE_NAME = "changes"
+
+# Models whose writes are stamped
+TRACKED_MODELS = (Booking, Caregiver)
+
+CHANGE_FEED_DEFAULT_LIMIT = 100
+CHANGE_FEED_MAX_LIMIT = 500
+
+
+def allocate_change_seqs(session: Session, count: int = 1) -> int:
+    """
+    Reserve *count* consecutive change numbers in the session's transaction.
+
+    Returns:
+        The first number of the block
+    """
+    table = ChangeSequence.__table__
+    connection = session.connection()
+    value = connection.execute(
+        update(table)
+        .where(table.c.name == SEQUENCE_NAME)
+        .values(value=table.c.value + count)
+        .returning(table.c.value)
+    ).scalar()
+    if value is None:
+        # Normally seeded by ensure_sequence at startup
+        connection.execute(insert(table).values(name=SEQUENCE_NAME, value=count))
+        value = count
+    return value - count + 1
+
+
+def next_change_seq(session: Session) -> int:
+    """A single change number, for statements that bypass the ORM flush."""
+    return allocate_change_seqs(session, 1)
+
+
+def current_change_seq(db: Session) -> int:
+    """Highest change number handed out so far (0 if none)."""
+    value = db.execute(
+        select(ChangeSequence.value).where(ChangeSequence.name == SEQUENCE_NAME)
+    ).scalar()
+    return value or 0
+
+
+def ensure_sequence(db: Session) -> None:
+    """Create the counter row and stamp rows written before it existed."""
+    if db.get(ChangeSequence, SEQUENCE_NAME) is None:
+        db.add(ChangeSequence(name=SEQUENCE_NAME, value=0))
+        db.flush()
+    stamped = 0
+    for model in TRACKED_MODELS:
+        rows = db.query(model).filter(model.change_seq.is_(None)).order_by(model.id).all()
+        if rows:
+            first = allocate_change_seqs(db, len(rows))
+            for offset, row in enumerate(rows):
+                row.change_seq = first + offset
+            stamped += len(rows)
+    db.commit()
+    if stamped:
+        print(f"Migration: stamped {stamped} rows with change numbers")
+
+
+@event.listens_for(Session, "before_flush")
+def _stamp_changes(session, flush_context, instances):
+    for obj in session.dirty:
+        if isinstance(obj, Booking) and attributes.get_history(obj, "caregiver_id").deleted:
+            obj.reassigned = True
+    changed = [obj for obj in session.new if isinstance(obj, TRACKED_MODELS)]
+    changed += [
+        obj for obj in session.dirty
+        if isinstance(obj, TRACKED_MODELS) and session.is_modified(obj)
+        # A number set explicitly (backfill) is kept
+        and not attributes.get_history(obj, "change_seq").has_changes()
+    ]
+    if not changed:
+        return
+    first = allocate_change_seqs(session, len(changed))
+    for offset, obj in enumerate(changed):
+        obj.change_seq = first + offset
+
+
+def clamp_limit(limit: int) -> int:
+    return max(1, min(limit or CHANGE_FEED_DEFAULT_LIMIT, CHANGE_FEED_MAX_LIMIT))
+
+
+def changes_since(db: Session, model, since: int, limit: int, *conditions) -> Tuple[List[Any], int, bool]:
+    """
+    Rows of *model* changed after cursor *since*, oldest change first.
+
+    Args:
+        db: Database session
+        model: Booking or Caregiver
+        since: Client cursor (0 for a full sync)
+        limit: Page size (clamped to CHANGE_FEED_MAX_LIMIT)
+        *conditions: Ownership filters, e.g. Booking.civilian_id == 7
+
+    Returns:
+        (rows, next_cursor, has_more).  When has_more is False the
+        cursor jumps to the current counter value, so changes that
+        belong to other users are never rescanned.
+    """
+    limit = clamp_limit(limit)
+    head = current_change_seq(db)
+    rows = (
+        db.query(model)
+        .filter(model.change_seq > since, *conditions)
+        .order_by(model.change_seq)
+        .limit(limit + 1)
+        .all()
+    )
+    has_more = len(rows) > limit
+    rows = rows[:limit]
+    if has_more:
+        next_cursor = rows[-1].change_seq
+    else:
+        next_cursor = max([since, head] + [row.change_seq for row in rows])
+    return rows, next_cursor, has_more
@@ -25,7 +25,78 @@ class Config:
     AI_SERVICE_URL: str = os.getenv("AI_SERVICE_URL", "http://localhost:8003")
     BLOCKCHAIN_SERVICE_URL: str = os.getenv("BLOCKCHAIN_SERVICE_URL", "http://localhost:8004")
     SAFETY_SERVICE_URL: str = os.getenv("SAFETY_SERVICE_URL", "http://localhost:8005")
+
+    # Matching pipeline (civilian-api → ai-service)
+    MATCH_DEADLINE_SECONDS: float = float(os.getenv("MATCH_DEADLINE_SECONDS", "2.0"))
+    MATCH_CANDIDATE_LIMIT: int = int(os.getenv("MATCH_CANDIDATE_LIMIT", "200"))
+    MATCH_TOP_N: int = int(os.getenv("MATCH_TOP_N", "3"))
+    MATCH_RADIUS_KM: float = float(os.getenv("MATCH_RADIUS_KM", "25.0"))
+    # Most caregivers a nearby query loads (nearest first) before the
+    # exact distance and service-radius filter
+    GEO_SCAN_LIMIT: int = int(os.getenv("GEO_SCAN_LIMIT", "500"))
+
+    # Longest allowed booking; bounds conflict range queries
+    MAX_BOOKING_HOURS: int = int(os.getenv("MAX_BOOKING_HOURS", "24"))
+
+    # Inter-service HTTP clients
+    SERVICE_CLIENT_TIMEOUT_SECONDS: float = float(os.getenv("SERVICE_CLIENT_TIMEOUT_SECONDS", "5.0"))
+    SERVICE_CLIENT_MAX_CONNECTIONS: int = int(os.getenv("SERVICE_CLIENT_MAX_CONNECTIONS", "20"))
+    SERVICE_CLIENT_RETRIES: int = int(os.getenv("SERVICE_CLIENT_RETRIES", "1"))
+    CIRCUIT_FAILURE_THRESHOLD: int = int(os.getenv("CIRCUIT_FAILURE_THRESHOLD", "5"))
+    CIRCUIT_RESET_SECONDS: float = float(os.getenv("CIRCUIT_RESET_SECONDS", "30.0"))
+
+    # Booking event outbox dispatcher
+    OUTBOX_POLL_SECONDS: float = float(os.getenv("OUTBOX_POLL_SECONDS", "0.5"))
+    OUTBOX_BATCH_SIZE: int = int(os.getenv("OUTBOX_BATCH_SIZE", "500"))
+
+    # Single-flight read coalescing: how long a finished result is reused
+    SINGLEFLIGHT_TTL_SECONDS: float = float(os.getenv("SINGLEFLIGHT_TTL_SECONDS", "0.25"))
+
+    # Buffered audit log writer
+    AUDIT_BATCH_SIZE: int = int(os.getenv("AUDIT_BATCH_SIZE", "200"))
+    AUDIT_FLUSH_MS: int = int(os.getenv("AUDIT_FLUSH_MS", "250"))
+    AUDIT_QUEUE_SIZE: int = int(os.getenv("AUDIT_QUEUE_SIZE", "10000"))
+    AUDIT_BLOCK_MS: int = int(os.getenv("AUDIT_BLOCK_MS", "50"))
+    AUDIT_SYNC: bool = os.getenv("AUDIT_SYNC", "false").lower() == "true"
+
+    # Audit retention: months kept in the database, archive location
+    AUDIT_HOT_MONTHS: int = int(os.getenv("AUDIT_HOT_MONTHS", "3"))
+    AUDIT_ARCHIVE_DIR: str = os.getenv("AUDIT_ARCHIVE_DIR", os.path.join(BASE_DIR, "audit_archive"))
+    AUDIT_ARCHIVE_BLOCK_ROWS: int = int(os.getenv("AUDIT_ARCHIVE_BLOCK_ROWS", "1000"))
+    AUDIT_RETENTION_INTERVAL_SECONDS: float = float(os.getenv("AUDIT_RETENTION_INTERVAL_SECONDS", "21600"))
     
+    # Booking archive: terminal bookings older than this move to bookings_archive
+    BOOKING_ARCHIVE_AFTER_DAYS: int = int(os.getenv("BOOKING_ARCHIVE_AFTER_DAYS", "30"))
+    BOOKING_ARCHIVE_BATCH_SIZE: int = int(os.getenv("BOOKING_ARCHIVE_BATCH_SIZE", "500"))
+    BOOKING_ARCHIVE_INTERVAL_SECONDS: float = float(os.getenv("BOOKING_ARCHIVE_INTERVAL_SECONDS", "3600"))
+
+    # Idempotency-Key: how long responses are kept, in-memory cache size,
+    # and after how long an unfinished claim may be taken over
+    IDEMPOTENCY_TTL_SECONDS: int = int(os.getenv("IDEMPOTENCY_TTL_SECONDS", "86400"))
+    IDEMPOTENCY_CACHE_SIZE: int = int(os.getenv("IDEMPOTENCY_CACHE_SIZE", "10000"))
+    IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS: int = int(os.getenv("IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS", "60"))
+    IDEMPOTENCY_PURGE_INTERVAL_SECONDS: float = float(os.getenv("IDEMPOTENCY_PURGE_INTERVAL_SECONDS", "3600"))
+
+    # Delayed-task scheduler: tasks claimed per batch, idle poll, claim
+    # lease, and retry policy for failing tasks
+    SCHEDULER_BATCH_SIZE: int = int(os.getenv("SCHEDULER_BATCH_SIZE", "100"))
+    SCHEDULER_POLL_SECONDS: float = float(os.getenv("SCHEDULER_POLL_SECONDS", "5"))
+    SCHEDULER_LEASE_SECONDS: int = int(os.getenv("SCHEDULER_LEASE_SECONDS", "60"))
+    SCHEDULER_MAX_ATTEMPTS: int = int(os.getenv("SCHEDULER_MAX_ATTEMPTS", "5"))
+    SCHEDULER_RETRY_SECONDS: int = int(os.getenv("SCHEDULER_RETRY_SECONDS", "30"))
+    SCHEDULER_WORKERS: int = int(os.getenv("SCHEDULER_WORKERS", "2"))
+
+    # Trust recompute jobs wait this long so a burst of ratings for one
+    # caregiver coalesces into a single run
+    TRUST_RECOMPUTE_DELAY_SECONDS: float = float(os.getenv("TRUST_RECOMPUTE_DELAY_SECONDS", "2"))
+
+    # Booking jobs: unmatched requests are cancelled this long after their
+    # start time, reminders go out this long before it; auto-accept after
+    # this many seconds (DEMO_MODE, 0 = off)
+    BOOKING_PENDING_GRACE_MINUTES: int = int(os.getenv("BOOKING_PENDING_GRACE_MINUTES", "15"))
+    BOOKING_REMINDER_LEAD_MINUTES: int = int(os.getenv("BOOKING_REMINDER_LEAD_MINUTES", "60"))
+    DEMO_AUTO_ACCEPT_SECONDS: float = float(os.getenv("DEMO_AUTO_ACCEPT_SECONDS", "0"))
+
     # Security
     SECRET_KEY: str = os.getenv("SECRET_KEY", "dev-secret-key-change-in-production")
     
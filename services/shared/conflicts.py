@@ -0,0 +1,279 @@
+"""
+Booking conflict detection.
+
+A caregiver must not hold two blocking bookings whose [start, end)
+windows overlap.  Two layers answer "does [start, end) clash with any
+of caregiver X's bookings?":
+
+    1. A bounded range query on idx_caregiver_time.  Because no booking
+       is longer than MAX_BOOKING_HOURS, only rows with
+       start_time in [start - MAX_BOOKING_HOURS, end) can overlap, so
+       the index scan never reads a caregiver's whole history.
+
+    2. A per-caregiver interval cache covering the next
+       CONFLICT_CACHE_DAYS.  Intervals are sorted by start with a
+       running maximum of end, so an overlap check is one bisect:
+
+           i = number of intervals with start < end
+           overlap  ⇔  max(end of those i) > start
+
+       Any commit that touches a booking's caregiver, window or status
+       drops that caregiver's entry; the next check reloads it with one
+       range query.  Entries also expire after CONFLICT_CACHE_TTL
+       seconds to bound staleness from other processes.
+
+The cache is only trusted to reject: a cached overlap fails fast, but
+ensure_no_conflict confirms "free" with the range query, since another
+process may have filled the slot since the entry was loaded.
+
+Racing confirms for the same caregiver are serialized with a
+per-caregiver lock (see caregiver_lock); confirms for different
+caregivers never wait on each other.  Caregiver-side claims
+(shared.workflow.claim_transition) carry the overlap check inside
+their UPDATE instead (see claim_would_overlap).
+"""
+
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Set, Tuple
+
+from fastapi import HTTPException, status
+from sqlalchemy import event, exists, func
+from sqlalchemy.orm import Session, aliased, attributes
+
+from .config import Config
+from .models import Booking
+
+
+# Statuses that hold a caregiver's time
+BLOCKING_STATUSES = ("confirmed", "accepted", "in_progress", "paused")
+
+# Caregiver ids that never conflict (0 = broadcast placeholder)
+NON_BLOCKING_CAREGIVERS = (0,)
+
+CONFLICT_CACHE_DAYS = 14
+CONFLICT_CACHE_TTL = 60.0
+
+
+def max_booking_duration() -> timedelta:
+    return timedelta(hours=Config.MAX_BOOKING_HOURS)
+
+
+def _naive_utc(value: datetime) -> datetime:
+    """Bookings are stored as naive UTC; normalise aware inputs to match."""
+    if value.tzinfo is not None:
+        value = value.astimezone(timezone.utc).replace(tzinfo=None)
+    return value
+
+
+def overlapping_bookings(db: Session, caregiver_ids, start: datetime, end: datetime):
+    """
+    Query blocking bookings of *caregiver_ids* that overlap [start, end).
+
+    The start_time lower bound keeps the idx_caregiver_time scan bounded.
+    """
+    return db.query(Booking).filter(
+        Booking.caregiver_id.in_(list(caregiver_ids)),
+        Booking.start_time >= start - max_booking_duration(),
+        Booking.start_time < end,
+        Booking.end_time > start,
+        Booking.status.in_(BLOCKING_STATUSES),
+    )
+
+
+def claim_would_overlap(caregiver_id: int):
+    """
+    EXISTS clause for an UPDATE on bookings: does *caregiver_id* already
+    hold a blocking booking overlapping the row being updated?
+
+    Correlated on the updated row, so the check and the write are one
+    statement.  The lower start_time bound mirrors overlapping_bookings.
+    """
+    other = aliased(Booking)
+    return exists().where(
+        other.caregiver_id == caregiver_id,
+        other.id != Booking.id,
+        other.start_time >= func.datetime(Booking.start_time, f"-{Config.MAX_BOOKING_HOURS} hours"),
+        other.start_time < Booking.end_time,
+        other.end_time > Booking.start_time,
+        other.status.in_(BLOCKING_STATUSES),
+    )
+
+
+class _Intervals:
+    """Sorted blocking intervals of one caregiver within a horizon."""
+
+    __slots__ = ("lo", "hi", "starts", "max_end", "max_id", "expires")
+
+    def __init__(self, lo: datetime, hi: datetime, rows: List[Tuple[datetime, datetime, int]]):
+        self.lo = lo
+        self.hi = hi
+        rows = sorted(rows)
+        self.starts = [start for start, _, _ in rows]
+        self.max_end: List[datetime] = []
+        self.max_id: List[int] = []
+        for start, end, booking_id in rows:
+            if not self.max_end or end > self.max_end[-1]:
+                self.max_end.append(end)
+                self.max_id.append(booking_id)
+            else:
+                self.max_end.append(self.max_end[-1])
+                self.max_id.append(self.max_id[-1])
+        self.expires = time.monotonic() + CONFLICT_CACHE_TTL
+
+    def covers(self, start: datetime, end: datetime) -> bool:
+        return self.lo <= start and end <= self.hi and time.monotonic() < self.expires
+
+    def find(self, start: datetime, end: datetime) -> Optional[int]:
+        i = bisect_left(self.starts, end)
+        if i and self.max_end[i - 1] > start:
+            return self.max_id[i - 1]
+        return None
+
+
+class ConflictCache:
+    """Per-caregiver interval cache with per-caregiver locks."""
+
+    def __init__(self):
+        self._entries: Dict[int, _Intervals] = {}
+        self._locks: Dict[int, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+
+    def lock_for(self, caregiver_id: int) -> threading.Lock:
+        lock = self._locks.get(caregiver_id)
+        if lock is None:
+            with self._registry_lock:
+                lock = self._locks.setdefault(caregiver_id, threading.Lock())
+        return lock
+
+    def invalidate(self, caregiver_ids) -> None:
+        for caregiver_id in caregiver_ids:
+            self._entries.pop(caregiver_id, None)
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+    def _load(self, db: Session, caregiver_id: int) -> _Intervals:
+        now = datetime.utcnow()
+        lo = now - timedelta(days=1)
+        hi = now + timedelta(days=CONFLICT_CACHE_DAYS)
+        rows = (
+            overlapping_bookings(db, [caregiver_id], lo, hi)
+            .with_entities(Booking.start_time, Booking.end_time, Booking.id)
+            .all()
+        )
+        entry = _Intervals(lo, hi, [tuple(row) for row in rows])
+        self._entries[caregiver_id] = entry
+        return entry
+
+    def find_conflict(
+        self,
+        db: Session,
+        caregiver_id: int,
+        start: datetime,
+        end: datetime,
+        exclude_booking_id: Optional[int] = None,
+        verify: bool = False,
+    ) -> Optional[int]:
+        """
+        Id of a blocking booking overlapping [start, end), or None.
+
+        Windows inside the cache horizon are answered from the interval
+        cache; anything else goes straight to the bounded range query.
+        With *verify*, a cached "free" is re-checked with the range query.
+        """
+        if caregiver_id in NON_BLOCKING_CAREGIVERS:
+            return None
+
+        entry = self._entries.get(caregiver_id)
+        if entry is None or not entry.covers(start, end):
+            now = datetime.utcnow()
+            in_horizon = start >= now and end <= now + timedelta(days=CONFLICT_CACHE_DAYS)
+            entry = self._load(db, caregiver_id) if in_horizon else None
+        if entry is not None:
+            found = entry.find(start, end)
+            if found is not None and found != exclude_booking_id:
+                return found
+            if found is None and not verify:
+                return None
+
+        query = overlapping_bookings(db, [caregiver_id], start, end)
+        if exclude_booking_id is not None:
+            query = query.filter(Booking.id != exclude_booking_id)
+        row = query.with_entities(Booking.id).first()
+        return row[0] if row else None
+
+
+# Global instance
+_cache = ConflictCache()
+
+
+@contextmanager
+def caregiver_lock(caregiver_id: int):
+    """Serialize conflict check + commit for one caregiver."""
+    lock = _cache.lock_for(caregiver_id)
+    with lock:
+        yield
+
+
+def find_conflict(db: Session, caregiver_id: int, start: datetime, end: datetime,
+                  exclude_booking_id: Optional[int] = None, verify: bool = False) -> Optional[int]:
+    """Id of a blocking booking of *caregiver_id* overlapping [start, end), or None."""
+    return _cache.find_conflict(db, caregiver_id, _naive_utc(start), _naive_utc(end),
+                                exclude_booking_id, verify)
+
+
+def ensure_no_conflict(db: Session, caregiver_id: int, start: datetime, end: datetime,
+                       exclude_booking_id: Optional[int] = None) -> None:
+    """
+    Raise HTTP 409 if the caregiver is already booked during [start, end).
+
+    Call it inside the writing transaction: "free" is confirmed against
+    the database, not taken from the cache.
+
+    Raises:
+        HTTPException 409 on overlap, 422 if the window is too long
+    """
+    if end - start > max_booking_duration():
+        raise HTTPException(
+            status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+            detail=f"Bookings cannot be longer than {Config.MAX_BOOKING_HOURS} hours",
+        )
+    conflict = find_conflict(db, caregiver_id, start, end, exclude_booking_id, verify=True)
+    if conflict is not None:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Caregiver {caregiver_id} is already booked at that time (booking {conflict})",
+        )
+
+
+def invalidate_caregivers(caregiver_ids) -> None:
+    _cache.invalidate(caregiver_ids)
+
+
+# ── Cache coherence ───────────────────────────────────────────────────
+
+@event.listens_for(Session, "after_flush")
+def _collect_booking_changes(session, flush_context):
+    """Remember caregivers whose bookings changed in this transaction."""
+    touched: Set[int] = session.info.setdefault("conflict_caregivers", set())
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Booking):
+            touched.add(obj.caregiver_id)
+            # A booking moved away from a caregiver frees their old slot
+            touched.update(attributes.get_history(obj, "caregiver_id").deleted or ())
+
+
+@event.listens_for(Session, "after_commit")
+def _invalidate_on_commit(session):
+    touched = session.info.pop("conflict_caregivers", None)
+    if touched:
+        _cache.invalidate(touched)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session):
+    session.info.pop("conflict_caregivers", None)
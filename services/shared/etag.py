@@ -0,0 +1,76 @@
+"""
+Conditional GET support (ETag / If-None-Match).
+
+ETags are built from change numbers (shared.changes), never from the
+response body, so a poll that has nothing new is answered with
+``304 Not Modified`` after one small version query — the entity is not
+loaded or serialized.
+
+Versions:
+    * A single row: its change_seq.
+    * A collection: (max change_seq, row count) over the rows matching
+      the endpoint's filter, read from an (owner, change_seq) index.
+      Any write to a member raises the max, a row joining the set has
+      just been written and raises it too, and a row leaving the set
+      lowers the count — so the pair changes whenever the set does.
+
+Tags are weak (W/"…"): they identify the data version, not a byte-exact
+body.  Responses carry ``Cache-Control: no-cache`` so browsers keep the
+body and revalidate with If-None-Match on every poll, which fetch()
+does on its own.
+"""
+
+from typing import Optional, Tuple
+
+from fastapi import Request, Response
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+
+def make_etag(*parts) -> str:
+    """Weak ETag from version parts, e.g. make_etag("booking", 7, 1234)."""
+    return 'W/"' + "-".join("0" if part is None else str(part) for part in parts) + '"'
+
+
+def etag_matches(if_none_match: Optional[str], etag: str) -> bool:
+    """Weak comparison of *etag* against an If-None-Match header value."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    opaque = etag[2:] if etag.startswith("W/") else etag
+    for candidate in if_none_match.split(","):
+        candidate = candidate.strip()
+        if candidate.startswith("W/"):
+            candidate = candidate[2:]
+        if candidate == opaque:
+            return True
+    return False
+
+
+def collection_version(db: Session, model, *conditions) -> Tuple[Optional[int], int]:
+    """(max change_seq, count) of *model* rows matching *conditions*."""
+    max_seq, count = db.query(func.max(model.change_seq), func.count()).select_from(model).filter(
+        *conditions
+    ).one()
+    return max_seq, count
+
+
+def check_etag(request: Request, response: Response, etag: str) -> Optional[Response]:
+    """
+    Answer a conditional GET.
+
+    Args:
+        request: Incoming request (If-None-Match is read from it)
+        response: The endpoint's response (ETag is set on it)
+        etag: Current ETag of the resource
+
+    Returns:
+        A 304 response if the client's copy is current, else None after
+        tagging *response*; the endpoint then builds its body as usual
+    """
+    headers = {"ETag": etag, "Cache-Control": "no-cache"}
+    if etag_matches(request.headers.get("if-none-match"), etag):
+        return Response(status_code=304, headers=headers)
+    response.headers.update(headers)
+    return None
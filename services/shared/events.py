@@ -0,0 +1,152 @@
+"""
+In-process booking change notifications.
+
+Committed booking changes reach this hub from the outbox dispatcher
+(shared.outbox, consumer "<service>:sse"), whichever service made the
+change.  The hub fans each event out to subscribers — typically one
+asyncio.Queue per open Server-Sent Events stream.  Idle streams wait
+on their queue and cost no queries.
+
+Publishing happens on the dispatcher thread, so events are handed to
+each subscriber's event loop with call_soon_threadsafe.
+"""
+
+import asyncio
+import json
+import threading
+from datetime import datetime
+from typing import Any, AsyncIterator, Callable, Dict, List, Optional
+
+
+# Per-subscriber buffer; a subscriber this far behind is disconnected
+SUBSCRIBER_QUEUE_SIZE = 256
+
+# Seconds between SSE keep-alive comments
+SSE_KEEPALIVE_SECONDS = 15.0
+
+
+def booking_snapshot(booking) -> Dict[str, Any]:
+    """The fields pushed to clients for a booking change."""
+    return {
+        "booking_id": booking.id,
+        "status": booking.status,
+        "caregiver_id": booking.caregiver_id,
+        "civilian_id": booking.civilian_id,
+        "start_time": booking.start_time.isoformat() if booking.start_time else None,
+        "end_time": booking.end_time.isoformat() if booking.end_time else None,
+        "payment_status": booking.payment_status,
+        "at": datetime.utcnow().isoformat(),
+    }
+
+
+class Subscription:
+    """One subscriber's queue plus the filter deciding what it receives."""
+
+    def __init__(self, hub: "EventHub", accepts: Callable[[Dict[str, Any]], bool]):
+        self._hub = hub
+        self.accepts = accepts
+        self.loop = asyncio.get_running_loop()
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=SUBSCRIBER_QUEUE_SIZE)
+        self.overflowed = False
+
+    def _deliver(self, evt: Dict[str, Any]) -> None:
+        try:
+            self.queue.put_nowait(evt)
+        except asyncio.QueueFull:
+            self.overflowed = True
+
+    def close(self) -> None:
+        self._hub.unsubscribe(self)
+
+
+class EventHub:
+    """Thread-safe fan-out of booking events to asyncio subscribers."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers: List[Subscription] = []
+        self.published = 0
+
+    def subscribe(self, accepts: Callable[[Dict[str, Any]], bool]) -> Subscription:
+        """Register a subscriber (must be called from inside an event loop)."""
+        subscription = Subscription(self, accepts)
+        with self._lock:
+            self._subscribers.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        with self._lock:
+            if subscription in self._subscribers:
+                self._subscribers.remove(subscription)
+
+    def publish(self, evt: Dict[str, Any]) -> None:
+        """Deliver an event to every matching subscriber (any thread)."""
+        with self._lock:
+            subscribers = list(self._subscribers)
+            self.published += 1
+        for subscription in subscribers:
+            if not subscription.accepts(evt):
+                continue
+            try:
+                subscription.loop.call_soon_threadsafe(subscription._deliver, evt)
+            except RuntimeError:
+                # Loop already closed; the stream is gone
+                self.unsubscribe(subscription)
+
+    @property
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return len(self._subscribers)
+
+
+# Global instance
+hub = EventHub()
+
+
+def publish(evt: Dict[str, Any]) -> None:
+    """Push a booking event to local subscribers (any thread)."""
+    hub.publish(evt)
+
+
+async def sse_stream(
+    accepts: Callable[[Dict[str, Any]], bool],
+    initial: Optional[List[Dict[str, Any]]] = None,
+    is_disconnected: Optional[Callable[[], Any]] = None,
+    view: Optional[Callable[[Dict[str, Any]], Dict[str, Any]]] = None,
+) -> AsyncIterator[str]:
+    """
+    Server-Sent Events body for booking changes matching *accepts*.
+
+    Args:
+        accepts: Filter deciding which events this client receives
+        initial: Events to send first (current state on connect)
+        is_disconnected: Awaitable callable, e.g. request.is_disconnected
+        view: Trims an accepted event to what this client may see
+
+    Yields:
+        SSE frames ("event: booking" + JSON data), with keep-alive
+        comments while idle
+    """
+    subscription = hub.subscribe(accepts)
+    try:
+        for evt in initial or []:
+            yield _frame(evt)
+        while True:
+            try:
+                evt = await asyncio.wait_for(subscription.queue.get(), timeout=SSE_KEEPALIVE_SECONDS)
+            except asyncio.TimeoutError:
+                if is_disconnected is not None and await is_disconnected():
+                    break
+                yield ": keep-alive\n\n"
+                continue
+            yield _frame(view(evt) if view is not None else evt)
+            if subscription.overflowed:
+                # Client too slow; make it reconnect and resync
+                break
+    finally:
+        subscription.close()
+
+
+def _frame(evt: Dict[str, Any]) -> str:
+    event_id = f"id: {evt['event_id']}\n" if "event_id" in evt else ""
+    return f"event: booking\n{event_id}data: {json.dumps(evt)}\n\n"
@@ -0,0 +1,284 @@
+"""
+Geospatial helpers for caregiver location.
+
+Caregivers store their home coordinates together with a geohash of
+them.  Geohashes of nearby points share a prefix, so "caregivers within
+r km" becomes a handful of indexed range scans on the geohash column:
+
+    1. pick the longest prefix whose cell is at least r km on each side
+    2. take the cells covering the r km box around the point (≤ 9)
+    3. WHERE geohash >= 'tdr1' AND geohash < 'tdr1{'  OR ...
+
+The range form is used instead of LIKE 'tdr1%' because SQLite only uses
+an index for LIKE under case-insensitive collation.  The cells can be
+far larger than the radius, so the query also keeps only homes inside
+the radius box (within_box), orders them by an approximate distance
+and stops at Config.GEO_SCAN_LIMIT rows.  Those candidates are then
+filtered and ordered by exact great-circle distance, computed for the
+whole set at once with numpy.
+"""
+
+import math
+from typing import Iterable, List, Optional, Sequence, Tuple
+
+import numpy as np
+from sqlalchemy import and_, or_
+
+
+GEOHASH_ALPHABET = "0123456789bcdefghjkmnpqrstuvwxyz"
+
+# Stored precision (~4.8 m × 4.8 m cells)
+GEOHASH_PRECISION = 9
+
+# Sorts after every geohash character, closing a prefix range
+_PREFIX_END = "{"
+
+EARTH_RADIUS_KM = 6371.0088
+KM_PER_DEGREE = math.pi * EARTH_RADIUS_KM / 180.0
+
+
+def encode_geohash(lat: float, lng: float, precision: int = GEOHASH_PRECISION) -> str:
+    """
+    Encode a coordinate as a geohash string.
+
+    Args:
+        lat: Latitude in degrees
+        lng: Longitude in degrees
+        precision: Number of characters
+
+    Returns:
+        Geohash of the cell containing the point
+    """
+    lat_lo, lat_hi = -90.0, 90.0
+    lng_lo, lng_hi = -180.0, 180.0
+    chars = []
+    bits = 0
+    n_bits = 0
+    even = True  # even bits refine longitude
+
+    while len(chars) < precision:
+        if even:
+            mid = (lng_lo + lng_hi) / 2
+            if lng >= mid:
+                bits = (bits << 1) | 1
+                lng_lo = mid
+            else:
+                bits <<= 1
+                lng_hi = mid
+        else:
+            mid = (lat_lo + lat_hi) / 2
+            if lat >= mid:
+                bits = (bits << 1) | 1
+                lat_lo = mid
+            else:
+                bits <<= 1
+                lat_hi = mid
+        even = not even
+        n_bits += 1
+        if n_bits == 5:
+            chars.append(GEOHASH_ALPHABET[bits])
+            bits = 0
+            n_bits = 0
+
+    return "".join(chars)
+
+
+def cell_size_degrees(precision: int) -> Tuple[float, float]:
+    """Return (lat_degrees, lng_degrees) spanned by a geohash cell."""
+    total_bits = 5 * precision
+    lng_bits = (total_bits + 1) // 2
+    lat_bits = total_bits // 2
+    return 180.0 / (2 ** lat_bits), 360.0 / (2 ** lng_bits)
+
+
+def precision_for_radius(radius_km: float, lat: float = 0.0) -> int:
+    """
+    Longest geohash precision whose cells are at least *radius_km* wide.
+
+    With cells that large, the 3×3 block around the point's cell covers
+    the whole search circle.
+    """
+    cos_lat = max(math.cos(math.radians(lat)), 0.01)
+    for precision in range(GEOHASH_PRECISION, 0, -1):
+        lat_deg, lng_deg = cell_size_degrees(precision)
+        if lat_deg * KM_PER_DEGREE >= radius_km and lng_deg * KM_PER_DEGREE * cos_lat >= radius_km:
+            return precision
+    return 1
+
+
+def covering_prefixes(lat: float, lng: float, radius_km: float) -> List[str]:
+    """
+    Geohash prefixes whose cells cover the *radius_km* box around a point.
+
+    Returns:
+        Up to nine distinct prefixes (fewer near cell-aligned edges)
+    """
+    precision = precision_for_radius(radius_km, lat)
+    lat_deg, lng_deg = cell_size_degrees(precision)
+    prefixes = set()
+    for d_lat in (-lat_deg, 0.0, lat_deg):
+        for d_lng in (-lng_deg, 0.0, lng_deg):
+            p_lat = min(max(lat + d_lat, -90.0), 90.0 - 1e-9)
+            p_lng = (lng + d_lng + 180.0) % 360.0 - 180.0
+            prefixes.add(encode_geohash(p_lat, p_lng, precision))
+    return sorted(prefixes)
+
+
+def within_cells(column, lat: float, lng: float, radius_km: float):
+    """
+    SQL filter selecting rows whose geohash lies near a point.
+
+    Args:
+        column: Geohash column (e.g. Caregiver.geohash)
+        lat: Latitude in degrees
+        lng: Longitude in degrees
+        radius_km: Search radius
+
+    Returns:
+        An OR of prefix range conditions, each answered by the index
+    """
+    return or_(*[
+        and_(column >= prefix, column < prefix + _PREFIX_END)
+        for prefix in covering_prefixes(lat, lng, radius_km)
+    ])
+
+
+def within_box(lat_column, lng_column, lat: float, lng: float, radius_km: float):
+    """
+    SQL filter selecting coordinates inside the *radius_km* box around a point.
+
+    Returns:
+        Latitude and longitude range conditions (the longitude range is
+        split in two where the box crosses the antimeridian)
+    """
+    d_lat = radius_km / KM_PER_DEGREE
+    cos_lat = math.cos(math.radians(lat))
+    conditions = [lat_column.between(lat - d_lat, lat + d_lat)]
+    if cos_lat > 1e-9 and radius_km / (KM_PER_DEGREE * cos_lat) < 180.0:
+        d_lng = radius_km / (KM_PER_DEGREE * cos_lat)
+        low, high = lng - d_lng, lng + d_lng
+        if low < -180.0:
+            conditions.append(or_(lng_column >= low + 360.0, lng_column <= high))
+        elif high > 180.0:
+            conditions.append(or_(lng_column >= low, lng_column <= high - 360.0))
+        else:
+            conditions.append(lng_column.between(low, high))
+    return and_(*conditions)
+
+
+def approx_distance_sq(lat_column, lng_column, lat: float, lng: float):
+    """
+    SQL expression ordering rows by distance from a point.
+
+    Equirectangular squared distance in degrees²: cheap arithmetic the
+    database can sort by, and the same order as the great-circle
+    distance at city scale.
+    """
+    cos_sq = math.cos(math.radians(lat)) ** 2
+    d_lat = lat_column - lat
+    d_lng = lng_column - lng
+    return d_lat * d_lat + d_lng * d_lng * cos_sq
+
+
+def haversine_km(lat: float, lng: float, lats: Sequence[float], lngs: Sequence[float]) -> np.ndarray:
+    """
+    Great-circle distance from one point to many, vectorized.
+
+    Args:
+        lat: Origin latitude in degrees
+        lng: Origin longitude in degrees
+        lats: Target latitudes in degrees
+        lngs: Target longitudes in degrees
+
+    Returns:
+        float64 array of distances in km
+    """
+    lat1 = math.radians(lat)
+    lat2 = np.radians(np.asarray(lats, dtype=np.float64))
+    d_lat = lat2 - lat1
+    d_lng = np.radians(np.asarray(lngs, dtype=np.float64) - lng)
+    a = np.sin(d_lat / 2) ** 2 + math.cos(lat1) * np.cos(lat2) * np.sin(d_lng / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * np.arcsin(np.sqrt(np.clip(a, 0.0, 1.0)))
+
+
+def distance_scores(distances_km: np.ndarray, radius_km: float) -> np.ndarray:
+    """
+    Map distances to the model's distance_score (1 = on the spot, 0 = at
+    or beyond the radius).  NaN distances (unknown location) score 0.5.
+    """
+    scores = 1.0 - np.asarray(distances_km, dtype=np.float64) / radius_km
+    scores = np.clip(scores, 0.0, 1.0)
+    return np.where(np.isnan(scores), 0.5, scores)
+
+
+def caregiver_distances(lat: float, lng: float, caregivers: Iterable) -> np.ndarray:
+    """
+    Distances (km) from a point to each caregiver's home.
+
+    Caregivers without a home location get NaN.
+    """
+    caregivers = list(caregivers)
+    lats = [cg.home_lat if cg.home_lat is not None else np.nan for cg in caregivers]
+    lngs = [cg.home_lng if cg.home_lng is not None else np.nan for cg in caregivers]
+    return haversine_km(lat, lng, lats, lngs)
+
+
+def nearest(
+    lat: float,
+    lng: float,
+    caregivers: Iterable,
+    radius_km: float,
+    k: Optional[int] = None,
+) -> List[Tuple[object, float]]:
+    """
+    Keep caregivers within reach of a point, nearest first.
+
+    A caregiver is within reach if they are inside *radius_km* and the
+    point is inside their own service radius (when they have set one).
+
+    Args:
+        lat: Latitude in degrees
+        lng: Longitude in degrees
+        caregivers: Candidates, typically pre-filtered with within_cells
+        radius_km: Search radius
+        k: Maximum number to return
+
+    Returns:
+        List of (caregiver, distance_km)
+    """
+    caregivers = list(caregivers)
+    if not caregivers:
+        return []
+
+    distances = caregiver_distances(lat, lng, caregivers)
+    service = np.array(
+        [cg.service_radius_km if cg.service_radius_km is not None else np.inf for cg in caregivers],
+        dtype=np.float64,
+    )
+    mask = (distances <= radius_km) & (distances <= service)
+    order = np.flatnonzero(mask)
+    order = order[np.argsort(distances[order], kind="stable")]
+    if k is not None:
+        order = order[:k]
+    return [(caregivers[i], float(distances[i])) for i in order]
+
+
+def parse_location(location: Optional[str]) -> Optional[Tuple[float, float]]:
+    """
+    Parse a "lat,lng" location string.
+
+    Returns:
+        (lat, lng), or None for free-text addresses and invalid values
+    """
+    if not location:
+        return None
+    parts = location.split(",")
+    if len(parts) != 2:
+        return None
+    try:
+        lat, lng = float(parts[0]), float(parts[1])
+    except ValueError:
+        return None
+    if not (-90.0 <= lat <= 90.0 and -180.0 <= lng <= 180.0):
+        return None
+    return lat, lng
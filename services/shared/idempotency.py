@@ -0,0 +1,381 @@
+"""
+Idempotency-Key support for non-idempotent POSTs.
+
+Mobile clients on flaky networks retry requests whose response they
+never received.  A client that sends an ``Idempotency-Key`` header gets
+the first response back on every retry with the same key; the handler
+runs once.
+
+    idem: IdempotentRequest = Depends(idempotency_key())
+    return idem.run(db, user["identity_id"], lambda: _submit_rating(...))
+
+Protocol, per (identity, route, key):
+    1. Look the key up in the in-memory front cache, then in the
+       idempotency_keys table.  A completed record whose fingerprint
+       (method, path and canonical JSON body) matches is replayed as
+       stored, with an ``Idempotent-Replayed: true`` header.  A
+       different request under the same key is rejected with 422.
+    2. Otherwise claim the key by inserting its row (committed before
+       the handler runs, so other processes see it).  A concurrent
+       duplicate finds the unfinished claim and gets 409; claims older
+       than IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS (a crashed request) and
+       expired records are taken over with a compare-and-set.
+    3. Run the handler and store its serialized response on the row
+       in the handler's own transaction: the handler's unit_of_work
+       blocks flush instead of committing (held_commit) and the store
+       commits once, so the writes and the stored response land
+       together or not at all.  Handlers must therefore write through
+       unit_of_work rather than calling commit themselves.  If anything
+       raises (including HTTPException) the claim is released, so
+       errors are not replayed and the client may retry.
+
+Records expire after IDEMPOTENCY_TTL_SECONDS; the purger thread deletes
+expired rows using the expires_at index.  Requests without the header
+run unchanged.
+"""
+
+import hashlib
+import json
+import threading
+from collections import OrderedDict
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from fastapi import Header, HTTPException, Request, status
+from fastapi.encoders import jsonable_encoder
+from fastapi.responses import JSONResponse
+from sqlalchemy import delete, select, update
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .config import Config
+from .database import SessionLocal
+from .models import IdempotencyRecord
+from .unit_of_work import held_commit
+
+# Longest Idempotency-Key accepted from clients
+MAX_KEY_LENGTH = 255
+
+# Header set on replayed responses
+REPLAY_HEADER = "Idempotent-Replayed"
+
+# Rows deleted per purge transaction
+_PURGE_BATCH = 1000
+
+
+def request_fingerprint(method: str, path: str, body: bytes) -> str:
+    """SHA-256 of the request; JSON bodies are canonicalized first."""
+    try:
+        body = json.dumps(json.loads(body), sort_keys=True, separators=(",", ":")).encode()
+    except ValueError:
+        pass
+    return hashlib.sha256(method.encode() + b" " + path.encode() + b"\n" + body).hexdigest()
+
+
+class IdempotencyStore:
+    """
+    Stored responses keyed by idempotency key, with an LRU front cache.
+
+    Args:
+        ttl_seconds: How long a response is replayed
+        cache_size: Completed responses kept in memory
+        claim_timeout_seconds: Age after which an unfinished claim is stale
+    """
+
+    def __init__(self, ttl_seconds: Optional[int] = None, cache_size: Optional[int] = None,
+                 claim_timeout_seconds: Optional[int] = None):
+        self.ttl = timedelta(seconds=ttl_seconds or Config.IDEMPOTENCY_TTL_SECONDS)
+        self.cache_size = cache_size or Config.IDEMPOTENCY_CACHE_SIZE
+        self.claim_timeout = timedelta(
+            seconds=claim_timeout_seconds or Config.IDEMPOTENCY_CLAIM_TIMEOUT_SECONDS
+        )
+        # key -> (fingerprint, status_code, body, expires_at)
+        self._cache: "OrderedDict[str, Tuple[str, int, str, datetime]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.executions = 0
+        self.cache_hits = 0
+        self.db_hits = 0
+        self.in_progress = 0
+        self.mismatches = 0
+
+    # ── Front cache ───────────────────────────────────────────────────
+
+    def _cached(self, key: str, now: datetime):
+        with self._lock:
+            entry = self._cache.get(key)
+            if entry is None:
+                return None
+            if entry[3] <= now:
+                del self._cache[key]
+                return None
+            self._cache.move_to_end(key)
+            return entry
+
+    def _remember(self, key: str, entry: Tuple[str, int, str, datetime]) -> None:
+        with self._lock:
+            self._cache[key] = entry
+            self._cache.move_to_end(key)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    # ── Protocol ──────────────────────────────────────────────────────
+
+    def _replay(self, entry, fingerprint: str) -> JSONResponse:
+        stored_fingerprint, status_code, body, _ = entry
+        if stored_fingerprint != fingerprint:
+            with self._lock:
+                self.mismatches += 1
+            raise HTTPException(
+                status_code=status.HTTP_422_UNPROCESSABLE_ENTITY,
+                detail="Idempotency-Key was already used for a different request",
+            )
+        return JSONResponse(content=json.loads(body), status_code=status_code,
+                            headers={REPLAY_HEADER: "true"})
+
+    def _claim(self, db: Session, key: str, fingerprint: str, now: datetime):
+        """
+        Claim *key* for this request.
+
+        Returns:
+            (created_at of our claim, None) once claimed, or
+            (None, stored entry) if a completed response exists
+        """
+        record = db.get(IdempotencyRecord, key)
+        if record is None:
+            db.add(IdempotencyRecord(key=key, fingerprint=fingerprint, created_at=now,
+                                     expires_at=now + self.ttl))
+            try:
+                db.commit()
+                return now, None
+            except IntegrityError:
+                # A concurrent duplicate claimed it first
+                db.rollback()
+                record = db.get(IdempotencyRecord, key)
+                if record is None:
+                    raise
+
+        expired = record.expires_at <= now
+        if record.status_code is not None and not expired:
+            return None, (record.fingerprint, record.status_code, record.response_body, record.expires_at)
+        if not expired and record.created_at > now - self.claim_timeout:
+            with self._lock:
+                self.in_progress += 1
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail="A request with this Idempotency-Key is still being processed",
+                headers={"Retry-After": "1"},
+            )
+
+        # Expired record or stale claim: take it over unless someone else just did
+        taken = db.execute(
+            update(IdempotencyRecord)
+            .where(IdempotencyRecord.key == key, IdempotencyRecord.created_at == record.created_at)
+            .values(fingerprint=fingerprint, status_code=None, response_body=None,
+                    created_at=now, expires_at=now + self.ttl)
+        ).rowcount
+        db.commit()
+        if not taken:
+            db.expire_all()
+            return self._claim(db, key, fingerprint, now)
+        return now, None
+
+    def _release(self, db: Session, key: str, claimed_at: datetime) -> None:
+        try:
+            db.rollback()
+            db.execute(
+                delete(IdempotencyRecord)
+                .where(IdempotencyRecord.key == key, IdempotencyRecord.created_at == claimed_at)
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            print(f"Releasing idempotency key {key} failed: {e}")
+
+    def run(self, db: Session, key: str, fingerprint: str, status_code: int,
+            handler: Callable[[], Any]) -> Any:
+        """
+        Run *handler* once per key; replay its response on retries.
+
+        Args:
+            db: Database session (the handler's own)
+            key: Scoped key, "<identity>:<route>:<client key>"
+            fingerprint: request_fingerprint of this request
+            status_code: Status the route answers with on success
+            handler: Produces the response (a pydantic model or plain data)
+
+        Returns:
+            The handler's result, or a JSONResponse replaying the stored one
+        """
+        now = datetime.utcnow()
+        with self._lock:
+            self.requests += 1
+        entry = self._cached(key, now)
+        if entry is not None:
+            with self._lock:
+                self.cache_hits += 1
+            return self._replay(entry, fingerprint)
+
+        claimed_at, entry = self._claim(db, key, fingerprint, now)
+        if entry is not None:
+            with self._lock:
+                self.db_hits += 1
+            self._remember(key, entry)
+            return self._replay(entry, fingerprint)
+
+        with self._lock:
+            self.executions += 1
+        try:
+            with held_commit(db):
+                result = handler()
+                body = json.dumps(jsonable_encoder(result))
+                db.execute(
+                    update(IdempotencyRecord)
+                    .where(IdempotencyRecord.key == key, IdempotencyRecord.created_at == claimed_at)
+                    .values(status_code=status_code, response_body=body)
+                )
+            db.commit()
+        except BaseException:
+            self._release(db, key, claimed_at)
+            raise
+        self._remember(key, (fingerprint, status_code, body, claimed_at + self.ttl))
+        return result
+
+    def forget(self) -> None:
+        """Drop the front cache (tests)."""
+        with self._lock:
+            self._cache.clear()
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "cache_hits": self.cache_hits,
+                "db_hits": self.db_hits,
+                "in_progress": self.in_progress,
+                "mismatches": self.mismatches,
+                "cached": len(self._cache),
+            }
+
+
+def purge_expired(db: Session, now: Optional[datetime] = None) -> int:
+    """
+    Delete expired idempotency records, _PURGE_BATCH per transaction.
+
+    Returns:
+        Number of rows deleted
+    """
+    now = now or datetime.utcnow()
+    purged = 0
+    while True:
+        keys = db.execute(
+            select(IdempotencyRecord.key)
+            .where(IdempotencyRecord.expires_at <= now)
+            .limit(_PURGE_BATCH)
+        ).scalars().all()
+        if not keys:
+            break
+        db.execute(delete(IdempotencyRecord).where(IdempotencyRecord.key.in_(keys)))
+        db.commit()
+        purged += len(keys)
+        if len(keys) < _PURGE_BATCH:
+            break
+    return purged
+
+
+# Global instance
+_store = IdempotencyStore()
+
+
+class IdempotentRequest:
+    """The current request's Idempotency-Key (if any) and fingerprint."""
+
+    def __init__(self, store: IdempotencyStore, route: str, key: Optional[str],
+                 fingerprint: str, status_code: int):
+        self.store = store
+        self.route = route
+        self.key = key
+        self.fingerprint = fingerprint
+        self.status_code = status_code
+
+    def run(self, db: Session, identity_id: int, handler: Callable[[], Any]) -> Any:
+        """Run *handler*, or replay its stored response for a retried key."""
+        if self.key is None:
+            return handler()
+        return self.store.run(db, f"{identity_id}:{self.route}:{self.key}", self.fingerprint,
+                              self.status_code, handler)
+
+
+def idempotency_key(store: Optional[IdempotencyStore] = None):
+    """
+    FastAPI dependency factory yielding an IdempotentRequest for the route.
+
+    Args:
+        store: Store to use (default: the global one)
+    """
+
+    async def _dependency(
+        request: Request,
+        idempotency_key: Optional[str] = Header(default=None),
+    ) -> IdempotentRequest:
+        if idempotency_key is not None and not 0 < len(idempotency_key) <= MAX_KEY_LENGTH:
+            raise HTTPException(
+                status_code=status.HTTP_400_BAD_REQUEST,
+                detail=f"Idempotency-Key must be 1-{MAX_KEY_LENGTH} characters",
+            )
+        route = request.scope.get("route")
+        path = getattr(route, "path", request.url.path)
+        fingerprint = request_fingerprint(request.method, request.url.path, await request.body())
+        return IdempotentRequest(
+            store or _store,
+            path,
+            idempotency_key,
+            fingerprint,
+            getattr(route, "status_code", None) or status.HTTP_200_OK,
+        )
+
+    return _dependency
+
+
+def idempotency_metrics() -> Dict[str, Any]:
+    return _store.metrics()
+
+
+# Background purger
+_purger: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def start_purger(interval: Optional[float] = None) -> None:
+    """Purge expired records now and then every *interval* seconds (call from lifespan)."""
+    global _purger
+    if _purger is not None and _purger.is_alive():
+        return
+    interval = interval or Config.IDEMPOTENCY_PURGE_INTERVAL_SECONDS
+    _stop.clear()
+
+    def _run():
+        while True:
+            db = SessionLocal()
+            try:
+                purge_expired(db)
+            except Exception as e:
+                db.rollback()
+                print(f"Idempotency purge failed: {e}")
+            finally:
+                db.close()
+            if _stop.wait(interval):
+                break
+
+    _purger = threading.Thread(target=_run, name="idempotency-purger", daemon=True)
+    _purger.start()
+
+
+def stop_purger() -> None:
+    """Stop the purger thread (call from lifespan)."""
+    global _purger
+    _stop.set()
+    if _purger is not None:
+        _purger.join(timeout=5)
+        _purger = None
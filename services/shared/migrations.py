@@ -0,0 +1,146 @@
+"""
+Lightweight schema migrations.
+
+``Base.metadata.create_all`` creates missing tables but never touches
+existing ones.  ``run_migrations`` wraps it, adds columns and indexes
+that were introduced after a table was first created, and then applies
+the idempotent steps create_all cannot do on its own, such as seeding
+and backfilling derived tables.  Every service calls it on startup, so each
+step must be safe to run repeatedly and from several processes.
+"""
+
+from sqlalchemy import func, inspect, text
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .changes import ensure_sequence
+from .workflow import BROADCAST_CAREGIVER_ID
+from .database import Base, engine
+from .models import AuthIdentity, Caregiver
+from .models.audit import ensure_partition_indexes, migrate_legacy_audit
+from .models.skill import CaregiverSkill, seed_skills, rebuild_skill_index
+from .trust_passport import backfill_passports
+
+
+def _add_missing_columns(bind) -> None:
+    """
+    ALTER existing tables to add columns and indexes new to the models.
+
+    New columns must be nullable or carry a scalar default, which is
+    what SQLite's ADD COLUMN supports.
+    """
+    inspector = inspect(bind)
+    existing_tables = set(inspector.get_table_names())
+    for table in Base.metadata.sorted_tables:
+        if table.name not in existing_tables:
+            continue
+        present = {column["name"] for column in inspector.get_columns(table.name)}
+        for column in table.columns:
+            if column.name in present:
+                continue
+            ddl = f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column.type.compile(bind.dialect)}"
+            default = column.default.arg if column.default is not None and column.default.is_scalar else None
+            if default is not None:
+                ddl += f" DEFAULT {int(default) if isinstance(default, bool) else repr(default)}"
+            if not column.nullable:
+                ddl += " NOT NULL"
+            with bind.begin() as connection:
+                connection.execute(text(ddl))
+            print(f"Migration: added {table.name}.{column.name}")
+        for index in table.indexes:
+            try:
+                index.create(bind, checkfirst=True)
+            except IntegrityError as e:
+                # A new unique index the existing rows violate; the app
+                # keeps working without it until the data is cleaned up
+                print(f"Migration: could not create {index.name}: {e.orig}")
+
+
+def _backfill_geohash(db: Session) -> None:
+    """Fill the geohash for caregivers whose coordinates were set directly."""
+    stale = db.query(Caregiver).filter(
+        Caregiver.home_lat.isnot(None),
+        Caregiver.home_lng.isnot(None),
+        Caregiver.geohash.is_(None),
+    ).all()
+    for caregiver in stale:
+        caregiver.set_home_location(caregiver.home_lat, caregiver.home_lng)
+    if stale:
+        db.commit()
+
+
+def _backfill_skill_index(db: Session) -> None:
+    """Populate caregiver_skills for caregivers created before it existed."""
+    has_index = db.query(func.count(CaregiverSkill.caregiver_id)).scalar()
+    has_caregivers = db.query(func.count(Caregiver.id)).filter(Caregiver._skills != "[]").scalar()
+    if has_caregivers and not has_index:
+        count = rebuild_skill_index(db)
+        print(f"Migration: indexed skills for {count} caregivers")
+
+
+def _seed_broadcast_caregiver(db: Session) -> None:
+    """
+    Guarantee the broadcast sentinel (caregiver 0 and its identity).
+
+    New care requests are assigned to caregiver 0 until someone claims
+    them; seeding it here keeps that check off the request path.
+    """
+    if db.get(AuthIdentity, BROADCAST_CAREGIVER_ID) is None:
+        db.add(AuthIdentity(
+            id=BROADCAST_CAREGIVER_ID,
+            phone_number="0000000000",
+            role="caregiver",
+            is_verified=True,
+        ))
+    if db.get(Caregiver, BROADCAST_CAREGIVER_ID) is None:
+        db.add(Caregiver(
+            id=BROADCAST_CAREGIVER_ID,
+            identity_id=BROADCAST_CAREGIVER_ID,
+            name="Broadcast",
+            hashed_identity="broadcast",
+            skills=[],
+            experience_years=0,
+            rating_average=5.0,
+            verified=True,
+        ))
+    if db.new:
+        try:
+            db.commit()
+        except IntegrityError:
+            # Another service seeded it at the same time
+            db.rollback()
+
+
+# Ordered data migrations, each taking a session
+MIGRATIONS = [
+    _seed_broadcast_caregiver,
+    seed_skills,
+    _backfill_skill_index,
+    _backfill_geohash,
+    ensure_sequence,
+    migrate_legacy_audit,
+    ensure_partition_indexes,
+    backfill_passports,
+]
+
+
+def run_migrations(bind=None) -> None:
+    """
+    Create missing tables and apply all data migrations.
+
+    Args:
+        bind: Engine to migrate (defaults to the shared engine)
+    """
+    bind = bind or engine
+    Base.metadata.create_all(bind=bind)
+    _add_missing_columns(bind)
+
+    db = Session(bind=bind)
+    try:
+        for migration in MIGRATIONS:
+            migration(db)
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
@@ -6,8 +6,16 @@ from .identity import AuthIdentity
 from .caregiver import Caregiver
 from .civilian import Civilian
 from .booking import Booking, BookingStatus
+from .booking_archive import BookingArchive
 from .rating import Rating, BlockchainStatus
 from .audit import AuditLog
+from .skill import Skill, CaregiverSkill
+from .availability import AvailabilityTemplate, AvailabilityOverride
+from .booking_event import BookingEvent, ConsumerOffset
+from .change_sequence import ChangeSequence
+from .idempotency import IdempotencyRecord
+from .scheduled_task import ScheduledTask
+from .trust_passport import TrustPassport
 
 __all__ = [
     "AuthIdentity",
@@ -15,7 +23,18 @@ __all__ = [
     "Civilian",
     "Booking",
     "BookingStatus",
+    "BookingArchive",
     "Rating",
     "BlockchainStatus",
     "AuditLog",
+    "Skill",
+    "CaregiverSkill",
+    "AvailabilityTemplate",
+    "AvailabilityOverride",
+    "BookingEvent",
+    "ConsumerOffset",
+    "ChangeSequence",
+    "IdempotencyRecord",
+    "ScheduledTask",
+    "TrustPassport",
 ]
@@ -1,12 +1,29 @@
 """
-Audit log model and helper.
+Audit log model and monthly partition router.
 
-Logs critical actions across all services for traceability.
+Logs critical actions across all services for traceability.  Rows are
+written through shared.audit.log_audit into one table per calendar
+month (audit_logs_YYYYMM), so inserts and recent-history queries only
+touch a small, recent table and whole months can be archived and
+dropped at once (shared.audit_archive).
+
+``audit_logs`` itself is the column template for the partitions and
+holds rows written before partitioning; migrate_legacy_audit moves them
+into their partitions.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, Text
+import re
+import threading
+import weakref
 from datetime import datetime
-from ..database import Base, SessionLocal
+from typing import Dict, List, Optional, Set
+
+from sqlalchemy import Column, Integer, String, DateTime, Text, Index, MetaData, Table, inspect, text
+from ..database import Base
+
+# Partition table names: audit_logs_YYYYMM
+PARTITION_PREFIX = "audit_logs_"
+_PARTITION_RE = re.compile(r"^audit_logs_(\d{6})$")
 
 
 class AuditLog(Base):
@@ -14,7 +31,7 @@ class AuditLog(Base):
     Immutable audit trail for platform actions.
 
     Attributes:
-        id:         Auto-incrementing PK
+        id:         Auto-incrementing PK (unique within a partition)
         user_id:    AuthIdentity id of the actor (0 for system)
         action:     Short verb (login, booking_created, rating_submitted, …)
         entity:     Table / resource name (booking, caregiver, …)
@@ -33,29 +50,110 @@ class AuditLog(Base):
     timestamp = Column(DateTime, nullable=False, default=datetime.utcnow)
 
 
-def log_audit(
-    user_id: int,
-    action: str,
-    entity: str,
-    entity_id: int = None,
-    detail: str = None,
-) -> None:
+# ── Partition router ─────────────────────────────────────────────────────
+
+# Partitions are Core tables on their own MetaData so create_all never
+# creates them; they appear on first write to their month
+_partition_metadata = MetaData()
+_partitions: Dict[str, Table] = {}
+_created: "weakref.WeakKeyDictionary[object, Set[str]]" = weakref.WeakKeyDictionary()
+_lock = threading.Lock()
+
+
+def month_key(ts: datetime) -> str:
+    """Partition key (YYYYMM) of a timestamp."""
+    return ts.strftime("%Y%m")
+
+
+def partition_table(month: str) -> Table:
+    """Table object for the partition of *month* (YYYYMM)."""
+    table = _partitions.get(month)
+    if table is None:
+        with _lock:
+            table = _partitions.get(month)
+            if table is None:
+                name = PARTITION_PREFIX + month
+                table = Table(
+                    name,
+                    _partition_metadata,
+                    *[column._copy() for column in AuditLog.__table__.columns],
+                    Index(f"ix_{name}_timestamp", "timestamp"),
+                    # "everything user X did" / "all events for booking Y";
+                    # ties on timestamp are ordered by the rowid (id)
+                    Index(f"ix_{name}_user_ts", "user_id", "timestamp"),
+                    Index(f"ix_{name}_entity_ts", "entity", "entity_id", "timestamp"),
+                )
+                _partitions[month] = table
+    return table
+
+
+def ensure_partition(bind, month: str) -> Table:
     """
-    Write an audit row.  Safe to call from anywhere — opens and
-    closes its own session so it never interferes with the caller's
-    transaction.
+    Create the partition of *month* if it does not exist yet.
+
+    Args:
+        bind: Engine to create it on (not a connection inside a
+              transaction — the DDL is committed on its own)
+        month: YYYYMM
+
+    Returns:
+        The partition table
     """
-    db = SessionLocal()
-    try:
-        db.add(AuditLog(
-            user_id=user_id,
-            action=action,
-            entity=entity,
-            entity_id=entity_id,
-            detail=detail,
+    table = partition_table(month)
+    created = _created.setdefault(bind, set())
+    if month not in created:
+        table.create(bind, checkfirst=True)
+        for index in table.indexes:
+            index.create(bind, checkfirst=True)
+        created.add(month)
+    return table
+
+
+def forget_partition(bind, month: str) -> None:
+    """Drop *month* from the created-partition cache (after a DROP TABLE)."""
+    _created.get(bind, set()).discard(month)
+
+
+def list_partitions(bind) -> List[str]:
+    """Months (YYYYMM) that have a partition table, oldest first."""
+    names = inspect(bind).get_table_names()
+    return sorted(m.group(1) for m in map(_PARTITION_RE.match, names) if m)
+
+
+def partitions_between(bind, start: Optional[datetime], end: Optional[datetime]) -> List[str]:
+    """Existing partitions overlapping [start, end) (either bound optional)."""
+    low = month_key(start) if start is not None else None
+    high = month_key(end) if end is not None else None
+    return [
+        month for month in list_partitions(bind)
+        if (low is None or month >= low) and (high is None or month <= high)
+    ]
+
+
+def ensure_partition_indexes(db) -> None:
+    """Create indexes added since an existing partition was created."""
+    for month in list_partitions(db.get_bind()):
+        ensure_partition(db.get_bind(), month)
+
+
+def migrate_legacy_audit(db) -> None:
+    """Move rows from the unpartitioned audit_logs table into partitions."""
+    months = [
+        row[0] for row in db.execute(text(
+            "SELECT DISTINCT strftime('%Y%m', timestamp) FROM audit_logs"
         ))
-        db.commit()
-    except Exception:
-        db.rollback()
-    finally:
-        db.close()
+    ]
+    db.commit()
+    if not months:
+        return
+    # DDL first: it commits on its own connection
+    tables = {month: ensure_partition(db.get_bind(), month) for month in months}
+    columns = "user_id, action, entity, entity_id, detail, timestamp"
+    for month, table in tables.items():
+        db.execute(text(
+            f"INSERT INTO {table.name} ({columns}) SELECT {columns} FROM audit_logs "
+            f"WHERE strftime('%Y%m', timestamp) = :month ORDER BY id"
+        ), {"month": month})
+    db.execute(text("DELETE FROM audit_logs"))
+    db.commit()
+    print(f"Migration: moved legacy audit rows into {len(months)} monthly partitions")
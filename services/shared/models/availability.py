@@ -0,0 +1,64 @@
+"""
+Caregiver availability models.
+
+This module defines the tables behind the availability calendar.  Each
+row holds one day as a 96-bit slot bitmap (12 bytes, one bit per
+15-minute slot, slot 0 = 00:00-00:15, most significant bit first), see
+shared.availability for encoding and matching.
+
+Table Purpose:
+    availability_templates: Recurring weekly hours, one row per
+                            (caregiver, weekday).
+    availability_overrides: Replaces the template for a specific date
+                            (holidays, extra shifts).
+
+A caregiver without a weekly template has not set a calendar and is
+treated as available except where a date override says otherwise.
+"""
+
+from sqlalchemy import Column, Integer, Date, LargeBinary, ForeignKey
+from ..database import Base
+
+
+class AvailabilityTemplate(Base):
+    """
+    Weekly availability for one weekday.
+
+    Attributes:
+        caregiver_id (int): FK to caregivers (cascade on delete)
+        weekday (int): 0 = Monday … 6 = Sunday
+        slots (bytes): 12-byte slot bitmap
+    """
+
+    __tablename__ = "availability_templates"
+
+    caregiver_id = Column(
+        Integer, ForeignKey("caregivers.id", ondelete="CASCADE"), primary_key=True
+    )
+    weekday = Column(Integer, primary_key=True)
+    slots = Column(LargeBinary(12), nullable=False)
+
+    def __repr__(self):
+        return f"<AvailabilityTemplate(caregiver_id={self.caregiver_id}, weekday={self.weekday})>"
+
+
+class AvailabilityOverride(Base):
+    """
+    Availability for one specific date, replacing the weekly template.
+
+    Attributes:
+        caregiver_id (int): FK to caregivers (cascade on delete)
+        date (date): Calendar date
+        slots (bytes): 12-byte slot bitmap (all zero = day off)
+    """
+
+    __tablename__ = "availability_overrides"
+
+    caregiver_id = Column(
+        Integer, ForeignKey("caregivers.id", ondelete="CASCADE"), primary_key=True
+    )
+    date = Column(Date, primary_key=True)
+    slots = Column(LargeBinary(12), nullable=False)
+
+    def __repr__(self):
+        return f"<AvailabilityOverride(caregiver_id={self.caregiver_id}, date={self.date})>"
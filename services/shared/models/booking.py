@@ -9,7 +9,7 @@ Table Purpose:
     and relationships between caregivers and civilians.
 """
 
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Index
+from sqlalchemy import Boolean, Column, Integer, String, DateTime, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.orm import relationship
 from datetime import datetime
 import enum
@@ -36,6 +36,25 @@ class BookingStatus(str, enum.Enum):
     REJECTED = "rejected"
 
 
+# Final states: the booking no longer blocks the civilian from booking
+# again and becomes eligible for the archive (shared.booking_archive)
+TERMINAL_STATUSES = ("closed", "cancelled", "rejected")
+
+_ACTIVE = text("status NOT IN ({})".format(", ".join(f"'{s}'" for s in TERMINAL_STATUSES)))
+_REASSIGNED = text("reassigned = 1")
+
+
+def violates_active_civilian(error) -> bool:
+    """
+    True if an IntegrityError came from uq_booking_active_civilian.
+
+    SQLite names the columns of a failed unique index, PostgreSQL the
+    index itself.
+    """
+    message = str(getattr(error, "orig", error))
+    return "uq_booking_active_civilian" in message or "bookings.civilian_id" in message
+
+
 class Booking(Base):
     """
     Booking model representing care service appointments.
@@ -50,6 +69,9 @@ class Booking(Base):
         started_at (datetime): Actual job start timestamp
         ended_at (datetime): Actual job end timestamp
         payment_status (str): Payment state (unpaid/reserved/paid)
+        change_seq (int): Change number of the last write (shared.changes)
+        reassigned (bool): Has changed caregiver at least once (e.g. a
+            claimed broadcast offer)
     """
 
     __tablename__ = "bookings"
@@ -71,12 +93,27 @@ class Booking(Base):
     # Payment tracking
     payment_status = Column(String(20), nullable=False, default="unpaid")
 
+    # Position in the change feed; bumped on every write (feeds are read
+    # through the per-caregiver / per-civilian (…, change_seq) indexes)
+    change_seq = Column(Integer, nullable=True)
+
+    # Set once the booking changes caregiver, so caregiver feeds can tell
+    # the ones who no longer hold it to drop it (idx_booking_reassigned_seq)
+    reassigned = Column(Boolean, nullable=True)
+
     # Relationships
     caregiver = relationship("Caregiver", back_populates="bookings")
     civilian = relationship("Civilian", back_populates="bookings")
 
     __table_args__ = (
         Index('idx_caregiver_time', 'caregiver_id', 'start_time', 'end_time'),
+        Index('idx_booking_caregiver_seq', 'caregiver_id', 'change_seq'),
+        Index('idx_booking_civilian_seq', 'civilian_id', 'change_seq'),
+        Index('idx_booking_reassigned_seq', 'change_seq',
+              sqlite_where=_REASSIGNED, postgresql_where=_REASSIGNED),
+        # At most one non-terminal booking per civilian
+        Index('uq_booking_active_civilian', 'civilian_id', unique=True,
+              sqlite_where=_ACTIVE, postgresql_where=_ACTIVE),
         CheckConstraint('start_time < end_time', name='check_valid_time_range'),
     )
 
@@ -0,0 +1,61 @@
+"""
+Booking archive model.
+
+Table Purpose:
+    bookings_archive: Cold storage for bookings in a terminal state
+                      (closed / cancelled / rejected) older than
+                      BOOKING_ARCHIVE_AFTER_DAYS.  Rows keep their
+                      booking id and every column, so history reads can
+                      merge them with live bookings transparently.  The
+                      hot bookings table then holds mostly active rows.
+
+See shared.booking_archive for the mover and the merged reads.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime, Index
+from datetime import datetime
+from ..database import Base
+
+
+class BookingArchive(Base):
+    """
+    A terminal booking moved out of the bookings table.
+
+    Attributes:
+        id (int): Original booking id
+        caregiver_id (int): Caregiver (no FK; the archive is append-only)
+        civilian_id (int): Civilian
+        start_time (datetime): Scheduled start
+        end_time (datetime): Scheduled end
+        status (str): Final workflow state
+        started_at (datetime): Actual job start
+        ended_at (datetime): Actual job end
+        payment_status (str): Final payment state
+        change_seq (int): Change number of the booking's last write
+        archived_at (datetime): When the row was moved
+    """
+
+    __tablename__ = "bookings_archive"
+
+    id = Column(Integer, primary_key=True, autoincrement=False)
+    caregiver_id = Column(Integer, nullable=False)
+    civilian_id = Column(Integer, nullable=False)
+    start_time = Column(DateTime, nullable=False)
+    end_time = Column(DateTime, nullable=False)
+    status = Column(String(20), nullable=False)
+    started_at = Column(DateTime, nullable=True)
+    ended_at = Column(DateTime, nullable=True)
+    payment_status = Column(String(20), nullable=False)
+    change_seq = Column(Integer, nullable=True)
+    archived_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_booking_archive_caregiver_seq', 'caregiver_id', 'change_seq'),
+        Index('idx_booking_archive_civilian_seq', 'civilian_id', 'change_seq'),
+    )
+
+    def __repr__(self):
+        return (
+            f"<BookingArchive(id={self.id}, caregiver={self.caregiver_id}, "
+            f"civilian={self.civilian_id}, status={self.status})>"
+        )
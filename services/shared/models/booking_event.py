@@ -0,0 +1,75 @@
+"""
+Booking event outbox models.
+
+Table Purpose:
+    booking_events:   Append-only outbox.  One row per booking state
+                      change, inserted in the same transaction as the
+                      change itself, so an event exists if and only if
+                      the change committed.  Ids are monotonic and
+                      never reused (SQLite AUTOINCREMENT).
+    consumer_offsets: Highest booking_events id each named consumer has
+                      processed.
+
+See shared.outbox for how rows are written and dispatched.
+"""
+
+from sqlalchemy import Column, Integer, String, DateTime
+from datetime import datetime
+from ..database import Base
+
+
+class BookingEvent(Base):
+    """
+    Snapshot of a booking immediately after a committed change.
+
+    Attributes:
+        id (int): Monotonic event id (dispatch order)
+        booking_id (int): Changed booking (no FK; events outlive rows)
+        caregiver_id (int): Caregiver after the change (0 = broadcast)
+        civilian_id (int): Civilian who made the booking
+        status (str): Workflow state after the change
+        payment_status (str): Payment state after the change
+        start_time (datetime): Scheduled start
+        end_time (datetime): Scheduled end
+        kind (str): NULL for a state change; "reminder" for a reminder
+                    notice that carries the unchanged snapshot
+        created_at (datetime): When the change was recorded
+    """
+
+    __tablename__ = "booking_events"
+
+    id = Column(Integer, primary_key=True)
+    booking_id = Column(Integer, nullable=False, index=True)
+    caregiver_id = Column(Integer, nullable=False)
+    civilian_id = Column(Integer, nullable=False)
+    status = Column(String(20), nullable=False)
+    payment_status = Column(String(20), nullable=True)
+    start_time = Column(DateTime, nullable=True)
+    end_time = Column(DateTime, nullable=True)
+    kind = Column(String(20), nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = {"sqlite_autoincrement": True}
+
+    def __repr__(self):
+        return f"<BookingEvent(id={self.id}, booking={self.booking_id}, status={self.status})>"
+
+
+class ConsumerOffset(Base):
+    """
+    Delivery position of one outbox consumer.
+
+    Attributes:
+        consumer (str): Unique consumer name, e.g. "civilian-api:sse"
+        last_event_id (int): Highest event id fully processed
+        updated_at (datetime): Last time the offset moved
+    """
+
+    __tablename__ = "consumer_offsets"
+
+    consumer = Column(String(100), primary_key=True)
+    last_event_id = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<ConsumerOffset(consumer={self.consumer}, last_event_id={self.last_event_id})>"
@@ -11,10 +11,20 @@ Table Purpose:
     reputation tracking.
 """
 
-from sqlalchemy import Column, Integer, String, Float, Boolean, Text, ForeignKey
+from sqlalchemy import Column, Integer, String, Float, Boolean, Text, ForeignKey, DateTime
 from sqlalchemy.orm import relationship
 import json
 from ..database import Base
+from ..skills import vocabulary
+from ..geo import encode_geohash
+
+
+def decode_skills(raw) -> list:
+    """Decode the JSON skills column, treating bad data as no skills."""
+    try:
+        return json.loads(raw) if raw else []
+    except (json.JSONDecodeError, TypeError):
+        return []
 
 
 class Caregiver(Base):
@@ -35,6 +45,13 @@ class Caregiver(Base):
         rating_average (float): Average rating from all reviews (1.0-5.0)
         trust_score (float): Computed trust score from fraud detection engine
         verified (bool): Whether identity verification is complete
+        home_lat (float): Home latitude (nullable until the caregiver sets it)
+        home_lng (float): Home longitude
+        service_radius_km (float): How far from home they will travel
+        geohash (str): Geohash of the home location, for nearby queries
+        last_lat / last_lng / last_seen_at: Latest live position snapshot
+            (flushed periodically from shared.presence)
+        change_seq (int): Change number of the last profile write
     """
 
     __tablename__ = "caregivers"
@@ -56,6 +73,21 @@ class Caregiver(Base):
     trust_score = Column(Float, nullable=False, default=0.0)
     verified = Column(Boolean, nullable=False, default=False)
 
+    # Home / service area (geohash kept in sync by set_home_location)
+    home_lat = Column(Float, nullable=True)
+    home_lng = Column(Float, nullable=True)
+    service_radius_km = Column(Float, nullable=True)
+    geohash = Column(String(12), nullable=True, index=True)
+
+    # Live position snapshot (written in batches by shared.presence)
+    last_lat = Column(Float, nullable=True)
+    last_lng = Column(Float, nullable=True)
+    last_seen_at = Column(DateTime, nullable=True)
+
+    # Position in the change feed; bumped on every ORM write (the batched
+    # location snapshot above does not count as a profile change)
+    change_seq = Column(Integer, nullable=True)
+
     # Relationships
     identity = relationship("AuthIdentity", back_populates="caregiver_profile")
     bookings = relationship("Booking", back_populates="caregiver")
@@ -63,13 +95,20 @@ class Caregiver(Base):
 
     @property
     def skills(self):
-        """Get skills as a Python list."""
+        """
+        Get skills as a Python list.
+
+        The decoded list is cached against the raw column text, so
+        repeated access only pays for JSON decoding after a change.
+        """
         if isinstance(self._skills, list):
             return self._skills
-        try:
-            return json.loads(self._skills) if self._skills else []
-        except (json.JSONDecodeError, TypeError):
-            return []
+        raw = self._skills
+        cached = self.__dict__.get("_skills_cache")
+        if cached is None or cached[0] != raw:
+            cached = (raw, decode_skills(raw), None)
+            self.__dict__["_skills_cache"] = cached
+        return list(cached[1])
 
     @skills.setter
     def skills(self, value):
@@ -79,5 +118,25 @@ class Caregiver(Base):
         else:
             self._skills = value
 
+    @property
+    def skill_ids(self):
+        """Canonical skill ids from the shared vocabulary (cached)."""
+        skills = self.skills
+        if isinstance(self._skills, list):
+            return vocabulary.ids_for(skills)
+        raw, decoded, ids = self.__dict__["_skills_cache"]
+        if ids is None:
+            ids = vocabulary.ids_for(decoded)
+            self.__dict__["_skills_cache"] = (raw, decoded, ids)
+        return list(ids)
+
+    def set_home_location(self, lat, lng, service_radius_km=None):
+        """Set home coordinates (and optionally the service radius)."""
+        self.home_lat = lat
+        self.home_lng = lng
+        self.geohash = encode_geohash(lat, lng) if lat is not None and lng is not None else None
+        if service_radius_km is not None:
+            self.service_radius_km = service_radius_km
+
     def __repr__(self):
         return f"<Caregiver(id={self.id}, name='{self.name}', trust_score={self.trust_score})>"
@@ -0,0 +1,32 @@
+"""
+Change sequence model.
+
+Table Purpose:
+    change_sequences: Named counters handing out monotonic change
+                      numbers.  The "changes" counter stamps
+                      bookings.change_seq and caregivers.change_seq, so
+                      one cursor orders every change a client syncs.
+
+See shared.changes for allocation and the change feed.
+"""
+
+from sqlalchemy import Column, Integer, String
+from ..database import Base
+
+
+class ChangeSequence(Base):
+    """
+    One named monotonic counter.
+
+    Attributes:
+        name (str): Counter name
+        value (int): Last number handed out
+    """
+
+    __tablename__ = "change_sequences"
+
+    name = Column(String(50), primary_key=True)
+    value = Column(Integer, nullable=False, default=0)
+
+    def __repr__(self):
+        return f"<ChangeSequence(name={self.name}, value={self.value})>"
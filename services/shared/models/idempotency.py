@@ -0,0 +1,48 @@
+"""
+Idempotency record model.
+
+Table Purpose:
+    idempotency_keys: One row per Idempotency-Key a client sent to a
+                      non-idempotent POST.  The row is claimed before the
+                      handler runs and then holds the request fingerprint
+                      and the serialized response, so a retry with the
+                      same key is answered from it.  Rows expire after
+                      IDEMPOTENCY_TTL_SECONDS; expires_at is indexed for
+                      the purge.
+
+See shared.idempotency for the claim / replay protocol.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from ..database import Base
+
+
+class IdempotencyRecord(Base):
+    """
+    A request made with an Idempotency-Key.
+
+    Attributes:
+        key (str): "<identity>:<endpoint>:<client key>"
+        fingerprint (str): SHA-256 of method, path and canonical body
+        status_code (int): Response status; NULL while the request runs
+        response_body (str): Response JSON once completed
+        created_at (datetime): When the key was claimed
+        expires_at (datetime): When the record may be purged
+    """
+
+    __tablename__ = "idempotency_keys"
+
+    key = Column(String(400), primary_key=True)
+    fingerprint = Column(String(64), nullable=False)
+    status_code = Column(Integer, nullable=True)
+    response_body = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+    expires_at = Column(DateTime, nullable=False)
+
+    __table_args__ = (
+        Index('idx_idempotency_expires', 'expires_at'),
+    )
+
+    def __repr__(self):
+        return f"<IdempotencyRecord(key={self.key}, status={self.status_code})>"
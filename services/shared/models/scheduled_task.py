@@ -0,0 +1,59 @@
+"""
+Scheduled task model.
+
+Table Purpose:
+    scheduled_tasks: Delayed actions (auto-accept a booking, expire an
+                     unmatched request, send a reminder) that must run
+                     at due_at even if the process restarts in between.
+                     A worker claims due rows by setting claimed_until
+                     (a lease), runs them and deletes them in the same
+                     transaction as their effect.  Rows that keep
+                     failing stay behind with status "failed".
+
+See shared.scheduler for the worker.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, Index
+from datetime import datetime
+from ..database import Base
+
+
+class ScheduledTask(Base):
+    """
+    One delayed action.
+
+    Attributes:
+        id (int): Task id
+        key (str): Optional dedupe key, e.g. "booking.expire:42";
+                   scheduling an existing key moves that task
+        kind (str): Handler name, e.g. "booking.expire"
+        target_id (int): Entity the task acts on (a booking id)
+        payload (str): Optional JSON arguments
+        due_at (datetime): Earliest time to run
+        status (str): "pending" or "failed"
+        attempts (int): Runs started so far
+        claimed_until (datetime): Lease of the worker running it
+        last_error (str): Error of the last failed run
+        created_at (datetime): When the task was first scheduled
+    """
+
+    __tablename__ = "scheduled_tasks"
+
+    id = Column(Integer, primary_key=True)
+    key = Column(String(200), nullable=True, unique=True)
+    kind = Column(String(50), nullable=False)
+    target_id = Column(Integer, nullable=True)
+    payload = Column(Text, nullable=True)
+    due_at = Column(DateTime, nullable=False)
+    status = Column(String(10), nullable=False, default="pending")
+    attempts = Column(Integer, nullable=False, default=0)
+    claimed_until = Column(DateTime, nullable=True)
+    last_error = Column(Text, nullable=True)
+    created_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    __table_args__ = (
+        Index('idx_scheduled_task_due', 'status', 'due_at'),
+    )
+
+    def __repr__(self):
+        return f"<ScheduledTask(id={self.id}, kind={self.kind}, target={self.target_id}, due={self.due_at})>"
@@ -0,0 +1,184 @@
+"""
+Skill and CaregiverSkill models.
+
+This module defines the normalized skill tables that back SQL-side
+candidate filtering.  ``caregivers.skills`` stays the source of truth
+for display; ``caregiver_skills`` is an inverted index derived from it.
+
+Table Purpose:
+    skills:           Canonical skill names (see shared.skills) with
+                      persistent integer ids.
+    caregiver_skills: One row per (caregiver, skill).  The
+                      (skill_id, caregiver_id) index covers "who has
+                      skill X" lookups without touching caregivers.
+
+Sync:
+    An ``after_flush`` hook rewrites a caregiver's rows whenever its
+    skills column was inserted or changed in that flush, so every code
+    path that assigns ``Caregiver.skills`` keeps the index current.
+    ``rebuild_skill_index`` backfills rows written before this table
+    existed (called from shared.migrations).
+"""
+
+from sqlalchemy import Column, Integer, String, ForeignKey, Index, event, select, insert, delete
+from sqlalchemy.orm import Session, attributes
+from typing import Dict, Iterable, List
+from ..database import Base
+from ..skills import vocabulary
+
+
+class Skill(Base):
+    """
+    Canonical skill with a persistent integer id.
+
+    Attributes:
+        id (int): Primary key, referenced by caregiver_skills.skill_id
+        name (str): Canonical skill name (e.g. "elderly_care")
+    """
+
+    __tablename__ = "skills"
+
+    id = Column(Integer, primary_key=True)
+    name = Column(String(100), nullable=False, unique=True)
+
+    def __repr__(self):
+        return f"<Skill(id={self.id}, name='{self.name}')>"
+
+
+class CaregiverSkill(Base):
+    """
+    Inverted index row linking a caregiver to one canonical skill.
+
+    Attributes:
+        caregiver_id (int): FK to caregivers (cascade on delete)
+        skill_id (int): FK to skills
+    """
+
+    __tablename__ = "caregiver_skills"
+
+    caregiver_id = Column(
+        Integer, ForeignKey("caregivers.id", ondelete="CASCADE"), primary_key=True
+    )
+    skill_id = Column(Integer, ForeignKey("skills.id"), primary_key=True)
+
+    __table_args__ = (
+        # Covering index for skill → caregivers lookups
+        Index('idx_skill_caregiver', 'skill_id', 'caregiver_id'),
+    )
+
+    def __repr__(self):
+        return f"<CaregiverSkill(caregiver={self.caregiver_id}, skill={self.skill_id})>"
+
+
+def resolve_skill_ids(connection, skills: Iterable[str], create: bool = False) -> Dict[str, int]:
+    """
+    Map skill spellings to persisted skill ids.
+
+    Args:
+        connection: SQLAlchemy Connection or Session
+        skills: Any spellings; folded through the shared vocabulary
+        create: Insert canonical names that have no row yet
+
+    Returns:
+        Dictionary of canonical name → skill id (unknown names omitted
+        when create is False)
+    """
+    names = {vocabulary.canonical(skill) for skill in skills}
+    names.discard("")
+    if not names:
+        return {}
+
+    table = Skill.__table__
+    found = {
+        row.name: row.id
+        for row in connection.execute(
+            select(table.c.id, table.c.name).where(table.c.name.in_(names))
+        )
+    }
+    if create:
+        for name in sorted(names - found.keys()):
+            result = connection.execute(insert(table).values(name=name))
+            found[name] = result.inserted_primary_key[0]
+    return found
+
+
+def _write_caregiver_skills(connection, caregiver_id: int, skills: List[str]) -> None:
+    """Replace one caregiver's inverted-index rows."""
+    table = CaregiverSkill.__table__
+    skill_ids = resolve_skill_ids(connection, skills, create=True).values()
+    connection.execute(delete(table).where(table.c.caregiver_id == caregiver_id))
+    if skill_ids:
+        connection.execute(
+            insert(table),
+            [{"caregiver_id": caregiver_id, "skill_id": skill_id} for skill_id in skill_ids],
+        )
+
+
+def seed_skills(db: Session) -> None:
+    """
+    Persist the vocabulary's canonical skills and adopt the stored ids.
+
+    Canonical skills are inserted with their vocabulary ids so a fresh
+    database and the in-process bitsets agree; afterwards the table is
+    the authority and is loaded back into the shared vocabulary.
+    """
+    table = Skill.__table__
+    rows = db.execute(select(table.c.id, table.c.name)).all()
+    taken_ids = {row.id for row in rows}
+    stored = {row.name for row in rows}
+
+    missing = [
+        (skill_id, name)
+        for skill_id, name in ((i, vocabulary.name_for(i)) for i in range(len(vocabulary)))
+        if name is not None and name not in stored
+    ]
+    # Keep vocabulary ids where free first, then let the rest autoincrement
+    for skill_id, name in missing:
+        if skill_id not in taken_ids:
+            db.execute(insert(table).values(id=skill_id, name=name))
+    for skill_id, name in missing:
+        if skill_id in taken_ids:
+            db.execute(insert(table).values(name=name))
+    db.commit()
+
+    vocabulary.load(db.execute(select(table.c.id, table.c.name)).all())
+
+
+def rebuild_skill_index(db: Session) -> int:
+    """
+    Rebuild caregiver_skills for every caregiver.
+
+    Used as a migration backfill; the flush hook keeps rows current
+    afterwards.
+
+    Returns:
+        Number of caregivers indexed
+    """
+    from .caregiver import Caregiver, decode_skills
+
+    # Read (id, raw skills) up front so the writes below never interleave
+    # with an open cursor on the same SQLite connection.
+    rows = db.query(Caregiver.id, Caregiver._skills).all()
+    connection = db.connection()
+    for caregiver_id, raw in rows:
+        _write_caregiver_skills(connection, caregiver_id, decode_skills(raw))
+    db.commit()
+    return len(rows)
+
+
+@event.listens_for(Session, "after_flush")
+def _sync_caregiver_skills(session, flush_context):
+    """Mirror changed ``Caregiver.skills`` into caregiver_skills."""
+    from .caregiver import Caregiver
+
+    changed = [
+        obj for obj in list(session.new) + list(session.dirty)
+        if isinstance(obj, Caregiver)
+        and attributes.get_history(obj, "_skills").has_changes()
+    ]
+    if not changed:
+        return
+
+    connection = session.connection()
+    for caregiver in changed:
+        _write_caregiver_skills(connection, caregiver.id, caregiver.skills)
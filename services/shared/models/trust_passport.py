@@ -0,0 +1,44 @@
+"""
+Trust Passport model.
+
+Table Purpose:
+    trust_passports: One precomputed Trust Passport per caregiver — the
+                     explain_trust_score breakdown (verification,
+                     ratings, experience, penalties, level) serialized
+                     once as canonical JSON.  A new version is written
+                     only when the inputs it was built from change
+                     (inputs_hash), and the stored document and its
+                     strong ETag are served as-is.
+
+See shared.trust_passport for regeneration and serving.
+"""
+
+from sqlalchemy import Column, Integer, String, Text, DateTime, ForeignKey
+from datetime import datetime
+from ..database import Base
+
+
+class TrustPassport(Base):
+    """
+    Current Trust Passport of a caregiver.
+
+    Attributes:
+        caregiver_id (int): FK to caregivers, one passport each
+        version (int): Bumped on every regeneration, starting at 1
+        inputs_hash (str): SHA-256 of the inputs the document was built from
+        document (str): Canonical JSON body served to clients
+        etag (str): Strong ETag of document ("<sha256 prefix>")
+        generated_at (datetime): When this version was built
+    """
+
+    __tablename__ = "trust_passports"
+
+    caregiver_id = Column(Integer, ForeignKey("caregivers.id"), primary_key=True)
+    version = Column(Integer, nullable=False, default=1)
+    inputs_hash = Column(String(64), nullable=False)
+    document = Column(Text, nullable=False)
+    etag = Column(String(80), nullable=False)
+    generated_at = Column(DateTime, nullable=False, default=datetime.utcnow)
+
+    def __repr__(self):
+        return f"<TrustPassport(caregiver_id={self.caregiver_id}, version={self.version})>"
@@ -0,0 +1,337 @@
+"""
+Transactional outbox for booking events.
+
+Every booking state change inserts a booking_events row in the same
+transaction as the change, so other services learn about exactly the
+changes that committed — no more, no less.  A dispatcher in each
+service tails the table by id and hands events to named consumers:
+
+    civilian-api:sse        → push to open SSE streams (shared.events)
+    civilian-api:conflicts  → drop stale conflict-cache entries
+    civilian-api:trust      → recompute the caregiver's trust score
+    caregiver-api:sse / caregiver-api:conflicts
+
+Delivery is at-least-once: a consumer's offset (consumer_offsets) only
+moves after its handler returned, and is committed after the batch, so
+a crash or a raising handler means the event is delivered again.
+Handlers must therefore be idempotent.  A failing consumer is retried
+on the next tick and never holds back the others.
+
+Tailing by id is safe because SQLite serializes writers: ids become
+visible in commit order, so no lower id can appear behind the tail.
+
+Recording:
+    * ORM changes (transition_booking, new bookings, direct edits) are
+      picked up by an ``after_flush`` hook.
+    * Bulk UPDATEs that skip the flush (shared.workflow.claim_transition)
+      call record_booking_change themselves.
+    * Notices about an unchanged booking (kind=REMINDER, from the
+      scheduler) travel the same way so every service's SSE streams get
+      them; their payload has "reminder": True and state consumers skip
+      them.
+
+A commit that wrote events wakes the local dispatcher immediately;
+events from other processes are picked up within OUTBOX_POLL_SECONDS.
+Consumer names must be unique per process.
+"""
+
+import threading
+import time
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import event, func
+from sqlalchemy.orm import Session, attributes
+
+from .config import Config
+from .database import SessionLocal
+from .models import Booking, BookingEvent, ConsumerOffset
+
+
+Handler = Callable[[Dict[str, Any]], None]
+
+
+# ── Recording ─────────────────────────────────────────────────────────
+
+# BookingEvent.kind of a reminder notice
+REMINDER = "reminder"
+
+
+def _event_row(booking, kind: Optional[str] = None) -> Dict[str, Any]:
+    return {
+        "booking_id": booking.id,
+        "caregiver_id": booking.caregiver_id,
+        "civilian_id": booking.civilian_id,
+        "status": booking.status,
+        "payment_status": booking.payment_status,
+        "start_time": booking.start_time,
+        "end_time": booking.end_time,
+        "kind": kind,
+        "created_at": datetime.utcnow(),
+    }
+
+
+def _insert_events(session: Session, rows: List[Dict[str, Any]]) -> None:
+    # Core insert on the session's connection: same transaction, no autoflush
+    session.connection().execute(BookingEvent.__table__.insert(), rows)
+    session.info["outbox_written"] = True
+
+
+def record_booking_change(session: Session, booking, kind: Optional[str] = None) -> None:
+    """Append an outbox event for *booking* to the session's transaction."""
+    _insert_events(session, [_event_row(booking, kind)])
+
+
+@event.listens_for(Session, "after_flush")
+def _record_flushed_changes(session, flush_context):
+    rows = []
+    for obj in list(session.new) + list(session.dirty):
+        if not isinstance(obj, Booking):
+            continue
+        if obj in session.new or attributes.get_history(obj, "status").has_changes() \
+                or attributes.get_history(obj, "caregiver_id").has_changes():
+            rows.append(_event_row(obj))
+    if rows:
+        _insert_events(session, rows)
+
+
+@event.listens_for(Session, "after_commit")
+def _wake_on_commit(session):
+    if session.info.pop("outbox_written", False):
+        _dispatcher.wake()
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session):
+    session.info.pop("outbox_written", None)
+
+
+def event_payload(row: BookingEvent) -> Dict[str, Any]:
+    """The dict handed to consumers (and pushed to SSE clients)."""
+    payload = {
+        "event_id": row.id,
+        "booking_id": row.booking_id,
+        "status": row.status,
+        "caregiver_id": row.caregiver_id,
+        "civilian_id": row.civilian_id,
+        "start_time": row.start_time.isoformat() if row.start_time else None,
+        "end_time": row.end_time.isoformat() if row.end_time else None,
+        "payment_status": row.payment_status,
+        "at": row.created_at.isoformat(),
+    }
+    if row.kind == REMINDER:
+        payload["reminder"] = True
+    return payload
+
+
+# ── Dispatch ──────────────────────────────────────────────────────────
+
+class _Consumer:
+    __slots__ = ("name", "handler", "replay", "offset", "delivered", "failures", "last_error")
+
+    def __init__(self, name: str, handler: Handler, replay: bool):
+        self.name = name
+        self.handler = handler
+        self.replay = replay
+        self.offset: Optional[int] = None
+        self.delivered = 0
+        self.failures = 0
+        self.last_error: Optional[str] = None
+
+
+class OutboxDispatcher:
+    """
+    Tails booking_events and delivers each event to every consumer.
+
+    Args:
+        session_factory: Session factory for reading events and offsets
+        batch_size: Max events read per consumer per tick
+        poll_interval: Seconds between ticks when not woken by a commit
+    """
+
+    def __init__(self, session_factory=SessionLocal, batch_size: Optional[int] = None,
+                 poll_interval: Optional[float] = None):
+        self._session_factory = session_factory
+        self.batch_size = batch_size or Config.OUTBOX_BATCH_SIZE
+        self.poll_interval = poll_interval or Config.OUTBOX_POLL_SECONDS
+        self._consumers: Dict[str, _Consumer] = {}
+        self._poll_lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.ticks = 0
+        self.last_tick_at: Optional[float] = None
+
+    def subscribe(self, consumer: str, handler: Handler, replay: bool = False) -> None:
+        """
+        Register a named consumer.
+
+        Args:
+            consumer: Unique name; its offset is persisted under this name
+            handler: Called once per event (at least once), in id order
+            replay: With no stored offset, start from the first event
+                    instead of the current end of the outbox
+        """
+        with self._poll_lock:
+            self._consumers[consumer] = _Consumer(consumer, handler, replay)
+
+    def unsubscribe(self, consumer: str) -> None:
+        with self._poll_lock:
+            self._consumers.pop(consumer, None)
+
+    def _load_offsets(self, db: Session, consumers: List[_Consumer]) -> Dict[str, ConsumerOffset]:
+        stored = {
+            row.consumer: row
+            for row in db.query(ConsumerOffset).filter(
+                ConsumerOffset.consumer.in_([c.name for c in consumers])
+            )
+        }
+        tail = None
+        for c in consumers:
+            if c.name not in stored:
+                if c.replay:
+                    start = 0
+                else:
+                    if tail is None:
+                        tail = db.query(func.coalesce(func.max(BookingEvent.id), 0)).scalar()
+                    start = tail
+                stored[c.name] = ConsumerOffset(consumer=c.name, last_event_id=start)
+                db.add(stored[c.name])
+            c.offset = stored[c.name].last_event_id
+        return stored
+
+    def poll_once(self) -> int:
+        """
+        Deliver pending events to every consumer.
+
+        Returns:
+            Number of (event, consumer) deliveries made
+        """
+        with self._poll_lock:
+            consumers = list(self._consumers.values())
+            if not consumers:
+                return 0
+            delivered = 0
+            db = self._session_factory()
+            try:
+                stored = self._load_offsets(db, consumers)
+                batches: Dict[int, List[Dict[str, Any]]] = {}
+                for c in consumers:
+                    start = c.offset
+                    if start not in batches:
+                        rows = (
+                            db.query(BookingEvent)
+                            .filter(BookingEvent.id > start)
+                            .order_by(BookingEvent.id)
+                            .limit(self.batch_size)
+                            .all()
+                        )
+                        batches[start] = [event_payload(row) for row in rows]
+                    for evt in batches[start]:
+                        try:
+                            c.handler(evt)
+                        except Exception as e:
+                            # Retry from this event on the next tick
+                            c.failures += 1
+                            c.last_error = f"{type(e).__name__}: {e}"
+                            print(f"Outbox consumer {c.name} failed at event {evt['event_id']}: {e}")
+                            break
+                        c.offset = evt["event_id"]
+                        c.delivered += 1
+                        delivered += 1
+                    if c.offset != start:
+                        stored[c.name].last_event_id = c.offset
+                        stored[c.name].updated_at = datetime.utcnow()
+                db.commit()
+            except Exception:
+                db.rollback()
+                raise
+            finally:
+                db.close()
+            self.ticks += 1
+            self.last_tick_at = time.time()
+            return delivered
+
+    def wake(self) -> None:
+        """Run the next tick now (called after a local commit wrote events)."""
+        self._wake.set()
+
+    def start(self) -> None:
+        """Start the background dispatch thread."""
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                self._wake.wait(self.poll_interval)
+                self._wake.clear()
+                if self._stop.is_set():
+                    break
+                try:
+                    self.poll_once()
+                except Exception as e:
+                    print(f"Outbox dispatch failed: {e}")
+
+        self._thread = threading.Thread(target=_run, name="outbox-dispatcher", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the dispatch thread; undelivered events stay in the outbox."""
+        self._stop.set()
+        self._wake.set()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+            self._thread = None
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._poll_lock:
+            consumers = {
+                c.name: {
+                    "offset": c.offset,
+                    "delivered": c.delivered,
+                    "failures": c.failures,
+                    "last_error": c.last_error,
+                }
+                for c in self._consumers.values()
+            }
+        return {"ticks": self.ticks, "last_tick_at": self.last_tick_at, "consumers": consumers}
+
+
+# Global instance
+_dispatcher = OutboxDispatcher()
+
+
+def subscribe(consumer: str, handler: Handler, replay: bool = False) -> None:
+    _dispatcher.subscribe(consumer, handler, replay)
+
+
+def unsubscribe(consumer: str) -> None:
+    _dispatcher.unsubscribe(consumer)
+
+
+def dispatch_pending() -> int:
+    return _dispatcher.poll_once()
+
+
+def outbox_metrics() -> Dict[str, Any]:
+    return _dispatcher.metrics()
+
+
+def subscribe_standard(service: str) -> None:
+    """Register the SSE push and conflict-cache consumers for *service*."""
+    from .conflicts import invalidate_caregivers
+    from .events import publish
+
+    subscribe(f"{service}:sse", publish)
+    subscribe(f"{service}:conflicts", lambda evt: invalidate_caregivers([evt["caregiver_id"]]))
+
+
+def start_dispatcher() -> None:
+    """Start the background dispatcher (call from lifespan)."""
+    _dispatcher.start()
+
+
+def stop_dispatcher() -> None:
+    """Stop the background dispatcher (call from lifespan)."""
+    _dispatcher.stop()
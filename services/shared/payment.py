@@ -47,8 +47,18 @@ def reserve_payment(booking) -> dict:
 def capture_payment(booking) -> dict:
     """Capture reserved payment when job starts."""
     transition_payment(booking, "paid")
+    return payment_receipt(booking)
+
+
+def payment_receipt(booking) -> dict:
+    """
+    Receipt for a captured payment.
+
+    Used directly when the capture was folded into the job-start UPDATE
+    (see shared.workflow.claim_transition).
+    """
     return {
         "payment_id": f"PAY-{booking.id:06d}",
-        "status": "paid",
+        "status": booking.payment_status,
         "message": "Payment captured (mock)",
     }
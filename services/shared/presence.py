@@ -0,0 +1,312 @@
+"""
+Live caregiver presence.
+
+Caregivers on shift report their location every few seconds.  Writing
+each ping to the caregivers table would turn SQLite's single writer into
+the bottleneck, so pings land in an in-memory grid instead and only a
+periodic snapshot of the latest positions is flushed to the database
+(caregivers.last_lat / last_lng / last_seen_at).
+
+Layout:
+    * one slot per caregiver in parallel numpy arrays
+      (id, lat, lng, last_seen, available, cell)
+    * a uniform grid of CELL_DEGREES squares mapping cell → slots
+
+A nearby query visits the cells overlapping the search box — or, when
+the box spans more cells than are occupied, the occupied cells — copies
+their slots out under the lock and computes exact distances for them
+in one vectorized call after releasing it.  Callers cap the radius at
+MAX_NEARBY_RADIUS_KM.
+
+The grid is per process; caregiver-api owns it because that is where
+pings arrive.
+"""
+
+import math
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+import numpy as np
+from sqlalchemy import update
+
+from .database import SessionLocal
+from .geo import KM_PER_DEGREE, haversine_km
+from .models import Caregiver
+
+
+# Grid cell size (~1.1 km of latitude)
+CELL_DEGREES = 0.01
+
+# Largest radius and page size the nearby endpoint accepts
+MAX_NEARBY_RADIUS_KM = 100.0
+MAX_NEARBY_LIMIT = 100
+
+# Pings older than this are treated as offline
+PRESENCE_TTL_SECONDS = 120.0
+
+# Seconds between snapshot flushes to the database
+FLUSH_INTERVAL_SECONDS = 30.0
+
+_INITIAL_CAPACITY = 256
+
+
+def _cell_of(lat: float, lng: float) -> Tuple[int, int]:
+    return int(math.floor(lat / CELL_DEGREES)), int(math.floor(lng / CELL_DEGREES))
+
+
+class PresenceGrid:
+    """
+    Array-backed presence records indexed by a uniform lat/lng grid.
+
+    All methods are thread-safe.
+
+    Args:
+        capacity: Initial number of slots (grows by doubling)
+        session_factory: Session factory used by flush()
+    """
+
+    def __init__(self, capacity: int = _INITIAL_CAPACITY, session_factory=SessionLocal):
+        self._session_factory = session_factory
+        self._lock = threading.Lock()
+        self._ids = np.zeros(capacity, dtype=np.int64)
+        self._lat = np.zeros(capacity, dtype=np.float64)
+        self._lng = np.zeros(capacity, dtype=np.float64)
+        self._seen = np.zeros(capacity, dtype=np.float64)
+        self._available = np.zeros(capacity, dtype=bool)
+        self._cells: List[Optional[Tuple[int, int]]] = [None] * capacity
+        self._slots: Dict[int, int] = {}
+        self._grid: Dict[Tuple[int, int], Set[int]] = {}
+        self._dirty: Set[int] = set()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def _grow(self) -> None:
+        capacity = len(self._ids) * 2
+        for name in ("_ids", "_lat", "_lng", "_seen", "_available"):
+            old = getattr(self, name)
+            new = np.zeros(capacity, dtype=old.dtype)
+            new[:len(old)] = old
+            setattr(self, name, new)
+        self._cells.extend([None] * (capacity - len(self._cells)))
+
+    def update_many(self, updates: Iterable[Tuple[int, float, float, float, bool]]) -> int:
+        """
+        Apply a batch of pings under one lock acquisition.
+
+        Args:
+            updates: (caregiver_id, lat, lng, timestamp, available) tuples;
+                pings older than the stored one are ignored
+
+        Returns:
+            Number of records changed
+        """
+        changed = 0
+        with self._lock:
+            for caregiver_id, lat, lng, seen, available in updates:
+                slot = self._slots.get(caregiver_id)
+                if slot is None:
+                    if self._size == len(self._ids):
+                        self._grow()
+                    slot = self._size
+                    self._size += 1
+                    self._slots[caregiver_id] = slot
+                    self._ids[slot] = caregiver_id
+                elif seen < self._seen[slot]:
+                    continue
+
+                cell = _cell_of(lat, lng)
+                if cell != self._cells[slot]:
+                    old = self._cells[slot]
+                    if old is not None:
+                        self._grid[old].discard(slot)
+                        if not self._grid[old]:
+                            del self._grid[old]
+                    self._grid.setdefault(cell, set()).add(slot)
+                    self._cells[slot] = cell
+
+                self._lat[slot] = lat
+                self._lng[slot] = lng
+                self._seen[slot] = seen
+                self._available[slot] = available
+                self._dirty.add(slot)
+                changed += 1
+        return changed
+
+    def update(self, caregiver_id: int, lat: float, lng: float, available: bool = True,
+               seen: Optional[float] = None) -> None:
+        """Record a single ping (timestamp defaults to now)."""
+        self.update_many([(caregiver_id, lat, lng, time.time() if seen is None else seen, available)])
+
+    def set_available(self, caregiver_id: int, available: bool) -> None:
+        """Flip availability without a new position (e.g. job accepted)."""
+        with self._lock:
+            slot = self._slots.get(caregiver_id)
+            if slot is not None:
+                self._available[slot] = available
+
+    def nearby(
+        self,
+        lat: float,
+        lng: float,
+        radius_km: float,
+        limit: Optional[int] = None,
+        available_only: bool = True,
+        now: Optional[float] = None,
+    ) -> List[Tuple[int, float]]:
+        """
+        Caregivers seen recently within *radius_km* of a point.
+
+        Args:
+            lat: Latitude in degrees
+            lng: Longitude in degrees
+            radius_km: Search radius
+            limit: Maximum number of results
+            available_only: Skip caregivers marked unavailable
+            now: Current time (defaults to time.time())
+
+        Returns:
+            List of (caregiver_id, distance_km), nearest first
+        """
+        now = time.time() if now is None else now
+        d_lat = radius_km / KM_PER_DEGREE
+        d_lng = radius_km / (KM_PER_DEGREE * max(math.cos(math.radians(lat)), 0.01))
+        lat_lo, lng_lo = _cell_of(lat - d_lat, lng - d_lng)
+        lat_hi, lng_hi = _cell_of(lat + d_lat, lng + d_lng)
+
+        box_cells = (lat_hi - lat_lo + 1) * (lng_hi - lng_lo + 1)
+
+        with self._lock:
+            slots: List[int] = []
+            if box_cells > len(self._grid):
+                # Wide box over a sparse grid: walk what is occupied
+                for (i, j), bucket in self._grid.items():
+                    if lat_lo <= i <= lat_hi and lng_lo <= j <= lng_hi:
+                        slots.extend(bucket)
+            else:
+                for i in range(lat_lo, lat_hi + 1):
+                    for j in range(lng_lo, lng_hi + 1):
+                        bucket = self._grid.get((i, j))
+                        if bucket:
+                            slots.extend(bucket)
+            if not slots:
+                return []
+            # Fancy indexing copies, so scoring below runs without the lock
+            idx = np.fromiter(slots, dtype=np.int64, count=len(slots))
+            ids = self._ids[idx]
+            lats = self._lat[idx]
+            lngs = self._lng[idx]
+            fresh = self._seen[idx] >= now - PRESENCE_TTL_SECONDS
+            if available_only:
+                fresh &= self._available[idx]
+
+        distances = haversine_km(lat, lng, lats, lngs)
+        keep = np.flatnonzero(fresh & (distances <= radius_km))
+        keep = keep[np.argsort(distances[keep], kind="stable")]
+        if limit is not None:
+            keep = keep[:limit]
+        return [(int(ids[k]), float(distances[k])) for k in keep]
+
+    def take_dirty(self) -> List[Tuple[int, float, float, float]]:
+        """Pop (caregiver_id, lat, lng, seen) for records changed since the last call."""
+        with self._lock:
+            dirty, self._dirty = self._dirty, set()
+            return [
+                (int(self._ids[s]), float(self._lat[s]), float(self._lng[s]), float(self._seen[s]))
+                for s in dirty
+            ]
+
+    def flush(self) -> int:
+        """
+        Write the latest position of every changed caregiver to the DB.
+
+        Returns:
+            Number of caregivers written
+        """
+        rows = self.take_dirty()
+        if not rows:
+            return 0
+        db = self._session_factory()
+        try:
+            db.execute(
+                update(Caregiver),
+                [
+                    {
+                        "id": caregiver_id,
+                        "last_lat": lat,
+                        "last_lng": lng,
+                        "last_seen_at": datetime.fromtimestamp(seen, tz=timezone.utc).replace(tzinfo=None),
+                    }
+                    for caregiver_id, lat, lng, seen in rows
+                ],
+            )
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            # Put the records back so the next flush retries them
+            with self._lock:
+                self._dirty.update(self._slots[r[0]] for r in rows)
+            print(f"Presence flush failed: {e}")
+            return 0
+        finally:
+            db.close()
+        return len(rows)
+
+
+# Global instance
+_presence = PresenceGrid()
+_flusher: Optional[threading.Thread] = None
+_stop = threading.Event()
+
+
+def record_locations(updates: Iterable[Tuple[int, float, float, float, bool]]) -> int:
+    """Apply a batch of location pings to the global grid."""
+    return _presence.update_many(updates)
+
+
+def record_location(caregiver_id: int, lat: float, lng: float, available: bool = True) -> None:
+    """Apply one location ping to the global grid."""
+    _presence.update(caregiver_id, lat, lng, available)
+
+
+def set_available(caregiver_id: int, available: bool) -> None:
+    _presence.set_available(caregiver_id, available)
+
+
+def nearby_caregivers(lat: float, lng: float, radius_km: float,
+                      limit: Optional[int] = None) -> List[Tuple[int, float]]:
+    """Available caregivers seen recently near a point, nearest first."""
+    return _presence.nearby(lat, lng, radius_km, limit=limit)
+
+
+def flush_presence() -> int:
+    """Flush changed positions from the global grid to the database."""
+    return _presence.flush()
+
+
+def start_flusher(interval: float = FLUSH_INTERVAL_SECONDS) -> None:
+    """Start the background snapshot flusher (call from lifespan)."""
+    global _flusher
+    if _flusher is not None and _flusher.is_alive():
+        return
+    _stop.clear()
+
+    def _run():
+        while not _stop.wait(interval):
+            flush_presence()
+
+    _flusher = threading.Thread(target=_run, name="presence-flusher", daemon=True)
+    _flusher.start()
+
+
+def stop_flusher() -> None:
+    """Stop the flusher and write a final snapshot (call from lifespan)."""
+    global _flusher
+    _stop.set()
+    if _flusher is not None:
+        _flusher.join(timeout=5)
+        _flusher = None
+    flush_presence()
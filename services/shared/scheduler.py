@@ -0,0 +1,421 @@
+"""
+Persistent delayed-task scheduler.
+
+Delayed actions used to be one sleeping thread each: thousands of
+parked threads under load, and every pending action lost on restart.
+Now they are rows in scheduled_tasks, run by a small pool of worker
+threads.
+
+    scheduler.register("booking.expire", expire_booking)
+    schedule(db, "booking.expire", due_at, target_id=booking.id,
+             key=f"booking.expire:{booking.id}")       # caller commits
+
+Worker:
+    * A min-heap holds the due times the workers know of (committed
+      local schedules plus the earliest pending row in the table); it
+      sleeps until the top is due, at most SCHEDULER_POLL_SECONDS so
+      tasks scheduled by other processes are picked up too.
+    * Due tasks are claimed SCHEDULER_BATCH_SIZE at a time with one
+      conditional UPDATE that sets a lease (claimed_until), so several
+      workers never run the same task.  A worker that dies mid-batch
+      loses its lease after SCHEDULER_LEASE_SECONDS.
+    * A batch runs in one transaction: every handler, then the deletion
+      of the tasks, then a single commit — an action and the removal of
+      its task commit together.  If any handler raises, the batch is
+      rolled back and its tasks run one by one, so only the failing
+      task is retried (after SCHEDULER_RETRY_SECONDS, doubling) and
+      marked "failed" after SCHEDULER_MAX_ATTEMPTS.
+
+Queues: enqueue() is schedule() at "now" that coalesces — one waiting
+job per key, however often it is enqueued.  start() runs
+SCHEDULER_WORKERS worker threads; claims keep them from overlapping.
+metrics() reports per kind the depth and oldest wait of due jobs and
+the lag (due → done) of the last one executed.
+
+Handlers take (db, task), must not commit, and must be idempotent: a
+task can run again if its worker died after the action but before the
+commit.  Only kinds with a handler registered in this process are
+claimed.
+"""
+
+import heapq
+import json
+import threading
+import time
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional
+
+from sqlalchemy import delete, event, func, or_, select, update
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
+from sqlalchemy.orm import Session
+
+from .config import Config
+from .database import SessionLocal
+from .models import ScheduledTask
+
+Handler = Callable[[Session, ScheduledTask], None]
+
+
+def task_payload(task: ScheduledTask) -> Dict[str, Any]:
+    """The task's JSON payload as a dict."""
+    return json.loads(task.payload) if task.payload else {}
+
+
+class Scheduler:
+    """
+    Worker pool (SCHEDULER_WORKERS threads) running scheduled_tasks.
+
+    Args:
+        session_factory: Session factory for claiming and running tasks
+        batch_size: Tasks claimed and committed together
+        poll_interval: Longest sleep between checks of the table
+        lease_seconds: How long a claim protects a running batch
+        max_attempts: Runs before a task is marked failed
+        retry_seconds: Delay before the first retry (doubles each time)
+        workers: Worker threads started by start()
+    """
+
+    def __init__(self, session_factory=SessionLocal, batch_size: Optional[int] = None,
+                 poll_interval: Optional[float] = None, lease_seconds: Optional[int] = None,
+                 max_attempts: Optional[int] = None, retry_seconds: Optional[int] = None,
+                 workers: Optional[int] = None):
+        self._session_factory = session_factory
+        self.batch_size = batch_size or Config.SCHEDULER_BATCH_SIZE
+        self.poll_interval = poll_interval or Config.SCHEDULER_POLL_SECONDS
+        self.lease = timedelta(seconds=lease_seconds or Config.SCHEDULER_LEASE_SECONDS)
+        self.max_attempts = max_attempts or Config.SCHEDULER_MAX_ATTEMPTS
+        self.retry_seconds = retry_seconds or Config.SCHEDULER_RETRY_SECONDS
+        self.workers = workers or Config.SCHEDULER_WORKERS
+        self._handlers: Dict[str, Handler] = {}
+        self._heap: List[datetime] = []
+        self._lock = threading.Lock()
+        self._wake = threading.Event()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+        # kind -> depth / oldest wait / last lag / executed / coalesced
+        self._queues: Dict[str, Dict[str, Any]] = {}
+        self.batches = 0
+        self.executed = 0
+        self.retried = 0
+        self.failed = 0
+        self.last_error: Optional[str] = None
+        self.last_run_at: Optional[float] = None
+
+    def register(self, kind: str, handler: Handler) -> None:
+        """Run *handler* for due tasks of *kind* in this process."""
+        self._handlers[kind] = handler
+
+    # ── Heap of known due times ───────────────────────────────────────
+
+    def notify(self, due_at: datetime) -> None:
+        """A task due at *due_at* was committed; wake early if it is the next one."""
+        if not self._threads:
+            return
+        with self._lock:
+            heapq.heappush(self._heap, due_at)
+            earliest = self._heap[0] == due_at
+        if earliest:
+            self._wake.set()
+
+    def _sleep_seconds(self, now: datetime) -> float:
+        with self._lock:
+            while self._heap and self._heap[0] <= now:
+                heapq.heappop(self._heap)
+            if not self._heap:
+                return self.poll_interval
+            return min(self.poll_interval, (self._heap[0] - now).total_seconds())
+
+    # ── Queue statistics ──────────────────────────────────────────────
+
+    def _queue(self, kind: str) -> Dict[str, Any]:
+        # Caller holds self._lock
+        return self._queues.setdefault(kind, {
+            "depth": 0, "oldest_seconds": 0.0, "last_lag_seconds": None, "executed": 0, "coalesced": 0,
+        })
+
+    def note_coalesced(self, kind: str) -> None:
+        with self._lock:
+            self._queue(kind)["coalesced"] += 1
+
+    def _note_executed(self, tasks: List[ScheduledTask], due_times: Dict[int, datetime]) -> None:
+        done = datetime.utcnow()
+        with self._lock:
+            self.executed += len(tasks)
+            for task in tasks:
+                queue = self._queue(task.kind)
+                queue["executed"] += 1
+                queue["last_lag_seconds"] = round((done - due_times[task.id]).total_seconds(), 3)
+
+    def _refresh_queues(self, db: Session, now: datetime) -> None:
+        """Depth and oldest wait of the due, not yet finished tasks per kind."""
+        rows = db.query(ScheduledTask.kind, func.count(), func.min(ScheduledTask.due_at)).filter(
+            ScheduledTask.status == "pending", ScheduledTask.due_at <= now
+        ).group_by(ScheduledTask.kind).all()
+        waiting = {kind: (count, oldest) for kind, count, oldest in rows}
+        with self._lock:
+            for kind in set(waiting) | set(self._queues):
+                count, oldest = waiting.get(kind, (0, None))
+                queue = self._queue(kind)
+                queue["depth"] = count
+                queue["oldest_seconds"] = round((now - oldest).total_seconds(), 3) if oldest else 0.0
+
+    # ── Running ───────────────────────────────────────────────────────
+
+    def _claim(self, db: Session, now: datetime, lease_until: datetime) -> List[ScheduledTask]:
+        claimable = (
+            ScheduledTask.status == "pending",
+            ScheduledTask.due_at <= now,
+            ScheduledTask.kind.in_(list(self._handlers)),
+            or_(ScheduledTask.claimed_until.is_(None), ScheduledTask.claimed_until < now),
+        )
+        ids = select(ScheduledTask.id).where(*claimable).order_by(ScheduledTask.due_at).limit(self.batch_size)
+        claimed = db.execute(
+            update(ScheduledTask)
+            .where(ScheduledTask.id.in_(ids.scalar_subquery()), *claimable)
+            .values(claimed_until=lease_until, attempts=ScheduledTask.attempts + 1)
+            .returning(ScheduledTask.id)
+            .execution_options(synchronize_session=False)
+        ).scalars().all()
+        db.commit()
+        if not claimed:
+            return []
+        return db.query(ScheduledTask).filter(ScheduledTask.id.in_(claimed)).order_by(ScheduledTask.due_at).all()
+
+    def _finished(self, ids: List[int], lease_until: datetime):
+        # A task rescheduled while it ran lost our lease and must stay
+        return delete(ScheduledTask).where(ScheduledTask.id.in_(ids), ScheduledTask.claimed_until == lease_until)
+
+    def _run_one(self, db: Session, task: ScheduledTask, now: datetime, lease_until: datetime) -> bool:
+        task_id, kind, attempts, due_at = task.id, task.kind, task.attempts, task.due_at
+        try:
+            self._handlers[kind](db, task)
+            db.execute(self._finished([task_id], lease_until))
+            db.commit()
+            self._note_executed([task], {task_id: due_at})
+            return True
+        except Exception as e:
+            db.rollback()
+            error = f"{type(e).__name__}: {e}"
+            print(f"Scheduled task {task_id} ({kind}) failed: {e}")
+            values: Dict[str, Any] = {"claimed_until": None, "last_error": error}
+            if attempts >= self.max_attempts:
+                values["status"] = "failed"
+            else:
+                values["due_at"] = now + timedelta(seconds=self.retry_seconds * 2 ** (attempts - 1))
+            db.execute(
+                update(ScheduledTask)
+                .where(ScheduledTask.id == task_id, ScheduledTask.claimed_until == lease_until)
+                .values(**values)
+            )
+            db.commit()
+            with self._lock:
+                self.last_error = error
+                if attempts >= self.max_attempts:
+                    self.failed += 1
+                else:
+                    self.retried += 1
+            return False
+
+    def run_due(self, now: Optional[datetime] = None) -> int:
+        """
+        Run every task due at *now*, batch by batch.
+
+        Returns:
+            Number of tasks that ran successfully
+        """
+        executed = 0
+        db = self._session_factory()
+        try:
+            while True:
+                started = now or datetime.utcnow()
+                lease_until = started + self.lease
+                tasks = self._claim(db, started, lease_until)
+                if not tasks:
+                    break
+                due_times = {t.id: t.due_at for t in tasks}
+                try:
+                    for task in tasks:
+                        self._handlers[task.kind](db, task)
+                    db.execute(self._finished(list(due_times), lease_until))
+                    db.commit()
+                    self._note_executed(tasks, due_times)
+                    executed += len(tasks)
+                except Exception:
+                    # Isolate the failing task(s)
+                    db.rollback()
+                    executed += sum(self._run_one(db, task, started, lease_until) for task in tasks)
+                with self._lock:
+                    self.batches += 1
+                if len(tasks) < self.batch_size:
+                    break
+            next_due = db.query(func.min(ScheduledTask.due_at)).filter(
+                ScheduledTask.status == "pending"
+            ).scalar()
+            self._refresh_queues(db, now or datetime.utcnow())
+        finally:
+            db.close()
+        if next_due is not None:
+            with self._lock:
+                if not self._heap or next_due < self._heap[0]:
+                    heapq.heappush(self._heap, next_due)
+        self.last_run_at = time.time()
+        return executed
+
+    def start(self) -> None:
+        """Start the worker threads; tasks left from before a restart run first."""
+        if any(thread.is_alive() for thread in self._threads):
+            return
+        self._stop.clear()
+
+        def _run():
+            while not self._stop.is_set():
+                try:
+                    self.run_due()
+                except Exception as e:
+                    self.last_error = f"{type(e).__name__}: {e}"
+                    print(f"Scheduler run failed: {e}")
+                self._wake.wait(self._sleep_seconds(datetime.utcnow()))
+                self._wake.clear()
+
+        self._threads = [
+            threading.Thread(target=_run, name=f"scheduler-{i}", daemon=True) for i in range(self.workers)
+        ]
+        for thread in self._threads:
+            thread.start()
+
+    def stop(self) -> None:
+        """Stop the workers; unfinished tasks stay in the table."""
+        self._stop.set()
+        self._wake.set()
+        threads, self._threads = self._threads, []
+        for thread in threads:
+            thread.join(timeout=5)
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "kinds": sorted(self._handlers),
+                "workers": len(self._threads),
+                "queues": {kind: dict(queue) for kind, queue in self._queues.items()},
+                "known_due": len(self._heap),
+                "next_due": self._heap[0].isoformat() if self._heap else None,
+                "batches": self.batches,
+                "executed": self.executed,
+                "retried": self.retried,
+                "failed": self.failed,
+                "last_error": self.last_error,
+                "last_run_at": self.last_run_at,
+            }
+
+
+# ── Scheduling (inside the caller's transaction) ──────────────────────
+
+def schedule(db: Session, kind: str, due_at: datetime, target_id: Optional[int] = None,
+             payload: Optional[Dict[str, Any]] = None, key: Optional[str] = None) -> None:
+    """
+    Add a task to the session's transaction; the caller commits.
+
+    With a *key*, an existing task under that key is moved to the new
+    due time and arguments instead (its attempts are reset).
+    """
+    payload_json = json.dumps(payload) if payload is not None else None
+    task = db.query(ScheduledTask).filter(ScheduledTask.key == key).first() if key else None
+    if task is None:
+        db.add(ScheduledTask(key=key, kind=kind, target_id=target_id, payload=payload_json,
+                             due_at=due_at, status="pending", attempts=0))
+    else:
+        task.kind = kind
+        task.target_id = target_id
+        task.payload = payload_json
+        task.due_at = due_at
+        task.status = "pending"
+        task.attempts = 0
+        task.claimed_until = None
+        task.last_error = None
+    db.info.setdefault("scheduled_due", []).append(due_at)
+
+
+def enqueue(db: Session, kind: str, key: str, target_id: Optional[int] = None,
+            payload: Optional[Dict[str, Any]] = None, delay_seconds: float = 0.0) -> bool:
+    """
+    Queue a job to run as soon as possible, coalescing duplicates.
+
+    While a job with *key* is still waiting, further enqueues are
+    absorbed by it: it runs once and sees the latest data.  A job that
+    is already running is re-armed instead, so changes made during the
+    run are picked up by one more run.  *delay_seconds* gives a burst
+    time to coalesce before the first run.  The caller commits.
+
+    Returns:
+        False if an existing waiting job absorbed this one
+    """
+    now = datetime.utcnow()
+    due_at = now + timedelta(seconds=delay_seconds)
+    task = db.query(ScheduledTask).filter(ScheduledTask.key == key).first()
+    if task is None:
+        # Another transaction may insert the key between our read and
+        # this insert; its job absorbs ours instead of failing the
+        # caller's whole transaction on the unique key.
+        inserted = db.execute(
+            sqlite_insert(ScheduledTask)
+            .values(key=key, kind=kind, target_id=target_id,
+                    payload=json.dumps(payload) if payload is not None else None,
+                    due_at=due_at, status="pending", attempts=0)
+            .on_conflict_do_nothing(index_elements=[ScheduledTask.key])
+        ).rowcount
+        if not inserted:
+            scheduler.note_coalesced(kind)
+            return False
+        db.info.setdefault("scheduled_due", []).append(due_at)
+        return True
+    if task.status == "pending" and (task.claimed_until is None or task.claimed_until < now):
+        scheduler.note_coalesced(kind)
+        return False
+    schedule(db, kind, due_at, target_id=target_id, payload=payload, key=key)
+    return True
+
+
+def cancel(db: Session, *keys: str) -> int:
+    """Delete the tasks with these keys in the session's transaction."""
+    if not keys:
+        return 0
+    return db.execute(
+        delete(ScheduledTask).where(ScheduledTask.key.in_(keys)).execution_options(synchronize_session=False)
+    ).rowcount
+
+
+@event.listens_for(Session, "after_commit")
+def _notify_on_commit(session):
+    for due_at in session.info.pop("scheduled_due", []):
+        scheduler.notify(due_at)
+
+
+@event.listens_for(Session, "after_rollback")
+def _forget_on_rollback(session):
+    session.info.pop("scheduled_due", None)
+
+
+# Global instance
+scheduler = Scheduler()
+
+
+def register(kind: str, handler: Handler) -> None:
+    scheduler.register(kind, handler)
+
+
+def run_due_tasks() -> int:
+    return scheduler.run_due()
+
+
+def scheduler_metrics() -> Dict[str, Any]:
+    return scheduler.metrics()
+
+
+def start_scheduler() -> None:
+    """Start the scheduler worker (call from lifespan)."""
+    scheduler.start()
+
+
+def stop_scheduler() -> None:
+    """Stop the scheduler worker (call from lifespan)."""
+    scheduler.stop()
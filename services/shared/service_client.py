@@ -0,0 +1,304 @@
+"""
+Pooled HTTP clients for inter-service calls.
+
+One keep-alive ``httpx.AsyncClient`` per target service, so calls reuse
+open connections instead of paying TCP setup on every request.  Each
+call runs under a deadline, retries transient failures with jittered
+backoff, and goes through a per-target circuit breaker: once a target
+keeps failing, calls fail instantly (or return the caller's fallback)
+until a cool-down has passed and a probe call succeeds.
+
+Usage (in a service lifespan):
+    await start_clients()
+    yield
+    await close_clients()
+
+Usage (in a route):
+    response = await get_client("ai-service").post("/rank", json=payload, deadline=1.5)
+"""
+
+import asyncio
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, Optional
+
+import httpx
+
+from .config import Config
+
+
+# Known targets; services can register more with start_clients()
+SERVICE_TARGETS: Dict[str, str] = {
+    "ai-service": Config.AI_SERVICE_URL,
+    "blockchain-service": Config.BLOCKCHAIN_SERVICE_URL,
+    "safety-service": Config.SAFETY_SERVICE_URL,
+}
+
+# Latency samples kept per target for percentiles
+LATENCY_WINDOW = 256
+
+# Backoff base between retries (seconds); actual sleep is jittered
+RETRY_BACKOFF_SECONDS = 0.05
+
+
+class ServiceCallError(Exception):
+    """A call to another service failed after retries."""
+
+    def __init__(self, target: str, message: str):
+        super().__init__(f"{target}: {message}")
+        self.target = target
+
+
+class CircuitOpenError(ServiceCallError):
+    """The target's circuit is open; the call was not attempted."""
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker.
+
+    closed    → calls flow; *failure_threshold* failures in a row open it
+    open      → calls are rejected until *reset_seconds* have passed
+    half_open → one probe call is let through; success closes the
+                circuit, failure re-opens it
+    """
+
+    def __init__(self, failure_threshold: int, reset_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probing = False
+
+    def allow(self) -> bool:
+        """Return True if a call may be attempted now."""
+        if self.state == "closed":
+            return True
+        if self.state == "open":
+            if time.monotonic() - self._opened_at < self.reset_seconds:
+                return False
+            self.state = "half_open"
+        if self._probing:
+            return False
+        self._probing = True
+        return True
+
+    def record_success(self) -> None:
+        self.state = "closed"
+        self._failures = 0
+        self._probing = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        self._probing = False
+        if self.state == "half_open" or self._failures >= self.failure_threshold:
+            self.state = "open"
+            self._opened_at = time.monotonic()
+
+    def release(self) -> None:
+        """End a call that recorded no outcome (e.g. it was cancelled)."""
+        self._probing = False
+
+
+class ServiceClient:
+    """
+    Pooled client for one target service.
+
+    Args:
+        name: Target name used in metrics and errors
+        base_url: Target base URL
+        timeout: Default per-call deadline in seconds
+        retries: Extra attempts after the first for transient failures
+        max_connections: Connection pool size
+    """
+
+    def __init__(
+        self,
+        name: str,
+        base_url: str,
+        timeout: float = Config.SERVICE_CLIENT_TIMEOUT_SECONDS,
+        retries: int = Config.SERVICE_CLIENT_RETRIES,
+        max_connections: int = Config.SERVICE_CLIENT_MAX_CONNECTIONS,
+    ):
+        self.name = name
+        self.base_url = base_url
+        self.timeout = timeout
+        self.retries = retries
+        self.breaker = CircuitBreaker(Config.CIRCUIT_FAILURE_THRESHOLD, Config.CIRCUIT_RESET_SECONDS)
+        self._client = httpx.AsyncClient(
+            base_url=base_url,
+            timeout=timeout,
+            limits=httpx.Limits(
+                max_connections=max_connections,
+                max_keepalive_connections=max_connections,
+            ),
+        )
+
+        self.calls = 0
+        self.errors = 0
+        self.rejected = 0
+        self._latencies = deque(maxlen=LATENCY_WINDOW)
+
+    async def request(
+        self,
+        method: str,
+        path: str,
+        deadline: Optional[float] = None,
+        fallback: Optional[Callable[[], Any]] = None,
+        **kwargs,
+    ) -> Any:
+        """
+        Send a request with deadline, retries and circuit breaking.
+
+        Retries cover connection errors, timeouts and 5xx replies; 4xx
+        replies are returned to the caller as-is.
+
+        Args:
+            method: HTTP method
+            path: Path relative to the target's base URL
+            deadline: Total time budget in seconds, including retries
+            fallback: Called instead of raising when the call fails
+            **kwargs: Passed to ``httpx.AsyncClient.request``
+
+        Returns:
+            httpx.Response, or the fallback's result
+
+        Raises:
+            CircuitOpenError: Circuit is open and no fallback was given
+            ServiceCallError: Every attempt failed and no fallback was given
+        """
+        loop = asyncio.get_running_loop()
+        budget = self.timeout if deadline is None else deadline
+        expires = loop.time() + budget
+
+        if not self.breaker.allow():
+            self.rejected += 1
+            if fallback is not None:
+                return fallback()
+            raise CircuitOpenError(self.name, "circuit open")
+        probe = self.breaker.state == "half_open"
+
+        try:
+            last_error = "deadline exceeded"
+            for attempt in range(self.retries + 1):
+                remaining = expires - loop.time()
+                if remaining <= 0:
+                    break
+
+                started = time.perf_counter()
+                self.calls += 1
+                try:
+                    response = await asyncio.wait_for(
+                        self._client.request(method, path, timeout=remaining, **kwargs),
+                        timeout=remaining,
+                    )
+                except (httpx.TransportError, asyncio.TimeoutError) as e:
+                    last_error = type(e).__name__
+                else:
+                    self._latencies.append(time.perf_counter() - started)
+                    if response.status_code < 500:
+                        self.breaker.record_success()
+                        return response
+                    last_error = f"HTTP {response.status_code}"
+
+                self.errors += 1
+                if attempt < self.retries:
+                    # Full jitter, never sleeping past the deadline
+                    backoff = random.uniform(0, RETRY_BACKOFF_SECONDS * (2 ** attempt))
+                    await asyncio.sleep(min(backoff, max(expires - loop.time(), 0)))
+
+            self.breaker.record_failure()
+        finally:
+            # A cancelled probe (client disconnect, outer timeout) records
+            # no outcome; without this the circuit would stay shut forever
+            if probe:
+                self.breaker.release()
+
+        if fallback is not None:
+            return fallback()
+        raise ServiceCallError(self.name, last_error)
+
+    async def get(self, path: str, **kwargs) -> Any:
+        return await self.request("GET", path, **kwargs)
+
+    async def post(self, path: str, **kwargs) -> Any:
+        return await self.request("POST", path, **kwargs)
+
+    def metrics(self) -> Dict[str, Any]:
+        """Call counts, error rate, latency percentiles and circuit state."""
+        latencies = sorted(self._latencies)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(int(p * len(latencies)), len(latencies) - 1)] * 1000, 2)
+
+        return {
+            "calls": self.calls,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "error_rate": round(self.errors / self.calls, 4) if self.calls else 0.0,
+            "latency_p50_ms": percentile(0.50),
+            "latency_p95_ms": percentile(0.95),
+            "circuit": self.breaker.state,
+        }
+
+    async def close(self) -> None:
+        await self._client.aclose()
+
+
+# ── Per-process client registry ───────────────────────────────────────
+
+_clients: Dict[str, ServiceClient] = {}
+_lock = threading.Lock()
+
+
+async def start_clients(targets: Optional[Dict[str, str]] = None) -> None:
+    """
+    Create pooled clients for every known target (call from lifespan).
+
+    Args:
+        targets: Extra or overriding name → base URL entries
+    """
+    all_targets = dict(SERVICE_TARGETS)
+    all_targets.update(targets or {})
+    with _lock:
+        for name, base_url in all_targets.items():
+            if name not in _clients:
+                _clients[name] = ServiceClient(name, base_url)
+
+
+async def close_clients() -> None:
+    """Close every client and drop the registry (call from lifespan)."""
+    with _lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        await client.close()
+
+
+def get_client(name: str) -> ServiceClient:
+    """
+    Return the pooled client for a target.
+
+    Created on first use if the lifespan did not start it (e.g. in
+    scripts and tests).
+
+    Raises:
+        KeyError: If the target is unknown
+    """
+    with _lock:
+        client = _clients.get(name)
+        if client is None:
+            client = _clients[name] = ServiceClient(name, SERVICE_TARGETS[name])
+        return client
+
+
+def client_metrics() -> Dict[str, Dict[str, Any]]:
+    """Metrics for every active client, keyed by target name."""
+    with _lock:
+        clients = list(_clients.values())
+    return {client.name: client.metrics() for client in clients}
@@ -0,0 +1,174 @@
+"""
+Single-flight coalescing of identical concurrent reads.
+
+When many requests ask the same question at once — hundreds of
+caregivers polling the same broadcast job list — only the first
+(the leader) runs the query; the others wait for it and share its
+result.  An optional micro-TTL keeps a finished result for a fraction
+of a second so requests arriving just after also reuse it.
+
+    flight: Coalescer = Depends(coalesced(ttl=0.25))
+    jobs = flight.run(lambda: load_jobs(db), "broadcast", version)
+
+Keys are the route template plus normalized (sorted) path and query
+parameters, plus any extra parts the endpoint adds.  Include a data
+version in the extra parts whenever one is available, so a cached
+result can never be served for a newer version.
+
+Rules for shared functions:
+    * Return plain data (pydantic models, tuples, dicts), never ORM
+      objects — they are bound to the leader's session.
+    * Must not depend on the caller's identity unless that identity is
+      part of the key.
+
+Errors are shared with the requests waiting at that moment but are
+never cached.  Endpoints here are sync and run in the threadpool, so
+waiting uses threading primitives.
+"""
+
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+
+from fastapi import Request
+
+from .config import Config
+
+# Finished entries are pruned once a group holds this many keys
+_PRUNE_THRESHOLD = 1024
+
+
+class _Call:
+    __slots__ = ("done", "result", "error", "expires")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+        self.expires = 0.0
+
+
+class SingleFlight:
+    """
+    Coalesces concurrent calls that share a key.
+
+    Args:
+        ttl: Seconds a finished result stays reusable (0 = in-flight only)
+    """
+
+    def __init__(self, ttl: float = 0.0):
+        self.ttl = ttl
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.requests = 0
+        self.executions = 0
+        self.coalesced = 0
+        self.cache_hits = 0
+        self.errors = 0
+
+    def _prune(self, now: float) -> None:
+        for key in [k for k, c in self._calls.items() if c.done.is_set() and c.expires <= now]:
+            del self._calls[key]
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """Return fn(), sharing one execution among concurrent callers of *key*."""
+        with self._lock:
+            self.requests += 1
+            now = time.monotonic()
+            call = self._calls.get(key)
+            if call is not None and not call.done.is_set():
+                self.coalesced += 1
+                leader = False
+            elif call is not None and call.error is None and now < call.expires:
+                self.cache_hits += 1
+                return call.result
+            else:
+                if len(self._calls) >= _PRUNE_THRESHOLD:
+                    self._prune(now)
+                call = self._calls[key] = _Call()
+                self.executions += 1
+                leader = True
+
+        if not leader:
+            call.done.wait()
+        else:
+            try:
+                call.result = fn()
+            except BaseException as e:
+                call.error = e
+            finally:
+                call.expires = time.monotonic() + self.ttl
+                with self._lock:
+                    if call.error is not None:
+                        self.errors += 1
+                    if (call.error is not None or self.ttl <= 0) and self._calls.get(key) is call:
+                        del self._calls[key]
+                call.done.set()
+
+        if call.error is not None:
+            raise call.error
+        return call.result
+
+    def metrics(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "executions": self.executions,
+                "coalesced": self.coalesced,
+                "cache_hits": self.cache_hits,
+                "errors": self.errors,
+                "ttl_seconds": self.ttl,
+            }
+
+
+# Global registry: one group per route template
+_groups: Dict[str, SingleFlight] = {}
+_groups_lock = threading.Lock()
+
+
+def get_group(name: str, ttl: float = 0.0) -> SingleFlight:
+    group = _groups.get(name)
+    if group is None:
+        with _groups_lock:
+            group = _groups.setdefault(name, SingleFlight(ttl))
+    return group
+
+
+def singleflight_metrics() -> Dict[str, Dict[str, Any]]:
+    """Per-route request, execution and coalescing counts."""
+    with _groups_lock:
+        groups = dict(_groups)
+    return {name: group.metrics() for name, group in groups.items()}
+
+
+class Coalescer:
+    """A route's single-flight group plus the request's normalized key."""
+
+    def __init__(self, group: SingleFlight, base_key: Tuple):
+        self.group = group
+        self.base_key = base_key
+
+    def run(self, fn: Callable[[], Any], *key_parts: Hashable) -> Any:
+        return self.group.do(self.base_key + key_parts, fn)
+
+
+def coalesced(ttl: Optional[float] = None):
+    """
+    FastAPI dependency factory yielding a Coalescer for the current route.
+
+    Args:
+        ttl: Micro-TTL for finished results (default
+             Config.SINGLEFLIGHT_TTL_SECONDS)
+    """
+    ttl = Config.SINGLEFLIGHT_TTL_SECONDS if ttl is None else ttl
+
+    def _dependency(request: Request) -> Coalescer:
+        route = request.scope.get("route")
+        name = f"{request.method} {getattr(route, 'path', request.url.path)}"
+        key = (
+            tuple(sorted(request.path_params.items())),
+            tuple(sorted(request.query_params.multi_items())),
+        )
+        return Coalescer(get_group(name, ttl), key)
+
+    return _dependency
@@ -0,0 +1,300 @@
+"""
+Skill vocabulary and bitset-based skill matching.
+
+Caregiver skills are stored as free text ("elderly care", "elderly_care",
+"Elder Care" …).  This module folds those spellings and known synonyms
+onto one canonical name per skill, gives every canonical skill a small
+integer id, and encodes a skill list as a bitset of ``uint64`` words
+(bit *i* set ⇔ skill id *i* present).
+
+With every candidate encoded as a row of the same width, the model's
+``skill_match_score`` for a request is computed against all candidates
+at once using NumPy ``&`` / ``|`` and a byte popcount table — no Python
+loop over caregivers or skills.
+
+Metrics:
+    coverage = |required ∩ offered| / |required|   (default)
+    jaccard  = |required ∩ offered| / |required ∪ offered|
+
+Only caregiver skills register new ids.  Request skills are looked up
+without creating any, so clients cannot grow the vocabulary; a required
+skill nobody has ever offered still counts in |required|.
+"""
+
+import re
+import threading
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import numpy as np
+
+
+WORD_BITS = 64
+
+# Canonical skill → accepted alternative spellings.  Alternatives are
+# normalized with the same rules as input, so "Elder Care" and
+# "elder-care" both hit the "elder care" entry.
+DEFAULT_SYNONYMS: Dict[str, List[str]] = {
+    "elderly_care": ["elder care", "senior care", "geriatric care", "elderly", "old age care"],
+    "nursing": ["nurse", "nursing care"],
+    "mobility_assistance": ["mobility", "mobility support", "walking assistance"],
+    "physiotherapy": ["physio", "physical therapy"],
+    "dementia_care": ["dementia", "alzheimers care", "memory care"],
+    "medication_management": ["medication", "medicine management", "medication reminders"],
+    "wound_care": ["wound dressing"],
+    "companionship": ["companion"],
+    "assistance": ["general assistance", "daily assistance"],
+    "medical": ["medical care"],
+}
+
+# Number of set bits for every byte value, used to popcount uint64 words
+# through a uint8 view (np.bitwise_count needs NumPy 2.x).
+_POPCOUNT8 = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+_NON_ALNUM = re.compile(r"[^a-z0-9]+")
+
+
+def normalize_skill(skill: str) -> str:
+    """
+    Normalize free-text skill spelling.
+
+    Lower-cases and collapses every run of non-alphanumerics to a single
+    underscore: ``" Elderly  Care "`` → ``"elderly_care"``.
+    """
+    return _NON_ALNUM.sub("_", skill.strip().lower()).strip("_")
+
+
+def popcount(words: np.ndarray) -> np.ndarray:
+    """
+    Count set bits per row of a ``uint64`` bitset array.
+
+    Args:
+        words: Array of shape (..., n_words), dtype uint64
+
+    Returns:
+        Array of shape (...) with the number of set bits per row
+    """
+    words = np.ascontiguousarray(words, dtype=np.uint64)
+    as_bytes = words.view(np.uint8).reshape(words.shape[:-1] + (-1,))
+    return _POPCOUNT8[as_bytes].sum(axis=-1, dtype=np.int64)
+
+
+class SkillVocabulary:
+    """
+    Thread-safe mapping between skill spellings and integer ids.
+
+    Canonical skills from the synonym table are registered up front so
+    their ids are stable across processes; unseen skills get the next
+    free id on first use.  ``load`` lets a persisted id table (if any)
+    override the in-process assignment.
+    """
+
+    def __init__(self, synonyms: Optional[Dict[str, List[str]]] = None):
+        """
+        Initialize vocabulary.
+
+        Args:
+            synonyms: Canonical skill → alternative spellings
+        """
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}
+        self._names: Dict[int, str] = {}
+        self._aliases: Dict[str, str] = {}
+
+        for canonical, alternatives in (synonyms or DEFAULT_SYNONYMS).items():
+            name = normalize_skill(canonical)
+            self._register(name)
+            for alternative in alternatives:
+                self._aliases[normalize_skill(alternative)] = name
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    @property
+    def n_words(self) -> int:
+        """Bitset width (in uint64 words) covering every known id."""
+        top = max(self._names, default=-1)
+        return top // WORD_BITS + 1 if top >= 0 else 1
+
+    def _register(self, name: str, skill_id: Optional[int] = None) -> int:
+        """Assign *name* an id (caller holds the lock or is __init__)."""
+        if name in self._ids:
+            return self._ids[name]
+        if skill_id is None:
+            skill_id = max(self._names, default=-1) + 1
+        self._ids[name] = skill_id
+        self._names[skill_id] = name
+        return skill_id
+
+    def canonical(self, skill: str) -> str:
+        """Return the canonical name for any spelling of *skill*."""
+        name = normalize_skill(skill)
+        return self._aliases.get(name, name)
+
+    def id_for(self, skill: str, create: bool = True) -> Optional[int]:
+        """
+        Resolve *skill* to its integer id.
+
+        Args:
+            skill: Any spelling of the skill
+            create: Register unseen skills instead of returning None
+
+        Returns:
+            Skill id, or None for an unknown skill when create is False
+        """
+        name = self.canonical(skill)
+        skill_id = self._ids.get(name)
+        if skill_id is not None or not create or not name:
+            return skill_id
+        with self._lock:
+            return self._register(name)
+
+    def ids_for(self, skills: Iterable[str], create: bool = True) -> List[int]:
+        """Resolve a skill list to sorted, de-duplicated ids."""
+        ids = {self.id_for(skill, create=create) for skill in skills}
+        ids.discard(None)
+        return sorted(ids)
+
+    def name_for(self, skill_id: int) -> Optional[str]:
+        """Return the canonical name for *skill_id*."""
+        return self._names.get(skill_id)
+
+    def load(self, rows: Iterable[Sequence]) -> None:
+        """
+        Adopt persisted ``(skill_id, name)`` assignments.
+
+        Args:
+            rows: Iterable of (id, canonical name) pairs
+        """
+        with self._lock:
+            for skill_id, name in rows:
+                if self._ids.get(name) == skill_id:
+                    continue
+                old_id = self._ids.pop(name, None)
+                if old_id is not None:
+                    self._names.pop(old_id, None)
+                # The persisted table wins over an in-process assignment
+                previous_owner = self._names.get(skill_id)
+                if previous_owner is not None:
+                    self._ids.pop(previous_owner, None)
+                self._ids[name] = skill_id
+                self._names[skill_id] = name
+
+    def encode_ids(self, ids: Iterable[int], n_words: Optional[int] = None) -> np.ndarray:
+        """Encode skill ids as a bitset of *n_words* uint64 words."""
+        ids = list(ids)
+        needed = max(ids, default=0) // WORD_BITS + 1
+        n_words = max(n_words or self.n_words, needed)
+        words = np.zeros(n_words, dtype=np.uint64)
+        for skill_id in ids:
+            words[skill_id // WORD_BITS] |= np.uint64(1) << np.uint64(skill_id % WORD_BITS)
+        return words
+
+    def encode(self, skills: Iterable[str], n_words: Optional[int] = None) -> np.ndarray:
+        """Encode a skill list as a bitset (unknown skills are registered)."""
+        return self.encode_ids(self.ids_for(skills), n_words=n_words)
+
+    def encode_many(self, skill_lists: Iterable[Iterable[str]]) -> np.ndarray:
+        """
+        Encode many skill lists into one ``(n, n_words)`` bitset matrix.
+
+        Args:
+            skill_lists: One skill list per candidate
+
+        Returns:
+            uint64 array with one row per candidate
+        """
+        id_lists = [self.ids_for(skills) for skills in skill_lists]
+        n_words = self.n_words
+        matrix = np.zeros((len(id_lists), n_words), dtype=np.uint64)
+        for row, ids in enumerate(id_lists):
+            matrix[row] = self.encode_ids(ids, n_words=n_words)
+        return matrix
+
+    def decode(self, words: np.ndarray) -> List[str]:
+        """Return the canonical skill names set in a bitset."""
+        names = []
+        for word_index, word in enumerate(np.asarray(words, dtype=np.uint64)):
+            word = int(word)
+            while word:
+                low = word & -word
+                names.append(self._names[word_index * WORD_BITS + low.bit_length() - 1])
+                word ^= low
+        return names
+
+
+def _pad_words(matrix: np.ndarray, n_words: int) -> np.ndarray:
+    """Zero-pad the last axis of a bitset array to *n_words* words."""
+    missing = n_words - matrix.shape[-1]
+    if missing <= 0:
+        return matrix
+    pad = [(0, 0)] * (matrix.ndim - 1) + [(0, missing)]
+    return np.pad(matrix, pad)
+
+
+def skill_match_scores(
+    required: np.ndarray,
+    candidates: np.ndarray,
+    metric: str = "coverage",
+    unknown: int = 0,
+) -> np.ndarray:
+    """
+    Score one request's required skills against every candidate.
+
+    Args:
+        required: Bitset of required skills, shape (n_words,)
+        candidates: Candidate bitsets, shape (n_candidates, n_words)
+        metric: "coverage" or "jaccard"
+        unknown: Required skills outside the vocabulary (not in
+            *required*); they match no candidate but count as required
+
+    Returns:
+        float array of shape (n_candidates,) with scores in [0.0, 1.0]
+
+    Raises:
+        ValueError: On an unknown metric
+    """
+    candidates = np.atleast_2d(np.asarray(candidates, dtype=np.uint64))
+    required = np.asarray(required, dtype=np.uint64)
+    n_words = max(required.shape[-1], candidates.shape[-1])
+    required = _pad_words(required, n_words)
+    candidates = _pad_words(candidates, n_words)
+
+    overlap = popcount(candidates & required)
+    if metric == "coverage":
+        denominator = np.full(len(candidates), popcount(required) + unknown, dtype=np.int64)
+    elif metric == "jaccard":
+        denominator = popcount(candidates | required) + unknown
+    else:
+        raise ValueError(f"Unknown skill match metric: {metric}")
+
+    scores = np.zeros(len(candidates), dtype=float)
+    np.divide(overlap, denominator, out=scores, where=denominator > 0)
+    return scores
+
+
+# Process-wide vocabulary shared by all services
+vocabulary = SkillVocabulary()
+
+
+def score_candidates(
+    required_skills: Iterable[str],
+    candidate_skills: Iterable[Iterable[str]],
+    metric: str = "coverage",
+) -> np.ndarray:
+    """
+    Convenience wrapper: encode with the shared vocabulary and score.
+
+    Args:
+        required_skills: Skills requested by the civilian
+        candidate_skills: One skill list per candidate caregiver
+        metric: "coverage" or "jaccard"
+
+    Returns:
+        float array of skill_match_score values, one per candidate
+    """
+    # Look up only: request text must not register new skills
+    names = {vocabulary.canonical(skill) for skill in required_skills} - {""}
+    ids = vocabulary.ids_for(names, create=False)
+    candidates = vocabulary.encode_many(candidate_skills)
+    required = vocabulary.encode_ids(ids, n_words=candidates.shape[-1])
+    return skill_match_scores(required, candidates, metric=metric, unknown=len(names) - len(ids))
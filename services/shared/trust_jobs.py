@@ -0,0 +1,91 @@
+"""
+Trust score recompute jobs.
+
+A caregiver's trust score depends on verification, rating average and
+completed jobs.  Whenever one of them changes, a "trust.recompute" job
+is queued on the scheduler (shared.scheduler.enqueue) in the same
+transaction as the change, so it survives a crash of the process.
+Jobs are keyed per caregiver and wait TRUST_RECOMPUTE_DELAY_SECONDS
+before running: a burst of ratings for one caregiver collapses into a
+single recompute that sees all of them.  The same job regenerates the
+caregiver's Trust Passport (shared.trust_passport) if its inputs moved.
+
+Sources:
+    * submit_rating queues a job with the rating.
+    * The outbox consumer on_booking_event queues one when a job is
+      completed or rated, whichever service made the change.
+"""
+
+from typing import Any, Dict, Optional
+
+from sqlalchemy.orm import Session
+
+from .config import Config
+from .database import SessionLocal
+from .models import Booking, Caregiver, ScheduledTask
+from .scheduler import Scheduler, enqueue, scheduler as default_scheduler
+from .trust_passport import regenerate_passport
+
+TRUST_RECOMPUTE = "trust.recompute"
+
+# Booking states whose commit changes a caregiver's trust inputs
+TRUST_EVENT_STATUSES = ("completed", "rated")
+
+
+def recompute_trust_score(db: Session, caregiver_id: int) -> Optional[float]:
+    """Recompute one caregiver's trust score in the session (caller commits)."""
+    cg = db.get(Caregiver, caregiver_id)
+    if cg is None:
+        return None
+    completed = db.query(Booking).filter(
+        Booking.caregiver_id == caregiver_id, Booking.status == "completed"
+    ).count()
+    score = (
+        40.0 * int(cg.verified)
+        + 30.0 * (cg.rating_average / 5.0)
+        + 30.0 * min(completed / 10.0, 1.0)
+    )
+    cg.trust_score = round(score, 2)
+    return cg.trust_score
+
+
+def enqueue_trust_recompute(db: Session, caregiver_id: int) -> bool:
+    """
+    Queue a recompute for *caregiver_id* in the session's transaction.
+
+    Returns:
+        False if a waiting job for the caregiver absorbed it
+    """
+    return enqueue(
+        db,
+        TRUST_RECOMPUTE,
+        key=f"{TRUST_RECOMPUTE}:{caregiver_id}",
+        target_id=caregiver_id,
+        delay_seconds=Config.TRUST_RECOMPUTE_DELAY_SECONDS,
+    )
+
+
+def _run_recompute(db: Session, task: ScheduledTask) -> None:
+    recompute_trust_score(db, task.target_id)
+    regenerate_passport(db, task.target_id)
+    db.flush()
+
+
+def register_trust_jobs(scheduler: Optional[Scheduler] = None) -> None:
+    """Register the recompute handler with *scheduler* (default: the global one)."""
+    (scheduler or default_scheduler).register(TRUST_RECOMPUTE, _run_recompute)
+
+
+def on_booking_event(evt: Dict[str, Any], session_factory=SessionLocal) -> None:
+    """Outbox consumer: queue a recompute when a job completes or is rated."""
+    if evt["status"] not in TRUST_EVENT_STATUSES or not evt["caregiver_id"]:
+        return
+    db = session_factory()
+    try:
+        enqueue_trust_recompute(db, evt["caregiver_id"])
+        db.commit()
+    except Exception:
+        db.rollback()
+        raise
+    finally:
+        db.close()
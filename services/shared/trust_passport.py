@@ -0,0 +1,202 @@
+"""
+Trust Passport read model.
+
+A caregiver's Trust Passport is the explain_trust_score breakdown
+(verification, ratings, experience, penalties, level) together with the
+profile facts it is shown next to.  It is built on write, not on read:
+
+    * regenerate_passport hashes the caregiver's current inputs and only
+      writes a new version when that hash differs from the stored one,
+      so repeated recomputes of unchanged data are free.
+    * The document is stored as canonical JSON with a strong ETag (a
+      hash of the exact bytes), and served verbatim — a request is one
+      primary-key read and, for If-None-Match hits, not even the body.
+
+Regeneration runs in the transaction of whatever changed the inputs:
+the trust recompute job (ratings, completed jobs) and profile updates.
+A caregiver without a passport yet (new registration, rows from before
+this table) gets one built on first read.
+
+URLs:
+    .../passport             current version, Cache-Control: no-cache;
+                             Content-Location names the versioned URL
+    .../passport/{version}   that version only, immutable — cacheable
+                             forever because a version never changes
+
+complaints and anomaly_flags are not recorded anywhere yet and are
+passed as 0.
+"""
+
+import hashlib
+import json
+from datetime import datetime
+from typing import Any, Dict, Optional
+
+from fastapi import HTTPException, Request, Response
+from sqlalchemy import func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from .etag import etag_matches
+from .models import Booking, BookingArchive, Caregiver, Rating, TrustPassport
+from .trust_engine import explain_trust_score
+
+# Booking states that count as a job done
+COMPLETED_STATUSES = ("completed", "rated", "closed")
+
+# Versioned URLs never change content
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+CURRENT_CACHE_CONTROL = "no-cache"
+
+
+def _canonical(data: Dict[str, Any]) -> str:
+    return json.dumps(data, sort_keys=True, separators=(",", ":"), default=str)
+
+
+def passport_inputs(db: Session, caregiver: Caregiver) -> Dict[str, Any]:
+    """Everything a caregiver's passport is built from."""
+    completed = db.query(func.count()).select_from(Booking).filter(
+        Booking.caregiver_id == caregiver.id, Booking.status.in_(COMPLETED_STATUSES)
+    ).scalar()
+    completed += db.query(func.count()).select_from(BookingArchive).filter(
+        BookingArchive.caregiver_id == caregiver.id, BookingArchive.status == "closed"
+    ).scalar()
+    ratings = db.query(func.count()).select_from(Rating).filter(
+        Rating.caregiver_id == caregiver.id
+    ).scalar()
+    return {
+        "name": caregiver.name,
+        "experience_years": caregiver.experience_years or 0,
+        "skills": caregiver.skills,
+        "verified": bool(caregiver.verified),
+        "rating_average": round(caregiver.rating_average or 0.0, 2),
+        "total_ratings": ratings,
+        "completed_jobs": completed,
+        "complaints": 0,
+        "anomaly_flags": 0,
+    }
+
+
+def build_document(caregiver_id: int, inputs: Dict[str, Any], version: int,
+                   generated_at: datetime) -> str:
+    """Canonical JSON of one passport version."""
+    explained = explain_trust_score(
+        inputs["verified"],
+        # explain_trust_score maps ratings from [1, 5]; unrated starts at 1
+        max(inputs["rating_average"], 1.0),
+        inputs["completed_jobs"],
+        inputs["complaints"],
+        inputs["anomaly_flags"],
+    )
+    return _canonical({
+        "caregiver_id": caregiver_id,
+        "version": version,
+        "generated_at": generated_at.isoformat(),
+        "name": inputs["name"],
+        "experience_years": inputs["experience_years"],
+        "skills": inputs["skills"],
+        "total_ratings": inputs["total_ratings"],
+        **explained,
+    })
+
+
+def regenerate_passport(db: Session, caregiver_id: int) -> Optional[TrustPassport]:
+    """
+    Bring a caregiver's passport up to date in the session (caller commits).
+
+    Args:
+        db: Session the input change was made in
+        caregiver_id: Caregiver to regenerate
+
+    Returns:
+        The passport (unchanged if its inputs are), or None if there is
+        no such caregiver
+    """
+    caregiver = db.get(Caregiver, caregiver_id)
+    if caregiver is None:
+        return None
+    db.flush()  # the counts must see the caller's pending changes
+    inputs = passport_inputs(db, caregiver)
+    inputs_hash = hashlib.sha256(_canonical(inputs).encode()).hexdigest()
+
+    passport = db.get(TrustPassport, caregiver_id)
+    if passport is not None and passport.inputs_hash == inputs_hash:
+        return passport
+    if passport is None:
+        passport = TrustPassport(caregiver_id=caregiver_id, version=0)
+        db.add(passport)
+
+    passport.version += 1
+    passport.generated_at = datetime.utcnow()
+    passport.inputs_hash = inputs_hash
+    passport.document = build_document(caregiver_id, inputs, passport.version, passport.generated_at)
+    passport.etag = '"' + hashlib.sha256(passport.document.encode()).hexdigest()[:32] + '"'
+    return passport
+
+
+def backfill_passports(db: Session) -> None:
+    """Migration: build a passport for every caregiver that lacks one."""
+    missing = db.query(Caregiver.id).outerjoin(
+        TrustPassport, TrustPassport.caregiver_id == Caregiver.id
+    ).filter(TrustPassport.caregiver_id.is_(None)).all()
+    for (caregiver_id,) in missing:
+        regenerate_passport(db, caregiver_id)
+    if missing:
+        try:
+            db.commit()
+            print(f"Migration: built trust passports for {len(missing)} caregivers")
+        except IntegrityError:
+            # Another service built them at the same time
+            db.rollback()
+
+
+def passport_response(request: Request, db: Session, caregiver_id: int,
+                      version: Optional[int] = None) -> Response:
+    """
+    Serve a caregiver's stored passport.
+
+    Args:
+        request: Incoming request (If-None-Match is read from it)
+        db: Database session
+        caregiver_id: Whose passport
+        version: Serve this version only (immutable URL); None for current
+
+    Returns:
+        The stored document, or 304 if the client's copy is current
+
+    Raises:
+        HTTPException: 404 for an unknown caregiver or a superseded version
+    """
+    row = _current(db, caregiver_id, TrustPassport.version, TrustPassport.etag)
+    if row is None:
+        # First read of a caregiver that predates its passport
+        if regenerate_passport(db, caregiver_id) is None:
+            raise HTTPException(status_code=404, detail="Caregiver not found")
+        try:
+            db.commit()
+        except IntegrityError:
+            # A concurrent first read built it
+            db.rollback()
+        row = _current(db, caregiver_id, TrustPassport.version, TrustPassport.etag)
+
+    if etag_matches(request.headers.get("if-none-match"), row.etag) and version in (None, row.version):
+        return Response(status_code=304, headers=_headers(request, row, version))
+    # Re-read version and tag with the body so the three always agree
+    row = _current(db, caregiver_id, TrustPassport.version, TrustPassport.etag, TrustPassport.document)
+    if version is not None and version != row.version:
+        raise HTTPException(status_code=404, detail="Passport version superseded")
+    return Response(content=row.document, media_type="application/json",
+                    headers=_headers(request, row, version))
+
+
+def _current(db: Session, caregiver_id: int, *columns):
+    return db.query(*columns).filter(TrustPassport.caregiver_id == caregiver_id).first()
+
+
+def _headers(request: Request, row, version: Optional[int]) -> Dict[str, str]:
+    base = request.url.path.rstrip("/").rsplit("/passport", 1)[0]
+    return {
+        "ETag": row.etag,
+        "Cache-Control": IMMUTABLE_CACHE_CONTROL if version is not None else CURRENT_CACHE_CONTROL,
+        "Content-Location": f"{base}/passport/{row.version}",
+    }
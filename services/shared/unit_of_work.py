@@ -0,0 +1,84 @@
+"""
+Unit of work: one transaction and one commit per request.
+
+Every commit is an fsync in SQLite, so a handler that commits after
+each step (create the civilian, create the booking, …) pays for several
+round trips to the disk and can leave half its work behind on failure.
+Inside ``unit_of_work`` a handler only adds and flushes; the block
+commits once on success and rolls everything back on any exception.
+
+    with unit_of_work(db):
+        db.add(civilian)
+        db.add(booking)
+        db.flush()                       # ids are available from here
+        after_commit(db, lambda: notify(booking_id))
+
+Side effects that must only happen if the data is really written
+(audit rows, notifications) are registered with after_commit and run
+right after the commit; a rollback discards them.  They run after the
+transaction ended, so they must not use the session.
+
+Nested blocks join the outermost one; only it commits.  Inside
+``held_commit`` even the outermost block only flushes, and the holder
+commits — that is how a wrapper such as shared.idempotency writes its
+own rows in the same transaction as the handler it runs.
+"""
+
+from contextlib import contextmanager
+from typing import Callable, Iterator
+
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+_ACTIVE_KEY = "unit_of_work_active"
+_CALLBACKS_KEY = "unit_of_work_after_commit"
+_HOLD_KEY = "unit_of_work_hold"
+
+
+@contextmanager
+def unit_of_work(db: Session) -> Iterator[Session]:
+    """Run the block in one transaction; commit once at the end."""
+    if db.info.get(_ACTIVE_KEY):
+        yield db
+        return
+    db.info[_ACTIVE_KEY] = True
+    try:
+        yield db
+        if db.info.get(_HOLD_KEY):
+            db.flush()
+        else:
+            db.commit()
+    except BaseException:
+        db.rollback()
+        raise
+    finally:
+        db.info.pop(_ACTIVE_KEY, None)
+
+
+@contextmanager
+def held_commit(db: Session) -> Iterator[Session]:
+    """Make unit_of_work blocks inside flush, not commit; the caller commits."""
+    db.info[_HOLD_KEY] = True
+    try:
+        yield db
+    finally:
+        db.info.pop(_HOLD_KEY, None)
+
+
+def after_commit(db: Session, callback: Callable[[], None]) -> None:
+    """Run *callback* once the current transaction commits (dropped on rollback)."""
+    db.info.setdefault(_CALLBACKS_KEY, []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_callbacks(session):
+    for callback in session.info.pop(_CALLBACKS_KEY, []):
+        try:
+            callback()
+        except Exception as e:
+            print(f"after_commit callback failed: {e}")
+
+
+@event.listens_for(Session, "after_rollback")
+def _drop_callbacks(session):
+    session.info.pop(_CALLBACKS_KEY, None)
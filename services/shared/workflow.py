@@ -7,9 +7,34 @@ on illegal moves.  Used by all endpoints that change booking status.
 State diagram:
     PENDING → MATCHED → CONFIRMED → IN_PROGRESS → COMPLETED → RATED → CLOSED
     Any state → CANCELLED  (always allowed)
+
+Two ways to move a booking:
+    transition_booking   – check and mutate a loaded Booking in memory
+                           (the caller commits)
+    claim_transition     – one conditional UPDATE … RETURNING that only
+                           matches if the row is still in an allowed
+                           predecessor state and free or owned by the
+                           caller; concurrent callers race on the row
+                           and exactly one wins, with no SELECT first
+                           and no locks held in Python; moving a booking
+                           into a blocking state also requires the caregiver
+                           to have no overlapping blocking booking, checked
+                           in the same UPDATE
 """
 
+from typing import Optional
+
 from fastapi import HTTPException, status
+from sqlalchemy import and_, case, or_, select, update
+from sqlalchemy.orm import Session
+
+from .changes import next_change_seq
+from .conflicts import BLOCKING_STATUSES, claim_would_overlap, find_conflict
+from .models import Booking
+from .outbox import record_booking_change
+
+# Caregiver id of bookings broadcast to every caregiver
+BROADCAST_CAREGIVER_ID = 0
 
 
 # Legal state transitions  (current → set of allowed targets)
@@ -33,7 +58,8 @@ def transition_booking(booking, target_state: str) -> None:
     Attempt to move *booking* to *target_state*.
 
     Mutates ``booking.status`` in place on success.
-    Raises HTTP 409 Conflict on an illegal transition.
+    Raises HTTP 409 Conflict on an illegal transition.  Once the caller
+    commits, the change is published through the outbox (shared.outbox).
 
     Args:
         booking:      SQLAlchemy Booking instance (must have `.status`)
@@ -61,3 +87,120 @@ def transition_booking(booking, target_state: str) -> None:
 def get_allowed_transitions(current_state: str) -> list[str]:
     """Return the list of states reachable from *current_state*."""
     return sorted(_TRANSITIONS.get(current_state, set()))
+
+
+def predecessors(target_state: str) -> list[str]:
+    """Return the states from which *target_state* is reachable."""
+    return sorted(state for state, targets in _TRANSITIONS.items() if target_state in targets)
+
+
+def claim_transition(
+    db: Session,
+    booking_id: int,
+    target_state: str,
+    caregiver_id: int,
+    where=(),
+    values: Optional[dict] = None,
+) -> Booking:
+    """
+    Atomically move a booking to *target_state* on behalf of a caregiver.
+
+    Issues a single statement:
+
+        UPDATE bookings
+           SET status = :target, caregiver_id = :me,
+               reassigned = (caregiver_id != :me OR reassigned),
+               change_seq = :next_change, ...values
+         WHERE id = :id
+           AND status IN (:predecessors)
+           AND caregiver_id IN (0, :me)
+           AND ...where
+        RETURNING *
+
+    A broadcast booking (caregiver_id = 0) is claimed by whoever's
+    UPDATE lands first; everyone else matches zero rows.  When the
+    target state blocks the caregiver's time and the booking does not
+    already, the WHERE also requires that :me has no overlapping
+    blocking booking (claim_would_overlap), so a caregiver cannot be
+    double-booked by racing accepts or by a civilian confirm landing in
+    another process.  The caller commits.
+
+    Args:
+        db:           Database session
+        booking_id:   Booking to move
+        target_state: Desired next state
+        caregiver_id: Acting caregiver
+        where:        Extra conditions the row must satisfy
+        values:       Extra columns to set in the same statement
+
+    Returns:
+        The updated Booking (identity map refreshed)
+
+    Raises:
+        HTTPException 404 if the booking does not exist, 409 if another
+        caregiver holds it, the caregiver is booked at that time, or its
+        state does not allow the move.
+    """
+    allowed_from = predecessors(target_state)
+    if target_state in BLOCKING_STATUSES:
+        already_held = and_(Booking.caregiver_id == caregiver_id, Booking.status.in_(BLOCKING_STATUSES))
+        where = (*where, or_(already_held, ~claim_would_overlap(caregiver_id)))
+    stmt = (
+        update(Booking)
+        .where(
+            Booking.id == booking_id,
+            Booking.status.in_(allowed_from),
+            Booking.caregiver_id.in_([BROADCAST_CAREGIVER_ID, caregiver_id]),
+            *where,
+        )
+        .values(
+            status=target_state,
+            caregiver_id=caregiver_id,
+            reassigned=case((Booking.caregiver_id != caregiver_id, True), else_=Booking.reassigned),
+            change_seq=next_change_seq(db),
+            **(values or {}),
+        )
+        .returning(Booking)
+        .execution_options(synchronize_session=False, populate_existing=True)
+    )
+    booking = db.execute(stmt).scalars().first()
+    if booking is not None:
+        # Bulk UPDATEs skip flush hooks; tell the conflict cache and the
+        # outbox directly
+        db.info.setdefault("conflict_caregivers", set()).add(caregiver_id)
+        record_booking_change(db, booking)
+        return booking
+
+    # Lost the race or illegal move: one read to explain why
+    row = db.execute(
+        select(Booking.status, Booking.caregiver_id, Booking.start_time, Booking.end_time)
+        .where(Booking.id == booking_id)
+    ).first()
+    if row is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Booking not found")
+    current, owner, start, end = row
+    if owner not in (BROADCAST_CAREGIVER_ID, caregiver_id):
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=f"Booking {booking_id} is already taken by another caregiver",
+        )
+    if current not in allowed_from:
+        raise HTTPException(
+            status_code=status.HTTP_409_CONFLICT,
+            detail=(
+                f"Cannot transition booking {booking_id} "
+                f"from '{current}' to '{target_state}'. "
+                f"Allowed targets: {get_allowed_transitions(current) or 'none (terminal state)'}"
+            ),
+        )
+    if target_state in BLOCKING_STATUSES:
+        conflict = find_conflict(db, caregiver_id, start, end, exclude_booking_id=booking_id, verify=True)
+        if conflict is not None:
+            raise HTTPException(
+                status_code=status.HTTP_409_CONFLICT,
+                detail=f"Caregiver {caregiver_id} is already booked at that time (booking {conflict})",
+            )
+    raise HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail=f"Booking {booking_id} is not ready to move to '{target_state}'",
+    )
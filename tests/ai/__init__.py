@@ -0,0 +1,3 @@
+"""
+AI matching service tests package.
+"""
@@ -0,0 +1,64 @@
+"""
+Tests for tree-path contribution explanations in CaregiverMatcher.
+
+Checks that the precomputed per-node deltas reproduce the forest's own
+predictions and that ranking attaches explanations to the top K only.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+AI_SERVICE_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'ai-service')
+sys.path.insert(0, AI_SERVICE_DIR)
+sys.path.insert(0, os.path.join(AI_SERVICE_DIR, 'model'))
+
+from model.predict import CaregiverMatcher, FEATURE_REASONS
+from model.synthetic_data import generate_synthetic_dataset
+
+
+@pytest.fixture(scope="module")
+def matcher():
+    """Small forest fitted on synthetic data (no model file needed)."""
+    X, y = generate_synthetic_dataset(300)
+    forest = RandomForestRegressor(n_estimators=10, max_depth=6, random_state=0)
+    forest.fit(X, y)
+    return CaregiverMatcher(model=forest)
+
+
+@pytest.fixture
+def caregivers():
+    X, _ = generate_synthetic_dataset(20)
+    return X.to_dict(orient="records")
+
+
+def test_contributions_sum_to_prediction(matcher, caregivers):
+    """bias + contributions must equal the forest's prediction."""
+    predictions, bias, contributions = matcher.explain(caregivers)
+
+    expected = matcher.model.predict(matcher._feature_frame(caregivers))
+    np.testing.assert_allclose(predictions, expected)
+    np.testing.assert_allclose(bias + contributions.sum(axis=1), expected)
+
+
+def test_rank_explains_top_k_only(matcher, caregivers):
+    """Only the returned top K carry explanations, sorted by score."""
+    ranked = matcher.rank_caregivers(caregivers, top_k=3, explain=True)
+
+    assert len(ranked) == 3
+    scores = [cg["match_score"] for cg in ranked]
+    assert scores == sorted(scores, reverse=True)
+    for cg in ranked:
+        assert cg["ai_reason"] in FEATURE_REASONS.values()
+        assert set(cg["explanation"]["contributions"]) == set(matcher.feature_names)
+
+
+def test_rank_matches_single_predictions(matcher, caregivers):
+    """Batched ranking agrees with the per-caregiver predict path."""
+    ranked = matcher.rank_caregivers([dict(cg) for cg in caregivers])
+
+    for cg in ranked:
+        assert cg["match_score"] == pytest.approx(matcher.predict_match_score(cg))
@@ -0,0 +1,3 @@
+"""
+Caregiver API tests package.
+"""
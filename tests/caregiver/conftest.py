@@ -0,0 +1,6 @@
+"""
+Fixtures for caregiver-api tests: the same isolated in-memory database
+as the shared module tests.
+"""
+
+from tests.shared.conftest import db, engine, session_factory  # noqa: F401
@@ -0,0 +1,70 @@
+"""
+Tests for the caregiver-api incremental change feed.
+
+Imports caregiver-api's ``routes`` package for this module only, as
+test_job_board does.
+"""
+
+import importlib
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+from shared.models import AuthIdentity, Booking, Caregiver, Civilian
+from shared.workflow import claim_transition
+
+CAREGIVER_API_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'caregiver-api')
+
+
+@pytest.fixture(scope="module")
+def routes():
+    before = set(sys.modules)
+    sys.path.insert(0, CAREGIVER_API_DIR)
+    try:
+        yield importlib.import_module("routes.caregiver")
+    finally:
+        sys.path.remove(CAREGIVER_API_DIR)
+        for name in set(sys.modules) - before:
+            if name.split(".")[0] in ("routes", "schemas"):
+                del sys.modules[name]
+
+
+def _seed(db):
+    db.add_all([
+        AuthIdentity(id=11, phone_number="11", role="caregiver"),
+        AuthIdentity(id=12, phone_number="12", role="caregiver"),
+        Caregiver(id=0, hashed_identity="hash_broadcast", name="Broadcast", skills=[]),
+        Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[], identity_id=11),
+        Caregiver(id=2, hashed_identity="hash_2", name="cg2", skills=[], identity_id=12),
+        Civilian(id=1, name="Asha", guardian_contact="g@example.com"),
+    ])
+    start = datetime.utcnow() + timedelta(days=1)
+    offer = Booking(caregiver_id=0, civilian_id=1, start_time=start,
+                    end_time=start + timedelta(hours=2), status="confirmed")
+    db.add(offer)
+    db.commit()
+    return offer
+
+
+def _sync(routes, db, identity_id, since):
+    return routes.get_changes(since=since, limit=100, db=db, user={"identity_id": identity_id})
+
+
+def test_offer_claimed_elsewhere_is_sent_as_removal(routes, db):
+    offer = _seed(db)
+    first = _sync(routes, db, 11, 0)
+    assert [b.id for b in first.bookings] == [offer.id] and first.removed == []
+
+    claim_transition(db, offer.id, "accepted", caregiver_id=2)
+    db.commit()
+
+    mine = _sync(routes, db, 11, first.next_cursor)
+    assert (mine.bookings, mine.removed) == ([], [offer.id])
+    theirs = _sync(routes, db, 12, first.next_cursor)
+    assert ([b.id for b in theirs.bookings], theirs.removed) == ([offer.id], [])
+
+    # Nothing new: the removal is not repeated
+    again = _sync(routes, db, 11, mine.next_cursor)
+    assert (again.bookings, again.removed) == ([], [])
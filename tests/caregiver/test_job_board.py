@@ -0,0 +1,85 @@
+"""
+Tests for the caregiver-api in-memory job board.
+
+The caregiver-api ``routes`` and ``schemas`` packages share their names
+with civilian-api's, so they are imported for this module only and
+removed from sys.modules afterwards.
+"""
+
+import importlib
+import os
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+from shared.models import Booking, Caregiver, Civilian
+from shared.outbox import OutboxDispatcher
+
+CAREGIVER_API_DIR = os.path.join(os.path.dirname(__file__), '..', '..', 'services', 'caregiver-api')
+
+
+@pytest.fixture(scope="module")
+def job_board():
+    before = set(sys.modules)
+    sys.path.insert(0, CAREGIVER_API_DIR)
+    try:
+        yield importlib.import_module("routes.job_board")
+    finally:
+        sys.path.remove(CAREGIVER_API_DIR)
+        for name in set(sys.modules) - before:
+            if name.split(".")[0] in ("routes", "schemas"):
+                del sys.modules[name]
+
+
+def _seed(db):
+    db.add_all([
+        Caregiver(id=0, hashed_identity="hash_broadcast", name="Broadcast", skills=[]),
+        Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[]),
+        Caregiver(id=2, hashed_identity="hash_2", name="cg2", skills=[]),
+        Civilian(id=1, name="Asha", guardian_contact="g@example.com"),
+        Civilian(id=2, name="Ravi", guardian_contact="g@example.com"),
+        Civilian(id=3, name="Meena", guardian_contact="g@example.com"),
+    ])
+    db.commit()
+
+
+def _book(db, caregiver_id, day, civilian_id):
+    start = datetime.utcnow() + timedelta(days=day)
+    booking = Booking(caregiver_id=caregiver_id, civilian_id=civilian_id, start_time=start,
+                      end_time=start + timedelta(hours=2), status="confirmed")
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def test_board_tracks_transitions_incrementally(job_board, db, session_factory):
+    _seed(db)
+    broadcast = _book(db, 0, 1, civilian_id=1)
+    assigned = _book(db, 2, 2, civilian_id=2)
+
+    board = job_board.JobBoard(session_factory=session_factory)
+    dispatcher = OutboxDispatcher(session_factory=session_factory)
+    dispatcher.subscribe("test:jobboard", board.apply)
+    dispatcher.poll_once()
+
+    assert [job.id for job in board.pending(1)] == [broadcast.id]
+    assert [job.id for job in board.pending(2)] == [broadcast.id, assigned.id]
+    assert board.pending(2)[0].civilian_name == "Asha"
+    v1, v2 = board.version(1), board.version(2)
+
+    # Caregiver 1 claims the broadcast job: both boards change
+    broadcast.caregiver_id, broadcast.status = 1, "accepted"
+    db.commit()
+    dispatcher.poll_once()
+    assert board.pending(1) == []
+    assert [job.id for job in board.pending(2)] == [assigned.id]
+    assert board.version(1) != v1 and board.version(2) != v2
+
+    # A change to caregiver 2's set leaves caregiver 1's version alone
+    v1 = board.version(1)
+    new = _book(db, 2, 3, civilian_id=3)
+    dispatcher.poll_once()
+    assert [job.id for job in board.pending(2)] == [assigned.id, new.id]
+    assert board.version(1) == v1
+    assert board.metrics()["applied_events"] == 2
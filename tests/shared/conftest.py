@@ -0,0 +1,51 @@
+"""
+Fixtures for shared module tests.
+
+Each test gets its own in-memory SQLite database with the full schema,
+so these tests never touch the services' sevasetu.db.
+"""
+
+import sys
+import os
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'services'))
+
+from shared.database import Base
+import shared.models  # noqa: F401  (registers every table on Base)
+
+
+@pytest.fixture
+def engine():
+    """Isolated in-memory engine with foreign keys enabled."""
+    test_engine = create_engine(
+        "sqlite://",
+        connect_args={"check_same_thread": False},
+        poolclass=StaticPool,
+    )
+
+    @event.listens_for(test_engine, "connect")
+    def _pragma(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA foreign_keys=ON")
+        cursor.close()
+
+    Base.metadata.create_all(bind=test_engine)
+    yield test_engine
+    test_engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
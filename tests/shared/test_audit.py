@@ -0,0 +1,90 @@
+"""
+Tests for the buffered audit log writer.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import func, select
+
+from shared.audit import AuditWriter
+from shared.models.audit import list_partitions, month_key, partition_table
+
+
+def _rows(db):
+    table = partition_table(month_key(datetime.utcnow()))
+    if month_key(datetime.utcnow()) not in list_partitions(db.get_bind()):
+        return []
+    return db.execute(select(table).order_by(table.c.id)).all()
+
+
+def test_rows_wait_in_the_queue_until_flushed(db, session_factory):
+    writer = AuditWriter(session_factory=session_factory, batch_size=2, sync=False)
+    writer._ensure_started = lambda: None  # drive flushes by hand
+
+    for i in range(5):
+        assert writer.log(1, "booking_created", "booking", i)
+    assert _rows(db) == []
+
+    assert writer.flush() == 5
+    assert [r.entity_id for r in _rows(db)] == [0, 1, 2, 3, 4]
+    assert writer.metrics()["batches"] == 3
+    assert writer.metrics()["queued"] == 0
+
+
+def test_full_queue_applies_backpressure_then_drops(db, session_factory):
+    writer = AuditWriter(session_factory=session_factory, queue_size=2, block_ms=0, sync=False)
+    writer._ensure_started = lambda: None
+
+    results = [writer.log(1, "job_started", "booking", i) for i in range(3)]
+    assert results == [True, True, False]
+    metrics = writer.metrics()
+    assert metrics["dropped"] == 1 and metrics["backpressure"] == 1
+
+    writer.flush()
+    assert len(_rows(db)) == 2
+
+
+def test_failed_batch_is_retried(db, session_factory, engine):
+    writer = AuditWriter(session_factory=session_factory, sync=False)
+    writer._ensure_started = lambda: None
+    writer.log(1, "job_ended", "booking", 7)
+    writer.log(1, "job_ended", "booking", 8)
+    writer.flush()
+
+    # Partition vanishes behind the writer's back
+    table = partition_table(month_key(datetime.utcnow()))
+    table.drop(engine)
+    writer.log(1, "job_ended", "booking", 9)
+    assert writer.flush() == 0
+    assert writer.metrics()["write_errors"] == 1
+    table.create(engine)
+
+    assert writer.flush() == 1
+    assert [r.entity_id for r in _rows(db)] == [9]
+
+
+def test_background_thread_and_sync_mode(db, session_factory):
+    writer = AuditWriter(session_factory=session_factory, flush_ms=10, sync=False)
+    writer.log(1, "booking_confirmed", "booking", 1)
+    writer.stop()
+    assert len(_rows(db)) == 1
+
+    sync = AuditWriter(session_factory=session_factory, sync=True)
+    sync.log(1, "rating_submitted", "rating", 2)
+    assert len(_rows(db)) == 2
+
+
+def test_bad_row_is_rejected_without_blocking_the_rest(db, session_factory):
+    writer = AuditWriter(session_factory=session_factory, batch_size=10, sync=False)
+    writer._ensure_started = lambda: None
+    writer.log(1, "job_started", "booking", 1)
+    writer.log(1, None, "booking", 2)          # violates NOT NULL on action
+    writer.log(1, "job_ended", "booking", 3)
+
+    assert writer.flush() == 2
+    assert [r.entity_id for r in _rows(db)] == [1, 3]
+    metrics = writer.metrics()
+    assert (metrics["rejected"], metrics["queued"]) == (1, 0)
+
+    writer.log(1, "job_paused_safety", "booking", 4)
+    assert writer.flush() == 1
@@ -0,0 +1,102 @@
+"""
+Tests for monthly audit partitions and archival of cold months.
+"""
+
+import json
+from datetime import datetime
+
+from sqlalchemy import event, insert, select, text
+
+from shared.audit_archive import archive_partition, cutoff_month, read_archive, run_retention
+from shared.models.audit import ensure_partition, list_partitions, migrate_legacy_audit
+
+
+def _fill(engine, month, count, day_of=lambda i: 1 + i % 28):
+    table = ensure_partition(engine, month)
+    year, mon = int(month[:4]), int(month[4:])
+    rows = [
+        {"user_id": i % 3, "action": "job_started", "entity": "booking", "entity_id": i,
+         "detail": None, "timestamp": datetime(year, mon, day_of(i), 12, 0, i % 60)}
+        for i in range(count)
+    ]
+    with engine.begin() as conn:
+        conn.execute(insert(table), rows)
+    return rows
+
+
+def test_legacy_rows_move_into_monthly_partitions(db, engine):
+    db.execute(text(
+        "INSERT INTO audit_logs (user_id, action, entity, timestamp) VALUES "
+        "(1, 'login', 'identity', '2026-01-05 10:00:00'), (2, 'login', 'identity', '2026-02-07 10:00:00')"
+    ))
+    db.commit()
+
+    migrate_legacy_audit(db)
+    assert list_partitions(engine) == ["202601", "202602"]
+    assert db.execute(text("SELECT COUNT(*) FROM audit_logs")).scalar() == 0
+    assert db.execute(text("SELECT user_id FROM audit_logs_202602")).scalar() == 2
+
+
+def test_archive_writes_blocks_and_drops_the_table(engine, tmp_path):
+    _fill(engine, "202601", 25, day_of=lambda i: 1 + i)
+
+    assert archive_partition(engine, "202601", str(tmp_path), block_rows=10) == 25
+    assert "202601" not in list_partitions(engine)
+
+    entries = [json.loads(line) for line in open(tmp_path / "audit_202601.idx")]
+    assert [e.get("rows") for e in entries] == [10, 10, 5, 25]
+    assert entries[-1]["sealed"]
+
+    rows = list(read_archive("202601", directory=str(tmp_path)))
+    assert [r["entity_id"] for r in rows] == list(range(25))
+
+    # Days 12-13 live in the second block only
+    window = list(read_archive("202601", datetime(2026, 1, 12), datetime(2026, 1, 14), str(tmp_path)))
+    assert [r["entity_id"] for r in window] == [11, 12]
+
+
+def test_rows_inserted_during_export_are_archived_once(engine, tmp_path):
+    _fill(engine, "202601", 5)
+    inserted = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _late_insert(conn, cursor, statement, *args):
+        # A row lands after the stats query, just as the export starts
+        if statement.startswith("SELECT") and "ORDER BY" in statement and not inserted:
+            inserted.append(True)
+            cursor.connection.execute(
+                "INSERT INTO audit_logs_202601 (user_id, action, entity, entity_id, timestamp) "
+                "VALUES (9, 'login', 'identity', 99, '2026-01-20 10:00:00')"
+            )
+            cursor.connection.commit()
+
+    assert archive_partition(engine, "202601", str(tmp_path)) == 5
+    assert "202601" in list_partitions(engine)
+    assert archive_partition(engine, "202601", str(tmp_path)) == 1
+    ids = [r["entity_id"] for r in read_archive("202601", directory=str(tmp_path))]
+    assert ids == [0, 1, 2, 3, 4, 99]
+
+
+def test_late_rows_append_a_new_run_and_torn_tails_are_cut(engine, tmp_path):
+    _fill(engine, "202601", 5)
+    archive_partition(engine, "202601", str(tmp_path))
+    _fill(engine, "202601", 3)
+
+    # Simulate a crash mid-run: an unsealed block and stray bytes
+    with open(tmp_path / "audit_202601.idx", "a") as f:
+        f.write(json.dumps({"run": "x", "offset": 0, "length": 1, "rows": 1}) + "\n")
+    with open(tmp_path / "audit_202601.ndjson.gz", "ab") as f:
+        f.write(b"garbage")
+
+    assert archive_partition(engine, "202601", str(tmp_path)) == 3
+    assert len(list(read_archive("202601", directory=str(tmp_path)))) == 8
+
+
+def test_retention_keeps_the_hot_window(engine, tmp_path):
+    for month in ("202605", "202606", "202607", "202608"):
+        _fill(engine, month, 2)
+
+    assert cutoff_month(datetime(2026, 8, 15), 3) == "202606"
+    archived = run_retention(engine, now=datetime(2026, 8, 15), hot_months=3, directory=str(tmp_path))
+    assert archived == {"202605": 2}
+    assert list_partitions(engine) == ["202606", "202607", "202608"]
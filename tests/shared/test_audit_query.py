@@ -0,0 +1,66 @@
+"""
+Tests for keyset-paginated and streaming audit queries.
+"""
+
+from datetime import datetime
+
+from sqlalchemy import insert, inspect
+
+from shared.audit_archive import archive_partition
+from shared.audit_query import iter_audit, query_audit
+from shared.models.audit import ensure_partition
+
+
+def _log(engine, entries):
+    """entries: (user_id, entity_id, timestamp)"""
+    for user_id, entity_id, ts in entries:
+        table = ensure_partition(engine, ts.strftime("%Y%m"))
+        with engine.begin() as conn:
+            conn.execute(insert(table), [{
+                "user_id": user_id, "action": "job_started", "entity": "booking",
+                "entity_id": entity_id, "detail": None, "timestamp": ts,
+            }])
+
+
+def test_partitions_carry_the_composite_indexes(engine):
+    ensure_partition(engine, "202603")
+    names = {ix["name"] for ix in inspect(engine).get_indexes("audit_logs_202603")}
+    assert {"ix_audit_logs_202603_user_ts", "ix_audit_logs_202603_entity_ts"} <= names
+
+
+def test_pages_follow_the_cursor_across_months(engine):
+    same = datetime(2026, 3, 31, 23, 0)
+    _log(engine, [
+        (1, 10, datetime(2026, 3, 5)),
+        (2, 11, datetime(2026, 3, 6)),
+        (1, 12, same),
+        (1, 13, same),  # tie on timestamp, broken by id
+        (1, 14, datetime(2026, 4, 1, 1, 0)),
+        (1, 15, datetime(2026, 4, 2)),
+    ])
+
+    seen, cursor = [], None
+    while True:
+        rows, cursor = query_audit(engine, user_id=1, cursor=cursor, limit=2)
+        seen.append([r["entity_id"] for r in rows])
+        if cursor is None:
+            break
+    assert seen == [[10, 12], [13, 14], [15]]
+
+    rows, _ = query_audit(engine, entity="booking", entity_id=11)
+    assert [r["user_id"] for r in rows] == [2]
+
+    rows, _ = query_audit(engine, start=datetime(2026, 3, 31), end=datetime(2026, 4, 2))
+    assert [r["entity_id"] for r in rows] == [12, 13, 14]
+
+
+def test_export_streams_archived_and_live_rows(engine, tmp_path):
+    _log(engine, [(1, n, datetime(2026, 1, 1 + n)) for n in range(5)])
+    archive_partition(engine, "202601", str(tmp_path), block_rows=2)
+    _log(engine, [(1, 9, datetime(2026, 2, 1)), (2, 8, datetime(2026, 2, 2))])
+
+    live = [r["entity_id"] for r in iter_audit(engine, user_id=1)]
+    assert live == [9]
+
+    everything = list(iter_audit(engine, user_id=1, include_archived=True, archive_dir=str(tmp_path)))
+    assert [r["entity_id"] for r in everything] == [0, 1, 2, 3, 4, 9]
@@ -0,0 +1,39 @@
+"""
+Tests for the role-checking auth dependencies.
+"""
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from shared.auth.dependencies import require_role
+from shared.security.jwt_handler import create_access_token
+
+
+@pytest.fixture
+def client():
+    app = FastAPI()
+
+    @app.get("/admin")
+    def admin(user=Depends(require_role("admin"))):
+        return user
+
+    @app.get("/civilian")
+    def civilian(user=Depends(require_role("civilian"))):
+        return user
+
+    return TestClient(app)
+
+
+def _get(client, path, token):
+    return client.get(path, headers={"Authorization": f"Bearer {token}"})
+
+
+def test_demo_tokens_cannot_reach_admin_routes(client):
+    assert _get(client, "/admin", "demo_token_sevasetu_admin").status_code == 403
+    assert _get(client, "/civilian", "demo_token_sevasetu_civilian").status_code == 200
+
+    token = create_access_token(7, "admin", None)  # no session to look up
+    response = _get(client, "/admin", token)
+    assert response.status_code == 200
+    assert response.json()["identity_id"] == 7
@@ -0,0 +1,67 @@
+"""
+Tests for the slot-bitmap availability calendar.
+"""
+
+from datetime import date, datetime, time
+
+from shared.availability import (
+    BYTES_PER_DAY,
+    decode_ranges,
+    encode_ranges,
+    free_mask,
+    set_calendar,
+    window_masks,
+)
+from shared.models import Caregiver
+
+
+MONDAY = date(2026, 10, 19)
+
+
+def _caregiver(db, name):
+    cg = Caregiver(hashed_identity=f"hash_{name}", name=name, skills=["nursing"], verified=True)
+    db.add(cg)
+    db.commit()
+    return cg
+
+
+def test_ranges_round_trip():
+    bitmap = encode_ranges([(time(9, 0), time(12, 30)), (time(22, 0), time(0, 0))])
+    assert len(bitmap) == BYTES_PER_DAY
+    assert decode_ranges(bitmap) == [(time(9, 0), time(12, 30)), (time(22, 0), time(0, 0))]
+
+    # Partial slots are not offered
+    assert decode_ranges(encode_ranges([(time(9, 10), time(9, 50))])) == [(time(9, 15), time(9, 45))]
+
+
+def test_window_masks_span_midnight():
+    masks = window_masks(datetime(2026, 10, 19, 23, 0), datetime(2026, 10, 20, 1, 5))
+    assert [day for day, _ in masks] == [MONDAY, date(2026, 10, 20)]
+    assert decode_ranges(masks[0][1]) == [(time(23, 0), time(0, 0))]
+    assert decode_ranges(masks[1][1]) == [(time(0, 0), time(1, 15))]
+
+
+def test_free_mask_uses_template_overrides_and_default(db):
+    weekday_nine_to_five = _caregiver(db, "nine_to_five")
+    no_calendar = _caregiver(db, "no_calendar")
+    on_leave = _caregiver(db, "on_leave")
+
+    office = encode_ranges([(time(9, 0), time(17, 0))])
+    set_calendar(db, weekday_nine_to_five.id, weekly={day: office for day in range(5)})
+    set_calendar(db, on_leave.id, weekly={day: office for day in range(5)},
+                 overrides={MONDAY: encode_ranges([])})
+    db.commit()
+
+    ids = [weekday_nine_to_five.id, no_calendar.id, on_leave.id]
+
+    morning = free_mask(db, ids, datetime(2026, 10, 19, 10, 0), datetime(2026, 10, 19, 12, 0))
+    assert morning.tolist() == [True, True, False]
+
+    evening = free_mask(db, ids, datetime(2026, 10, 19, 16, 0), datetime(2026, 10, 19, 18, 0))
+    assert evening.tolist() == [False, True, False]
+
+    saturday = free_mask(db, ids, datetime(2026, 10, 24, 10, 0), datetime(2026, 10, 24, 12, 0))
+    assert saturday.tolist() == [False, True, False]
+
+    tuesday = free_mask(db, ids, datetime(2026, 10, 20, 10, 0), datetime(2026, 10, 20, 12, 0))
+    assert tuesday.tolist() == [True, True, True]
@@ -0,0 +1,74 @@
+"""
+Tests for the bookings hot/cold split and the one-active-booking index.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+import shared.changes  # noqa: F401  (stamps change_seq on flush)
+from shared.booking_archive import archive_bookings, booking_history, find_booking
+from shared.models import Booking, BookingArchive, Caregiver, Civilian
+from shared.models.booking import violates_active_civilian
+
+
+@pytest.fixture
+def people(db):
+    db.add(Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[]))
+    db.add_all([Civilian(id=i, name=f"civ{i}", guardian_contact="g@example.com") for i in (1, 2)])
+    db.commit()
+
+
+def _book(db, civilian_id, days_ago, status):
+    start = datetime.utcnow() - timedelta(days=days_ago)
+    booking = Booking(caregiver_id=1, civilian_id=civilian_id, start_time=start,
+                      end_time=start + timedelta(hours=2), status=status)
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def test_one_active_booking_per_civilian(db, people):
+    _book(db, 1, 90, "closed")
+    _book(db, 1, 60, "cancelled")
+    _book(db, 1, -1, "confirmed")
+    _book(db, 2, -1, "pending")
+
+    with pytest.raises(IntegrityError) as exc:
+        _book(db, 1, -2, "pending")
+    db.rollback()
+    assert violates_active_civilian(exc.value)
+
+    # Other integrity errors are not mistaken for it
+    db.add(Civilian(id=2, name="dup", guardian_contact="g@example.com"))
+    with pytest.raises(IntegrityError) as exc:
+        db.commit()
+    db.rollback()
+    assert not violates_active_civilian(exc.value)
+
+    # Finishing the active booking frees the civilian to book again
+    active = db.query(Booking).filter_by(civilian_id=1, status="confirmed").one()
+    active.status = "closed"
+    db.commit()
+    _book(db, 1, -2, "pending")
+
+
+def test_old_terminal_bookings_move_in_batches(db, people):
+    old = [_book(db, 1, 90 - i, "closed").id for i in range(5)]
+    recent = _book(db, 1, 2, "cancelled").id
+    active = _book(db, 2, 100, "completed").id
+    newest = _book(db, 1, 95, "rejected").id  # highest id: never moved
+
+    assert archive_bookings(db, after_days=30, batch_size=2) == 5
+    assert {b.id for b in db.query(BookingArchive)} == set(old)
+    assert {b.id for b in db.query(Booking)} == {recent, active, newest}
+    assert archive_bookings(db, after_days=30) == 0
+
+    archived = find_booking(db, old[0])
+    assert isinstance(archived, BookingArchive) and archived.status == "closed"
+    assert archived.change_seq is not None
+
+    history = booking_history(db, civilian_id=1)
+    assert [b.id for b in history] == [newest] + old + [recent]
+    assert [b.id for b in booking_history(db, civilian_id=1, include_archived=False)] == [newest, recent]
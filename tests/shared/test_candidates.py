@@ -0,0 +1,75 @@
+"""
+Tests for the caregiver_skills inverted index and SQL candidate retrieval.
+"""
+
+from shared.candidates import find_candidates
+from shared.migrations import run_migrations
+from shared.models import Caregiver, CaregiverSkill
+
+
+def _caregiver(db, name, skills, verified=True, gender="Female", trust=50.0):
+    cg = Caregiver(
+        hashed_identity=f"hash_{name}",
+        name=name,
+        gender=gender,
+        skills=skills,
+        verified=verified,
+        trust_score=trust,
+    )
+    db.add(cg)
+    db.commit()
+    return cg
+
+
+def _indexed_skill_count(db, caregiver_id):
+    return db.query(CaregiverSkill).filter(CaregiverSkill.caregiver_id == caregiver_id).count()
+
+
+def test_index_follows_skills_setter(db):
+    """Inserts and updates through Caregiver.skills keep rows in sync."""
+    cg = _caregiver(db, "sync", ["elderly care", "nursing"])
+    assert _indexed_skill_count(db, cg.id) == 2
+
+    cg.skills = ["nursing"]
+    db.commit()
+    assert _indexed_skill_count(db, cg.id) == 1
+
+    db.delete(cg)
+    db.commit()
+    assert db.query(CaregiverSkill).count() == 0
+
+
+def test_any_and_all_matching(db):
+    """Matching folds spellings and honours any/all semantics."""
+    both = _caregiver(db, "both", ["elderly_care", "nursing"], trust=60.0)
+    one = _caregiver(db, "one", ["Elder Care"], trust=90.0)
+    _caregiver(db, "other", ["companionship"])
+
+    any_match = find_candidates(db, ["elderly care", "nurse"])
+    assert [(cg.id, n) for cg, n in any_match] == [(both.id, 2), (one.id, 1)]
+
+    all_match = find_candidates(db, ["elderly care", "nurse"], match="all")
+    assert [cg.id for cg, _ in all_match] == [both.id]
+
+    assert find_candidates(db, ["nursing", "astrophysics"], match="all") == []
+
+
+def test_verified_and_gender_filters(db):
+    _caregiver(db, "unverified", ["nursing"], verified=False)
+    male = _caregiver(db, "male", ["nursing"], gender="Male")
+
+    results = find_candidates(db, ["nursing"], gender="male")
+    assert [cg.id for cg, _ in results] == [male.id]
+
+    results = find_candidates(db, ["nursing"], verified=None)
+    assert len(results) == 2
+
+
+def test_migration_backfills_existing_rows(engine, db):
+    """Rows written before the index existed are picked up on migration."""
+    cg = _caregiver(db, "legacy", ["wound care"])
+    db.query(CaregiverSkill).delete()
+    db.commit()
+
+    run_migrations(bind=engine)
+    assert _indexed_skill_count(db, cg.id) == 1
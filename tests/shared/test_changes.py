@@ -0,0 +1,78 @@
+"""
+Tests for change-number stamping and the incremental change feed.
+"""
+
+from datetime import datetime, timedelta
+
+from shared.changes import changes_since, current_change_seq, ensure_sequence
+from shared.models import Booking, Caregiver, Civilian
+from shared.workflow import claim_transition
+
+
+def _people(db):
+    db.add(Caregiver(id=0, hashed_identity="hash_broadcast", name="Broadcast", skills=[]))
+    db.add(Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[]))
+    db.add(Civilian(id=1, name="civ1", guardian_contact="g@example.com"))
+    db.add(Civilian(id=2, name="civ2", guardian_contact="g@example.com"))
+    db.commit()
+
+
+def _book(db, civilian_id, caregiver_id=1, day=1, status="confirmed"):
+    start = datetime.utcnow() + timedelta(days=day)
+    booking = Booking(caregiver_id=caregiver_id, civilian_id=civilian_id, start_time=start,
+                      end_time=start + timedelta(hours=2), status=status)
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def test_every_write_gets_a_higher_number(db):
+    _people(db)
+    cg = db.get(Caregiver, 1)
+    first = cg.change_seq
+
+    booking = _book(db, 1)
+    assert booking.change_seq > first
+
+    cg.name = "renamed"
+    db.commit()
+    assert cg.change_seq > booking.change_seq
+
+    claimed = _book(db, 2, caregiver_id=0, day=2)  # not overlapping cg1's booking
+    before = claimed.change_seq
+    claim_transition(db, claimed.id, "accepted", caregiver_id=1)
+    db.commit()
+    assert claimed.change_seq > before
+    assert current_change_seq(db) == claimed.change_seq
+
+
+def test_feed_pages_by_cursor_and_filters_by_owner(db):
+    _people(db)
+    # Past bookings: a civilian has only one active booking at a time
+    mine = [_book(db, 1, day=d, status="closed") for d in range(1, 6)]
+    _book(db, 2)
+
+    rows, cursor, more = changes_since(db, Booking, 0, 3, Booking.civilian_id == 1)
+    assert [b.id for b in rows] == [b.id for b in mine[:3]] and more
+    rows, cursor, more = changes_since(db, Booking, cursor, 3, Booking.civilian_id == 1)
+    assert [b.id for b in rows] == [b.id for b in mine[3:]] and not more
+
+    # Caught up: cursor jumps past other civilians' changes
+    assert cursor == current_change_seq(db)
+    assert changes_since(db, Booking, cursor, 3, Booking.civilian_id == 1)[0] == []
+
+    mine[1].status = "cancelled"
+    db.commit()
+    rows, _, _ = changes_since(db, Booking, cursor, 3, Booking.civilian_id == 1)
+    assert [(b.id, b.status) for b in rows] == [(mine[1].id, "cancelled")]
+
+
+def test_ensure_sequence_backfills_unstamped_rows(db):
+    _people(db)
+    booking = _book(db, 1)
+    db.query(Booking).update({Booking.change_seq: None})
+    db.commit()
+
+    ensure_sequence(db)
+    db.refresh(booking)
+    assert booking.change_seq == current_change_seq(db)
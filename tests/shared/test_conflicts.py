@@ -0,0 +1,107 @@
+"""
+Tests for booking conflict detection and its interval cache.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import insert
+
+from shared import conflicts
+from shared.conflicts import ensure_no_conflict, find_conflict
+from shared.models import Booking, Caregiver, Civilian
+
+
+@pytest.fixture
+def cg(db):
+    conflicts._cache.clear()
+    caregiver = Caregiver(hashed_identity="hash_cg", name="cg", skills=["nursing"], verified=True)
+    db.add(caregiver)
+    db.commit()
+    return caregiver
+
+
+def _book(db, cg, start, hours, status="confirmed"):
+    # A civilian holds one active booking at a time; book for a fresh one
+    civ = Civilian(name="civ", guardian_contact="g@example.com")
+    db.add(civ)
+    db.flush()
+    booking = Booking(caregiver_id=cg.id, civilian_id=civ.id, start_time=start,
+                      end_time=start + timedelta(hours=hours), status=status)
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def _tomorrow(hour):
+    day = datetime.utcnow().date() + timedelta(days=1)
+    return datetime.combine(day, datetime.min.time()) + timedelta(hours=hour)
+
+
+def test_overlaps_found_from_cache(db, cg):
+    long_shift = _book(db, cg, _tomorrow(8), 8)        # 08:00-16:00
+    _book(db, cg, _tomorrow(10), 1)                     # 10:00-11:00
+    _book(db, cg, _tomorrow(18), 2, status="cancelled")
+
+    assert find_conflict(db, cg.id, _tomorrow(12), _tomorrow(13)) == long_shift.id
+    assert find_conflict(db, cg.id, _tomorrow(16), _tomorrow(17)) is None
+    assert find_conflict(db, cg.id, _tomorrow(18), _tomorrow(19)) is None
+    assert cg.id in conflicts._cache._entries
+
+    # Broadcast placeholder never conflicts
+    assert find_conflict(db, 0, _tomorrow(12), _tomorrow(13)) is None
+
+
+def test_commits_invalidate_the_cache(db, cg):
+    booking = _book(db, cg, _tomorrow(9), 2)
+    assert find_conflict(db, cg.id, _tomorrow(10), _tomorrow(11)) == booking.id
+
+    booking.status = "cancelled"
+    db.commit()
+    assert cg.id not in conflicts._cache._entries
+    assert find_conflict(db, cg.id, _tomorrow(10), _tomorrow(11)) is None
+
+    again = _book(db, cg, _tomorrow(10), 1)
+    assert find_conflict(db, cg.id, _tomorrow(10), _tomorrow(11)) == again.id
+
+
+def test_outside_horizon_uses_bounded_query(db, cg):
+    far = datetime.utcnow() + timedelta(days=conflicts.CONFLICT_CACHE_DAYS + 30)
+    booking = _book(db, cg, far, 3)
+
+    assert find_conflict(db, cg.id, far + timedelta(hours=1), far + timedelta(hours=5)) == booking.id
+    assert find_conflict(db, cg.id, far + timedelta(hours=1), far + timedelta(hours=2),
+                         exclude_booking_id=booking.id) is None
+
+
+def test_ensure_no_conflict_raises(db, cg):
+    _book(db, cg, _tomorrow(9), 2)
+
+    with pytest.raises(HTTPException) as exc:
+        ensure_no_conflict(db, cg.id, _tomorrow(10), _tomorrow(12))
+    assert exc.value.status_code == 409
+
+    with pytest.raises(HTTPException) as exc:
+        ensure_no_conflict(db, cg.id, _tomorrow(12), _tomorrow(12) + timedelta(days=3))
+    assert exc.value.status_code == 422
+
+    ensure_no_conflict(db, cg.id, _tomorrow(11), _tomorrow(12))
+
+
+
+def test_ensure_no_conflict_does_not_trust_a_stale_free_entry(db, cg):
+    assert find_conflict(db, cg.id, _tomorrow(10), _tomorrow(11)) is None  # cached as free
+
+    # Another process fills the slot: a plain INSERT this cache never hears of
+    civ = Civilian(name="civ", guardian_contact="g@example.com")
+    db.add(civ)
+    db.commit()
+    db.execute(insert(Booking).values(caregiver_id=cg.id, civilian_id=civ.id, start_time=_tomorrow(10),
+                                      end_time=_tomorrow(11), status="accepted"))
+    db.commit()
+    assert cg.id in conflicts._cache._entries
+
+    with pytest.raises(HTTPException) as exc:
+        ensure_no_conflict(db, cg.id, _tomorrow(10), _tomorrow(11))
+    assert exc.value.status_code == 409
@@ -0,0 +1,71 @@
+"""
+Tests for version-based ETags and conditional GET handling.
+"""
+
+from datetime import datetime, timedelta
+
+from fastapi import FastAPI, Request, Response
+from fastapi.testclient import TestClient
+
+from shared.etag import check_etag, collection_version, etag_matches, make_etag
+from shared.models import Booking, Caregiver, Civilian
+
+
+def test_etag_matching():
+    etag = make_etag("booking", 7, 12, None)
+    assert etag == 'W/"booking-7-12-0"'
+    assert etag_matches('W/"booking-7-12-0"', etag)
+    assert etag_matches('"other", "booking-7-12-0"', etag)
+    assert etag_matches("*", etag)
+    assert not etag_matches('W/"booking-7-13-0"', etag)
+    assert not etag_matches(None, etag)
+
+
+def test_collection_version_tracks_membership(db):
+    db.add_all([
+        Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[]),
+        Caregiver(id=2, hashed_identity="hash_2", name="cg2", skills=[]),
+        Civilian(id=1, name="civ1", guardian_contact="g@example.com"),
+        Civilian(id=2, name="civ2", guardian_contact="g@example.com"),
+    ])
+    db.commit()
+    start = datetime.utcnow() + timedelta(days=1)
+    older, newer = [
+        Booking(caregiver_id=1, civilian_id=d + 1, start_time=start + timedelta(days=d),
+                end_time=start + timedelta(days=d, hours=1), status="confirmed")
+        for d in (0, 1)
+    ]
+    db.add_all([older, newer])
+    db.commit()
+
+    mine = Booking.caregiver_id == 1
+    before = collection_version(db, Booking, mine)
+    assert before == (newer.change_seq, 2)
+
+    # The older row leaves the set without raising the set's max
+    older.caregiver_id = 2
+    db.commit()
+    assert collection_version(db, Booking, mine) != before
+
+
+def test_check_etag_returns_304():
+    app = FastAPI()
+    version = {"value": 1}
+
+    @app.get("/thing")
+    def thing(request: Request, response: Response):
+        not_modified = check_etag(request, response, make_etag("thing", version["value"]))
+        if not_modified is not None:
+            return not_modified
+        return {"value": version["value"]}
+
+    client = TestClient(app)
+    first = client.get("/thing")
+    assert first.status_code == 200 and first.headers["cache-control"] == "no-cache"
+
+    again = client.get("/thing", headers={"If-None-Match": first.headers["etag"]})
+    assert again.status_code == 304 and again.content == b""
+
+    version["value"] = 2
+    changed = client.get("/thing", headers={"If-None-Match": first.headers["etag"]})
+    assert changed.status_code == 200 and changed.json() == {"value": 2}
@@ -0,0 +1,43 @@
+"""
+Tests for the booking event hub and the SSE stream.
+"""
+
+import asyncio
+import json
+
+from shared import events
+
+
+def test_sse_stream_frames_and_filters():
+    async def run():
+        stream = events.sse_stream(lambda evt: evt["booking_id"] == 7,
+                                   initial=[{"booking_id": 7, "status": "confirmed"}])
+        first = await stream.__anext__()
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        events.publish({"event_id": 41, "booking_id": 8, "status": "accepted"})
+        events.publish({"event_id": 42, "booking_id": 7, "status": "accepted"})
+        second = await asyncio.wait_for(pending, timeout=1)
+        await stream.aclose()
+        return first, second
+
+    first, second = asyncio.run(run())
+    assert first.startswith("event: booking\ndata: ")
+    assert second.startswith("event: booking\nid: 42\n")
+    payload = json.loads(second.split("data: ", 1)[1])
+    assert payload == {"event_id": 42, "booking_id": 7, "status": "accepted"}
+    assert events.hub.subscriber_count == 0
+
+
+def test_sse_stream_view_trims_events():
+    async def run():
+        stream = events.sse_stream(lambda evt: True, view=lambda evt: {"booking_id": evt["booking_id"]})
+        pending = asyncio.ensure_future(stream.__anext__())
+        await asyncio.sleep(0)
+        events.publish({"event_id": 43, "booking_id": 9, "status": "accepted", "civilian_id": 3})
+        frame = await asyncio.wait_for(pending, timeout=1)
+        await stream.aclose()
+        return frame
+
+    frame = asyncio.run(run())
+    assert json.loads(frame.split("data: ", 1)[1]) == {"booking_id": 9}
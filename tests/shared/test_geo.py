@@ -0,0 +1,97 @@
+"""
+Tests for geohash location indexing and nearby caregiver retrieval.
+"""
+
+import numpy as np
+
+from shared import candidates as geo_candidates
+from shared.candidates import find_candidates, find_nearby
+from shared.config import Config
+from shared.geo import (
+    covering_prefixes,
+    distance_scores,
+    encode_geohash,
+    haversine_km,
+    nearest,
+    parse_location,
+)
+from shared.models import Caregiver
+
+
+# Bengaluru city centre and points at known distances from it
+CENTRE = (12.9716, 77.5946)
+
+
+def _caregiver(db, name, lat, lng, skills=("nursing",), radius=None):
+    cg = Caregiver(hashed_identity=f"hash_{name}", name=name, skills=list(skills), verified=True)
+    cg.set_home_location(lat, lng, service_radius_km=radius)
+    db.add(cg)
+    db.commit()
+    return cg
+
+
+def test_encode_geohash_known_value():
+    assert encode_geohash(57.64911, 10.40744, 11) == "u4pruydqqvj"
+
+
+def test_haversine_matches_known_distance():
+    # Bengaluru → Chennai is roughly 290 km
+    distance = haversine_km(*CENTRE, [13.0827], [80.2707])[0]
+    assert 280 < distance < 300
+
+
+def test_covering_cells_contain_points_in_radius():
+    lat, lng = CENTRE
+    prefixes = covering_prefixes(lat, lng, 5.0)
+    for angle in np.linspace(0, 2 * np.pi, 16, endpoint=False):
+        p_lat = lat + 0.04 * np.cos(angle)   # ~4.4 km
+        p_lng = lng + 0.04 * np.sin(angle)
+        assert any(encode_geohash(p_lat, p_lng).startswith(p) for p in prefixes)
+
+
+def test_distance_scores_fall_off_with_distance():
+    scores = distance_scores(np.array([0.0, 5.0, 20.0, np.nan]), 10.0)
+    assert scores.tolist() == [1.0, 0.5, 0.0, 0.5]
+
+
+def test_find_nearby_orders_by_distance_and_respects_radius(db):
+    far = _caregiver(db, "far", 13.0827, 80.2707)
+    mid = _caregiver(db, "mid", 12.99, 77.60)
+    close = _caregiver(db, "close", 12.972, 77.595)
+    _caregiver(db, "homebody", 12.98, 77.59, radius=0.5)
+
+    results = find_nearby(db, *CENTRE, radius_km=10.0, k=5)
+    assert [cg.id for cg, _ in results] == [close.id, mid.id]
+    assert far.id not in {cg.id for cg, _ in results}
+
+
+def test_find_candidates_near_is_nearest_first(db):
+    close = _caregiver(db, "close", 12.972, 77.595, skills=("nursing",))
+    both = _caregiver(db, "both", 12.99, 77.60, skills=("nursing", "wound care"))
+    _caregiver(db, "remote", 28.6139, 77.2090, skills=("nursing", "wound care"))
+
+    results = find_candidates(db, ["nursing", "wound care"], near=(*CENTRE, 10.0))
+    assert [(cg.id, n) for cg, n in results] == [(close.id, 1), (both.id, 2)]
+
+
+def test_parse_location():
+    assert parse_location("12.97, 77.59") == (12.97, 77.59)
+    assert parse_location("MG Road, Bengaluru") is None
+    assert parse_location("100,0") is None
+    assert parse_location(None) is None
+
+
+def test_nearby_queries_load_a_bounded_nearest_set(db, monkeypatch):
+    monkeypatch.setattr(Config, "GEO_SCAN_LIMIT", 3)
+    # A dense cluster just outside the radius, in the same cells
+    for i in range(10):
+        _caregiver(db, f"edge{i}", 13.08 + i * 0.001, 77.5946)
+    inside = [_caregiver(db, f"in{i}", 12.972 + i * 0.01, 77.595) for i in range(5)]
+
+    loaded = []
+    monkeypatch.setattr(geo_candidates, "nearest",
+                        lambda *args, **kwargs: loaded.append(len(args[2])) or nearest(*args, **kwargs))
+    results = find_nearby(db, *CENTRE, radius_km=10.0, k=2)
+    assert [cg.id for cg, _ in results] == [inside[0].id, inside[1].id]
+    # Only the three nearest rows were loaded
+    assert loaded == [3]
@@ -0,0 +1,122 @@
+"""
+Tests for Idempotency-Key handling (claim, replay, release, purge).
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import event
+
+from shared.idempotency import IdempotencyStore, purge_expired, request_fingerprint
+from shared.models import Civilian, IdempotencyRecord
+from shared.unit_of_work import unit_of_work
+
+KEY = "1:/civilian/submit-rating:abc"
+
+
+@pytest.fixture
+def store():
+    return IdempotencyStore(ttl_seconds=3600, cache_size=10, claim_timeout_seconds=60)
+
+
+def test_fingerprint_ignores_json_key_order():
+    a = request_fingerprint("POST", "/x", b'{"a": 1, "b": 2}')
+    b = request_fingerprint("POST", "/x", b'{"b":2,"a":1}')
+    assert a == b
+    assert a != request_fingerprint("POST", "/x", b'{"a": 1, "b": 3}')
+
+
+def test_retry_is_replayed_without_running_the_handler(db, store):
+    calls = []
+
+    def handler():
+        calls.append(1)
+        return {"rating_id": len(calls)}
+
+    assert store.run(db, KEY, "fp", 201, handler) == {"rating_id": 1}
+    replay = store.run(db, KEY, "fp", 201, handler)
+    assert replay.status_code == 201
+    assert replay.body == b'{"rating_id":1}'
+    assert replay.headers["Idempotent-Replayed"] == "true"
+
+    # From the table once the front cache is gone
+    store.forget()
+    assert store.run(db, KEY, "fp", 201, handler).body == b'{"rating_id":1}'
+    assert calls == [1]
+    assert store.metrics()["cache_hits"] == 1
+    assert store.metrics()["db_hits"] == 1
+
+
+def test_same_key_different_request_is_rejected(db, store):
+    store.run(db, KEY, "fp", 201, lambda: {"ok": True})
+    with pytest.raises(HTTPException) as err:
+        store.run(db, KEY, "other", 201, lambda: {"ok": True})
+    assert err.value.status_code == 422
+
+
+def test_failed_handler_releases_the_key(db, store):
+    def failing():
+        raise HTTPException(status_code=404, detail="Caregiver not found")
+
+    with pytest.raises(HTTPException):
+        store.run(db, KEY, "fp", 201, failing)
+    assert db.get(IdempotencyRecord, KEY) is None
+    assert store.run(db, KEY, "fp", 201, lambda: {"ok": True}) == {"ok": True}
+
+
+def test_unfinished_claim_blocks_until_stale(db, store):
+    started = datetime.utcnow()
+    db.add(IdempotencyRecord(key=KEY, fingerprint="fp", created_at=started,
+                             expires_at=started + timedelta(hours=1)))
+    db.commit()
+    with pytest.raises(HTTPException) as err:
+        store.run(db, KEY, "fp", 201, lambda: {"ok": True})
+    assert err.value.status_code == 409
+
+    # A claim older than the timeout belonged to a request that died
+    record = db.get(IdempotencyRecord, KEY)
+    record.created_at = started - timedelta(minutes=5)
+    db.commit()
+    assert store.run(db, KEY, "fp", 201, lambda: {"ok": True}) == {"ok": True}
+
+
+def test_handler_writes_and_response_commit_together(db, engine, store):
+    def handler():
+        with unit_of_work(db):
+            db.add(Civilian(name="civ", guardian_contact="g@example.com"))
+        return {"ok": True}
+
+    # The commit that carries the stored response fails (disk full, crash…)
+    storing = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _watch(conn, cursor, statement, parameters, context, executemany):
+        if statement.startswith("UPDATE idempotency_keys SET status_code"):
+            storing.append(1)
+
+    @event.listens_for(db, "before_commit")
+    def _fail(session):
+        if storing:
+            storing.clear()
+            raise RuntimeError("commit failed")
+
+    with pytest.raises(RuntimeError):
+        store.run(db, KEY, "fp", 201, handler)
+    event.remove(db, "before_commit", _fail)
+
+    # Nothing half-done: no civilian, and the key is free for the retry
+    assert db.query(Civilian).count() == 0
+    assert db.get(IdempotencyRecord, KEY) is None
+    assert store.run(db, KEY, "fp", 201, handler) == {"ok": True}
+    assert db.query(Civilian).count() == 1
+
+
+def test_purge_removes_only_expired_records(db, store):
+    store.run(db, KEY, "fp", 201, lambda: {"ok": True})
+    store.run(db, KEY + "2", "fp", 201, lambda: {"ok": True})
+    db.get(IdempotencyRecord, KEY).expires_at = datetime.utcnow() - timedelta(seconds=1)
+    db.commit()
+
+    assert purge_expired(db) == 1
+    assert [r.key for r in db.query(IdempotencyRecord)] == [KEY + "2"]
@@ -0,0 +1,90 @@
+"""
+Tests for the booking event outbox and its dispatcher.
+"""
+
+from datetime import datetime, timedelta
+
+from shared.models import Booking, BookingEvent, Caregiver, Civilian, ConsumerOffset
+from shared.outbox import OutboxDispatcher
+from shared.workflow import claim_transition, transition_booking
+
+
+def _seed(db, caregiver_id=0):
+    db.add(Caregiver(id=0, hashed_identity="hash_broadcast", name="Broadcast", skills=[]))
+    db.add(Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[]))
+    db.add(Civilian(id=1, name="civ", guardian_contact="g@example.com"))
+    start = datetime.utcnow() + timedelta(days=1)
+    booking = Booking(caregiver_id=caregiver_id, civilian_id=1, start_time=start,
+                      end_time=start + timedelta(hours=2), status="confirmed")
+    db.add(booking)
+    db.commit()
+    return booking
+
+
+def _statuses(db):
+    return [(e.booking_id, e.status, e.caregiver_id) for e in db.query(BookingEvent).order_by(BookingEvent.id)]
+
+
+def test_events_written_with_commit_only(db):
+    booking = _seed(db, caregiver_id=1)
+    assert _statuses(db) == [(booking.id, "confirmed", 1)]
+
+    transition_booking(booking, "accepted")
+    db.flush()
+    db.rollback()
+    assert _statuses(db) == [(booking.id, "confirmed", 1)]
+
+    transition_booking(booking, "accepted")
+    db.commit()
+    booking.payment_status = "paid"   # not a state change
+    db.commit()
+    assert _statuses(db) == [(booking.id, "confirmed", 1), (booking.id, "accepted", 1)]
+
+
+def test_claim_transition_writes_event(db):
+    booking = _seed(db)
+
+    claim_transition(db, booking.id, "accepted", caregiver_id=1)
+    db.commit()
+    assert _statuses(db)[-1] == (booking.id, "accepted", 1)
+
+
+def test_dispatcher_offsets_and_redelivery(db, session_factory):
+    booking = _seed(db, caregiver_id=1)
+    dispatcher = OutboxDispatcher(session_factory=session_factory)
+
+    seen, flaky = [], []
+
+    def flaky_handler(evt):
+        if not flaky:
+            flaky.append(evt["event_id"])
+            raise RuntimeError("downstream unavailable")
+        flaky.append(evt["event_id"])
+
+    dispatcher.subscribe("test:history", lambda evt: seen.append(evt["status"]), replay=True)
+    dispatcher.subscribe("test:flaky", flaky_handler)   # starts at the current tail
+    dispatcher.poll_once()
+    assert seen == ["confirmed"]
+
+    transition_booking(booking, "accepted")
+    db.commit()
+    dispatcher.poll_once()
+    assert seen == ["confirmed", "accepted"]
+    assert dispatcher.metrics()["consumers"]["test:flaky"]["failures"] == 1
+
+    # Failed event is delivered again; the healthy consumer is not held back
+    dispatcher.poll_once()
+    assert flaky[0] == flaky[1]
+    assert seen == ["confirmed", "accepted"]
+
+    offsets = {o.consumer: o.last_event_id for o in db.query(ConsumerOffset)}
+    assert offsets["test:history"] == offsets["test:flaky"] == flaky[1]
+
+    # A restarted dispatcher resumes from the stored offsets
+    restarted = OutboxDispatcher(session_factory=session_factory)
+    again = []
+    restarted.subscribe("test:history", lambda evt: again.append(evt["status"]), replay=True)
+    transition_booking(booking, "in_progress")
+    db.commit()
+    restarted.poll_once()
+    assert again == ["in_progress"]
@@ -0,0 +1,68 @@
+"""
+Tests for the in-memory caregiver presence grid.
+"""
+
+from shared.models import Caregiver
+from shared.presence import PRESENCE_TTL_SECONDS, PresenceGrid
+
+
+NOW = 1_700_000_000.0
+
+
+def test_nearby_filters_by_radius_freshness_and_availability():
+    grid = PresenceGrid(capacity=2)
+    grid.update_many([
+        (1, 12.9716, 77.5946, NOW, True),        # at the point
+        (2, 12.9900, 77.6000, NOW, True),        # ~2 km away
+        (3, 13.0827, 80.2707, NOW, True),        # another city
+        (4, 12.9720, 77.5950, NOW, False),       # on a job
+        (5, 12.9718, 77.5947, NOW - PRESENCE_TTL_SECONDS - 1, True),  # stale
+    ])
+    assert len(grid) == 5
+
+    results = grid.nearby(12.9716, 77.5946, 5.0, now=NOW)
+    assert [cg for cg, _ in results] == [1, 2]
+    assert results[0][1] < 0.01 and 1.5 < results[1][1] < 3.0
+    assert [cg for cg, _ in grid.nearby(12.9716, 77.5946, 5.0, available_only=False, now=NOW)] == [1, 4, 2]
+    assert [cg for cg, _ in grid.nearby(12.9716, 77.5946, 5.0, limit=1, now=NOW)] == [1]
+
+
+def test_moves_change_cells_and_old_pings_are_ignored():
+    grid = PresenceGrid()
+    grid.update(1, 12.9716, 77.5946, seen=NOW)
+    grid.update(1, 28.6139, 77.2090, seen=NOW + 5)
+    assert grid.update_many([(1, 12.9716, 77.5946, NOW + 1, True)]) == 0
+
+    assert grid.nearby(12.9716, 77.5946, 5.0, now=NOW + 5) == []
+    assert [cg for cg, _ in grid.nearby(28.6139, 77.2090, 1.0, now=NOW + 5)] == [1]
+
+
+def test_flush_writes_only_changed_snapshots(session_factory, db):
+    cg = Caregiver(hashed_identity="hash_live", name="live", skills=["nursing"], verified=True)
+    db.add(cg)
+    db.commit()
+
+    grid = PresenceGrid(session_factory=session_factory)
+    grid.update(cg.id, 12.9716, 77.5946, seen=NOW)
+    grid.update(cg.id, 12.9720, 77.5950, seen=NOW + 1)
+
+    assert grid.flush() == 1
+    assert grid.flush() == 0
+
+    db.expire_all()
+    stored = db.get(Caregiver, cg.id)
+    assert (stored.last_lat, stored.last_lng) == (12.9720, 77.5950)
+    assert stored.last_seen_at is not None
+
+
+def test_wide_box_walks_occupied_cells_only():
+    grid = PresenceGrid()
+    grid.update_many([
+        (1, 12.9716, 77.5946, NOW, True),
+        (2, 13.5000, 78.0000, NOW, True),        # ~70 km away
+    ])
+    grid.update(2, 13.0000, 77.6000, seen=NOW + 1)   # moved: its old cell is dropped
+    assert len(grid._grid) == 2
+
+    # 1000 km spans millions of cells; only the two occupied ones are visited
+    assert [cg for cg, _ in grid.nearby(12.9716, 77.5946, 1000.0, now=NOW)] == [1, 2]
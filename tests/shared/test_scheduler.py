@@ -0,0 +1,140 @@
+"""
+Tests for the persistent scheduler and the booking jobs it runs.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+
+import shared.changes  # noqa: F401  (stamps change_seq on flush)
+from shared.booking_jobs import (
+    EXPIRE, REMIND, booking_job_times, register_booking_jobs, schedule_booking_jobs, task_key,
+)
+from shared.models import Booking, BookingEvent, Caregiver, Civilian, ScheduledTask
+from shared.outbox import event_payload
+from shared.scheduler import Scheduler, cancel, schedule
+
+NOW = datetime(2030, 1, 1, 12, 0)
+
+
+@pytest.fixture
+def scheduler(session_factory):
+    return Scheduler(session_factory, batch_size=10, lease_seconds=60, max_attempts=2, retry_seconds=30)
+
+
+def test_runs_due_tasks_in_a_batch_and_keeps_later_ones(db, scheduler):
+    ran = []
+    scheduler.register("noop", lambda db, task: ran.append(task.target_id))
+    for i in range(3):
+        schedule(db, "noop", NOW - timedelta(minutes=i), target_id=i)
+    schedule(db, "noop", NOW + timedelta(hours=1), target_id=99)
+    db.commit()
+
+    assert scheduler.run_due(NOW) == 3
+    assert sorted(ran) == [0, 1, 2]
+    assert [t.target_id for t in db.query(ScheduledTask)] == [99]
+    assert scheduler.metrics()["batches"] == 1
+
+
+def test_failing_task_is_retried_then_marked_failed(db, scheduler):
+    ran = []
+
+    def handler(db, task):
+        if task.target_id == 1:
+            raise RuntimeError("boom")
+        ran.append(task.target_id)
+
+    scheduler.register("job", handler)
+    schedule(db, "job", NOW, target_id=1)
+    schedule(db, "job", NOW, target_id=2)
+    db.commit()
+
+    # The good task still runs; the bad one moves back by the retry delay
+    assert scheduler.run_due(NOW) == 1
+    assert ran == [2]
+    task = db.query(ScheduledTask).one()
+    assert (task.status, task.attempts, task.due_at) == ("pending", 1, NOW + timedelta(seconds=30))
+
+    scheduler.run_due(NOW + timedelta(minutes=1))
+    db.expire_all()
+    task = db.query(ScheduledTask).one()
+    assert task.status == "failed"
+    assert "boom" in task.last_error
+    assert scheduler.metrics()["failed"] == 1
+
+
+def test_claimed_tasks_are_not_run_twice(db, scheduler):
+    scheduler.register("job", lambda db, task: None)
+    schedule(db, "job", NOW, target_id=1)
+    db.commit()
+    db.query(ScheduledTask).update({"claimed_until": NOW + timedelta(seconds=30)})
+    db.commit()
+
+    assert scheduler.run_due(NOW) == 0
+    # The lease ran out: the worker that held it died
+    assert scheduler.run_due(NOW + timedelta(minutes=1)) == 1
+
+
+def test_keyed_schedule_moves_the_task_and_cancel_removes_it(db):
+    schedule(db, "job", NOW, target_id=1, key="job:1")
+    db.commit()
+    schedule(db, "job", NOW + timedelta(hours=1), target_id=1, key="job:1")
+    db.commit()
+    assert [t.due_at for t in db.query(ScheduledTask)] == [NOW + timedelta(hours=1)]
+
+    assert cancel(db, "job:1") == 1
+    db.commit()
+    assert db.query(ScheduledTask).count() == 0
+
+
+def test_unmatched_booking_expires(db, session_factory, scheduler):
+    db.add(Caregiver(id=0, hashed_identity="broadcast", name="Broadcast", skills=[]))
+    db.add(Civilian(id=1, name="civ", guardian_contact="g@example.com"))
+    start = NOW + timedelta(hours=2)
+    booking = Booking(id=1, caregiver_id=0, civilian_id=1, start_time=start,
+                      end_time=start + timedelta(hours=1), status="pending")
+    db.add(booking)
+    db.commit()
+
+    evt = {"booking_id": 1, "status": "pending", "start_time": start.isoformat(), "at": NOW.isoformat()}
+    schedule_booking_jobs(evt, session_factory)
+    task = db.query(ScheduledTask).one()
+    assert task.key == task_key(EXPIRE, 1)
+
+    register_booking_jobs(scheduler)
+    assert scheduler.run_due(start) == 0
+    assert scheduler.run_due(task.due_at) == 1
+    db.expire_all()
+    assert db.get(Booking, 1).status == "cancelled"
+
+
+def test_confirmed_booking_gets_a_reminder_instead_of_expiry():
+    start = NOW + timedelta(days=1)
+    due = booking_job_times({"status": "confirmed", "start_time": start.isoformat()}, now=NOW)
+    assert list(due) == [REMIND]
+    assert due[REMIND] < start
+
+    assert booking_job_times({"status": "completed", "start_time": start.isoformat()}, now=NOW) == {}
+
+
+def test_reminder_goes_through_the_outbox(db, session_factory, scheduler):
+    db.add(Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[]))
+    db.add(Civilian(id=1, name="civ", guardian_contact="g@example.com"))
+    start = NOW + timedelta(days=1)
+    db.add(Booking(id=1, caregiver_id=1, civilian_id=1, start_time=start,
+                   end_time=start + timedelta(hours=1), status="confirmed"))
+    db.commit()
+    events_before = db.query(BookingEvent).count()
+
+    schedule(db, REMIND, NOW, target_id=1, key=task_key(REMIND, 1))
+    db.commit()
+    register_booking_jobs(scheduler)
+    assert scheduler.run_due(NOW) == 1
+
+    # Every service's SSE consumer sees it; the scheduler consumer ignores it
+    row = db.query(BookingEvent).order_by(BookingEvent.id.desc()).first()
+    assert db.query(BookingEvent).count() == events_before + 1
+    evt = event_payload(row)
+    assert evt["reminder"] is True and evt["caregiver_id"] == 1
+    schedule_booking_jobs(evt, session_factory)
+    assert db.query(ScheduledTask).count() == 0
@@ -0,0 +1,111 @@
+"""
+Tests for the pooled inter-service client: retries, deadlines and the
+circuit breaker.
+"""
+
+import asyncio
+
+import httpx
+import pytest
+
+from shared.service_client import CircuitOpenError, ServiceCallError, ServiceClient
+
+
+def _client(handler, retries=1):
+    client = ServiceClient("test", "http://test", timeout=1.0, retries=retries)
+    client._client = httpx.AsyncClient(base_url="http://test", transport=httpx.MockTransport(handler))
+    client.breaker.failure_threshold = 2
+    client.breaker.reset_seconds = 60.0
+    return client
+
+
+def test_retries_transient_failures():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        if len(attempts) == 1:
+            return httpx.Response(503)
+        return httpx.Response(200, json={"ok": True})
+
+    client = _client(handler)
+    response = asyncio.run(client.post("/rank", json={}))
+
+    assert response.json() == {"ok": True}
+    assert len(attempts) == 2
+    metrics = client.metrics()
+    assert metrics["calls"] == 2 and metrics["errors"] == 1
+    assert metrics["circuit"] == "closed"
+
+
+def test_client_errors_are_not_retried():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        return httpx.Response(422)
+
+    client = _client(handler)
+    response = asyncio.run(client.post("/rank", json={}))
+    assert response.status_code == 422
+    assert len(attempts) == 1
+
+
+def test_circuit_opens_and_serves_fallback():
+    attempts = []
+
+    def handler(request):
+        attempts.append(request)
+        raise httpx.ConnectError("refused")
+
+    client = _client(handler, retries=0)
+
+    async def scenario():
+        for _ in range(2):
+            with pytest.raises(ServiceCallError):
+                await client.get("/health")
+        with pytest.raises(CircuitOpenError):
+            await client.get("/health")
+        return await client.get("/health", fallback=lambda: "cached")
+
+    assert asyncio.run(scenario()) == "cached"
+    assert len(attempts) == 2
+    assert client.metrics()["circuit"] == "open"
+    assert client.metrics()["rejected"] == 2
+
+
+def test_deadline_bounds_slow_calls():
+    async def handler(request):
+        await asyncio.sleep(1.0)
+        return httpx.Response(200)
+
+    client = _client(handler, retries=3)
+
+    async def scenario():
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        with pytest.raises(ServiceCallError):
+            await client.get("/slow", deadline=0.1)
+        return loop.time() - started
+
+    assert asyncio.run(scenario()) < 0.5
+
+
+def test_cancelled_probe_does_not_wedge_the_circuit():
+    async def handler(request):
+        await asyncio.sleep(10)
+
+    client = _client(handler)
+    client.breaker.state = "open"
+    client.breaker.reset_seconds = 0.0
+
+    async def cancel_probe():
+        probe = asyncio.ensure_future(client.post("/rank", json={}))
+        await asyncio.sleep(0.05)
+        probe.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await probe
+
+    asyncio.run(cancel_probe())
+    assert client.breaker.state == "half_open"
+    assert client.breaker.allow() is True
@@ -0,0 +1,77 @@
+"""
+Tests for single-flight read coalescing.
+"""
+
+import threading
+import time
+
+import pytest
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+
+from shared.singleflight import Coalescer, SingleFlight, coalesced, get_group
+
+
+def test_concurrent_callers_share_one_execution():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    runs = []
+
+    def slow_query():
+        runs.append(1)
+        started.set()
+        release.wait(timeout=5)
+        return ("job-1", "job-2")
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("pending", slow_query)))
+    leader.start()
+    started.wait(timeout=5)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("pending", slow_query)))
+                 for _ in range(5)]
+    for t in followers:
+        t.start()
+    while flight.metrics()["coalesced"] < 5:
+        time.sleep(0.001)
+    release.set()
+    for t in [leader, *followers]:
+        t.join()
+
+    assert len(runs) == 1
+    assert results == [("job-1", "job-2")] * 6
+    assert flight.metrics()["coalesced"] == 5
+
+    # ttl=0: nothing is kept once the call finished
+    flight.do("pending", slow_query)
+    assert len(runs) == 2
+
+
+def test_micro_ttl_and_errors():
+    flight = SingleFlight(ttl=60)
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 1
+    assert flight.metrics()["cache_hits"] == 1
+
+    def boom():
+        raise RuntimeError("db down")
+
+    with pytest.raises(RuntimeError):
+        flight.do("e", boom)
+    # Errors are not cached
+    assert flight.do("e", lambda: 3) == 3
+
+
+def test_dependency_keys_by_route_and_normalized_params():
+    app = FastAPI()
+    calls = []
+
+    @app.get("/items/{item_id}")
+    def item(item_id: int, flight: Coalescer = Depends(coalesced(ttl=60))):
+        return flight.run(lambda: calls.append(item_id) or {"id": item_id, "n": len(calls)})
+
+    client = TestClient(app)
+    first = client.get("/items/1?b=2&a=1").json()
+    assert client.get("/items/1?a=1&b=2").json() == first
+    assert client.get("/items/2?a=1&b=2").json() != first
+    assert calls == [1, 2]
+    assert get_group("GET /items/{item_id}").metrics()["cache_hits"] == 1
@@ -0,0 +1,101 @@
+"""
+Tests for the skill vocabulary and bitset skill matching.
+"""
+
+import sys
+import os
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..', 'services'))
+
+from shared import skills
+from shared.skills import (
+    SkillVocabulary,
+    normalize_skill,
+    popcount,
+    skill_match_scores,
+)
+from shared.models import Caregiver
+
+
+@pytest.fixture
+def vocab():
+    return SkillVocabulary()
+
+
+def test_spellings_and_synonyms_fold(vocab):
+    """Different spellings of one skill resolve to a single id."""
+    assert normalize_skill("  Elderly   Care ") == "elderly_care"
+    ids = {vocab.id_for(s) for s in ["elderly care", "elderly_care", "Elder-Care", "senior care"]}
+    assert len(ids) == 1
+    assert vocab.name_for(ids.pop()) == "elderly_care"
+
+
+def test_unknown_skill_registration(vocab):
+    """Unseen skills get a new id only when creation is allowed."""
+    assert vocab.id_for("tracheostomy care", create=False) is None
+    new_id = vocab.id_for("tracheostomy care")
+    assert new_id == len(vocab) - 1
+    assert vocab.id_for("Tracheostomy-Care") == new_id
+
+
+def test_encode_decode_roundtrip_beyond_one_word():
+    """Bitsets grow past 64 skills and decode back to canonical names."""
+    vocab = SkillVocabulary(synonyms={f"skill {i}": [] for i in range(70)})
+    words = vocab.encode(["skill 3", "skill 69"])
+    assert words.shape == (2,)
+    assert popcount(words) == 2
+    assert sorted(vocab.decode(words)) == ["skill_3", "skill_69"]
+
+
+def test_vectorized_scores(vocab):
+    """Coverage and Jaccard are computed for all candidates at once."""
+    candidates = vocab.encode_many([
+        ["elderly care", "nursing"],
+        ["nursing"],
+        ["companionship"],
+        ["elder_care", "nursing", "wound care", "physio"],
+    ])
+    required = vocab.encode(["elderly care", "nurse"])
+
+    coverage = skill_match_scores(required, candidates)
+    jaccard = skill_match_scores(required, candidates, metric="jaccard")
+
+    np.testing.assert_allclose(coverage, [1.0, 0.5, 0.0, 1.0])
+    np.testing.assert_allclose(jaccard, [1.0, 0.5, 0.0, 0.5])
+
+
+def test_empty_request_scores_zero(vocab):
+    candidates = vocab.encode_many([["nursing"]])
+    assert skill_match_scores(vocab.encode([]), candidates).tolist() == [0.0]
+
+
+def test_unknown_request_skills_are_not_registered(monkeypatch, vocab):
+    """Request skills never grow the vocabulary, and unknown ones still count."""
+    monkeypatch.setattr(skills, "vocabulary", vocab)
+    size, n_words = len(vocab), vocab.n_words
+    required = ["nursing"] + [f"made up {i}" for i in range(100)]
+
+    coverage = skills.score_candidates(required[:2], [["nursing"], ["companionship"]])
+    jaccard = skills.score_candidates(required[:2], [["nursing"]], metric="jaccard")
+    skills.score_candidates(required, [["nursing"]])
+
+    assert (len(vocab), vocab.n_words) == (size, n_words)
+    np.testing.assert_allclose(coverage, [0.5, 0.0])
+    np.testing.assert_allclose(jaccard, [0.5])
+
+
+def test_caregiver_skills_cache_tracks_changes():
+    """Decoded skills are cached but follow updates through the setter."""
+    cg = Caregiver(name="Cache Test", hashed_identity="h", skills=["nursing"])
+    assert cg.skills == ["nursing"]
+    first_ids = cg.skill_ids
+
+    cg.skills = ["nursing", "elderly care"]
+    assert cg.skills == ["nursing", "elderly care"]
+    assert len(cg.skill_ids) == 2 and set(first_ids) < set(cg.skill_ids)
+
+    cg.skills.append("mutated")
+    assert "mutated" not in cg.skills
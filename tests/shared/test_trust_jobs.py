@@ -0,0 +1,96 @@
+"""
+Tests for the coalescing trust recompute queue.
+"""
+
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from shared.database import Base
+from shared.models import Caregiver, ScheduledTask
+from shared.scheduler import Scheduler
+from shared.trust_jobs import (
+    TRUST_RECOMPUTE, enqueue_trust_recompute, on_booking_event, register_trust_jobs,
+)
+
+
+@pytest.fixture
+def scheduler(session_factory):
+    scheduler = Scheduler(session_factory, batch_size=10, lease_seconds=60)
+    register_trust_jobs(scheduler)
+    return scheduler
+
+
+@pytest.fixture
+def caregiver(db):
+    cg = Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=[],
+                   verified=True, rating_average=4.0, trust_score=0.0)
+    db.add(cg)
+    db.commit()
+    return cg
+
+
+def test_burst_of_ratings_runs_one_recompute(db, scheduler, caregiver):
+    queued = []
+    for _ in range(50):
+        queued.append(enqueue_trust_recompute(db, 1))
+        db.commit()
+
+    assert queued.count(True) == 1
+    assert db.query(ScheduledTask).count() == 1
+
+    assert scheduler.run_due(datetime.utcnow() + timedelta(minutes=1)) == 1
+    db.expire_all()
+    assert db.get(Caregiver, 1).trust_score == 64.0
+    queue = scheduler.metrics()["queues"][TRUST_RECOMPUTE]
+    assert (queue["executed"], queue["depth"]) == (1, 0)
+
+
+def test_running_job_is_rearmed(db, caregiver):
+    enqueue_trust_recompute(db, 1)
+    db.commit()
+    # A worker holds it: a new rating must cause one more run
+    db.query(ScheduledTask).update({"claimed_until": datetime.utcnow() + timedelta(seconds=30)})
+    db.commit()
+
+    assert enqueue_trust_recompute(db, 1) is True
+    db.commit()
+    task = db.query(ScheduledTask).one()
+    assert task.claimed_until is None
+
+
+def test_only_trust_relevant_events_queue_jobs(db, session_factory, caregiver):
+    on_booking_event({"status": "accepted", "caregiver_id": 1}, session_factory)
+    on_booking_event({"status": "completed", "caregiver_id": 0}, session_factory)
+    assert db.query(ScheduledTask).count() == 0
+
+    on_booking_event({"status": "completed", "caregiver_id": 1}, session_factory)
+    assert db.query(ScheduledTask).one().target_id == 1
+
+
+
+def test_interleaved_enqueues_coalesce_instead_of_failing(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'queue.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autoflush=False, bind=engine)
+    first, second = factory(), factory()
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def _first_commits_in_between(conn, cursor, statement, *args):
+        # The second session has looked and found no job; the first one
+        # queues its job and commits just before the second one inserts
+        if statement.startswith("INSERT INTO scheduled_tasks") and not first.info.get("done"):
+            first.info["done"] = True
+            assert enqueue_trust_recompute(first, 1) is True
+            first.commit()
+
+    try:
+        assert enqueue_trust_recompute(second, 1) is False
+        second.commit()
+        assert second.query(ScheduledTask).count() == 1
+    finally:
+        first.close()
+        second.close()
+        engine.dispose()
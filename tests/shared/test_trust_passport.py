@@ -0,0 +1,89 @@
+"""
+Tests for the precomputed Trust Passport read model.
+"""
+
+import json
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+
+from shared.models import Booking, Caregiver, Civilian, Rating, TrustPassport
+from shared.trust_passport import backfill_passports, passport_response, regenerate_passport
+
+START = datetime(2030, 1, 1, 9, 0)
+
+
+@pytest.fixture
+def caregiver(db):
+    cg = Caregiver(id=1, hashed_identity="hash_1", name="cg1", skills=["elderly_care"],
+                   experience_years=3, verified=True, rating_average=4.0)
+    db.add(cg)
+    db.add(Civilian(id=1, name="civ", guardian_contact="g@example.com"))
+    db.commit()
+    return cg
+
+
+@pytest.fixture
+def client(session_factory):
+    app = FastAPI()
+
+    @app.get("/caregiver/{caregiver_id}/passport")
+    @app.get("/caregiver/{caregiver_id}/passport/{version}")
+    def get_passport(caregiver_id: int, request: Request, version: int = None):
+        db = session_factory()
+        try:
+            return passport_response(request, db, caregiver_id, version)
+        finally:
+            db.close()
+
+    return TestClient(app)
+
+
+def test_regenerates_only_when_inputs_change(db, caregiver):
+    passport = regenerate_passport(db, 1)
+    db.commit()
+    assert passport.version == 1
+    doc = json.loads(passport.document)
+    assert doc["trust_level"] == "Good"
+    assert doc["breakdown"]["ratings"]["score"] == 22.5
+
+    etag = passport.etag
+    regenerate_passport(db, 1)
+    db.commit()
+    assert (passport.version, passport.etag) == (1, etag)
+
+    db.add(Booking(caregiver_id=1, civilian_id=1, start_time=START,
+                   end_time=START + timedelta(hours=1), status="completed"))
+    db.add(Rating(caregiver_hash="hash_1", caregiver_id=1, rating=5))
+    regenerate_passport(db, 1)
+    db.commit()
+    doc = json.loads(passport.document)
+    assert passport.version == 2 and passport.etag != etag
+    assert (doc["breakdown"]["experience"]["completed_jobs"], doc["total_ratings"]) == (1, 1)
+
+
+def test_serves_stored_document_with_strong_etag(db, caregiver, client):
+    backfill_passports(db)
+    stored = db.get(TrustPassport, 1)
+
+    res = client.get("/caregiver/1/passport")
+    assert res.status_code == 200
+    assert res.content == stored.document.encode()
+    assert res.headers["etag"] == stored.etag and not stored.etag.startswith("W/")
+    assert res.headers["cache-control"] == "no-cache"
+    assert res.headers["content-location"] == "/caregiver/1/passport/1"
+
+    assert client.get("/caregiver/1/passport", headers={"If-None-Match": stored.etag}).status_code == 304
+
+    res = client.get("/caregiver/1/passport/1")
+    assert "immutable" in res.headers["cache-control"]
+    assert client.get("/caregiver/1/passport/2").status_code == 404
+    assert client.get("/caregiver/9/passport").status_code == 404
+
+
+def test_missing_passport_is_built_on_first_read(db, caregiver, client):
+    assert db.query(TrustPassport).count() == 0
+    assert client.get("/caregiver/1/passport").json()["version"] == 1
+    assert db.query(TrustPassport).count() == 1
@@ -0,0 +1,55 @@
+"""
+Tests for the unit-of-work helper and the bootstrap sentinel rows.
+"""
+
+import pytest
+from sqlalchemy import event
+
+from shared.migrations import _seed_broadcast_caregiver
+from shared.models import AuthIdentity, Caregiver, Civilian
+from shared.unit_of_work import after_commit, unit_of_work
+from shared.workflow import BROADCAST_CAREGIVER_ID
+
+
+def _civilian(civilian_id):
+    return Civilian(id=civilian_id, name=f"civ{civilian_id}", guardian_contact="g@example.com")
+
+
+def test_commits_once_and_runs_callbacks_after(db, session_factory):
+    calls = []
+    commits = []
+    event.listen(db, "after_commit", lambda session: commits.append(1))
+
+    with unit_of_work(db):
+        db.add(_civilian(1))
+        with unit_of_work(db):  # joins the outer block
+            db.add(_civilian(2))
+        db.flush()
+        after_commit(db, lambda: calls.append("audit"))
+        assert calls == []
+
+    assert len(commits) == 1
+    assert calls == ["audit"]
+    assert session_factory().query(Civilian).count() == 2
+
+
+def test_rolls_back_everything_and_drops_callbacks(db):
+    calls = []
+    with pytest.raises(RuntimeError):
+        with unit_of_work(db):
+            db.add(_civilian(1))
+            db.flush()
+            after_commit(db, lambda: calls.append("audit"))
+            raise RuntimeError("boom")
+
+    assert db.query(Civilian).count() == 0
+    db.commit()
+    assert calls == []
+
+
+def test_broadcast_caregiver_is_seeded_once(db):
+    _seed_broadcast_caregiver(db)
+    _seed_broadcast_caregiver(db)
+
+    assert db.get(AuthIdentity, BROADCAST_CAREGIVER_ID) is not None
+    assert db.query(Caregiver).filter(Caregiver.id == BROADCAST_CAREGIVER_ID).count() == 1
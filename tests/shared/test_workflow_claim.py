@@ -0,0 +1,132 @@
+"""
+Tests for atomic compare-and-set booking transitions.
+"""
+
+import threading
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import HTTPException
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from shared.database import Base
+from shared.models import Booking, Caregiver, Civilian
+from shared.workflow import claim_transition, predecessors
+
+
+def _seed(db, n_caregivers=2, status="confirmed"):
+    db.add(Caregiver(id=0, hashed_identity="hash_broadcast", name="Broadcast", skills=[]))
+    for i in range(1, n_caregivers + 1):
+        db.add(Caregiver(id=i, hashed_identity=f"hash_{i}", name=f"cg{i}", skills=[]))
+    db.add(Civilian(id=1, name="civ", guardian_contact="g@example.com"))
+    start = datetime.utcnow() + timedelta(days=1)
+    booking = Booking(caregiver_id=0, civilian_id=1, start_time=start,
+                      end_time=start + timedelta(hours=2), status=status, payment_status="reserved")
+    db.add(booking)
+    db.commit()
+    return booking.id
+
+
+def test_predecessors():
+    assert predecessors("in_progress") == ["accepted", "paused"]
+    assert predecessors("closed") == ["rated"]
+
+
+def test_first_claim_wins(db):
+    booking_id = _seed(db)
+
+    booking = claim_transition(db, booking_id, "accepted", caregiver_id=1)
+    db.commit()
+    assert (booking.status, booking.caregiver_id) == ("accepted", 1)
+
+    with pytest.raises(HTTPException) as exc:
+        claim_transition(db, booking_id, "accepted", caregiver_id=2)
+    assert exc.value.status_code == 409
+    assert "another caregiver" in exc.value.detail
+
+
+def test_illegal_move_and_missing_booking(db):
+    booking_id = _seed(db)
+
+    with pytest.raises(HTTPException) as exc:
+        claim_transition(db, booking_id, "completed", caregiver_id=1)
+    assert exc.value.status_code == 409
+    assert "from 'confirmed'" in exc.value.detail
+
+    with pytest.raises(HTTPException) as exc:
+        claim_transition(db, 999, "accepted", caregiver_id=1)
+    assert exc.value.status_code == 404
+
+
+def test_extra_values_and_conditions(db):
+    booking_id = _seed(db, status="accepted")
+
+    started = datetime.utcnow()
+    booking = claim_transition(
+        db, booking_id, "in_progress", caregiver_id=1,
+        where=(Booking.payment_status == "reserved",),
+        values={"started_at": started, "payment_status": "paid"},
+    )
+    db.commit()
+    assert (booking.status, booking.payment_status, booking.started_at) == ("in_progress", "paid", started)
+
+
+def test_claim_refuses_overlapping_booking(db):
+    booking_id = _seed(db)
+    held = db.get(Booking, booking_id)
+    db.add(Civilian(id=2, name="civ2", guardian_contact="g2@example.com"))
+    db.add(Booking(caregiver_id=1, civilian_id=2, start_time=held.start_time + timedelta(hours=1),
+                   end_time=held.end_time + timedelta(hours=1), status="accepted",
+                   payment_status="reserved"))
+    db.commit()
+
+    with pytest.raises(HTTPException) as exc:
+        claim_transition(db, booking_id, "accepted", caregiver_id=1)
+    assert exc.value.status_code == 409
+    assert "already booked" in exc.value.detail
+    db.rollback()
+
+    # A free caregiver still claims it, and moves along its own booking
+    booking = claim_transition(db, booking_id, "accepted", caregiver_id=2)
+    db.commit()
+    assert (booking.status, booking.caregiver_id) == ("accepted", 2)
+
+
+def test_concurrent_claims_have_one_winner(tmp_path):
+    engine = create_engine(
+        f"sqlite:///{tmp_path / 'race.db'}",
+        connect_args={"check_same_thread": False, "timeout": 10},
+    )
+    Base.metadata.create_all(bind=engine)
+    Session = sessionmaker(bind=engine)
+    with Session() as db:
+        booking_id = _seed(db, n_caregivers=8)
+
+    results = {}
+    barrier = threading.Barrier(8)
+
+    def attempt(caregiver_id):
+        with Session() as db:
+            barrier.wait()
+            try:
+                claim_transition(db, booking_id, "accepted", caregiver_id)
+                db.commit()
+                results[caregiver_id] = "won"
+            except HTTPException as e:
+                db.rollback()
+                results[caregiver_id] = e.status_code
+
+    threads = [threading.Thread(target=attempt, args=(i,)) for i in range(1, 9)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    winners = [cg for cg, result in results.items() if result == "won"]
+    assert len(winners) == 1
+    assert sorted(r for r in results.values() if r != "won") == [409] * 7
+
+    with Session() as db:
+        assert db.get(Booking, booking_id).caregiver_id == winners[0]
+    engine.dispose()